@@ -0,0 +1,65 @@
+"""
+Compare sequential KV v2 reads with read_many against a local stub server.
+
+Usage: python -m benchmarks.bench_kv_read_many [--paths 200] [--latency 0.005] [--concurrency 1 4 16 64]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_server import StubVaultServer
+from vaultx import AsyncClient, Client
+
+
+def _report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<32} {elapsed * 1000:>9.1f} ms {count / elapsed:>10.1f} reads/s")
+
+
+def run_sync(url: str, paths: list[str], concurrencies: list[int]) -> None:
+    with Client(url=url, token="bench") as client:
+        kv = client.secrets.kv.v2
+        kv.read_secret_version(path=paths[0])
+
+        start = time.perf_counter()
+        for path in paths:
+            kv.read_secret_version(path=path)
+        _report("sync sequential", len(paths), time.perf_counter() - start)
+
+        for concurrency in concurrencies:
+            start = time.perf_counter()
+            kv.read_many(paths, concurrency=concurrency, on_error="raise")
+            _report(f"sync read_many concurrency={concurrency}", len(paths), time.perf_counter() - start)
+
+
+async def run_async(url: str, paths: list[str], concurrencies: list[int]) -> None:
+    async with AsyncClient(url=url, token="bench") as client:
+        kv = client.secrets.kv.v2
+        await kv.read_secret_version(path=paths[0])
+
+        start = time.perf_counter()
+        for path in paths:
+            await kv.read_secret_version(path=path)
+        _report("async sequential", len(paths), time.perf_counter() - start)
+
+        for concurrency in concurrencies:
+            start = time.perf_counter()
+            await kv.read_many(paths, concurrency=concurrency, on_error="raise")
+            _report(f"async read_many concurrency={concurrency}", len(paths), time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paths", type=int, default=200, help="number of distinct secrets to read")
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated server latency in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    paths = [f"app/secret-{i}" for i in range(args.paths)]
+    with StubVaultServer(latency=args.latency) as server:
+        run_sync(server.url, paths, args.concurrency)
+        asyncio.run(run_async(server.url, paths, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Minimal in-process stand-in for a Vault server, used by the benchmarks
+"""
+
+import json
+import os
+import re
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+
+def _envelope(data: Any, **fields: Any) -> dict[str, Any]:
+    return {
+        "request_id": "00000000-0000-0000-0000-000000000000",
+        "lease_id": "",
+        "renewable": False,
+        "lease_duration": 0,
+        "data": data,
+        "wrap_info": None,
+        "warnings": None,
+        "auth": None,
+        **fields,
+    }
+
+
+def kv_read_payload(value_size: int) -> dict[str, Any]:
+    return _envelope(
+        {
+            "data": {"username": "app", "password": "x" * value_size},
+            "metadata": {
+                "version": 1,
+                "created_time": "2024-01-01T00:00:00Z",
+                "deletion_time": "",
+                "destroyed": False,
+                "custom_metadata": None,
+            },
+        }
+    )
+
+
+def kv_list_payload(value_size: int) -> dict[str, Any]:
+    return _envelope({"keys": [f"secret-{i}" for i in range(max(value_size // 8, 1))]})
+
+
+def transit_encrypt_payload(value_size: int) -> dict[str, Any]:
+    return _envelope({"ciphertext": "vault:v1:" + "A" * value_size, "key_version": 1})
+
+
+# Fixed data key: the stub only has to answer with a valid AES key, not to keep it secret
+_DATA_KEY = "YmVuY2gtZGF0YS1rZXktYmVuY2gtZGF0YS1rZXkhISE="
+
+
+def transit_datakey_payload(value_size: int) -> dict[str, Any]:
+    return _envelope({"plaintext": _DATA_KEY, "ciphertext": "vault:v1:" + "A" * 80, "key_version": 1})
+
+
+def transit_decrypt_payload(value_size: int) -> dict[str, Any]:
+    return _envelope({"plaintext": _DATA_KEY})
+
+
+def token_lookup_payload(value_size: int) -> dict[str, Any]:
+    return _envelope(
+        {
+            "accessor": "8609694a-cdbc-db9b-d345-e782dbb562ed",
+            "creation_time": 1523979354,
+            "creation_ttl": 2764800,
+            "display_name": "token",
+            "entity_id": "",
+            "expire_time": "2018-05-19T11:35:54.466476215-04:00",
+            "explicit_max_ttl": 0,
+            "id": "s.bench",
+            "identity_policies": [],
+            "issue_time": "2018-04-17T11:35:54.466476078-04:00",
+            "meta": {"username": "x" * value_size},
+            "num_uses": 0,
+            "orphan": False,
+            "path": "auth/token/create",
+            "policies": ["default"],
+            "renewable": True,
+            "ttl": 2764790,
+        }
+    )
+
+
+def sys_mounts_payload(value_size: int) -> dict[str, Any]:
+    mounts = {
+        f"mount-{i}/": {
+            "accessor": f"kv_{i:08x}",
+            "config": {"default_lease_ttl": 0, "force_no_cache": False, "max_lease_ttl": 0},
+            "description": "",
+            "external_entropy_access": False,
+            "local": False,
+            "options": {"version": "2"},
+            "seal_wrap": False,
+            "type": "kv",
+            "uuid": f"00000000-0000-0000-0000-{i:012d}",
+        }
+        for i in range(max(value_size // 16, 1))
+    }
+    return _envelope(mounts, **mounts)
+
+
+def sys_health_payload(value_size: int) -> dict[str, Any]:
+    return {
+        "initialized": True,
+        "sealed": False,
+        "standby": False,
+        "performance_standby": False,
+        "replication_performance_mode": "disabled",
+        "replication_dr_mode": "disabled",
+        "server_time_utc": 1516639589,
+        "version": "1.15.0",
+        "cluster_name": "vault-cluster-bench",
+        "cluster_id": "bench",
+    }
+
+
+ROUTES = [
+    ("GET", re.compile(r"^/v1/sys/health$"), sys_health_payload),
+    ("GET", re.compile(r"^/v1/sys/mounts$"), sys_mounts_payload),
+    ("GET", re.compile(r"^/v1/auth/token/lookup-self$"), token_lookup_payload),
+    ("POST", re.compile(r"^/v1/[^/]+/encrypt/[^/]+$"), transit_encrypt_payload),
+    ("POST", re.compile(r"^/v1/[^/]+/datakey/plaintext/[^/]+$"), transit_datakey_payload),
+    ("POST", re.compile(r"^/v1/[^/]+/decrypt/[^/]+$"), transit_decrypt_payload),
+    ("LIST", re.compile(r"^/v1/[^/]+/metadata/"), kv_list_payload),
+    ("GET", re.compile(r"^/v1/[^/]+/metadata/.*\?(.*&)?list=true"), kv_list_payload),
+    ("GET", re.compile(r"^/v1/[^/]+/data/"), kv_read_payload),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "StubVaultServer"
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        status, body = self.server.response_for(self.command, self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_LIST = _reply  # noqa: N815
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+
+class _UnixHandler(_Handler):
+    # TCP_NODELAY does not apply to Unix domain sockets
+    disable_nagle_algorithm = False
+
+
+class StubVaultServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering KV, transit, token and sys requests with canned Vault responses.
+
+    Response bodies are encoded once, when the server is created, so that the server adds as little as possible
+    to the measured time. Unknown routes are answered with 404.
+
+    :param latency: Seconds each request is delayed by, simulating network and server time.
+    :param value_size: Approximate size in bytes of the variable part of every response.
+    :param port: TCP port to listen on, a free one by default.
+    :param path: Path of a Unix domain socket to listen on instead of a TCP port.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency: float = 0.0, value_size: int = 64, port: int = 0, path: Optional[str] = None) -> None:
+        self.path = path
+        if path is None:
+            super().__init__(("127.0.0.1", port), _Handler)
+        else:
+            self.address_family = socket.AF_UNIX
+            super().__init__(path, _UnixHandler)  # type: ignore[arg-type]
+        self.latency = latency
+        self.value_size = value_size
+        self._bodies = [
+            (method, pattern, json.dumps(payload(value_size)).encode()) for method, pattern, payload in ROUTES
+        ]
+        self._not_found = json.dumps({"errors": []}).encode()
+        self._thread: Optional[threading.Thread] = None
+
+    def server_bind(self) -> None:
+        if self.path is None:
+            super().server_bind()
+            return
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+    @property
+    def url(self) -> str:
+        if self.path is not None:
+            return f"unix://{self.path}"
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def response_for(self, method: str, path: str) -> tuple[int, bytes]:
+        for route_method, pattern, body in self._bodies:
+            if route_method == method and pattern.search(path):
+                return 200, body
+        return 404, self._not_found
+
+    def __enter__(self) -> "StubVaultServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        if self.path is not None:
+            os.unlink(self.path)
@@ -0,0 +1,510 @@
+"""
+Request overhead, throughput and response memory benchmarks against a local stub server.
+
+Usage: python -m benchmarks [--quick] [--output results.json] [--compare baseline.json] [--threshold 0.15]
+"""
+
+import argparse
+import asyncio
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from importlib import metadata
+from typing import Any, Optional
+
+import httpx
+
+from benchmarks.stub_server import StubVaultServer
+from vaultx import AsyncClient, Client, adapters
+from vaultx.adapters import VaultxResponse
+
+
+ENDPOINTS: dict[str, tuple[str, str, Callable[[Any], Any]]] = {
+    "kv.read": ("GET", "/v1/secret/data/bench/app", lambda c: c.secrets.kv.v2.read_secret_version(path="bench/app")),
+    "transit.encrypt": (
+        "POST",
+        "/v1/transit/encrypt/bench",
+        lambda c: c.secrets.transit.encrypt_data(name="bench", plaintext="aGVsbG8gd29ybGQ="),
+    ),
+    "token.lookup_self": ("GET", "/v1/auth/token/lookup-self", lambda c: c.auth.token.lookup_self()),
+    "sys.mounts": ("GET", "/v1/sys/mounts", lambda c: c.sys.list_mounted_secrets_engines()),
+}
+
+CLIENTS = ["sync-httpx", "async-aiohttp", "async-httpx", "async-aiohttp-native"]
+
+MOCK_URL = "http://vault.bench"
+
+# Metrics where a larger value is an improvement; every other metric is a cost.
+HIGHER_IS_BETTER_SUFFIXES = (".rps", ".mb_per_s")
+
+
+class Settings:
+    def __init__(self, quick: bool, endpoints: list[str], concurrency: list[int], latency: float, value_size: int):
+        self.endpoints = endpoints
+        self.concurrency = concurrency
+        self.latency = latency
+        self.value_size = value_size
+        self.rounds = 3 if quick else 7
+        self.calls = 100 if quick else 500
+        self.warmup = 20 if quick else 100
+        self.throughput_requests = 100 if quick else 400
+        self.memory_responses = 200 if quick else 1000
+        self.stream_bytes = (16 if quick else 128) * 1024 * 1024
+
+
+@contextmanager
+def _timed_section() -> Iterator[None]:
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def _median_round(rounds: int, run_round: Callable[[], float]) -> float:
+    return statistics.median(run_round() for _ in range(rounds))
+
+
+def _sync_client(url: str) -> Client:
+    return Client(url=url, token="s.bench")
+
+
+@asynccontextmanager
+async def _async_client(kind: str, url: str):
+    if kind == "async-httpx":
+        client = AsyncClient(url=url, token="s.bench", client=httpx.AsyncClient())
+    elif kind == "async-aiohttp-native":
+        client = AsyncClient(url=url, token="s.bench", adapter=adapters.AiohttpVaultxAdapter)
+    else:
+        client = AsyncClient(url=url, token="s.bench")
+    async with client:
+        yield client
+
+
+def _mock_handler(server: StubVaultServer) -> Callable[[httpx.Request], httpx.Response]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        status, body = server.response_for(request.method, request.url.raw_path.decode())
+        return httpx.Response(status, headers={"content-type": "application/json"}, content=body)
+
+    return handler
+
+
+def _per_call_us(settings: Settings, call: Callable[[], Any]) -> float:
+    for _ in range(settings.warmup):
+        call()
+    rounds = []
+    for _ in range(settings.rounds):
+        with _timed_section():
+            start = time.perf_counter()
+            for _ in range(settings.calls):
+                call()
+            rounds.append((time.perf_counter() - start) / settings.calls * 1e6)
+    # The fastest round is the one least disturbed by the rest of the machine.
+    return min(rounds)
+
+
+async def _async_per_call_us(settings: Settings, call: Callable[[], Awaitable[Any]]) -> float:
+    for _ in range(settings.warmup):
+        await call()
+    rounds = []
+    for _ in range(settings.rounds):
+        with _timed_section():
+            start = time.perf_counter()
+            for _ in range(settings.calls):
+                await call()
+            rounds.append((time.perf_counter() - start) / settings.calls * 1e6)
+    return min(rounds)
+
+
+class _CallCounter:
+    """Profiler counting Python and C function calls, a timing-independent measure of the work done per request."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, frame: Any, event: str, arg: Any) -> None:
+        if event in ("call", "c_call"):
+            self.calls += 1
+
+    def __enter__(self) -> "_CallCounter":
+        sys.setprofile(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        sys.setprofile(None)
+
+
+def _calls_per_request(call: Callable[[], Any], requests: int = 20) -> float:
+    call()
+    with _CallCounter() as counter:
+        for _ in range(requests):
+            call()
+    return counter.calls / requests
+
+
+async def _async_calls_per_request(call: Callable[[], Awaitable[Any]], requests: int = 20) -> float:
+    await call()
+    with _CallCounter() as counter:
+        for _ in range(requests):
+            await call()
+    return counter.calls / requests
+
+
+def bench_overhead(server: StubVaultServer, settings: Settings) -> dict[str, float]:
+    """
+    Work done by vaultx itself for one call: adapter, response wrapping and API layers.
+
+    Both vaultx and a bare httpx client send the same request through an in-memory httpx.MockTransport serving the
+    stub server's bodies; no sockets are involved. Reported are the per-call time of vaultx, the time it adds on top
+    of httpx, and the number of function calls it adds, which unlike timings does not depend on machine load.
+    """
+    results: dict[str, float] = {}
+    transport = httpx.MockTransport(_mock_handler(server))
+    with httpx.Client(base_url=MOCK_URL, transport=transport) as raw:
+        client = Client(url=MOCK_URL, token="s.bench", client=httpx.Client(transport=transport))
+        with client:
+            for name in settings.endpoints:
+                method, path, call = ENDPOINTS[name]
+                body: Optional[dict[str, Any]] = {} if method == "POST" else None
+                send_raw, send = partial(raw.request, method, path, json=body), partial(call, client)
+                measured, calls = _per_call_us(settings, send), _calls_per_request(send)
+                results[f"overhead.sync.{name}.us_per_call"] = measured
+                results[f"overhead.sync.{name}.calls_per_request"] = calls
+                results[f"overhead.sync.{name}.added_us"] = measured - _per_call_us(settings, send_raw)
+                results[f"overhead.sync.{name}.added_calls"] = calls - _calls_per_request(send_raw)
+
+    results.update(asyncio.run(_bench_async_overhead(server, settings)))
+    return results
+
+
+async def _bench_async_overhead(server: StubVaultServer, settings: Settings) -> dict[str, float]:
+    results: dict[str, float] = {}
+    transport = httpx.MockTransport(_mock_handler(server))
+    async with httpx.AsyncClient(base_url=MOCK_URL, transport=transport) as raw:
+        client = AsyncClient(url=MOCK_URL, token="s.bench", client=httpx.AsyncClient(transport=transport))
+        async with client:
+            for name in settings.endpoints:
+                method, path, call = ENDPOINTS[name]
+                body: Optional[dict[str, Any]] = {} if method == "POST" else None
+                send_raw, send = partial(raw.request, method, path, json=body), partial(call, client)
+                measured, calls = await _async_per_call_us(settings, send), await _async_calls_per_request(send)
+                results[f"overhead.async.{name}.us_per_call"] = measured
+                results[f"overhead.async.{name}.calls_per_request"] = calls
+                results[f"overhead.async.{name}.added_us"] = measured - await _async_per_call_us(settings, send_raw)
+                results[f"overhead.async.{name}.added_calls"] = calls - await _async_calls_per_request(send_raw)
+    return results
+
+
+def bench_latency(url: str, settings: Settings) -> dict[str, float]:
+    """Median time of one sequential call over loopback, for every client and transport."""
+    results: dict[str, float] = {}
+    with _sync_client(url) as client:
+        for name in settings.endpoints:
+            call = ENDPOINTS[name][2]
+            results[f"latency.sync-httpx.{name}.us_per_call"] = _per_call_us(settings, partial(call, client))
+
+    for kind in CLIENTS[1:]:
+        results.update(asyncio.run(_bench_async_latency(kind, url, settings)))
+    return results
+
+
+async def _bench_async_latency(kind: str, url: str, settings: Settings) -> dict[str, float]:
+    results: dict[str, float] = {}
+    async with _async_client(kind, url) as client:
+        for name in settings.endpoints:
+            call = ENDPOINTS[name][2]
+            results[f"latency.{kind}.{name}.us_per_call"] = await _async_per_call_us(settings, partial(call, client))
+    return results
+
+
+def bench_unix_socket(settings: Settings) -> dict[str, float]:
+    """Median time of one sequential call over loopback TCP and over a Unix domain socket, e.g. to a Vault Agent."""
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        uds_server = StubVaultServer(value_size=settings.value_size, path=os.path.join(directory, "vault.sock"))
+        with StubVaultServer(value_size=settings.value_size) as tcp, uds_server as uds:
+            for transport, url in (("tcp", tcp.url), ("unix", uds.url)):
+                with _sync_client(url) as client:
+                    for name in settings.endpoints:
+                        call = partial(ENDPOINTS[name][2], client)
+                        results[f"transport.{transport}.sync-httpx.{name}.us_per_call"] = _per_call_us(settings, call)
+                # async-httpx is left out, its client is built by the caller and ignores the address scheme
+                for kind in ("async-aiohttp", "async-aiohttp-native"):
+                    latency = asyncio.run(_bench_async_latency(kind, url, settings))
+                    for key, value in latency.items():
+                        results[key.replace("latency.", f"transport.{transport}.", 1)] = value
+    return results
+
+
+class _NullWriter(io.RawIOBase):
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        return len(data)
+
+
+def bench_envelope(url: str, settings: Settings) -> dict[str, float]:
+    """
+    Time of one local envelope encryption, next to transit.encrypt which sends every payload to Vault, and encrypted
+    stream throughput with chunks encrypted in the calling thread and across one thread per core.
+    """
+    results: dict[str, float] = {}
+    payload = os.urandom(settings.value_size)
+    plaintext = os.urandom(settings.stream_bytes)
+    with _sync_client(url) as client:
+        encryptor = client.secrets.transit.envelope("bench")
+        results["envelope.encrypt.us_per_call"] = _per_call_us(settings, partial(encryptor.encrypt, payload))
+        results["envelope.decrypt.us_per_call"] = _per_call_us(
+            settings, partial(encryptor.decrypt, encryptor.encrypt(payload))
+        )
+
+        def stream_mb_per_s(workers: int) -> float:
+            start = time.perf_counter()
+            encryptor.encrypt_stream(io.BytesIO(plaintext), _NullWriter(), workers=workers)
+            return len(plaintext) / (time.perf_counter() - start) / 1e6
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            results[f"envelope.encrypt_stream.w{workers}.mb_per_s"] = _median_round(
+                settings.rounds, partial(stream_mb_per_s, workers)
+            )
+    return results
+
+
+def _requests_per_second(executor: ThreadPoolExecutor, send: Callable[[], Any], requests: int) -> float:
+    start = time.perf_counter()
+    for future in [executor.submit(send) for _ in range(requests)]:
+        future.result()
+    return requests / (time.perf_counter() - start)
+
+
+def bench_throughput(url: str, settings: Settings) -> dict[str, float]:
+    """Median requests per second at each concurrency level, against a server with simulated latency."""
+    results: dict[str, float] = {}
+    total = settings.throughput_requests
+
+    with _sync_client(url) as client:
+        for name in settings.endpoints:
+            call = ENDPOINTS[name][2]
+            for concurrency in settings.concurrency:
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    send = partial(call, client)
+                    _requests_per_second(executor, send, concurrency)
+                    results[f"throughput.sync-httpx.{name}.c{concurrency}.rps"] = _median_round(
+                        settings.rounds, partial(_requests_per_second, executor, send, total)
+                    )
+
+    for kind in CLIENTS[1:]:
+        results.update(asyncio.run(_bench_async_throughput(kind, url, settings)))
+    return results
+
+
+async def _bench_async_throughput(kind: str, url: str, settings: Settings) -> dict[str, float]:
+    results: dict[str, float] = {}
+    total = settings.throughput_requests
+    async with _async_client(kind, url) as client:
+        for name in settings.endpoints:
+            call = ENDPOINTS[name][2]
+            for concurrency in settings.concurrency:
+                semaphore = asyncio.Semaphore(concurrency)
+
+                async def bounded_call(call=call, semaphore=semaphore) -> None:
+                    async with semaphore:
+                        await call(client)
+
+                await asyncio.gather(*(bounded_call() for _ in range(concurrency)))
+                rounds = []
+                for _ in range(settings.rounds):
+                    start = time.perf_counter()
+                    await asyncio.gather(*(bounded_call() for _ in range(total)))
+                    rounds.append(total / (time.perf_counter() - start))
+                results[f"throughput.{kind}.{name}.c{concurrency}.rps"] = statistics.median(rounds)
+    return results
+
+
+def bench_memory(server: StubVaultServer, settings: Settings) -> dict[str, float]:
+    """
+    Bytes retained per VaultxResponse (including the wrapped httpx.Response) for each endpoint's payload,
+    as returned by a request and once its body has been decoded.
+
+    Responses are built from the exact bodies the stub server sends, without any network involved, so these
+    figures are deterministic for a given Python and dependency set.
+    """
+    results: dict[str, float] = {}
+    for name in settings.endpoints:
+        method, path, _ = ENDPOINTS[name]
+        _, body = server.response_for(method, path)
+        request = httpx.Request(method, server.url + path)
+        headers = {"content-type": "application/json", "content-length": str(len(body))}
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        responses = [
+            VaultxResponse(httpx.Response(200, headers=headers, content=body, request=request))
+            for _ in range(settings.memory_responses)
+        ]
+        after = tracemalloc.take_snapshot()
+        for response in responses:
+            response.value  # noqa: B018
+        after_decoding = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        decoded = sum(stat.size_diff for stat in after_decoding.compare_to(before, "filename"))
+        results[f"memory.{name}.body_bytes"] = len(body)
+        results[f"memory.{name}.bytes_per_response"] = retained / len(responses)
+        results[f"memory.{name}.bytes_per_decoded_response"] = decoded / len(responses)
+        del responses
+    return results
+
+
+_STARTUP_SCRIPT = """
+import asyncio, sys, time
+start = time.perf_counter()
+import vaultx
+{create}
+print(time.perf_counter() - start, len(sys.modules))
+"""
+
+# aiohttp sessions can only be created with a running event loop
+_STARTUP_CLIENTS = {
+    "sync": "vaultx.Client()",
+    "async": "async def create():\n    return vaultx.AsyncClient()\nasyncio.run(create())",
+}
+
+
+def bench_startup(settings: Settings) -> dict[str, float]:
+    """
+    Time to import vaultx and create a client in a fresh interpreter, and the number of modules it loads.
+
+    Every round runs in a new process, so that nothing is already imported or cached in memory.
+    """
+    results: dict[str, float] = {}
+    for kind, create in _STARTUP_CLIENTS.items():
+        rounds, modules = [], 0.0
+        for _ in range(settings.rounds):
+            output = subprocess.run(
+                [sys.executable, "-c", _STARTUP_SCRIPT.format(create=create)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            rounds.append(float(output[0]) * 1e3)
+            modules = float(output[1])
+        results[f"startup.{kind}.ms"] = min(rounds)
+        results[f"startup.{kind}.modules"] = modules
+    return results
+
+
+def environment() -> dict[str, str]:
+    def version(package: str) -> str:
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "vaultx": version("vaultx"),
+        "httpx": version("httpx"),
+        "aiohttp": version("aiohttp"),
+    }
+
+
+def compare(
+    current: dict[str, float], baseline: dict[str, float], threshold: float, gate: Optional[list[str]] = None
+) -> list[str]:
+    """
+    Compare two sets of metrics.
+
+    :param current: Metrics of this run.
+    :param baseline: Metrics of the run to compare against.
+    :param threshold: Relative change (e.g. 0.15 for 15%) above which a worse result counts as a regression.
+    :param gate: Suffixes of the metrics to compare, all of them by default.
+    :return: Descriptions of every regressed metric.
+    """
+    regressions = []
+    for key, value in current.items():
+        if gate and not key.endswith(tuple(gate)):
+            continue
+        previous = baseline.get(key)
+        # Differences against bare httpx and payload sizes describe the run rather than the code under test.
+        if not previous or key.endswith(("added_us", "added_calls", "body_bytes")):
+            continue
+        change = (value - previous) / previous
+        if key.endswith(HIGHER_IS_BETTER_SUFFIXES):
+            change = -change
+        if change > threshold:
+            regressions.append(f"{key}: {previous:.1f} -> {value:.1f} ({change:+.1%} worse)")
+    return regressions
+
+
+def run(settings: Settings) -> dict[str, float]:
+    metrics = bench_startup(settings)
+    with StubVaultServer(value_size=settings.value_size) as server:
+        metrics.update(bench_overhead(server, settings))
+        metrics.update(bench_latency(server.url, settings))
+        metrics.update(bench_memory(server, settings))
+        metrics.update(bench_envelope(server.url, settings))
+    metrics.update(bench_unix_socket(settings))
+    with StubVaultServer(latency=settings.latency, value_size=settings.value_size) as server:
+        metrics.update(bench_throughput(server.url, settings))
+    return metrics
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer rounds and calls, for smoke testing")
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency", type=float, default=0.002, help="simulated server latency for throughput runs")
+    parser.add_argument("--value-size", type=int, default=256, help="size of the variable part of every response")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative change counted as a regression")
+    parser.add_argument(
+        "--gate",
+        nargs="+",
+        metavar="SUFFIX",
+        help="only compare metrics ending with these suffixes, e.g. calls_per_request bytes_per_response",
+    )
+    args = parser.parse_args(argv)
+
+    settings = Settings(args.quick, args.endpoints, args.concurrency, args.latency, args.value_size)
+    metrics = run(settings)
+
+    for key, value in metrics.items():
+        print(f"{key:<60} {value:>14.1f}")
+
+    if args.output:
+        parameters = {k: v for k, v in vars(args).items() if k not in ("output", "compare", "threshold", "gate")}
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "parameters": parameters, "metrics": metrics}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != environment():
+            print("warning: baseline was recorded in a different environment", file=sys.stderr)
+        regressions = compare(metrics, baseline["metrics"], args.threshold, args.gate)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
@@ -112,6 +112,18 @@ class TestKvV1(unittest.TestCase):
             url="/v1/secret/my-secret",
         )
 
+    def test_read_many_returns_responses_and_errors(self):
+        def get(url):
+            if url.endswith("missing"):
+                raise exceptions.HTTPError(status_code=404, method="GET", url=url)
+            return Response(200, json={"data": {"url": url}})
+
+        self.mock_adapter.get.side_effect = get
+
+        result = self.kv_v1.read_many(["a", "missing"])
+        self.assertEqual(result["a"].json(), {"data": {"url": "/v1/secret/a"}})
+        self.assertIsInstance(result["missing"], exceptions.HTTPError)
+
 
 class TestAsyncKvV1(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
@@ -216,3 +228,10 @@ class TestAsyncKvV1(unittest.IsolatedAsyncioTestCase):
         self.mock_adapter.delete.assert_called_once_with(
             url="/v1/secret/my-secret",
         )
+
+    async def test_read_many_returns_responses(self):
+        self.mock_adapter.get.side_effect = lambda url: Response(200, json={"data": {"url": url}})
+
+        result = await self.kv_v1.read_many(["a", "b"], mount_point="kv")
+        self.assertEqual(result["a"].json(), {"data": {"url": "/v1/kv/a"}})
+        self.assertEqual(result["b"].json(), {"data": {"url": "/v1/kv/b"}})
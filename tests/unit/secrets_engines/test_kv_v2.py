@@ -1,3 +1,7 @@
+import asyncio
+import os
+import tempfile
+import threading
 import unittest
 from unittest import mock
 
@@ -6,6 +10,8 @@ from httpx import Response
 from vaultx.adapters import VaultxResponse
 from vaultx.api.async_secrets_engines.kv_v2 import KvV2 as AsyncKvV2
 from vaultx.api.secrets_engines.kv_v2 import KvV2
+from vaultx.cache import FileCache
+from vaultx.exceptions import HTTPError, VaultxError
 
 
 class TestKvV2(unittest.TestCase):
@@ -364,3 +370,447 @@ class TestAsyncKvV2(unittest.IsolatedAsyncioTestCase):
         self.mock_adapter.delete.assert_called_once_with(
             url="/v1/secret/metadata/my-secret",
         )
+
+
+class TestKvV2Cache(unittest.TestCase):
+    def setUp(self):
+        self.mock_adapter = mock.Mock()
+        self.mock_adapter.namespace = None
+        self.kv_v2 = KvV2(self.mock_adapter)
+        self.cache = self.kv_v2.enable_cache(ttl=60, max_entries=10)
+        self.read_response = VaultxResponse(
+            Response(200, json={"data": {"data": {"key": "value"}, "metadata": {"version": 1}}})
+        )
+        self.mock_adapter.get.return_value = self.read_response
+
+    def test_cache_is_disabled_by_default(self):
+        kv_v2 = KvV2(self.mock_adapter)
+        self.assertIsNone(kv_v2.cache)
+        kv_v2.read_secret_version(path="my-secret")
+        kv_v2.read_secret_version(path="my-secret")
+        self.assertEqual(self.mock_adapter.get.call_count, 2)
+
+    def test_read_secret_version_is_served_from_cache(self):
+        first = self.kv_v2.read_secret_version(path="my-secret")
+        second = self.kv_v2.read_secret_version(path="my-secret")
+        self.assertIs(first, second)
+        self.mock_adapter.get.assert_called_once()
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_cache_key_includes_version_mount_point_and_namespace(self):
+        self.kv_v2.read_secret_version(path="my-secret")
+        self.kv_v2.read_secret_version(path="my-secret", version=1)
+        self.kv_v2.read_secret_version(path="my-secret", mount_point="other")
+        self.mock_adapter.namespace = "team-a"
+        self.kv_v2.read_secret_version(path="my-secret")
+        self.assertEqual(self.mock_adapter.get.call_count, 4)
+
+    def test_failed_reads_are_not_cached(self):
+        self.mock_adapter.get.side_effect = HTTPError(status_code=404)
+        self.assertIsNone(self.kv_v2.read_secret_version(path="my-secret"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_writes_invalidate_path(self):
+        self.mock_adapter.post.return_value = Response(204)
+        self.mock_adapter.delete.return_value = Response(204)
+        writes = [
+            lambda: self.kv_v2.create_or_update_secret(path="my-secret", secret={"key": "new"}),
+            lambda: self.kv_v2.delete_latest_version_of_secret(path="my-secret"),
+            lambda: self.kv_v2.delete_secret_versions(path="my-secret", versions=[1]),
+            lambda: self.kv_v2.undelete_secret_versions(path="my-secret", versions=[1]),
+            lambda: self.kv_v2.destroy_secret_versions(path="my-secret", versions=[1]),
+            lambda: self.kv_v2.delete_metadata_and_all_versions(path="my-secret"),
+        ]
+        for write in writes:
+            self.kv_v2.read_secret_version(path="my-secret")
+            self.kv_v2.read_secret_version(path="other-secret")
+            write()
+            self.assertNotIn(("secret", "my-secret", None, None), self.cache)
+            self.assertIn(("secret", "other-secret", None, None), self.cache)
+
+    def test_read_overlapping_a_write_is_not_cached(self):
+        self.mock_adapter.post.return_value = Response(204)
+
+        def read_answered_after_write(url, **kwargs):
+            self.kv_v2.create_or_update_secret(path="my-secret", secret={"key": "new"})
+            return self.read_response
+
+        self.mock_adapter.get.side_effect = read_answered_after_write
+        self.assertIs(self.kv_v2.read_secret_version(path="my-secret"), self.read_response)
+        self.assertEqual(len(self.cache), 0)
+        self.mock_adapter.get.side_effect = None
+        self.kv_v2.read_secret_version(path="my-secret")
+        self.assertEqual(len(self.cache), 1)
+
+    def test_patch_reads_fresh_version_and_invalidates(self):
+        self.mock_adapter.post.return_value = VaultxResponse(Response(200, json={"data": {"version": 2}}))
+        self.kv_v2.read_secret_version(path="my-secret")
+        self.kv_v2.patch(path="my-secret", secret={"key": "new-value"})
+        self.assertEqual(self.mock_adapter.get.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.read_response["data"]["data"], {"key": "value"})
+
+    def test_shared_file_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.kv_v2.enable_cache(cache=FileCache(directory, b"k" * 32))
+            self.kv_v2.read_secret_version(path="my-secret")
+            other = KvV2(self.mock_adapter)
+            other.enable_cache(cache=FileCache(directory, b"k" * 32))
+            result = other.read_secret_version(path="my-secret")
+            other.create_or_update_secret(path="my-secret", secret={"key": "new"})
+            self.assertEqual(len(self.kv_v2.cache), 0)
+
+        self.assertEqual(result["data"]["data"], {"key": "value"})
+        self.mock_adapter.get.assert_called_once()
+
+    def test_disable_cache(self):
+        self.kv_v2.read_secret_version(path="my-secret")
+        self.kv_v2.disable_cache()
+        self.assertIsNone(self.kv_v2.cache)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestAsyncKvV2Cache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_adapter = mock.AsyncMock()
+        self.mock_adapter.namespace = None
+        self.kv_v2 = AsyncKvV2(self.mock_adapter)
+        self.cache = self.kv_v2.enable_cache(ttl=60, max_entries=10)
+        self.mock_adapter.get.return_value = VaultxResponse(
+            Response(200, json={"data": {"data": {"key": "value"}, "metadata": {"version": 1}}})
+        )
+
+    async def test_read_secret_version_is_served_from_cache(self):
+        first = await self.kv_v2.read_secret_version(path="my-secret")
+        second = await self.kv_v2.read_secret_version(path="my-secret")
+        self.assertIs(first, second)
+        self.mock_adapter.get.assert_awaited_once()
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    async def test_writes_invalidate_path(self):
+        self.mock_adapter.post.return_value = Response(204)
+        await self.kv_v2.read_secret_version(path="my-secret")
+        await self.kv_v2.destroy_secret_versions(path="my-secret", versions=[1])
+        await self.kv_v2.read_secret_version(path="my-secret")
+        self.assertEqual(self.mock_adapter.get.await_count, 2)
+        self.assertEqual(self.cache.stats.invalidations, 1)
+
+    async def test_read_overlapping_a_write_is_not_cached(self):
+        self.mock_adapter.post.return_value = Response(204)
+        answer = asyncio.Event()
+        response = self.mock_adapter.get.return_value
+
+        async def slow_read(url, **kwargs):
+            await answer.wait()
+            return response
+
+        async def write():
+            await self.kv_v2.create_or_update_secret(path="my-secret", secret={"key": "new"})
+            answer.set()
+
+        self.mock_adapter.get.side_effect = slow_read
+        read = asyncio.ensure_future(self.kv_v2.read_secret_version(path="my-secret"))
+        await asyncio.sleep(0)
+        await write()
+
+        self.assertIs(await read, response)
+        self.assertEqual(len(self.cache), 0)
+
+
+def secret_response(version):
+    data = {"data": {"version": version}, "metadata": {"version": version}}
+    return VaultxResponse(Response(200, json={"data": data}))
+
+
+class FakeKv:
+    """Answers data and metadata reads of a KV v2 mount holding secrets at their current version."""
+
+    def __init__(self, **versions):
+        self.versions = versions
+        self.deleted = set()
+
+    def deletion_time(self, version):
+        return "2026-01-01T00:00:00Z" if version in self.deleted else ""
+
+    def get(self, url, params=None):
+        kind, path = url.split("/", 4)[3:]
+        if path not in self.versions:
+            raise HTTPError(status_code=404, method="GET", url=url)
+        if kind == "data":
+            return secret_response((params or {}).get("version", self.versions[path]))
+        versions = {
+            str(version): {"destroyed": False, "deletion_time": self.deletion_time(version)}
+            for version in range(1, self.versions[path] + 1)
+        }
+        metadata = {"current_version": self.versions[path], "versions": versions}
+        return VaultxResponse(Response(200, json={"data": metadata}))
+
+
+class TestKvV2Snapshot(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "kv.snapshot")
+        self.key = os.urandom(32)
+        self.vault = FakeKv(a=1, b=1)
+        self.mock_adapter = mock.Mock(namespace=None)
+        self.mock_adapter.get.side_effect = self.vault.get
+
+    def warm_kv(self):
+        kv_v2 = KvV2(self.mock_adapter)
+        kv_v2.enable_cache()
+        kv_v2.read_secret_version(path="a")
+        kv_v2.read_secret_version(path="b")
+        kv_v2.read_secret_version(path="b", version=1)
+        self.assertEqual(kv_v2.save_snapshot(self.path, self.key), 3)
+        self.mock_adapter.get.reset_mock()
+        return kv_v2
+
+    def test_loaded_snapshot_is_served_without_requests(self):
+        self.warm_kv()
+        kv_v2 = KvV2(self.mock_adapter)
+        self.assertEqual(kv_v2.load_snapshot(self.path, self.key, revalidate=False), 3)
+
+        self.assertEqual(kv_v2.read_secret_version(path="a")["data"]["data"], {"version": 1})
+        self.assertEqual(kv_v2.read_secret_version(path="b", version=1)["data"]["data"], {"version": 1})
+        self.mock_adapter.get.assert_not_called()
+
+    def test_revalidation_refreshes_outdated_responses(self):
+        self.warm_kv()
+        kv_v2 = KvV2(self.mock_adapter)
+        kv_v2.load_snapshot(self.path, self.key, revalidate=False)
+        self.vault.versions["a"] = 2
+        self.vault.deleted.add(1)
+        del self.vault.versions["b"]
+
+        self.assertEqual(kv_v2.revalidate_cache(), 3)
+
+        self.assertEqual(kv_v2.read_secret_version(path="a")["data"]["data"], {"version": 2})
+        self.assertEqual(len(kv_v2.cache), 1)
+
+    def test_revalidation_keeps_responses_that_cannot_be_checked(self):
+        self.warm_kv()
+        kv_v2 = KvV2(self.mock_adapter)
+        kv_v2.load_snapshot(self.path, self.key, revalidate=False)
+        self.mock_adapter.get.side_effect = HTTPError(status_code=503)
+
+        self.assertEqual(kv_v2.revalidate_cache(), 0)
+        self.assertEqual(len(kv_v2.cache), 3)
+
+    def test_load_snapshot_revalidates_in_background(self):
+        self.warm_kv()
+        kv_v2 = KvV2(self.mock_adapter)
+        kv_v2.load_snapshot(self.path, self.key)
+        for thread in threading.enumerate():
+            if thread.name == "vaultx-kv-revalidate":
+                thread.join()
+        self.assertEqual(self.mock_adapter.get.call_count, 3)
+
+    def test_unusable_snapshot_loads_nothing(self):
+        kv_v2 = KvV2(self.mock_adapter)
+        self.assertEqual(kv_v2.load_snapshot(self.path, self.key), 0)
+        self.warm_kv().save_snapshot(self.path, self.key, max_age=-1)
+        self.assertEqual(kv_v2.load_snapshot(self.path, self.key), 0)
+        self.warm_kv()
+        self.assertEqual(kv_v2.load_snapshot(self.path, key=os.urandom(32)), 0)
+        self.mock_adapter.get.assert_not_called()
+
+    def test_save_snapshot_requires_cache(self):
+        with self.assertRaises(VaultxError):
+            KvV2(self.mock_adapter).save_snapshot(self.path, self.key)
+
+    def test_save_snapshot_does_not_store_the_key(self):
+        self.warm_kv()
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["kv.snapshot"])
+        with open(self.path, "rb") as file:
+            self.assertNotIn(self.key, file.read())
+
+
+class TestAsyncKvV2Snapshot(unittest.IsolatedAsyncioTestCase):
+    async def test_snapshot_round_trip_and_revalidation(self):
+        vault = FakeKv(a=1)
+        mock_adapter = mock.AsyncMock(namespace=None)
+        mock_adapter.get.side_effect = vault.get
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "kv.snapshot")
+            key = os.urandom(32)
+            kv_v2 = AsyncKvV2(mock_adapter)
+            kv_v2.enable_cache()
+            await kv_v2.read_secret_version(path="a")
+            await kv_v2.save_snapshot(path, key)
+
+            vault.versions["a"] = 2
+            warm = AsyncKvV2(mock_adapter)
+            self.assertEqual(await warm.load_snapshot(path, key), 1)
+            self.assertEqual((await warm.read_secret_version(path="a"))["data"]["data"], {"version": 1})
+            await warm._revalidation
+
+        self.assertEqual((await warm.read_secret_version(path="a"))["data"]["data"], {"version": 2})
+
+
+def read_side_effect(url, params=None):
+    if url.endswith("/missing"):
+        raise HTTPError(status_code=404, method="GET", url=url)
+    return VaultxResponse(Response(200, json={"data": {"data": {"path": url}}}))
+
+
+class TestKvV2ReadMany(unittest.TestCase):
+    def setUp(self):
+        self.mock_adapter = mock.Mock()
+        self.mock_adapter.get.side_effect = read_side_effect
+        self.kv_v2 = KvV2(self.mock_adapter)
+
+    def test_read_many_returns_responses_in_input_order(self):
+        result = self.kv_v2.read_many(["b", "a", "b", "c"], mount_point="kv", concurrency=2)
+        self.assertEqual(list(result), ["b", "a", "c"])
+        self.assertEqual(result["a"]["data"]["data"], {"path": "/v1/kv/data/a"})
+        self.assertEqual(self.mock_adapter.get.call_count, 3)
+
+    def test_read_many_returns_errors_by_default(self):
+        result = self.kv_v2.read_many(["a", "missing"])
+        self.assertIsInstance(result["a"], VaultxResponse)
+        self.assertIsInstance(result["missing"], HTTPError)
+
+    def test_read_many_skips_errors(self):
+        result = self.kv_v2.read_many(["a", "missing"], on_error="skip")
+        self.assertEqual(list(result), ["a"])
+
+    def test_read_many_raises_errors(self):
+        with self.assertRaises(HTTPError):
+            self.kv_v2.read_many(["a", "missing"], on_error="raise")
+
+    def test_read_many_uses_cache(self):
+        self.kv_v2.enable_cache()
+        self.kv_v2.read_many(["a", "b"])
+        self.kv_v2.read_many(["a", "b"])
+        self.assertEqual(self.mock_adapter.get.call_count, 2)
+
+    def test_read_many_with_no_paths(self):
+        self.assertEqual(self.kv_v2.read_many([]), {})
+        self.mock_adapter.get.assert_not_called()
+
+    def test_read_many_invalid_parameters(self):
+        with self.assertRaises(VaultxError):
+            self.kv_v2.read_many(["a"], concurrency=0)
+        with self.assertRaises(VaultxError):
+            self.kv_v2.read_many(["a"], on_error="ignore")
+
+
+class TestAsyncKvV2ReadMany(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def get(url, params=None):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return read_side_effect(url, params)
+
+        self.mock_adapter = mock.AsyncMock()
+        self.mock_adapter.get.side_effect = get
+        self.kv_v2 = AsyncKvV2(self.mock_adapter)
+
+    async def test_read_many_bounds_concurrency(self):
+        paths = [f"app/{i}" for i in range(10)]
+        result = await self.kv_v2.read_many(paths, concurrency=3)
+        self.assertEqual(list(result), paths)
+        self.assertEqual(self.max_in_flight, 3)
+
+    async def test_read_many_returns_errors_by_default(self):
+        result = await self.kv_v2.read_many(["a", "missing"])
+        self.assertIsInstance(result["a"], VaultxResponse)
+        self.assertIsInstance(result["missing"], HTTPError)
+
+    async def test_read_many_skips_errors(self):
+        result = await self.kv_v2.read_many(["missing", "a"], on_error="skip")
+        self.assertEqual(list(result), ["a"])
+
+    async def test_read_many_raises_errors(self):
+        with self.assertRaises(HTTPError):
+            await self.kv_v2.read_many(["a", "missing"], on_error="raise")
+
+
+TREE = {
+    "": ["app/", "root-secret"],
+    "app/": ["db", "api", "team/", "gone/"],
+    "app/team/": ["a", "b"],
+}
+
+
+def list_side_effect(url):
+    folder = url.split("/metadata/", 1)[1]
+    if folder not in TREE:
+        raise HTTPError(status_code=404, method="LIST", url=url)
+    return VaultxResponse(Response(200, json={"data": {"keys": TREE[folder]}}))
+
+
+def walk_read_side_effect(url, params=None):
+    if url.endswith("/api"):
+        raise HTTPError(status_code=404, method="GET", url=url)
+    return read_side_effect(url, params)
+
+
+class TestKvV2Walk(unittest.TestCase):
+    def setUp(self):
+        self.mock_adapter = mock.Mock()
+        self.mock_adapter.list.side_effect = list_side_effect
+        self.mock_adapter.get.side_effect = walk_read_side_effect
+        self.kv_v2 = KvV2(self.mock_adapter)
+
+    def test_walk_yields_every_secret(self):
+        paths = list(self.kv_v2.walk(mount_point="kv", concurrency=2))
+        self.assertEqual(sorted(paths), ["app/api", "app/db", "app/team/a", "app/team/b", "root-secret"])
+        self.mock_adapter.list.assert_any_call(url="/v1/kv/metadata/")
+        self.mock_adapter.get.assert_not_called()
+
+    def test_walk_is_breadth_first(self):
+        paths = list(self.kv_v2.walk(concurrency=1))
+        self.assertEqual(paths, ["root-secret", "app/db", "app/api", "app/team/a", "app/team/b"])
+
+    def test_walk_subtree(self):
+        paths = list(self.kv_v2.walk(path="/app/team/"))
+        self.assertEqual(sorted(paths), ["app/team/a", "app/team/b"])
+
+    def test_walk_fetches_data_and_skips_deleted_secrets(self):
+        result = dict(self.kv_v2.walk(path="app", fetch_data=True))
+        self.assertEqual(sorted(result), ["app/db", "app/team/a", "app/team/b"])
+        self.assertEqual(result["app/db"]["data"]["data"], {"path": "/v1/secret/data/app/db"})
+
+    def test_walk_stops_listing_when_closed(self):
+        walker = self.kv_v2.walk(concurrency=1)
+        self.assertEqual(next(walker), "root-secret")
+        walker.close()
+        self.mock_adapter.list.assert_called_once_with(url="/v1/secret/metadata/")
+
+    def test_walk_raises_errors(self):
+        self.mock_adapter.list.side_effect = HTTPError(status_code=403, method="LIST", url="/v1/secret/metadata/")
+        with self.assertRaises(HTTPError):
+            list(self.kv_v2.walk())
+
+    def test_walk_invalid_concurrency(self):
+        with self.assertRaises(VaultxError):
+            list(self.kv_v2.walk(concurrency=0))
+
+
+class TestAsyncKvV2Walk(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_adapter = mock.AsyncMock()
+        self.mock_adapter.list.side_effect = list_side_effect
+        self.mock_adapter.get.side_effect = walk_read_side_effect
+        self.kv_v2 = AsyncKvV2(self.mock_adapter)
+
+    async def test_walk_yields_every_secret(self):
+        paths = [path async for path in self.kv_v2.walk(concurrency=3)]
+        self.assertEqual(sorted(paths), ["app/api", "app/db", "app/team/a", "app/team/b", "root-secret"])
+
+    async def test_walk_fetches_data_and_skips_deleted_secrets(self):
+        result = {path: response async for path, response in self.kv_v2.walk(fetch_data=True)}
+        self.assertEqual(sorted(result), ["app/db", "app/team/a", "app/team/b", "root-secret"])
+
+    async def test_walk_stops_listing_when_closed(self):
+        walker = self.kv_v2.walk(concurrency=1)
+        self.assertEqual(await walker.__anext__(), "root-secret")
+        await walker.aclose()
+        self.mock_adapter.list.assert_awaited_once_with(url="/v1/secret/metadata/")
@@ -1,9 +1,11 @@
+import asyncio
 import unittest
 from unittest import mock
 
 from httpx import Response
 
 from vaultx import exceptions
+from vaultx.adapters import VaultxResponse
 from vaultx.api.async_secrets_engines.transit import Transit as AsyncTransit
 from vaultx.api.secrets_engines.transit import DEFAULT_MOUNT_POINT, Transit
 
@@ -288,6 +290,32 @@ class TestTransit(unittest.TestCase):
             },
         )
 
+    def test_generate_hmac_batch_input(self):
+        self.mock_adapter.post.return_value = Response(200, json={"data": {"batch_results": [{"hmac": "h"}]}})
+
+        self.transit.generate_hmac(name="test-key", batch_input=[{"input": "aW5wdXQ="}])
+        self.mock_adapter.post.assert_called_once_with(
+            url=f"/v1/{DEFAULT_MOUNT_POINT}/hmac/test-key",
+            json={"batch_input": [{"input": "aW5wdXQ="}]},
+        )
+
+    def test_rewrap_data_batch_input_with_partial_failure_response_code(self):
+        self.transit.rewrap_data(
+            name="test-key", ciphertext="ignored", batch_input=[{"ciphertext": "c"}], partial_failure_response_code=200
+        )
+        self.mock_adapter.post.assert_called_once_with(
+            url=f"/v1/{DEFAULT_MOUNT_POINT}/rewrap/test-key",
+            json={"batch_input": [{"ciphertext": "c"}], "partial_failure_response_code": 200},
+        )
+
+    def test_generate_hmac_requires_input(self):
+        with self.assertRaises(ValueError):
+            self.transit.generate_hmac(name="test-key")
+
+    def test_rewrap_data_requires_ciphertext(self):
+        with self.assertRaises(ValueError):
+            self.transit.rewrap_data(name="test-key")
+
     def test_generate_hmac_invalid_algorithm(self):
         with self.assertRaises(exceptions.VaultxError) as context:
             self.transit.generate_hmac(name="test-key", hash_input="input-data", algorithm="invalid-algorithm")
@@ -898,3 +926,90 @@ class TestAsyncTransit(unittest.IsolatedAsyncioTestCase):
                 "min_available_version": 1,
             },
         )
+
+
+class TestTransitBatcher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.mock_adapter = mock.AsyncMock()
+        self.batcher = AsyncTransit(self.mock_adapter).batcher(max_batch_size=3, max_delay=0.01)
+
+        async def post(url, json):
+            results = []
+            for item in json["batch_input"]:
+                value = item.get("plaintext") or item.get("ciphertext") or item.get("input")
+                results.append({"error": "invalid input"} if value == "bad" else {"result": f"{url}:{value}"})
+            # Like Vault, fail the whole request when an item fails unless partial failures are reported with 200
+            if any("error" in result for result in results) and json.get("partial_failure_response_code") != 200:
+                raise exceptions.HTTPError(status_code=400, method="POST", url=url)
+            return VaultxResponse(Response(200, json={"data": {"batch_results": results}}))
+
+        self.mock_adapter.post.side_effect = post
+
+    async def test_concurrent_calls_share_one_request(self):
+        results = await asyncio.gather(*(self.batcher.encrypt("test-key", plaintext=f"p{i}") for i in range(2)))
+
+        self.assertEqual(
+            results,
+            [{"result": "/v1/transit/encrypt/test-key:p0"}, {"result": "/v1/transit/encrypt/test-key:p1"}],
+        )
+        self.mock_adapter.post.assert_awaited_once_with(
+            url="/v1/transit/encrypt/test-key",
+            json={"batch_input": [{"plaintext": "p0"}, {"plaintext": "p1"}], "partial_failure_response_code": 200},
+        )
+        self.assertEqual((self.batcher.items, self.batcher.requests), (2, 1))
+
+    async def test_full_batch_is_flushed_immediately(self):
+        self.batcher.max_delay = 60
+        results = await asyncio.wait_for(
+            asyncio.gather(*(self.batcher.decrypt("test-key", ciphertext=f"c{i}") for i in range(3))), 5
+        )
+        self.assertEqual(len(results), 3)
+        self.mock_adapter.post.assert_awaited_once()
+
+    async def test_batches_are_split_by_key_operation_and_options(self):
+        await asyncio.gather(
+            self.batcher.hmac("key-a", hash_input="i"),
+            self.batcher.hmac("key-a", hash_input="i", algorithm="sha2-512"),
+            self.batcher.hmac("key-b", hash_input="i"),
+            self.batcher.sign("key-a", hash_input="i"),
+            self.batcher.rewrap("key-a", ciphertext="c"),
+        )
+        self.assertEqual(self.mock_adapter.post.await_count, 5)
+
+    async def test_item_errors_are_raised_to_their_caller_only(self):
+        for operation, field in (("encrypt", "plaintext"), ("decrypt", "ciphertext"), ("rewrap", "ciphertext")):
+            results = await asyncio.gather(
+                getattr(self.batcher, operation)("test-key", **{field: "bad"}),
+                getattr(self.batcher, operation)("test-key", **{field: "good"}),
+                return_exceptions=True,
+            )
+            self.assertIsInstance(results[0], exceptions.VaultxError)
+            self.assertNotIsInstance(results[0], exceptions.HTTPError)
+            self.assertEqual(results[1], {"result": f"/v1/transit/{operation}/test-key:good"})
+        results = await asyncio.gather(
+            self.batcher.hmac("test-key", hash_input="bad"),
+            self.batcher.sign("test-key", hash_input="good"),
+            self.batcher.hmac("test-key", hash_input="good"),
+            return_exceptions=True,
+        )
+        self.assertIsInstance(results[0], exceptions.VaultxError)
+        self.assertEqual(
+            results[1:], [{"result": "/v1/transit/sign/test-key:good"}, {"result": "/v1/transit/hmac/test-key:good"}]
+        )
+
+    async def test_request_errors_are_raised_to_every_caller(self):
+        self.mock_adapter.post.side_effect = exceptions.HTTPError(status_code=500)
+        results = await asyncio.gather(
+            self.batcher.encrypt("test-key", plaintext="a"),
+            self.batcher.encrypt("test-key", plaintext="b"),
+            return_exceptions=True,
+        )
+        self.assertTrue(all(isinstance(result, exceptions.HTTPError) for result in results))
+
+    async def test_flush_sends_pending_items(self):
+        self.batcher.max_delay = 60
+        task = asyncio.ensure_future(self.batcher.encrypt("test-key", plaintext="p"))
+        await asyncio.sleep(0)
+        async with self.batcher:
+            pass
+        self.assertEqual(await task, {"result": "/v1/transit/encrypt/test-key:p"})
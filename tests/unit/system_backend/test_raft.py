@@ -1,10 +1,27 @@
+import gzip
+import hashlib
+import io
+import os
+import tempfile
 import unittest
 from unittest import mock
 
+import respx
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from httpx import Response
+from parameterized import parameterized  # type: ignore
 
+from vaultx import adapters
 from vaultx.api.async_system_backend.raft import Raft as AsyncRaft
 from vaultx.api.system_backend.raft import Raft
+from vaultx.constants.client import DEFAULT_URL
+from vaultx.exceptions import VaultxError
+
+
+SNAPSHOT = os.urandom(300_000) + bytes(300_000)
+SNAPSHOT_CHECKSUM = hashlib.sha256(SNAPSHOT).hexdigest()
+SNAPSHOT_URL = f"{DEFAULT_URL}/v1/sys/storage/raft/snapshot"
 
 
 class TestRaft(unittest.TestCase):
@@ -209,3 +226,118 @@ class TestAsyncRaft(unittest.IsolatedAsyncioTestCase):
         result = await self.raft.delete_raft_auto_snapshot_config(name="config1")
         self.assertEqual(result.status_code, 204)
         self.mock_adapter.delete.assert_called_once_with(url="/v1/sys/storage/raft/snapshot-auto/config/config1")
+
+
+class TestRaftSnapshotStreaming(unittest.TestCase):
+    def setUp(self):
+        self.raft = Raft(adapters.VaultxAdapter())
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "vault.snap")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @respx.mock
+    def test_save_and_restore(self):
+        respx.get(SNAPSHOT_URL).mock(return_value=Response(200, content=SNAPSHOT))
+        restore = respx.post(SNAPSHOT_URL).mock(return_value=Response(204))
+
+        saved = self.raft.save_raft_snapshot(self.path, chunk_size=65536)
+        response = self.raft.restore_raft_snapshot_from(self.path, checksum=saved["checksum"], chunk_size=65536)
+
+        self.assertEqual(saved, {"size": len(SNAPSHOT), "algorithm": "sha256", "checksum": SNAPSHOT_CHECKSUM})
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), SNAPSHOT)
+        self.assertEqual(response.status, 204)
+        self.assertEqual(restore.calls.last.request.content, SNAPSHOT)
+        self.assertEqual(restore.calls.last.request.headers["transfer-encoding"], "chunked")
+
+    @respx.mock
+    def test_compressed_file_object(self):
+        respx.get(SNAPSHOT_URL).mock(return_value=Response(200, content=SNAPSHOT))
+        restore = respx.post(f"{SNAPSHOT_URL}-force").mock(return_value=Response(204))
+        buffer = io.BytesIO()
+
+        saved = self.raft.save_raft_snapshot(buffer, compress=True)
+        buffer.seek(0)
+        self.raft.restore_raft_snapshot_from(buffer, force=True, decompress=True, checksum=saved["checksum"])
+
+        self.assertEqual(gzip.decompress(buffer.getvalue()), SNAPSHOT)
+        self.assertLess(len(buffer.getvalue()), len(SNAPSHOT))
+        self.assertEqual(restore.calls.last.request.content, SNAPSHOT)
+
+    @respx.mock
+    def test_checksum_mismatch_sends_nothing(self):
+        restore = respx.post(SNAPSHOT_URL).mock(return_value=Response(204))
+
+        with self.assertRaises(VaultxError):
+            self.raft.restore_raft_snapshot_from(io.BytesIO(SNAPSHOT), checksum="0" * 64)
+
+        self.assertFalse(restore.called)
+
+    def test_response_is_streamed(self):
+        response = mock.Mock()
+        response.raw.iter_bytes.return_value = iter([b"a", b"b"])
+        adapter = mock.Mock()
+        adapter.get.return_value = response
+
+        Raft(adapter).save_raft_snapshot(io.BytesIO(), chunk_size=1)
+
+        adapter.get.assert_called_once_with(url="/v1/sys/storage/raft/snapshot", stream=True)
+        response.raw.iter_bytes.assert_called_once_with(1)
+        response.raw.close.assert_called_once_with()
+
+
+class TestAsyncRaftSnapshotStreaming(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.restored = []
+
+        async def snapshot(request):
+            response = web.StreamResponse()
+            await response.prepare(request)
+            for start in range(0, len(SNAPSHOT), 100_000):
+                await response.write(SNAPSHOT[start : start + 100_000])
+            return response
+
+        async def restore(request):
+            self.restored.append(await request.read())
+            return web.Response(status=204)
+
+        app = web.Application()
+        app.router.add_get("/v1/sys/storage/raft/snapshot", snapshot)
+        app.router.add_post("/v1/sys/storage/raft/snapshot", restore)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "vault.snap")
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.directory.cleanup()
+
+    @parameterized.expand(
+        [
+            ("httpx over aiohttp", adapters.AsyncVaultxAdapter),
+            ("aiohttp", adapters.AiohttpVaultxAdapter),
+        ]
+    )
+    async def test_save_and_restore(self, name, adapter_class):
+        adapter = adapter_class(base_uri=str(self.server.make_url("")))
+        async with adapter:
+            raft = AsyncRaft(adapter)
+            saved = await raft.save_raft_snapshot(self.path, compress=True, chunk_size=65536)
+            response = await raft.restore_raft_snapshot_from(self.path, decompress=True, checksum=saved["checksum"])
+
+        self.assertEqual(saved["checksum"], SNAPSHOT_CHECKSUM)
+        self.assertEqual(saved["size"], len(SNAPSHOT))
+        with open(self.path, "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), SNAPSHOT)
+        self.assertEqual(response.status, 204)
+        self.assertEqual(self.restored, [SNAPSHOT])
+
+    async def test_checksum_mismatch_sends_nothing(self):
+        async with adapters.AsyncVaultxAdapter(base_uri=str(self.server.make_url(""))) as adapter:
+            with self.assertRaises(VaultxError):
+                await AsyncRaft(adapter).restore_raft_snapshot_from(io.BytesIO(SNAPSHOT), checksum="0" * 64)
+
+        self.assertEqual(self.restored, [])
@@ -1,11 +1,21 @@
-from unittest import IsolatedAsyncioTestCase, TestCase
+import asyncio
+import json
+import os
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
 
 import httpx
 import respx
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from parameterized import parameterized  # type: ignore
 
-from vaultx import adapters
+from vaultx import AsyncClient, adapters
 from vaultx.constants.client import DEFAULT_URL
+from vaultx.exceptions import HTTPError, VaultxError
 
 
 class TestRequest(TestCase):
@@ -162,3 +172,302 @@ class TestAsyncRequest(IsolatedAsyncioTestCase):
             second=response.status,
         )
         self.assertEqual(first=mock_response, second=response.value)
+
+
+class TestVaultxResponse(TestCase):
+    def test_body_is_decoded_on_first_access(self):
+        response = adapters.VaultxResponse(httpx.Response(200, json={"data": {"key": "value"}}))
+        self.assertIsNone(response._value)
+
+        self.assertEqual(response["data"], {"key": "value"})
+        self.assertIs(response.value, response.value)
+
+    def test_status_does_not_decode_body(self):
+        with mock.patch.object(adapters, "json_decoder") as decoder:
+            response = adapters.VaultxResponse(httpx.Response(200, json={"data": {}}))
+            self.assertEqual(response.status, 200)
+            decoder.assert_not_called()
+
+    def test_content_returns_raw_bytes(self):
+        response = adapters.VaultxResponse(httpx.Response(200, content=b'{"data": 1}'))
+        self.assertEqual(response.content, b'{"data": 1}')
+
+    def test_empty_and_invalid_bodies(self):
+        self.assertEqual(adapters.VaultxResponse(httpx.Response(204)).value, {})
+        self.assertEqual(adapters.VaultxResponse(httpx.Response(200, content=b"not json")).value, {})
+
+    def test_unread_stream_is_not_consumed(self):
+        stream = httpx.ByteStream(b"\x00\x01snapshot")
+        response = adapters.VaultxResponse(httpx.Response(200, stream=stream))
+        self.assertEqual(response.value, {})
+        self.assertEqual(response.raw.read(), b"\x00\x01snapshot")
+
+    def test_custom_json_decoder(self):
+        with mock.patch.object(adapters, "json_decoder", return_value={"decoded": True}) as decoder:
+            response = adapters.VaultxResponse(httpx.Response(200, content=b"{}"))
+            self.assertTrue(response["decoded"])
+        decoder.assert_called_once_with(b"{}")
+
+    def test_slots_layout(self):
+        response = adapters.VaultxResponse(httpx.Response(200, json={}))
+        self.assertFalse(hasattr(response, "__dict__"))
+
+
+class TestAiohttpVaultxAdapter(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def handler(request):
+            body = await request.read()
+            self.requests.append((request.method, request.path_qs, dict(request.headers), body))
+            if request.path == "/v1/missing":
+                return web.json_response({"errors": []}, status=404)
+            if request.path == "/v1/empty":
+                return web.Response(status=204)
+            return web.json_response({"data": {"path": request.path}}, headers={"X-Vault-Index": "abc"})
+
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.adapter = adapters.AiohttpVaultxAdapter(
+            base_uri=str(self.server.make_url("")), token="s.token", namespace="team", max_connections=5
+        )
+
+    async def asyncTearDown(self):
+        await self.adapter.close()
+        await self.server.close()
+
+    async def test_get_returns_vaultx_response(self):
+        response = await self.adapter.get("/v1/secret/data/foo", params={"version": 2})
+
+        self.assertIsInstance(response, adapters.VaultxResponse)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response["data"], {"path": "/v1/secret/data/foo"})
+        self.assertEqual(response.headers["x-vault-index"], "abc")
+        self.assertEqual(response.raw.json(), {"data": {"path": "/v1/secret/data/foo"}})
+        method, path, headers, _ = self.requests[0]
+        self.assertEqual((method, path), ("GET", "/v1/secret/data/foo?version=2"))
+        self.assertEqual(headers["X-Vault-Token"], "s.token")
+        self.assertEqual(headers["X-Vault-Namespace"], "team")
+        self.assertEqual(headers["X-Vault-Request"], "true")
+
+    async def test_post_sends_json_and_wrap_ttl(self):
+        await self.adapter.post("/v1/transit/encrypt/key", json={"plaintext": "aGk="}, wrap_ttl="60s")
+
+        method, _, headers, body = self.requests[0]
+        self.assertEqual(method, "POST")
+        self.assertEqual(json.loads(body), {"plaintext": "aGk="})
+        self.assertEqual(headers["X-Vault-Wrap-TTL"], "60s")
+
+    async def test_list_strict_http(self):
+        self.adapter.strict_http = True
+        await self.adapter.list("/v1/secret/metadata/")
+        self.assertEqual(self.requests[0][:2], ("GET", "/v1/secret/metadata?list=true"))
+
+    async def test_boolean_params_are_encoded(self):
+        await self.adapter.get("/v1/sys/health", params={"standbyok": True, "perfstandbyok": False})
+        self.assertEqual(self.requests[0][1], "/v1/sys/health?standbyok=true&perfstandbyok=false")
+
+    async def test_error_status_raises_http_error(self):
+        with self.assertRaises(HTTPError) as context:
+            await self.adapter.get("/v1/missing")
+        self.assertEqual(context.exception.status_code, 404)
+
+        response = await self.adapter.get("/v1/missing", raise_exception=False)
+        self.assertEqual(response.status, 404)
+
+    async def test_empty_response(self):
+        response = await self.adapter.delete("/v1/empty")
+        self.assertEqual(response.status, 204)
+        self.assertEqual(response.value, {})
+
+    async def test_get_login_token(self):
+        response = adapters.AiohttpVaultxResponse(
+            200, {"content-type": "application/json"}, b'{"auth": {"client_token": "s.new"}}', "POST", "/"
+        )
+        self.assertEqual(await self.adapter.get_login_token(response), "s.new")
+
+    async def test_unsupported_arguments(self):
+        with self.assertRaises(VaultxError):
+            await self.adapter.get("/v1/sys/health", files={"a": b""})
+
+    async def test_client_uses_adapter(self):
+        client = AsyncClient(url=str(self.server.make_url("")), token="s.token", adapter=adapters.AiohttpVaultxAdapter)
+        async with client:
+            response = await client.secrets.kv.v2.read_secret_version(path="foo")
+        self.assertEqual(response["data"]["path"], "/v1/secret/data/foo")
+
+
+class TestConnectionPool(TestCase):
+    def test_pool_limits(self):
+        adapter = adapters.VaultxAdapter(max_connections=7, max_keepalive_connections=3, keepalive_expiry=1.5)
+        pool = adapter.client._transport._pool
+        self.assertEqual((pool._max_connections, pool._max_keepalive_connections), (7, 3))
+        self.assertEqual(pool._keepalive_expiry, 1.5)
+
+    @respx.mock
+    def test_split_timeouts(self):
+        route = respx.get(f"{DEFAULT_URL}/v1/sys/health").mock(return_value=httpx.Response(200, json={}))
+        adapter = adapters.VaultxAdapter(timeout=10, connect_timeout=2, pool_timeout=0.5)
+
+        adapter.get("/v1/sys/health")
+
+        self.assertEqual(
+            route.calls.last.request.extensions["timeout"], {"connect": 2, "read": 10, "write": 10, "pool": 0.5}
+        )
+        self.assertNotIn("trace", route.calls.last.request.extensions)
+
+    @respx.mock
+    def test_track_pool_wait_adds_trace(self):
+        route = respx.get(f"{DEFAULT_URL}/v1/sys/health").mock(return_value=httpx.Response(200, json={}))
+        adapter = adapters.VaultxAdapter(track_pool_wait=True)
+
+        adapter.get("/v1/sys/health")
+
+        trace = route.calls.last.request.extensions["trace"]
+        trace("connection.connect_tcp.started", {})
+        trace("http11.send_request_headers.started", {})
+        self.assertEqual(adapter.pool_stats.requests, 1)
+        self.assertGreaterEqual(adapter.pool_stats.max_wait, adapter.pool_stats.mean_wait)
+
+    def test_pool_stats(self):
+        stats = adapters.PoolStats()
+        self.assertEqual(stats.mean_wait, 0.0)
+
+        stats.record(0.5)
+        stats.record(1.5)
+
+        self.assertEqual(stats.as_dict(), {"requests": 2, "wait_time": 2.0, "max_wait": 1.5})
+        self.assertEqual(stats.mean_wait, 1.0)
+        self.assertEqual(repr(stats), "PoolStats(requests=2, wait_time=2.0, max_wait=1.5)")
+
+    def test_aiohttp_timeout(self):
+        timeout = adapters._aiohttp_timeout(httpx.Timeout(10, connect=2, pool=1))
+        self.assertIsNone(timeout.total)
+        self.assertEqual((timeout.connect, timeout.sock_connect, timeout.sock_read), (1, 2, 10))
+
+
+class TestAsyncConnectionPool(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def handler(request):
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_get("/v1/sys/health", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.url = str(self.server.make_url(""))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    @parameterized.expand([("httpx", adapters.AsyncVaultxAdapter), ("aiohttp", adapters.AiohttpVaultxAdapter)])
+    async def test_track_pool_wait(self, name, adapter_class):
+        adapter = adapter_class(base_uri=self.url, max_connections=1, track_pool_wait=True)
+        try:
+            await asyncio.gather(*(adapter.get("/v1/sys/health") for _ in range(3)))
+        finally:
+            await adapter.close()
+
+        self.assertEqual(adapter.pool_stats.requests, 3)
+        self.assertGreater(adapter.pool_stats.max_wait, 0.0)
+
+    async def test_connector_limits(self):
+        async with AsyncClient(url=self.url, max_connections=4, keepalive_expiry=2) as client:
+            connector = client.adapter.client._transport._session.connector
+            self.assertEqual((connector.limit, connector._keepalive_timeout), (4, 2))
+            self.assertIsNone(client.adapter.pool_stats)
+
+    async def test_aiohttp_adapter_rejects_http2(self):
+        with self.assertRaises(VaultxError):
+            adapters.AiohttpVaultxAdapter(base_uri=self.url, http2=True)
+
+    async def test_http2_uses_httpx_transport(self):
+        with mock.patch.object(httpx, "AsyncHTTPTransport", spec=httpx.AsyncHTTPTransport) as transport:
+            adapter = adapters.AsyncVaultxAdapter(base_uri=self.url, http2=True, max_connections=8)
+
+        self.assertTrue(transport.call_args.kwargs["http2"])
+        self.assertEqual(transport.call_args.kwargs["limits"].max_connections, 8)
+        self.assertIs(adapter.client._transport, transport.return_value)
+
+
+class _UnixHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = json.dumps({"data": {"path": self.path}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, _UnixHandler)
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class TestUnixSocket(IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "agent.sock")
+        self.server = _UnixServer(self.path)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_sync_adapter_pools_connections_over_socket(self):
+        adapter = adapters.VaultxAdapter(base_uri=f"unix://{self.path}", proxy="http://proxy.invalid:3128")
+        with adapter:
+            responses = [adapter.get("/v1/secret/data/app") for _ in range(3)]
+
+        self.assertEqual(adapter.base_uri, "http://localhost")
+        self.assertEqual([response.value["data"]["path"] for response in responses], ["/v1/secret/data/app"] * 3)
+        self.assertEqual(self.server.connections, 1)
+
+    @parameterized.expand(
+        [
+            ("httpx over aiohttp", adapters.AsyncVaultxAdapter),
+            ("aiohttp", adapters.AiohttpVaultxAdapter),
+        ]
+    )
+    async def test_async_adapters_pool_connections_over_socket(self, name, adapter_class):
+        async with adapter_class(base_uri=f"unix://{self.path}") as adapter:
+            for _ in range(3):
+                response = await adapter.get("/v1/secret/data/app")
+
+        self.assertEqual(response.value["data"]["path"], "/v1/secret/data/app")
+        self.assertEqual(self.server.connections, 1)
+
+    def test_relative_socket_path_is_rejected(self):
+        with self.assertRaises(VaultxError):
+            adapters.VaultxAdapter(base_uri="unix://agent.sock")
+
+    @parameterized.expand(
+        [
+            ("httpx", adapters.VaultxAdapter),
+            ("httpx over aiohttp", adapters.AsyncVaultxAdapter),
+            ("aiohttp", adapters.AiohttpVaultxAdapter),
+        ]
+    )
+    def test_socket_with_client_is_rejected(self, name, adapter_class):
+        with self.assertRaises(VaultxError):
+            adapter_class(base_uri=f"unix://{self.path}", client=mock.Mock())
+
+    def test_client_url(self):
+        client = AsyncClient(url=f"unix://{self.path}", adapter=adapters.AiohttpVaultxAdapter)
+        self.assertEqual((client.url, client.adapter.uds), ("http://localhost", self.path))
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer, make_mocked_request
+from httpx import Response
+
+from vaultx import AsyncClient
+from vaultx.adapters import VaultxResponse
+from vaultx.agent import CACHE_HEADER, Agent, _secret_path
+from vaultx.lifecycle import LeaseEvent, ManagedLease
+
+
+class StubVault:
+    """Vault API stub recording the requests it receives."""
+
+    def __init__(self):
+        self.requests = []
+        self.secret = {"password": "1"}
+        self.credentials = 0
+        self.wrapping_tokens = 0
+        self.renewable = True
+        self.delay = 0.0
+
+    async def handle(self, request):
+        self.requests.append((request.method, request.path, request.headers.get("X-Vault-Token")))
+        await asyncio.sleep(self.delay)
+        path = request.path[len("/v1/") :]
+        if "X-Vault-Wrap-TTL" in request.headers or path == "secret/data/wrapped":
+            self.wrapping_tokens += 1
+            return web.json_response({"wrap_info": {"token": f"s.wrapping{self.wrapping_tokens}", "ttl": 60}})
+        if path == "secret/data/app" and request.method == "GET":
+            return web.json_response({"lease_id": "", "data": {"data": self.secret, "metadata": {"version": 1}}})
+        if path == "secret/data/app":
+            self.secret = (await request.json())["data"]
+            return web.json_response({"data": {"version": 2}})
+        if path == "database/creds/readonly":
+            self.credentials += 1
+            lease = {"lease_id": f"database/creds/readonly/{self.credentials}", "lease_duration": 3600}
+            data = {"username": f"v-{self.credentials}"}
+            return web.json_response({**lease, "renewable": self.renewable, "data": data})
+        if path == "sys/leases/renew":
+            return web.json_response({"lease_id": (await request.json())["lease_id"], "lease_duration": 3600})
+        if path == "sys/health":
+            return web.json_response({"initialized": True})
+        return web.json_response({"errors": []}, status=404)
+
+    def count(self, path):
+        return sum(1 for _, request_path, _ in self.requests if request_path == path)
+
+
+class TestSecretPath(TestCase):
+    def test_secret_path(self):
+        self.assertEqual(_secret_path("secret/data/app/db"), "secret/app/db")
+        self.assertEqual(_secret_path("secret/destroy/app/db"), "secret/app/db")
+        self.assertEqual(_secret_path("kv/app"), "kv/app")
+        self.assertEqual(_secret_path("database/creds/readonly"), "database/creds/readonly")
+
+
+class TestAgent(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.vault = StubVault()
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self.vault.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.client = AsyncClient(url=str(self.server.make_url("")), token="s.agent")
+        self.agent = Agent(self.client)
+        self.http = TestClient(TestServer(self.agent.application()))
+        await self.http.start_server()
+
+    async def asyncTearDown(self):
+        await self.http.close()
+        await self.client.close()
+        await self.server.close()
+
+    async def test_reads_are_cached_and_sent_with_agent_token(self):
+        first = await self.http.get("/v1/secret/data/app", headers={"X-Vault-Token": "s.caller"})
+        second = await self.http.get("/v1/secret/data/app")
+
+        self.assertEqual((first.status, first.headers[CACHE_HEADER]), (200, "MISS"))
+        self.assertEqual(second.headers[CACHE_HEADER], "HIT")
+        self.assertEqual((await second.json())["data"]["data"], {"password": "1"})
+        self.assertEqual(self.vault.requests, [("GET", "/v1/secret/data/app", "s.agent")])
+
+    async def test_concurrent_reads_are_sent_once(self):
+        self.vault.delay = 0.05
+        responses = await asyncio.gather(*(self.http.get("/v1/secret/data/app") for _ in range(5)))
+
+        self.assertEqual([response.status for response in responses], [200] * 5)
+        self.assertEqual(self.vault.count("/v1/secret/data/app"), 1)
+        self.assertEqual(self.agent.singleflight_stats.deduplicated, 4)
+
+    async def test_writes_invalidate_secret(self):
+        await self.http.get("/v1/secret/data/app")
+        write = await self.http.post("/v1/secret/data/app", json={"data": {"password": "2"}})
+        read = await self.http.get("/v1/secret/data/app")
+
+        self.assertEqual(write.headers[CACHE_HEADER], "BYPASS")
+        self.assertEqual(read.headers[CACHE_HEADER], "MISS")
+        self.assertEqual((await read.json())["data"]["data"], {"password": "2"})
+
+    async def test_lists_do_not_invalidate(self):
+        await self.http.get("/v1/secret/data/app")
+        # aiohttp's HTTP parser only accepts standard methods, so the request is handed to the agent directly
+        path = "secret/metadata/app"
+        list_request = make_mocked_request("LIST", f"/v1/{path}", match_info={"path": path})
+        keys = VaultxResponse(Response(200, json={"data": {"keys": ["app"]}}))
+        with mock.patch.object(self.agent, "_forward", mock.AsyncMock(return_value=keys)):
+            listed = await self.agent.handle(list_request)
+        read = await self.http.get("/v1/secret/data/app")
+
+        self.assertEqual((listed.status, listed.headers[CACHE_HEADER]), (200, "BYPASS"))
+        self.assertEqual(read.headers[CACHE_HEADER], "HIT")
+
+    async def test_wrapped_responses_are_never_shared(self):
+        headers = {"X-Vault-Wrap-TTL": "60"}
+        requested = [await self.http.get("/v1/secret/data/app", headers=headers) for _ in range(2)]
+        self.assertEqual([response.headers[CACHE_HEADER] for response in requested], ["BYPASS"] * 2)
+
+        self.vault.delay = 0.05
+        forced = await asyncio.gather(*(self.http.get("/v1/secret/data/wrapped") for _ in range(3)))
+        forced.append(await self.http.get("/v1/secret/data/wrapped"))
+
+        tokens = [(await response.json())["wrap_info"]["token"] for response in requested + forced]
+        self.assertEqual(len(set(tokens)), 6)
+        self.assertEqual(len(self.agent.cache), 0)
+
+    async def test_leases_are_shared_and_renewed(self):
+        first = await (await self.http.get("/v1/database/creds/readonly")).json()
+        second = await (await self.http.get("/v1/database/creds/readonly")).json()
+
+        self.assertEqual(first, second)
+        self.assertIn(first["lease_id"], self.agent.lease_manager)
+        self.assertEqual(self.agent.stats.leases, 1)
+
+        self.agent.lease_manager._emit(LeaseEvent.RENEWAL_FAILED, ManagedLease(first["lease_id"], 3600, True, 0))
+        third = await (await self.http.get("/v1/database/creds/readonly")).json()
+
+        self.assertEqual(third["data"], {"username": "v-2"})
+        self.assertNotIn(first["lease_id"], self.agent.lease_manager)
+
+    async def test_non_renewable_leases_are_not_tracked(self):
+        self.vault.renewable = False
+        await self.http.get("/v1/database/creds/readonly")
+
+        self.assertEqual(self.agent._lease_keys, {})
+        self.assertEqual(len(self.agent.lease_manager), 0)
+
+    async def test_leases_of_uncached_responses_are_unregistered_on_renewal(self):
+        first = await (await self.http.get("/v1/database/creds/readonly")).json()
+        self.agent.cache.clear()
+        second = await (await self.http.get("/v1/database/creds/readonly")).json()
+        self.agent.lease_manager._emit(LeaseEvent.RENEWED, ManagedLease(first["lease_id"], 3600, True, 0))
+
+        self.assertNotIn(first["lease_id"], self.agent.lease_manager)
+        self.assertIn(second["lease_id"], self.agent.lease_manager)
+        self.assertEqual(list(self.agent._lease_keys), [second["lease_id"]])
+        cached = await self.http.get("/v1/database/creds/readonly")
+        self.assertEqual((cached.headers[CACHE_HEADER], (await cached.json())["data"]), ("HIT", second["data"]))
+
+        self.agent.cache.clear()
+        self.agent.lease_manager._emit(LeaseEvent.RENEWED, ManagedLease(second["lease_id"], 3600, True, 0))
+        self.assertEqual(len(self.agent.lease_manager), 0)
+
+    async def test_uncached_paths_and_errors_are_forwarded(self):
+        for _ in range(2):
+            await self.http.get("/v1/sys/health")
+            missing = await self.http.get("/v1/secret/data/missing")
+
+        self.assertEqual(missing.status, 404)
+        self.assertEqual(self.vault.count("/v1/sys/health"), 2)
+        self.assertEqual(self.vault.count("/v1/secret/data/missing"), 2)
+
+    async def test_unreachable_vault(self):
+        await self.server.close()
+        self.client.adapter.retry_policy = None
+        response = await self.http.get("/v1/secret/data/app")
+
+        self.assertEqual(response.status, 502)
+        self.assertEqual(self.agent.stats.errors, 1)
+
+
+async def get_over_unix_socket(path, url):
+    async with aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=path)) as session:
+        response = await session.get(f"http://agent{url}")
+        return await response.json()
+
+
+class TestAgentServer(IsolatedAsyncioTestCase):
+    async def test_serves_unix_socket(self):
+        vault = StubVault()
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", vault.handle)
+        async with TestServer(app) as server, AsyncClient(url=str(server.make_url(""))) as client:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "agent.sock")
+                async with await Agent(client).start(path=path):
+                    body = await get_over_unix_socket(path, "/v1/secret/data/app")
+
+        self.assertEqual(body["data"]["data"], {"password": "1"})
+
+    async def test_refuses_non_loopback_host(self):
+        async with AsyncClient() as client:
+            with self.assertRaises(ValueError):
+                await Agent(client).start(host="0.0.0.0")
@@ -0,0 +1,239 @@
+import os
+import stat
+import tempfile
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+import respx
+
+from vaultx import adapters
+from vaultx.adapters import VaultxResponse
+from vaultx.cache import FileCache, TTLCache
+from vaultx.constants.client import DEFAULT_URL
+
+
+KEY = b"k" * 32
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.cache = TTLCache(ttl=10, max_entries=2, timer=self.timer)
+
+    def test_get_returns_stored_value(self):
+        self.cache.set("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_entries_expire(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, ttl=30)
+        self.timer.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+        self.assertEqual(self.cache.stats.expirations, 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_invalidate(self):
+        self.cache.set(("kv", "a"), 1)
+        self.cache.set(("kv", "b"), 2)
+        self.cache.invalidate(("kv", "a"))
+        self.assertEqual(self.cache.invalidate_where(lambda key: key[0] == "kv"), 1)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats.invalidations, 2)
+
+    def test_hit_ratio(self):
+        self.assertEqual(self.cache.stats.hit_ratio, 0.0)
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.get("b")
+        self.assertEqual(self.cache.stats.hit_ratio, 0.5)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TTLCache(ttl=0)
+        with self.assertRaises(ValueError):
+            TTLCache(max_entries=0)
+
+    def test_items_skip_expired_entries(self):
+        self.cache.set("a", 1, ttl=5)
+        self.cache.set("b", 2)
+        self.timer.now = 5
+        self.assertEqual(self.cache.items(), [("b", 2)])
+
+    def test_get_or_set(self):
+        factory_calls = []
+
+        def factory():
+            factory_calls.append(1)
+            return len(factory_calls)
+
+        self.assertEqual(self.cache.get_or_set("a", factory, ttl=lambda value: 5), 1)
+        self.assertEqual(self.cache.get_or_set("a", factory), 1)
+        self.timer.now = 5
+        self.assertEqual(self.cache.get_or_set("a", factory), 2)
+        self.assertIsNone(self.cache.get_or_set("b", lambda: None))
+        self.assertNotIn("b", self.cache)
+
+
+class TestFileCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.timer = FakeTimer()
+        self.cache = FileCache(self.directory.name, KEY, ttl=10, max_entries=2, timer=self.timer)
+
+    def test_entries_are_shared_between_instances(self):
+        self.cache.set(("kv", "a", None), {"key": "value"})
+        other = FileCache(self.directory.name, KEY, timer=self.timer)
+        self.assertEqual(other.get(("kv", "a", None)), {"key": "value"})
+        self.assertIsNone(other.get(("kv", "b", None)))
+        self.assertEqual((other.stats.hits, other.stats.misses), (1, 1))
+
+    def test_responses_are_stored(self):
+        self.cache.set("a", VaultxResponse(httpx.Response(200, json={"data": {"key": "value"}})))
+        response = self.cache.get("a")
+        self.assertIsInstance(response, VaultxResponse)
+        self.assertEqual((response.status, response.value), (200, {"data": {"key": "value"}}))
+
+    def test_entries_are_encrypted(self):
+        self.cache.set("a", "s.secret-token")
+        for name in self.cache._entries():
+            with open(self.cache._path(name), "rb") as f:
+                self.assertNotIn(b"s.secret-token", f.read())
+        self.assertIsNone(FileCache(self.directory.name, b"o" * 32).get("a"))
+
+    def test_entries_expire(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, ttl=30)
+        self.timer.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+        self.assertEqual(self.cache.stats.expirations, 1)
+        self.assertNotIn("a", self.cache)
+
+    def test_entries_expiring_first_are_evicted(self):
+        self.cache.set("a", 1, ttl=30)
+        self.cache.set("b", 2)
+        self.cache.set("c", 3, ttl=20)
+        self.assertEqual(len(self.cache), 2)
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_invalidate(self):
+        self.cache.set(("kv", "a"), 1)
+        self.cache.set(("kv", "b"), 2)
+        self.cache.invalidate(("kv", "a"))
+        self.assertEqual(self.cache.invalidate_where(lambda key: key == ("kv", "b")), 1)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats.invalidations, 2)
+
+    def test_directories_are_private(self):
+        directory = os.path.join(self.directory.name, "nested", "cache")
+        FileCache(directory, KEY)
+        for path in (directory, os.path.join(directory, "locks")):
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode) & 0o077, 0)
+
+    def test_lock_files_are_removed_with_entries(self):
+        locks = os.path.join(self.directory.name, "locks")
+        self.cache.get_or_set("a", lambda: 1, ttl=30)
+        self.cache.get_or_set("b", lambda: 2)
+        self.cache.get_or_set("c", lambda: 3, ttl=20)
+        self.assertEqual(len(os.listdir(locks)), 2)
+        self.cache.invalidate("a")
+        self.assertEqual(len(os.listdir(locks)), 1)
+        self.cache.get_or_set("d", lambda: None)
+        self.cache.clear()
+        self.assertEqual(os.listdir(locks), [])
+
+    def test_get_or_set_computes_value_once(self):
+        factory_calls = []
+
+        def factory():
+            factory_calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        caches = [FileCache(self.directory.name, KEY) for _ in range(4)]
+        threads = [threading.Thread(target=cache.get_or_set, args=("a", factory)) for cache in caches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(factory_calls, [1])
+        self.assertEqual(caches[0].get("a"), "value")
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            FileCache(self.directory.name, KEY, ttl=0)
+        with self.assertRaises(ValueError):
+            FileCache(self.directory.name, KEY, max_entries=0)
+
+
+class TestAsyncFileCache(IsolatedAsyncioTestCase):
+    async def test_get_or_set_async(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileCache(directory, KEY)
+            factory_calls = []
+
+            async def factory():
+                factory_calls.append(1)
+                return ["value"]
+
+            self.assertEqual(await cache.get_or_set_async("a", factory), ["value"])
+            self.assertEqual(await FileCache(directory, KEY).get_or_set_async("a", factory), ["value"])
+            self.assertEqual(factory_calls, [1])
+
+
+LOGIN_URL = f"{DEFAULT_URL}/v1/auth/approle/login"
+LOGIN_RESPONSE = {"auth": {"client_token": "s.shared", "lease_duration": 3600}}
+
+
+class TestLoginCache(TestCase):
+    @respx.mock
+    def test_processes_share_login(self):
+        route = respx.post(LOGIN_URL).mock(return_value=httpx.Response(200, json=LOGIN_RESPONSE))
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(2):
+                adapter = adapters.VaultxAdapter(login_cache=FileCache(directory, KEY, ttl=1))
+                adapter.login("/v1/auth/approle/login", json={"role_id": "r", "secret_id": "s"})
+                self.assertEqual(adapter.token, "s.shared")
+            adapter.login("/v1/auth/approle/login", json={"role_id": "other", "secret_id": "s"})
+            entry = adapter.login_cache._entries()[0]
+            expires_at = adapter.login_cache._expiry(entry)
+
+        self.assertEqual(route.call_count, 2)
+        self.assertAlmostEqual(expires_at - time.time(), 1800, delta=5)
+
+
+class TestAsyncLoginCache(IsolatedAsyncioTestCase):
+    @respx.mock
+    async def test_processes_share_login(self):
+        route = respx.post(LOGIN_URL).mock(return_value=httpx.Response(200, json=LOGIN_RESPONSE))
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(2):
+                adapter = adapters.AsyncVaultxAdapter(client=httpx.AsyncClient(), login_cache=FileCache(directory, KEY))
+                await adapter.login("/v1/auth/approle/login", json={"role_id": "r", "secret_id": "s"})
+                self.assertEqual(adapter.token, "s.shared")
+
+        self.assertEqual(route.call_count, 1)
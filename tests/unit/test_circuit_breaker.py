@@ -0,0 +1,191 @@
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+import respx
+from parameterized import parameterized  # type: ignore
+
+from vaultx import adapters
+from vaultx.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, endpoint_key, mount_endpoint_key
+from vaultx.constants.client import DEFAULT_URL
+from vaultx.exceptions import CircuitOpenError, HTTPError, VaultxError
+from vaultx.retry import RetryPolicy
+
+
+CREDS_URL = f"{DEFAULT_URL}/v1/database/creds/readonly"
+KV_URL = f"{DEFAULT_URL}/v1/secret/data/foo"
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEndpointKey(TestCase):
+    @parameterized.expand(
+        [
+            ("/v1/database/creds/readonly", None, "database/creds"),
+            ("/v1/secret/data/a/b/c?version=2", None, "secret/data"),
+            ("/v1/auth/approle/login", None, "auth/approle/login"),
+            ("/v1/sys/health", None, "sys/health"),
+            ("v1/database/creds/readonly", "ns1/", "ns1/database/creds"),
+        ]
+    )
+    def test_endpoint_key(self, url, namespace, expected):
+        self.assertEqual(endpoint_key(url, namespace), expected)
+
+    @parameterized.expand(
+        [
+            ("/v1/team/a/kv/data/app", None, "team/a/kv/data"),
+            ("/v1/team/a/pki/issue/web", None, "team/a/pki/issue"),
+            ("/v1/team/other/x", None, "team/other"),
+            ("/v1/kv/app/db", None, "kv"),
+            ("/v1/kv/other/x", "ns1", "ns1/kv"),
+            ("/v1/auth/approle/login", None, "auth/approle/login"),
+        ]
+    )
+    def test_mount_endpoint_key(self, url, namespace, expected):
+        key_func = mount_endpoint_key(["team/a/kv/", "team/a/pki", "auth/approle"], flat_mounts=["kv"])
+        self.assertEqual(key_func(url, namespace), expected)
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=0.5,
+            window_size=4,
+            minimum_calls=4,
+            open_duration=10,
+            half_open_calls=2,
+            timer=self.timer,
+        )
+        self.ok = mock.Mock(status=200)
+
+    def call(self, outcome, url="/v1/database/creds/readonly"):
+        send = mock.Mock(side_effect=[outcome]) if isinstance(outcome, Exception) else mock.Mock(return_value=outcome)
+        return self.breaker.call("GET", url, None, send)
+
+    def fail(self, times=1):
+        for _ in range(times):
+            with self.assertRaises(HTTPError):
+                self.call(HTTPError(503))
+
+    def test_opens_at_failure_rate(self):
+        self.call(self.ok)
+        self.fail(2)
+        self.assertEqual(self.breaker.state("database/creds"), CLOSED)
+        self.call(self.ok)
+
+        self.assertEqual(self.breaker.state("database/creds"), OPEN)
+        with self.assertRaises(CircuitOpenError) as context:
+            self.call(self.ok)
+        self.assertIsInstance(context.exception, VaultxError)
+        self.assertEqual(context.exception.retry_after, 10)
+        self.assertEqual(self.breaker.stats.as_dict()["rejected"], 1)
+
+    def test_other_endpoints_are_not_affected(self):
+        self.fail(4)
+        self.assertIs(self.call(self.ok, url="/v1/secret/data/foo"), self.ok)
+        self.assertEqual(self.breaker.states, {"database/creds": OPEN, "secret/data": CLOSED})
+
+    def test_client_errors_are_not_failures(self):
+        for _ in range(4):
+            with self.assertRaises(HTTPError):
+                self.call(HTTPError(404))
+        self.assertEqual(self.breaker.state("database/creds"), CLOSED)
+
+    def test_connection_errors_are_failures(self):
+        for _ in range(4):
+            with self.assertRaises(httpx.ConnectTimeout):
+                self.call(httpx.ConnectTimeout("timed out"))
+        self.assertEqual(self.breaker.state("database/creds"), OPEN)
+
+    def test_half_open_closes_after_successful_trials(self):
+        self.fail(4)
+        self.timer.now = 10
+        self.assertEqual(self.breaker.state("database/creds"), HALF_OPEN)
+
+        self.call(self.ok)
+        self.call(self.ok)
+
+        self.assertEqual(self.breaker.state("database/creds"), CLOSED)
+
+    def test_half_open_limits_trials_and_reopens_on_failure(self):
+        self.fail(4)
+        self.timer.now = 10
+        in_flight = []
+
+        def first_trial():
+            with self.assertRaises(CircuitOpenError):
+                self.breaker.call("GET", "/v1/database/creds/x", None, mock.Mock(return_value=self.ok))
+            in_flight.append(1)
+            raise HTTPError(502)
+
+        self.breaker.call("GET", "/v1/database/creds/x", None, lambda: self.ok)
+        with self.assertRaises(HTTPError):
+            self.breaker.call("GET", "/v1/database/creds/x", None, first_trial)
+
+        self.assertEqual(in_flight, [1])
+        self.assertEqual(self.breaker.state("database/creds"), OPEN)
+        self.assertEqual(self.breaker.stats.opened, 2)
+
+    def test_slow_calls(self):
+        breaker = CircuitBreaker(slow_call_duration=1, slow_call_rate_threshold=0.5, minimum_calls=2, timer=self.timer)
+
+        def slow():
+            self.timer.now += 2
+            return self.ok
+
+        breaker.call("GET", "/v1/database/creds/a", None, slow)
+        breaker.call("GET", "/v1/database/creds/a", None, lambda: self.ok)
+
+        self.assertEqual(breaker.state("database/creds"), OPEN)
+        self.assertEqual(breaker.stats.slow_calls, 1)
+
+    def test_reset(self):
+        self.fail(4)
+        self.breaker.reset("database/creds")
+        self.assertEqual(self.breaker.state("database/creds"), CLOSED)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            CircuitBreaker(failure_rate_threshold=0)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(window_size=5, minimum_calls=6)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(half_open_calls=0)
+
+
+class TestAdapterCircuitBreaker(TestCase):
+    @respx.mock
+    def test_open_circuit_fails_fast_without_retrying(self):
+        creds = respx.get(CREDS_URL).mock(side_effect=httpx.ReadTimeout("timed out"))
+        kv = respx.get(KV_URL).mock(return_value=httpx.Response(200, json={}))
+        breaker = CircuitBreaker(minimum_calls=2, window_size=2)
+        adapter = adapters.VaultxAdapter(circuit_breaker=breaker, retry_policy=RetryPolicy(backoff_base=0.001))
+
+        with self.assertRaises(VaultxError) as context:
+            adapter.get("/v1/database/creds/readonly")
+
+        self.assertIsInstance(context.exception, CircuitOpenError)
+        self.assertEqual(creds.call_count, 2)
+        self.assertEqual(adapter.get("/v1/secret/data/foo").status, 200)
+        self.assertEqual(kv.call_count, 1)
+
+
+class TestAsyncAdapterCircuitBreaker(IsolatedAsyncioTestCase):
+    @respx.mock
+    async def test_open_circuit_fails_fast(self):
+        route = respx.get(CREDS_URL).mock(return_value=httpx.Response(500))
+        breaker = CircuitBreaker(minimum_calls=1, window_size=1)
+        adapter = adapters.AsyncVaultxAdapter(client=httpx.AsyncClient(), circuit_breaker=breaker)
+
+        with self.assertRaises(HTTPError):
+            await adapter.get("/v1/database/creds/readonly")
+        with self.assertRaises(CircuitOpenError):
+            await adapter.get("/v1/database/creds/readonly")
+
+        self.assertEqual(route.call_count, 1)
@@ -1,12 +1,34 @@
+import subprocess
+import sys
 from unittest import IsolatedAsyncioTestCase, TestCase
 
-from vaultx import AsyncClient, Client
+from vaultx import AsyncClient, Client, api
 from vaultx.adapters import AsyncVaultxAdapter, VaultxAdapter
+from vaultx.api.secrets_engines.kv import Kv
+
+
+class BaselineAdapter(VaultxAdapter):
+    """Custom adapter accepting only the original adapter constructor arguments."""
+
+    def __init__(self, base_uri, token, cert, verify, timeout, proxy, follow_redirects, client, namespace):
+        super().__init__(base_uri=base_uri, token=token, namespace=namespace)
 
 
 class TestClient(TestCase):
     """Unit tests providing coverage for client related methods."""
 
+    def test_custom_adapter_with_original_signature(self):
+        client = Client(url="https://vault:8200", adapter=BaselineAdapter)
+        self.assertEqual(client.url, "https://vault:8200")
+
+        with self.assertRaises(TypeError):
+            Client(adapter=BaselineAdapter, http2=True)
+
+    def test_non_default_options_are_passed_to_adapter(self):
+        client = Client(max_connections=7, coalesce_requests=True)
+        self.assertIsNotNone(client.adapter.singleflight)
+        self.assertEqual(client.adapter.client._transport._pool._max_connections, 7)
+
     def test_setting_adapter_on_client_sets_adapter_of_endpoint_classes(self):
         client = Client()
         old_adapter = client.adapter
@@ -19,6 +41,54 @@ class TestClient(TestCase):
             {client.secrets.adapter, client.sys.adapter, client.auth.adapter},
         )
 
+    def test_engines_are_created_on_first_access(self):
+        client = Client()
+        self.assertNotIn("_kv", vars(client.secrets))
+
+        kv = client.secrets.kv
+
+        self.assertIsInstance(kv, Kv)
+        self.assertIs(client.secrets.kv, kv)
+        self.assertIs(kv._adapter, client.adapter)
+        with self.assertRaises(AttributeError):
+            client.secrets.unknown  # noqa: B018
+
+    def test_adapter_of_engines_created_later(self):
+        client = Client()
+        client.secrets.kv  # noqa: B018
+
+        client.adapter = VaultxAdapter()
+
+        self.assertIs(client.secrets.kv.adapter, client.adapter)
+        self.assertIs(client.secrets.transit._adapter, client.adapter)
+
+    def test_sync_client_does_not_import_async_modules(self):
+        script = (
+            "import sys, vaultx; vaultx.Client(); "
+            "print(sorted(m for m in sys.modules if m == 'aiohttp' or m.startswith('vaultx.api.async_')))"
+        )
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+    def test_client_does_not_import_unused_options(self):
+        script = (
+            "import sys, vaultx; vaultx.Client(); "
+            "print(sorted(m for m in ('vaultx.lifecycle', 'vaultx.cache', 'vaultx.circuit_breaker', "
+            "'vaultx.ratelimit') if m in sys.modules))"
+        )
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+    def test_lazy_attributes(self):
+        from vaultx.api.async_secrets_engines import AsyncSecretsEngines
+
+        self.assertIs(api.AsyncSecretsEngines, AsyncSecretsEngines)
+        self.assertIn("SystemBackend", dir(api))
+        with self.assertRaises(AttributeError):
+            api.Unknown  # noqa: B018
+
 
 class TestAsyncClient(IsolatedAsyncioTestCase):
     """Unit tests providing coverage for async_client related methods."""
@@ -0,0 +1,245 @@
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+import respx
+from parameterized import parameterized  # type: ignore
+
+from vaultx import Client
+from vaultx.circuit_breaker import CircuitBreaker
+from vaultx.cluster import (
+    ACTIVE,
+    PERFORMANCE_STANDBY,
+    SEALED,
+    STANDBY,
+    UNKNOWN,
+    UNREACHABLE,
+    AsyncClusterVaultxAdapter,
+    ClusterTopology,
+    ClusterVaultxAdapter,
+    role_from_health,
+)
+from vaultx.exceptions import HTTPError, VaultxError
+
+
+NODES = ["http://vault-0:8200", "http://vault-1:8200", "http://vault-2:8200"]
+
+HEALTH = {
+    ACTIVE: (200, {"initialized": True, "sealed": False, "standby": False, "performance_standby": False}),
+    PERFORMANCE_STANDBY: (473, {"initialized": True, "sealed": False, "standby": True, "performance_standby": True}),
+    STANDBY: (429, {"initialized": True, "sealed": False, "standby": True, "performance_standby": False}),
+    SEALED: (503, {"initialized": True, "sealed": True, "standby": True}),
+}
+
+
+def mock_cluster(roles):
+    """Mock the health endpoint and a KV path of every node, returning the KV routes."""
+    routes = {}
+    for index, role in enumerate(roles):
+        node = NODES[index]
+        if role == UNREACHABLE:
+            respx.get(f"{node}/v1/sys/health").mock(side_effect=httpx.ConnectError("refused"))
+        else:
+            status, body = HEALTH[role]
+            respx.get(f"{node}/v1/sys/health").mock(return_value=httpx.Response(status, json=body))
+        routes[node] = respx.route(url__startswith=f"{node}/v1/secret/").mock(
+            return_value=httpx.Response(200, json={"data": {"node": node}})
+        )
+    return routes
+
+
+class TestRoleFromHealth(TestCase):
+    @parameterized.expand([(role, body, role) for role, (_, body) in HEALTH.items()] + [("empty", {}, UNKNOWN)])
+    def test_role(self, name, health, expected):
+        self.assertEqual(role_from_health(health), expected)
+
+
+class TestClusterTopology(TestCase):
+    def setUp(self):
+        self.topology = ClusterTopology(NODES)
+        self.topology.set_roles({NODES[0]: ACTIVE, NODES[1]: PERFORMANCE_STANDBY, NODES[2]: PERFORMANCE_STANDBY})
+
+    def test_reads_rotate_across_performance_standbys(self):
+        self.assertEqual(self.topology.candidates("GET"), [NODES[1], NODES[2], NODES[0]])
+        self.assertEqual(self.topology.candidates("LIST"), [NODES[2], NODES[1], NODES[0]])
+
+    def test_writes_go_to_active_node(self):
+        self.assertEqual(self.topology.candidates("POST")[0], NODES[0])
+        self.assertEqual(self.topology.active, NODES[0])
+
+    def test_failed_nodes_are_tried_last(self):
+        self.topology.mark_failed(NODES[0])
+        self.topology.set_roles({NODES[1]: STANDBY})
+
+        self.assertEqual(self.topology.candidates("PUT"), [NODES[2], NODES[1], NODES[0]])
+        self.assertEqual(self.topology.failovers, 1)
+
+    def test_requires_nodes(self):
+        with self.assertRaises(ValueError):
+            ClusterTopology([])
+
+
+class TestClusterVaultxAdapter(TestCase):
+    def setUp(self):
+        self.adapter = ClusterVaultxAdapter(nodes=NODES, refresh_interval=None)
+        self.addCleanup(self.adapter.close)
+
+    @respx.mock
+    def test_routes_reads_to_standbys_and_writes_to_active(self):
+        routes = mock_cluster([ACTIVE, PERFORMANCE_STANDBY, PERFORMANCE_STANDBY])
+
+        self.adapter.get("/v1/secret/data/a")
+        self.adapter.get("/v1/secret/data/b")
+        self.adapter.post("/v1/secret/data/c", json={})
+
+        self.assertEqual([routes[node].call_count for node in NODES], [1, 1, 1])
+        self.assertEqual(routes[NODES[0]].calls.last.request.method, "POST")
+        self.assertEqual(
+            self.adapter.topology.roles,
+            {NODES[0]: ACTIVE, NODES[1]: PERFORMANCE_STANDBY, NODES[2]: PERFORMANCE_STANDBY},
+        )
+
+    @respx.mock
+    def test_fails_over_on_connection_error(self):
+        routes = mock_cluster([ACTIVE, PERFORMANCE_STANDBY, SEALED])
+        routes[NODES[1]].mock(side_effect=httpx.ConnectError("reset"))
+
+        response = self.adapter.get("/v1/secret/data/a")
+
+        self.assertEqual(response["data"]["node"], NODES[0])
+        self.assertEqual(self.adapter.topology.failovers, 1)
+
+    @respx.mock
+    def test_circuits_are_per_node(self):
+        breaker = CircuitBreaker(window_size=1, minimum_calls=1, open_duration=60)
+        adapter = ClusterVaultxAdapter(nodes=NODES, refresh_interval=None, circuit_breaker=breaker)
+        self.addCleanup(adapter.close)
+        routes = mock_cluster([ACTIVE, PERFORMANCE_STANDBY, SEALED])
+        routes[NODES[1]].mock(side_effect=httpx.ConnectError("refused"))
+
+        self.assertEqual(adapter.get("/v1/secret/data/a")["data"]["node"], NODES[0])
+        # A refresh found the node healthy again, while its circuit is still open
+        adapter.topology.set_roles({NODES[1]: PERFORMANCE_STANDBY})
+        self.assertEqual(adapter.get("/v1/secret/data/a")["data"]["node"], NODES[0])
+
+        self.assertEqual(routes[NODES[1]].call_count, 1)
+        self.assertEqual(breaker.state(f"secret/data@{NODES[1]}"), "open")
+        self.assertEqual(breaker.state(f"secret/data@{NODES[0]}"), "closed")
+
+    @respx.mock
+    def test_fails_over_on_service_unavailable(self):
+        routes = mock_cluster([ACTIVE, STANDBY, STANDBY])
+        routes[NODES[0]].mock(return_value=httpx.Response(503, json={"errors": ["Vault is sealed"]}))
+
+        response = self.adapter.put("/v1/secret/data/a", json={})
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(routes[NODES[1]].call_count, 1)
+
+    @respx.mock
+    def test_writes_fail_over_on_connect_errors_only(self):
+        routes = mock_cluster([ACTIVE, STANDBY, STANDBY])
+        routes[NODES[0]].mock(side_effect=httpx.ConnectError("refused"))
+        self.adapter.post("/v1/secret/data/a", json={})
+        self.assertEqual(routes[NODES[1]].call_count, 1)
+
+        self.adapter.topology.set_roles({NODES[0]: ACTIVE})
+        routes[NODES[0]].mock(side_effect=httpx.ReadTimeout("timed out"))
+        with self.assertRaises(VaultxError):
+            self.adapter.post("/v1/secret/data/a", json={})
+        self.assertEqual(routes[NODES[1]].call_count, 1)
+
+    @respx.mock
+    def test_streamed_content_does_not_fail_over(self):
+        routes = mock_cluster([ACTIVE, STANDBY, STANDBY])
+        routes[NODES[0]].mock(return_value=httpx.Response(503))
+
+        with self.assertRaises(HTTPError):
+            self.adapter.post("/v1/secret/snapshot", content=iter([b"chunk"]))
+        self.assertEqual([routes[node].call_count for node in NODES], [1, 0, 0])
+
+    @respx.mock
+    def test_refresh_probes_nodes_concurrently(self):
+        barrier = threading.Barrier(len(NODES), timeout=5)
+
+        def health(request):
+            barrier.wait()
+            status, body = HEALTH[ACTIVE if request.url.host == "vault-0" else PERFORMANCE_STANDBY]
+            return httpx.Response(status, json=body)
+
+        respx.get(url__regex=r"/v1/sys/health$").mock(side_effect=health)
+
+        roles = self.adapter.refresh()
+
+        self.assertEqual(list(roles.values()), [ACTIVE, PERFORMANCE_STANDBY, PERFORMANCE_STANDBY])
+
+    @respx.mock
+    def test_other_errors_are_raised(self):
+        routes = mock_cluster([ACTIVE, STANDBY, STANDBY])
+        routes[NODES[0]].mock(return_value=httpx.Response(404))
+
+        with self.assertRaises(HTTPError) as context:
+            self.adapter.get("/v1/secret/data/a")
+        self.assertEqual(context.exception.status_code, 404)
+        self.assertEqual(routes[NODES[1]].call_count, 0)
+
+    @respx.mock
+    def test_leader_address_is_used_when_no_node_is_active(self):
+        mock_cluster([STANDBY, UNREACHABLE, STANDBY])
+        respx.get(f"{NODES[0]}/v1/sys/leader").mock(
+            return_value=httpx.Response(200, json={"ha_enabled": True, "leader_address": "http://vault-3:8200/"})
+        )
+
+        roles = self.adapter.refresh()
+
+        self.assertEqual(roles["http://vault-3:8200"], ACTIVE)
+        self.assertEqual(roles[NODES[1]], UNREACHABLE)
+
+    @respx.mock
+    def test_client_with_cluster_adapter(self):
+        mock_cluster([ACTIVE, PERFORMANCE_STANDBY, PERFORMANCE_STANDBY])
+        client = Client(url=NODES[0], adapter=ClusterVaultxAdapter, nodes=NODES, refresh_interval=None)
+
+        with client:
+            response = client.secrets.kv.v2.read_secret_version(path="a")
+
+        self.assertEqual(response["data"]["node"], NODES[1])
+        self.assertFalse(client.adapter._thread.is_alive())
+
+
+class TestAsyncClusterVaultxAdapter(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.adapter = AsyncClusterVaultxAdapter(nodes=NODES, refresh_interval=None, client=httpx.AsyncClient())
+
+    async def asyncTearDown(self):
+        await self.adapter.close()
+
+    @respx.mock
+    async def test_routes_and_fails_over(self):
+        routes = mock_cluster([ACTIVE, PERFORMANCE_STANDBY, PERFORMANCE_STANDBY])
+        routes[NODES[2]].mock(side_effect=httpx.ConnectError("reset"))
+
+        first = await self.adapter.get("/v1/secret/data/a")
+        second = await self.adapter.get("/v1/secret/data/b")
+        await self.adapter.delete("/v1/secret/data/c")
+
+        self.assertEqual((first["data"]["node"], second["data"]["node"]), (NODES[1], NODES[1]))
+        self.assertEqual(routes[NODES[0]].calls.last.request.method, "DELETE")
+        self.assertEqual(self.adapter.topology.failovers, 1)
+
+    @respx.mock
+    async def test_writes_do_not_fail_over_after_sending(self):
+        routes = mock_cluster([ACTIVE, STANDBY, STANDBY])
+        routes[NODES[0]].mock(side_effect=httpx.ReadError("connection reset"))
+
+        with self.assertRaises(VaultxError):
+            await self.adapter.put("/v1/secret/data/a", json={})
+        self.assertEqual(routes[NODES[1]].call_count, 0)
+
+    @respx.mock
+    async def test_refresh(self):
+        mock_cluster([SEALED, ACTIVE, UNREACHABLE])
+
+        roles = await self.adapter.refresh()
+
+        self.assertEqual(roles, {NODES[0]: SEALED, NODES[1]: ACTIVE, NODES[2]: UNREACHABLE})
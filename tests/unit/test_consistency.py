@@ -0,0 +1,183 @@
+import asyncio
+import base64
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+import respx
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from tests.unit.test_cluster import NODES, mock_cluster
+from vaultx import Client, adapters
+from vaultx.cluster import ACTIVE, PERFORMANCE_STANDBY, ClusterVaultxAdapter
+from vaultx.consistency import (
+    EVENTUAL,
+    SESSION,
+    STRONG,
+    ConsistencySession,
+    consistency,
+    current_session,
+    newest_index_state,
+    parse_index_state,
+)
+from vaultx.constants.client import DEFAULT_URL
+
+
+DATA_URL = f"{DEFAULT_URL}/v1/secret/data/foo"
+
+
+def index_state(cluster_id, local, replicated):
+    return base64.b64encode(f"v1:{cluster_id}:{local}:{replicated}:hmac".encode()).decode()
+
+
+class TestIndexStates(TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_index_state(index_state("c1", 7, 3)), ("c1", 3, 7))
+
+    def test_parse_malformed(self):
+        self.assertIsNone(parse_index_state("not base64!"))
+        self.assertIsNone(parse_index_state(base64.b64encode(b"v2:c1:1:1:hmac").decode()))
+        self.assertIsNone(parse_index_state(base64.b64encode(b"v1:c1:x:1:hmac").decode()))
+
+    def test_newest_of_the_same_cluster_is_kept(self):
+        old, new = index_state("c1", 5, 2), index_state("c1", 9, 2)
+        self.assertEqual(newest_index_state(new, old), new)
+        self.assertEqual(newest_index_state(old, new), new)
+        self.assertEqual(newest_index_state(None, old), old)
+
+    def test_other_cluster_replaces_state(self):
+        other = index_state("c2", 1, 1)
+        self.assertEqual(newest_index_state(index_state("c1", 9, 9), other), other)
+
+
+class TestConsistencySession(TestCase):
+    def test_session_headers(self):
+        session = ConsistencySession(SESSION)
+        headers = {}
+        session.apply(headers)
+        self.assertEqual(headers, {})
+
+        session.record({"X-Vault-Index": index_state("c1", 3, 1)})
+        session.apply(headers)
+
+        self.assertEqual(headers, {"X-Vault-Index": index_state("c1", 3, 1)})
+
+    def test_strong_and_eventual_headers(self):
+        strong, eventual = ConsistencySession(STRONG), ConsistencySession(EVENTUAL)
+        for session in (strong, eventual):
+            session.record({"X-Vault-Index": index_state("c1", 3, 1)})
+            self.assertIsNone(session.index)
+
+        headers = {}
+        eventual.apply(headers)
+        self.assertEqual(headers, {})
+        strong.apply(headers)
+        self.assertEqual(headers, {"X-Vault-Inconsistent": "forward-active-node"})
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            ConsistencySession("linearizable")
+
+    def test_context_manager(self):
+        self.assertIsNone(current_session())
+        with consistency(STRONG) as session:
+            self.assertIs(current_session(), session)
+        self.assertIsNone(current_session())
+
+
+class TestAdapterConsistency(TestCase):
+    @respx.mock
+    def test_client_session_mode(self):
+        state = index_state("c1", 4, 2)
+        response = httpx.Response(200, json={}, headers={"X-Vault-Index": state})
+        route = respx.route(url=DATA_URL).mock(return_value=response)
+        client = Client(consistency=SESSION)
+
+        client.secrets.kv.v2.create_or_update_secret(path="foo", secret={"a": 1})
+        client.secrets.kv.v2.read_secret_version(path="foo")
+
+        self.assertNotIn("X-Vault-Index", route.calls[0].request.headers)
+        self.assertEqual(route.calls[1].request.headers["X-Vault-Index"], state)
+        self.assertEqual(client.adapter.consistency.index, state)
+
+    @respx.mock
+    def test_context_overrides_client_mode(self):
+        route = respx.get(DATA_URL).mock(return_value=httpx.Response(200, json={}))
+        adapter = adapters.VaultxAdapter()
+
+        adapter.get("/v1/secret/data/foo")
+        with consistency(STRONG):
+            adapter.get("/v1/secret/data/foo")
+
+        self.assertNotIn("X-Vault-Inconsistent", route.calls[0].request.headers)
+        self.assertEqual(route.calls[1].request.headers["X-Vault-Inconsistent"], "forward-active-node")
+
+    @respx.mock
+    def test_session_propagates_to_read_many_threads(self):
+        state = index_state("c1", 8, 8)
+        route = respx.get(url__startswith=f"{DEFAULT_URL}/v1/secret/data/").mock(
+            return_value=httpx.Response(200, json={"data": {}})
+        )
+        client = Client()
+
+        with consistency(SESSION) as session:
+            session.record({"X-Vault-Index": state})
+            client.secrets.kv.v2.read_many(["a", "b", "c"], concurrency=3)
+
+        self.assertEqual([call.request.headers.get("X-Vault-Index") for call in route.calls], [state] * 3)
+
+    @respx.mock
+    def test_strong_reads_go_to_active_node(self):
+        routes = mock_cluster([ACTIVE, PERFORMANCE_STANDBY, PERFORMANCE_STANDBY])
+        adapter = ClusterVaultxAdapter(nodes=NODES, refresh_interval=None, consistency=STRONG)
+        self.addCleanup(adapter.close)
+
+        adapter.get("/v1/secret/data/foo")
+
+        self.assertEqual([routes[node].call_count for node in NODES], [1, 0, 0])
+
+    @respx.mock
+    def test_lagging_standby_is_skipped(self):
+        routes = mock_cluster([ACTIVE, PERFORMANCE_STANDBY, PERFORMANCE_STANDBY])
+        routes[NODES[1]].mock(return_value=httpx.Response(412))
+        adapter = ClusterVaultxAdapter(nodes=NODES, refresh_interval=None, consistency=SESSION)
+        self.addCleanup(adapter.close)
+
+        response = adapter.get("/v1/secret/data/foo")
+
+        self.assertEqual(response["data"]["node"], NODES[2])
+        self.assertEqual(adapter.topology.failovers, 0)
+
+
+class TestAsyncAdapterConsistency(IsolatedAsyncioTestCase):
+    @respx.mock
+    async def test_session_follows_tasks(self):
+        state = index_state("c1", 2, 2)
+        route = respx.get(DATA_URL).mock(return_value=httpx.Response(200, json={}, headers={"X-Vault-Index": state}))
+        adapter = adapters.AsyncVaultxAdapter(client=httpx.AsyncClient())
+
+        with consistency(SESSION) as session:
+            await adapter.get("/v1/secret/data/foo")
+            await asyncio.gather(adapter.get("/v1/secret/data/foo"), adapter.get("/v1/secret/data/foo"))
+
+        self.assertEqual(session.index, state)
+        self.assertEqual([call.request.headers.get("X-Vault-Index") for call in route.calls], [None, state, state])
+        self.assertIsNone(adapter.consistency.index)
+
+    async def test_aiohttp_adapter(self):
+        state = index_state("c1", 6, 6)
+        received = []
+
+        async def handler(request):
+            received.append(request.headers.get("X-Vault-Index"))
+            return web.json_response({}, headers={"X-Vault-Index": state})
+
+        app = web.Application()
+        app.router.add_get("/v1/secret/data/foo", handler)
+        async with TestServer(app) as server:
+            adapter = adapters.AiohttpVaultxAdapter(base_uri=str(server.make_url("")), consistency=SESSION)
+            async with adapter:
+                await adapter.get("/v1/secret/data/foo")
+                await adapter.get("/v1/secret/data/foo")
+
+        self.assertEqual(received, [None, state])
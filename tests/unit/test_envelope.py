@@ -0,0 +1,241 @@
+import base64
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from httpx import Response
+
+from vaultx import exceptions
+from vaultx.adapters import VaultxResponse
+from vaultx.api.async_secrets_engines.transit import Transit as AsyncTransit
+from vaultx.api.secrets_engines.transit import Transit
+from vaultx.envelope import EnvelopeEncryptor, wrapped_key
+
+
+class FakeTransitAdapter:
+    """Adapter answering Transit datakey and decrypt requests, wrapping data keys with a local key."""
+
+    def __init__(self):
+        self.key = AESGCM(os.urandom(32))
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def post(self, url, json):
+        with self._lock:
+            self.urls.append(url)
+        if "/datakey/plaintext/" in url:
+            data_key = os.urandom(json["bits"] // 8)
+            return self._response({"plaintext": base64.b64encode(data_key).decode(), "ciphertext": self.wrap(data_key)})
+        if "/decrypt/" in url:
+            wrapped = base64.b64decode(json["ciphertext"][len("vault:v1:") :])
+            data_key = self.key.decrypt(wrapped[:12], wrapped[12:], None)
+            return self._response({"plaintext": base64.b64encode(data_key).decode()})
+        raise AssertionError(f"Unexpected request to {url}")
+
+    def wrap(self, data_key):
+        nonce = os.urandom(12)
+        return "vault:v1:" + base64.b64encode(nonce + self.key.encrypt(nonce, data_key, None)).decode()
+
+    def _response(self, data):
+        return VaultxResponse(Response(200, json={"data": data}))
+
+    def count(self, operation):
+        return sum(f"/{operation}/" in url for url in self.urls)
+
+
+class AsyncFakeTransitAdapter(FakeTransitAdapter):
+    async def post(self, url, json):
+        return super().post(url, json)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEnvelopeEncryptor(TestCase):
+    def setUp(self):
+        self.adapter = FakeTransitAdapter()
+        self.timer = FakeTimer()
+        self.encryptor = EnvelopeEncryptor(Transit(self.adapter), "app", max_age=60, max_uses=3, timer=self.timer)
+
+    def test_round_trip_uses_cached_data_key(self):
+        envelopes = [self.encryptor.encrypt(b"payload %d" % i, associated_data=b"row-1") for i in range(3)]
+
+        self.assertEqual([self.encryptor.decrypt(e, associated_data=b"row-1") for e in envelopes][2], b"payload 2")
+        self.assertEqual(self.adapter.urls, ["/v1/transit/datakey/plaintext/app"])
+        self.assertEqual(len({wrapped_key(e) for e in envelopes}), 1)
+        self.assertTrue(wrapped_key(envelopes[0]).startswith("vault:v1:"))
+        stats = {"data_keys": 1, "unwraps": 0, "encryptions": 3, "decryptions": 3}
+        self.assertEqual(self.encryptor.stats.as_dict(), stats)
+
+    def test_data_key_is_replaced_after_max_uses_and_max_age(self):
+        for _ in range(4):
+            self.encryptor.encrypt(b"payload")
+        self.assertEqual(self.adapter.count("datakey"), 2)
+
+        self.timer.now = 61
+        self.encryptor.encrypt(b"payload")
+        self.encryptor.rotate()
+        self.encryptor.encrypt(b"payload")
+        self.assertEqual(self.encryptor.stats.data_keys, 4)
+
+    def test_decrypt_unwraps_foreign_data_keys_once(self):
+        envelope = EnvelopeEncryptor(Transit(self.adapter), "app").encrypt(b"secret")
+
+        self.assertEqual(self.encryptor.decrypt(envelope), b"secret")
+        self.assertEqual(self.encryptor.decrypt(envelope), b"secret")
+        self.assertEqual(self.adapter.count("decrypt"), 1)
+        self.assertEqual(self.encryptor.stats.unwraps, 1)
+
+        self.timer.now = 301
+        self.encryptor.decrypt(envelope)
+        self.assertEqual(self.adapter.count("decrypt"), 2)
+
+    def test_concurrent_encryptions_generate_one_data_key(self):
+        encryptor = EnvelopeEncryptor(Transit(self.adapter), "app")
+        threads = [threading.Thread(target=encryptor.encrypt, args=(b"payload",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.adapter.count("datakey"), 1)
+
+    def test_tampered_envelopes_are_rejected(self):
+        envelope = self.encryptor.encrypt(b"payload", associated_data=b"row-1")
+
+        with self.assertRaises(exceptions.VaultxError):
+            self.encryptor.decrypt(envelope, associated_data=b"row-2")
+        with self.assertRaises(exceptions.VaultxError):
+            self.encryptor.decrypt(envelope[:-1] + bytes([envelope[-1] ^ 1]), associated_data=b"row-1")
+        with self.assertRaises(exceptions.VaultxError):
+            self.encryptor.decrypt(b"VXE0" + envelope[4:])
+
+    def test_invalid_parameters(self):
+        for kwargs in ({"bits": 512}, {"max_age": 0}, {"max_uses": 0}, {"max_uses": 2**33}):
+            with self.assertRaises(ValueError):
+                EnvelopeEncryptor(Transit(self.adapter), "app", **kwargs)
+
+
+def encrypt_stream(encryptor, plaintext, **kwargs):
+    encrypted = io.BytesIO()
+    encryptor.encrypt_stream(io.BytesIO(plaintext), encrypted, **kwargs)
+    return encrypted.getvalue()
+
+
+def wrapped_key_of(header):
+    return header[10 : 10 + int.from_bytes(header[8:10], "big")]
+
+
+def frames(encrypted, chunk_size):
+    """Split an encrypted stream of full chunks into its header and frames."""
+    start = 10 + int.from_bytes(encrypted[8:10], "big") + 32
+    header, body = encrypted[:start], encrypted[start:]
+    size = 5 + chunk_size + 16
+    return header, [body[i : i + size] for i in range(0, len(body), size)]
+
+
+class TestEncryptStream(TestCase):
+    def setUp(self):
+        self.adapter = FakeTransitAdapter()
+        self.encryptor = EnvelopeEncryptor(Transit(self.adapter), "app")
+
+    def decrypt_stream(self, encrypted, **kwargs):
+        decrypted = io.BytesIO()
+        self.encryptor.decrypt_stream(io.BytesIO(encrypted), decrypted, **kwargs)
+        return decrypted.getvalue()
+
+    def test_round_trip(self):
+        for size in (0, 1, 7, 8, 9, 100):
+            plaintext = os.urandom(size)
+            for workers in (1, 3):
+                encrypted = encrypt_stream(self.encryptor, plaintext, chunk_size=8, workers=workers)
+                self.assertEqual(self.decrypt_stream(encrypted, workers=workers), plaintext)
+
+    def test_returns_plaintext_digest(self):
+        plaintext = os.urandom(100)
+        encrypted = io.BytesIO()
+        digest = self.encryptor.encrypt_stream(io.BytesIO(plaintext), encrypted, chunk_size=16, workers=2)
+        decrypted = self.encryptor.decrypt_stream(io.BytesIO(encrypted.getvalue()), io.BytesIO())
+
+        checksum = hashlib.sha256(plaintext).hexdigest()
+        self.assertEqual(digest, {"size": 100, "algorithm": "sha256", "checksum": checksum})
+        self.assertEqual(decrypted, digest)
+
+    def test_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, encrypted, decrypted = (os.path.join(directory, name) for name in ("source", "encrypted", "out"))
+            with open(source, "wb") as f:
+                f.write(b"backup" * 1000)
+            Transit(self.adapter).encrypt_stream("app", source, encrypted, associated_data=b"backup-1", chunk_size=1000)
+            Transit(self.adapter).decrypt_stream("app", encrypted, decrypted, associated_data=b"backup-1", workers=2)
+            with open(decrypted, "rb") as f:
+                self.assertEqual(f.read(), b"backup" * 1000)
+        self.assertEqual([self.adapter.count("datakey"), self.adapter.count("decrypt")], [1, 1])
+
+    def test_modified_streams_are_rejected(self):
+        encrypted = encrypt_stream(self.encryptor, os.urandom(24), chunk_size=8, associated_data=b"a")
+        header, (first, second, last) = frames(encrypted, 8)
+        for modified in (
+            header + second + first + last,
+            header + first + second,
+            header + first + second + last + b"x",
+            encrypted[:-1],
+            b"VXF0" + encrypted[4:],
+        ):
+            with self.assertRaises(exceptions.VaultxError):
+                self.decrypt_stream(modified, associated_data=b"a")
+        with self.assertRaises(exceptions.VaultxError):
+            self.decrypt_stream(encrypted, associated_data=b"b")
+        self.assertEqual(len(self.decrypt_stream(encrypted, associated_data=b"a")), 24)
+
+    def test_streams_sharing_a_data_key_use_distinct_keys(self):
+        plaintext = os.urandom(16)
+        first_header, first_frames = frames(encrypt_stream(self.encryptor, plaintext, chunk_size=8), 8)
+        second_header, second_frames = frames(encrypt_stream(self.encryptor, plaintext, chunk_size=8), 8)
+
+        self.assertEqual(self.adapter.count("datakey"), 1)
+        self.assertEqual(wrapped_key_of(first_header), wrapped_key_of(second_header))
+        self.assertNotEqual(first_header[-32:], second_header[-32:])
+        # Frame nonces only depend on the frame index, so equal plaintexts give distinct frames under distinct keys
+        self.assertNotEqual(first_frames[0], second_frames[0])
+        with self.assertRaises(exceptions.VaultxError):
+            self.decrypt_stream(first_header + second_frames[0] + first_frames[1])
+
+    def test_invalid_parameters(self):
+        for kwargs in ({"chunk_size": 0}, {"workers": 0}):
+            with self.assertRaises(ValueError):
+                encrypt_stream(self.encryptor, b"", **kwargs)
+
+
+class TestAsyncEnvelopeEncryptor(IsolatedAsyncioTestCase):
+    async def test_round_trip(self):
+        adapter = AsyncFakeTransitAdapter()
+        encryptor = AsyncTransit(adapter).envelope("app", mount_point="keys", bits=128)
+
+        envelopes = [await encryptor.encrypt(b"payload %d" % i) for i in range(2)]
+        encryptor.clear()
+
+        self.assertEqual(await encryptor.decrypt(envelopes[1]), b"payload 1")
+        self.assertEqual(adapter.urls, ["/v1/keys/datakey/plaintext/app", "/v1/keys/decrypt/app"])
+        self.assertEqual(len(wrapped_key(envelopes[0])), len(adapter.wrap(os.urandom(16))))
+
+    async def test_stream_round_trip(self):
+        adapter = AsyncFakeTransitAdapter()
+        plaintext = os.urandom(1000)
+        encrypted, decrypted = io.BytesIO(), io.BytesIO()
+
+        digest = await AsyncTransit(adapter).encrypt_stream("app", io.BytesIO(plaintext), encrypted, chunk_size=64)
+        encrypted.seek(0)
+        await AsyncTransit(adapter).decrypt_stream("app", encrypted, decrypted, workers=4)
+
+        self.assertEqual(decrypted.getvalue(), plaintext)
+        self.assertEqual((digest["size"], digest["checksum"]), (1000, hashlib.sha256(plaintext).hexdigest()))
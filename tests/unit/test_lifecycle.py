@@ -0,0 +1,417 @@
+import asyncio
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+import respx
+
+from vaultx import adapters
+from vaultx.adapters import VaultxResponse
+from vaultx.constants.client import DEFAULT_URL
+from vaultx.exceptions import HTTPError, VaultxError
+from vaultx.lifecycle import AsyncLeaseManager, AsyncTokenManager, LeaseManager, TokenManager
+
+
+def auth_response(ttl, renewable=True, token="s.new"):
+    return VaultxResponse(
+        httpx.Response(200, json={"auth": {"client_token": token, "lease_duration": ttl, "renewable": renewable}})
+    )
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenManager(TestCase):
+    def setUp(self):
+        self.adapter = mock.Mock()
+        self.adapter.token = "s.token"
+        self.timer = FakeTimer()
+        self.relogin = mock.Mock(return_value=auth_response(3600))
+        self.manager = TokenManager(self.adapter, relogin=self.relogin, jitter=0, timer=self.timer)
+
+    def test_track_login_response(self):
+        self.manager.track(auth_response(3000))
+        self.assertEqual(self.manager.ttl, 3000)
+        self.assertTrue(self.manager.renewable)
+        self.assertEqual(self.manager.next_delay(), 2000)
+
+    def test_track_lookup_self_response(self):
+        self.manager.track({"data": {"ttl": 90, "renewable": False}})
+        self.assertEqual(self.manager.ttl, 90)
+        self.assertTrue(self.manager.should_relogin)
+
+    def test_jitter_shortens_delay(self):
+        manager = TokenManager(self.adapter, jitter=0.5, timer=self.timer)
+        manager.track(auth_response(300))
+        for _ in range(20):
+            self.assertTrue(100 <= manager.next_delay() <= 200)
+
+    def test_non_expiring_token_is_not_scheduled(self):
+        self.manager.track(auth_response(0, renewable=False))
+        self.assertIsNone(self.manager.next_delay())
+
+    def test_refresh_renews_token(self):
+        self.manager.track(auth_response(3600))
+        self.adapter.post.return_value = auth_response(3600)
+        self.timer.now = 2400
+
+        self.assertTrue(self.manager.refresh())
+        self.adapter.post.assert_called_once_with(url="/v1/auth/token/renew-self", json={}, wrap_ttl=None)
+        self.assertEqual(self.manager.renewals, 1)
+        self.assertEqual(self.manager.expires_at, 6000)
+        self.relogin.assert_not_called()
+
+    def test_capped_renewal_triggers_relogin_on_next_cycle(self):
+        self.manager.track(auth_response(3600))
+        self.adapter.post.return_value = auth_response(600)
+
+        self.manager.refresh()
+        self.assertTrue(self.manager.should_relogin)
+        self.manager.refresh()
+        self.relogin.assert_called_once_with()
+        self.assertEqual(self.manager.relogins, 1)
+        self.assertFalse(self.manager.should_relogin)
+
+    def test_rejected_token_falls_back_to_relogin(self):
+        self.manager.track(auth_response(3600))
+        self.adapter.post.side_effect = HTTPError(status_code=403)
+
+        self.assertTrue(self.manager.refresh())
+        self.relogin.assert_called_once_with()
+        self.assertEqual(self.manager.failures, 1)
+
+    def test_transient_failure_keeps_renewing(self):
+        self.manager.track(auth_response(3600))
+        self.adapter.post.side_effect = HTTPError(status_code=503)
+
+        self.assertFalse(self.manager.refresh())
+        self.relogin.assert_not_called()
+        self.assertFalse(self.manager.should_relogin)
+
+    def test_failed_relogin_is_recorded(self):
+        self.manager.track(auth_response(3600, renewable=False))
+        self.relogin.side_effect = RuntimeError("boom")
+
+        self.assertFalse(self.manager.refresh())
+        self.assertIsInstance(self.manager.last_error, RuntimeError)
+
+    def test_start_looks_up_token_and_stop_detaches(self):
+        self.adapter.get.return_value = VaultxResponse(
+            httpx.Response(200, json={"data": {"ttl": 3600, "renewable": True}})
+        )
+        with self.manager:
+            self.assertTrue(self.manager.running)
+            self.assertIs(self.adapter.token_manager, self.manager)
+            self.adapter.get.assert_called_once_with(url="/v1/auth/token/lookup-self")
+        self.assertFalse(self.manager.running)
+        self.assertIsNone(self.adapter.token_manager)
+
+    def test_background_thread_renews_token(self):
+        renewed = threading.Event()
+
+        def renew_self(**kwargs):
+            renewed.set()
+            return auth_response(3600)
+
+        self.adapter.post.side_effect = renew_self
+        manager = TokenManager(self.adapter, jitter=0)
+        manager.track(auth_response(0.01))
+        manager.start()
+        try:
+            self.assertTrue(renewed.wait(5))
+        finally:
+            manager.stop()
+
+    def test_adapter_login_is_tracked(self):
+        adapter = adapters.VaultxAdapter()
+        manager = TokenManager(adapter)
+        adapter.token_manager = manager
+        with respx.mock:
+            respx.post(f"{DEFAULT_URL}/v1/auth/approle/login").mock(
+                return_value=httpx.Response(
+                    200, json={"auth": {"client_token": "s.abc", "lease_duration": 120, "renewable": True}}
+                )
+            )
+            adapter.login("/v1/auth/approle/login")
+        self.assertEqual(adapter.token, "s.abc")
+        self.assertEqual(manager.ttl, 120)
+
+    def test_login_after_start_schedules_renewal(self):
+        adapter = adapters.VaultxAdapter()
+        renewed = threading.Event()
+
+        def renew_self(request):
+            renewed.set()
+            return httpx.Response(200, json={"auth": {"lease_duration": 3600, "renewable": True}})
+
+        with respx.mock, TokenManager(adapter, jitter=0) as manager:
+            respx.post(f"{DEFAULT_URL}/v1/auth/approle/login").mock(
+                return_value=httpx.Response(
+                    200, json={"auth": {"client_token": "s.abc", "lease_duration": 0.03, "renewable": True}}
+                )
+            )
+            respx.post(f"{DEFAULT_URL}/v1/auth/token/renew-self").mock(side_effect=renew_self)
+            self.assertTrue(manager.running)
+            adapter.login("/v1/auth/approle/login")
+            self.assertTrue(renewed.wait(5))
+            self.assertTrue(manager.running)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenManager(self.adapter, renew_fraction=1)
+        with self.assertRaises(ValueError):
+            TokenManager(self.adapter, jitter=1)
+
+
+class TestAsyncTokenManager(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.adapter = mock.AsyncMock()
+        self.adapter.token = "s.token"
+        self.relogin = mock.AsyncMock(return_value=auth_response(3600))
+        self.manager = AsyncTokenManager(self.adapter, relogin=self.relogin, jitter=0)
+
+    async def test_refresh_renews_token(self):
+        self.manager.track(auth_response(3600))
+        self.adapter.post.return_value = auth_response(3600)
+
+        self.assertTrue(await self.manager.refresh())
+        self.adapter.post.assert_awaited_once_with(url="/v1/auth/token/renew-self", json={}, wrap_ttl=None)
+        self.assertEqual(self.manager.renewals, 1)
+
+    async def test_not_renewable_token_relogs_in(self):
+        self.manager.track(auth_response(3600, renewable=False))
+
+        self.assertTrue(await self.manager.refresh())
+        self.relogin.assert_awaited_once_with()
+        self.adapter.post.assert_not_called()
+
+    async def test_background_task_renews_token(self):
+        renewed = asyncio.Event()
+
+        async def renew_self(**kwargs):
+            renewed.set()
+            return auth_response(3600)
+
+        self.adapter.post.side_effect = renew_self
+        self.manager.track(auth_response(0.01))
+        async with self.manager:
+            self.assertIs(self.adapter.token_manager, self.manager)
+            await asyncio.wait_for(renewed.wait(), 5)
+        self.assertFalse(self.manager.running)
+        self.assertIsNone(self.adapter.token_manager)
+
+    async def test_login_after_start_schedules_renewal(self):
+        adapter = adapters.AsyncVaultxAdapter(client=httpx.AsyncClient())
+        renewed = asyncio.Event()
+
+        def renew_self(request):
+            renewed.set()
+            return httpx.Response(200, json={"auth": {"lease_duration": 3600, "renewable": True}})
+
+        with respx.mock:
+            respx.post(f"{DEFAULT_URL}/v1/auth/approle/login").mock(
+                return_value=httpx.Response(
+                    200, json={"auth": {"client_token": "s.abc", "lease_duration": 0.03, "renewable": True}}
+                )
+            )
+            respx.post(f"{DEFAULT_URL}/v1/auth/token/renew-self").mock(side_effect=renew_self)
+            async with AsyncTokenManager(adapter, jitter=0) as manager:
+                await asyncio.sleep(0.01)
+                await adapter.login("/v1/auth/approle/login")
+                await asyncio.wait_for(renewed.wait(), 5)
+                self.assertTrue(manager.running)
+        await adapter.close()
+
+    async def test_adapter_close_stops_manager(self):
+        adapter = adapters.AsyncVaultxAdapter(client=httpx.AsyncClient())
+        manager = AsyncTokenManager(adapter)
+        manager.track(auth_response(3600))
+        await manager.start()
+        await adapter.close()
+        self.assertFalse(manager.running)
+
+
+def lease_response(lease_id="database/creds/app/abc", duration=300, renewable=True):
+    return VaultxResponse(
+        httpx.Response(
+            200,
+            json={
+                "lease_id": lease_id,
+                "lease_duration": duration,
+                "renewable": renewable,
+                "data": {"username": "u", "password": "p"},
+            },
+        )
+    )
+
+
+class TestLeaseManager(TestCase):
+    def setUp(self):
+        self.adapter = mock.Mock()
+        self.timer = FakeTimer()
+        self.manager = LeaseManager(self.adapter, jitter=0, batch_window=1, timer=self.timer)
+        self.events = []
+        self.manager.add_listener(lambda event, lease, error: self.events.append((event, lease.lease_id)))
+
+    def test_register_response(self):
+        lease = self.manager.register(lease_response())
+        self.assertEqual(lease.lease_id, "database/creds/app/abc")
+        self.assertEqual(lease.data, {"username": "u", "password": "p"})
+        self.assertEqual(self.manager.next_deadline(), 200)
+        self.assertIn("database/creds/app/abc", self.manager)
+
+    def test_register_lease_id(self):
+        self.manager.register("aws/creds/app/abc", lease_duration=60, renewable=True)
+        self.assertEqual(self.manager.next_deadline(), 40)
+
+    def test_non_renewable_lease_is_not_managed(self):
+        self.assertIsNone(self.manager.register(lease_response(renewable=False)))
+        self.assertEqual(len(self.manager), 0)
+
+    def test_response_without_lease_is_rejected(self):
+        with self.assertRaises(VaultxError):
+            self.manager.register({"data": {}})
+
+    def test_heap_orders_leases_by_deadline(self):
+        self.manager.register(lease_response("a", duration=300))
+        self.manager.register(lease_response("b", duration=30))
+        self.manager.register(lease_response("c", duration=31))
+        self.assertEqual(self.manager.next_deadline(), 20)
+
+        self.adapter.put.side_effect = lambda url, json: lease_response(json["lease_id"], json["increment"])
+        self.timer.now = 20
+        self.assertEqual(self.manager.renew_due(), 2)
+        self.assertEqual(self.events, [("renewed", "b"), ("renewed", "c")])
+        self.assertEqual(self.manager.next_deadline(), 40)
+
+    def test_renew_due_requests_original_duration(self):
+        self.manager.register(lease_response(duration=300))
+        self.adapter.put.return_value = lease_response(duration=300)
+        self.timer.now = 200
+
+        self.manager.renew_due()
+        self.adapter.put.assert_called_once_with(
+            url="/v1/sys/leases/renew", json={"lease_id": "database/creds/app/abc", "increment": 300}
+        )
+        self.assertEqual(self.manager.get("database/creds/app/abc").expires_at, 500)
+
+    def test_max_ttl_reached(self):
+        self.manager.register(lease_response(duration=300))
+        self.adapter.put.return_value = lease_response(duration=120)
+        self.timer.now = 200
+
+        self.manager.renew_due()
+        self.assertEqual(self.events, [("max_ttl_reached", "database/creds/app/abc")])
+        self.assertEqual(len(self.manager), 0)
+
+    def test_renewal_failure(self):
+        self.manager.register(lease_response())
+        self.adapter.put.side_effect = HTTPError(status_code=400)
+        self.timer.now = 200
+
+        self.manager.renew_due()
+        self.assertEqual(self.events, [("renewal_failed", "database/creds/app/abc")])
+        self.assertEqual(self.manager.failures, 1)
+        self.assertIsNone(self.manager.next_deadline())
+
+    def test_transient_renewal_failure_is_retried(self):
+        connection_error = VaultxError("An error occurred in renew_lease")
+        connection_error.__cause__ = httpx.ConnectError("Connection refused")
+        self.manager.register(lease_response(duration=300))
+        self.adapter.put.side_effect = [HTTPError(status_code=503), connection_error, lease_response(duration=300)]
+        self.timer.now = 200
+
+        self.manager.renew_due()
+        self.assertEqual(self.manager.next_deadline(), 201)
+        self.timer.now = 201
+        self.manager.renew_due()
+        self.assertEqual(self.manager.next_deadline(), 203)
+        self.timer.now = 203
+        self.manager.renew_due()
+
+        self.assertEqual(self.events, [("renewed", "database/creds/app/abc")])
+        self.assertEqual(self.manager.get("database/creds/app/abc").expires_at, 503)
+        self.assertEqual(self.manager.failures, 2)
+
+    def test_transient_renewal_failure_drops_expired_lease(self):
+        self.manager.register(lease_response(duration=300))
+        self.adapter.put.side_effect = HTTPError(status_code=503)
+        self.timer.now = 300
+
+        self.manager.renew_due()
+        self.assertEqual(self.events, [("renewal_failed", "database/creds/app/abc")])
+
+    def test_unregister(self):
+        self.manager.register(lease_response())
+        self.manager.unregister("database/creds/app/abc")
+        self.timer.now = 1000
+        self.assertEqual(self.manager.renew_due(), 0)
+
+    def test_lease_unregistered_during_renewal(self):
+        self.manager.register(lease_response())
+
+        def renewal_failing_after_unregister(url, json):
+            self.manager.unregister(json["lease_id"])
+            raise HTTPError(status_code=400)
+
+        self.adapter.put.side_effect = renewal_failing_after_unregister
+        self.timer.now = 200
+
+        self.assertEqual(self.manager.renew_due(), 1)
+        self.assertEqual(self.events, [])
+        self.assertEqual(self.manager.failures, 0)
+
+    def test_background_thread_renews_leases(self):
+        renewed = threading.Event()
+        manager = LeaseManager(self.adapter, jitter=0, batch_window=0)
+        manager.add_listener(lambda event, lease, error: renewed.set())
+        self.adapter.put.return_value = lease_response(duration=3600)
+        with manager:
+            manager.register(lease_response(duration=0.01))
+            self.assertTrue(renewed.wait(5))
+        self.assertFalse(manager.running)
+
+
+class TestAsyncLeaseManager(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.adapter = mock.AsyncMock()
+        self.manager = AsyncLeaseManager(self.adapter, jitter=0, batch_window=0)
+
+    async def test_renew_due_renews_concurrently(self):
+        self.manager.register(lease_response("a", duration=0.01))
+        self.manager.register(lease_response("b", duration=0.01))
+        self.adapter.put.side_effect = lambda url, json: lease_response(json["lease_id"], 3600)
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(await self.manager.renew_due(), 2)
+        self.assertEqual(self.adapter.put.await_count, 2)
+        self.assertEqual(self.manager.renewals, 2)
+
+    async def test_lease_unregistered_during_renewal(self):
+        events = []
+        self.manager.add_listener(lambda event, lease, error: events.append(event))
+        self.manager.register(lease_response(duration=0.01))
+
+        async def renewal_failing_after_unregister(url, json):
+            self.manager.unregister(json["lease_id"])
+            raise HTTPError(status_code=400)
+
+        self.adapter.put.side_effect = renewal_failing_after_unregister
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(await self.manager.renew_due(), 1)
+        self.assertEqual(events, [])
+
+    async def test_background_task_renews_leases(self):
+        renewed = asyncio.Event()
+        self.manager.add_listener(lambda event, lease, error: renewed.set())
+        self.adapter.put.return_value = lease_response(duration=3600)
+        async with self.manager:
+            self.manager.register(lease_response(duration=0.01))
+            await asyncio.wait_for(renewed.wait(), 5)
+        self.assertFalse(self.manager.running)
@@ -0,0 +1,183 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+import respx
+
+from vaultx import Client, adapters
+from vaultx.constants.client import DEFAULT_URL
+from vaultx.exceptions import HTTPError
+from vaultx.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.bucket = TokenBucket(rate=10, burst=2, timer=self.timer)
+
+    def test_burst_then_queue(self):
+        self.assertEqual([self.bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.1, 0.2])
+
+    def test_refills_over_time(self):
+        self.bucket.reserve()
+        self.bucket.reserve()
+        self.timer.now = 0.1
+        self.assertEqual(self.bucket.reserve(), 0.0)
+        self.timer.now = 10
+        self.assertEqual([self.bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.1])
+
+    def test_refund(self):
+        self.bucket.reserve()
+        self.bucket.reserve()
+        self.assertEqual(self.bucket.reserve(), 0.1)
+        self.bucket.refund()
+        self.assertEqual(self.bucket.reserve(), 0.1)
+
+    def test_aimd(self):
+        self.bucket.on_throttled()
+        self.bucket.on_throttled()
+        self.assertEqual(self.bucket.rate, 2.5)
+
+        for _ in range(100):
+            self.bucket.on_success()
+        self.assertEqual(self.bucket.rate, 10)
+
+        for _ in range(10):
+            self.bucket.on_throttled()
+        self.assertEqual(self.bucket.rate, 0.5)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, burst=0.5)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, decrease_factor=1)
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        self.kv, self.ns, self.default = TokenBucket(10), TokenBucket(20), TokenBucket(100)
+        self.limiter = RateLimiter({"secret": self.kv, "ns1/secret/": self.ns, "": self.default})
+
+    def test_longest_prefix_wins(self):
+        self.assertIs(self.limiter.bucket_for("/v1/secret/data/foo"), self.kv)
+        self.assertIs(self.limiter.bucket_for("/v1/secret/data/foo", namespace="ns1"), self.ns)
+        self.assertIs(self.limiter.bucket_for("/v1/secret"), self.kv)
+        self.assertIs(self.limiter.bucket_for("/v1/secrets/data/foo"), self.default)
+        self.assertIsNone(RateLimiter({"secret/": self.kv}).bucket_for("/v1/auth/token/lookup-self"))
+
+    def test_acquire_sleeps_for_reserved_delay(self):
+        self.kv.reserve = mock.Mock(return_value=0.25)
+        with mock.patch("vaultx.ratelimit.time.sleep") as sleep:
+            self.assertEqual(self.limiter.acquire("/v1/secret/data/foo"), 0.25)
+        sleep.assert_called_once_with(0.25)
+        stats = {"acquired": 1, "delayed": 1, "wait_time": 0.25, "throttled": 0}
+        self.assertEqual(self.limiter.stats.as_dict(), stats)
+
+    def test_record_throttling(self):
+        self.limiter.record("/v1/secret/data/foo", None, 429)
+        self.assertEqual(self.kv.rate, 5)
+        self.assertEqual(self.limiter.stats.throttled, 1)
+
+    def test_from_quota_configs(self):
+        limiter = RateLimiter.from_quota_configs(
+            [
+                {"name": "global", "path": "", "rate": 500, "interval": 1, "type": "rate-limit"},
+                {"name": "kv", "path": "secret/", "rate": 60, "interval": "1m", "type": "rate-limit"},
+                {"name": "leases", "path": "", "max_leases": 100, "type": "lease-count"},
+            ]
+        )
+
+        self.assertEqual(list(limiter.buckets), ["secret/", ""])
+        self.assertEqual(limiter.buckets["secret/"].rate, 1)
+        self.assertEqual(limiter.buckets["secret/"].burst, 60)
+        self.assertEqual(limiter.buckets[""].rate, 500)
+
+    @respx.mock
+    def test_from_quotas(self):
+        respx.route(method="LIST", url=f"{DEFAULT_URL}/v1/sys/quotas/rate-limit").mock(
+            return_value=httpx.Response(200, json={"data": {"keys": ["kv"]}})
+        )
+        respx.get(f"{DEFAULT_URL}/v1/sys/quotas/rate-limit/kv").mock(
+            return_value=httpx.Response(200, json={"data": {"path": "secret/", "rate": 5, "interval": 1}})
+        )
+
+        limiter = RateLimiter.from_quotas(Client())
+
+        self.assertEqual(limiter.buckets["secret/"].rate, 5)
+
+    @respx.mock
+    def test_from_quotas_without_quotas(self):
+        respx.route(method="LIST", url=f"{DEFAULT_URL}/v1/sys/quotas/rate-limit").mock(return_value=httpx.Response(404))
+
+        self.assertEqual(RateLimiter.from_quotas(Client()).buckets, {})
+
+
+class TestAdapterRateLimiting(TestCase):
+    @respx.mock
+    def test_requests_are_limited_and_backed_off(self):
+        route = respx.get(f"{DEFAULT_URL}/v1/secret/data/foo").mock(
+            side_effect=[httpx.Response(200, json={}), httpx.Response(429)]
+        )
+        bucket = TokenBucket(rate=4, burst=1)
+        adapter = adapters.VaultxAdapter(rate_limiter=RateLimiter({"secret/": bucket}))
+
+        with mock.patch("vaultx.ratelimit.time.sleep") as sleep:
+            adapter.get("/v1/secret/data/foo")
+            with self.assertRaises(HTTPError):
+                adapter.get("/v1/secret/data/foo")
+
+        self.assertEqual(route.call_count, 2)
+        self.assertAlmostEqual(sleep.call_args.args[0], 0.25, places=2)
+        self.assertEqual(bucket.rate, 2)
+
+
+class TestAsyncRateLimiting(IsolatedAsyncioTestCase):
+    async def test_waiters_are_served_in_order_without_polling(self):
+        limiter = RateLimiter({"": TokenBucket(rate=100, burst=1)})
+        served = []
+
+        async def request(number):
+            await limiter.acquire_async("/v1/secret/data/foo")
+            served.append(number)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(request(number) for number in range(5)))
+
+        self.assertEqual(served, list(range(5)))
+        self.assertGreaterEqual(loop.time() - started, 0.035)
+        self.assertEqual(limiter.stats.delayed, 4)
+
+    async def test_cancelled_waiter_refunds_its_token(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        limiter = RateLimiter({"": bucket})
+        await limiter.acquire_async("/v1/sys/health")
+
+        waiter = asyncio.ensure_future(limiter.acquire_async("/v1/sys/health"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        self.assertLess(bucket.reserve(), 0.11)
+
+    @respx.mock
+    async def test_async_adapter(self):
+        respx.get(f"{DEFAULT_URL}/v1/secret/data/foo").mock(return_value=httpx.Response(429))
+        limiter = RateLimiter({"secret/": TokenBucket(rate=10)})
+        adapter = adapters.AsyncVaultxAdapter(client=httpx.AsyncClient(), rate_limiter=limiter)
+
+        with self.assertRaises(HTTPError):
+            await adapter.get("/v1/secret/data/foo")
+
+        self.assertEqual(limiter.stats.as_dict()["throttled"], 1)
@@ -0,0 +1,200 @@
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+import httpx
+import respx
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from vaultx import adapters
+from vaultx.constants.client import DEFAULT_URL
+from vaultx.exceptions import HTTPError, VaultxError
+from vaultx.retry import RetryPolicy, parse_retry_after
+
+
+HEALTH_URL = f"{DEFAULT_URL}/v1/sys/health"
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestParseRetryAfter(TestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("-1"), 0.0)
+
+    def test_http_date(self):
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:05 GMT", now=1445412480), 5.0)
+
+    def test_missing_or_malformed(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestRetryPolicy(TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.policy = RetryPolicy(max_retries=3, backoff_base=0.5, max_backoff=2, deadline=10, timer=self.timer)
+        self.ok = mock.Mock(status=200, headers={})
+        patcher = mock.patch("vaultx.retry.time.sleep", side_effect=self.timer.sleep)
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_applies_to_idempotent_methods(self):
+        self.assertTrue(self.policy.applies_to("get"))
+        self.assertTrue(self.policy.applies_to("LIST"))
+        self.assertFalse(self.policy.applies_to("POST"))
+        self.assertTrue(self.policy.applies_to("POST", retry=True))
+        self.assertFalse(self.policy.applies_to("GET", retry=False))
+
+    def test_backoff_is_fully_jittered_and_capped(self):
+        with mock.patch("vaultx.retry.random.uniform", side_effect=lambda low, high: high) as uniform:
+            self.assertEqual([self.policy.backoff(n) for n in range(4)], [0.5, 1.0, 2, 2])
+        self.assertEqual(uniform.call_args_list[0], mock.call(0, 0.5))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_retries=-1)
+        with self.assertRaises(ValueError):
+            RetryPolicy(backoff_base=0)
+        with self.assertRaises(ValueError):
+            RetryPolicy(deadline=0)
+
+    def test_retries_transient_status_until_success(self):
+        send = mock.Mock(side_effect=[HTTPError(503), HTTPError(429), self.ok])
+
+        self.assertIs(self.policy.call(send), self.ok)
+
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(self.policy.stats.as_dict(), {"retries": 2, "recovered": 1, "exhausted": 0})
+
+    def test_does_not_retry_other_errors(self):
+        send = mock.Mock(side_effect=[HTTPError(404)])
+        with self.assertRaises(HTTPError):
+            self.policy.call(send)
+
+        send = mock.Mock(side_effect=[VaultxError("permission denied")])
+        with self.assertRaises(VaultxError):
+            self.policy.call(send)
+        self.assertEqual(self.policy.stats.retries, 0)
+
+    def test_retries_wrapped_connection_errors(self):
+        error = VaultxError("An error occurred in request")
+        error.__cause__ = httpx.ConnectError("connection refused")
+        send = mock.Mock(side_effect=[error, ConnectionResetError(), self.ok])
+
+        self.assertIs(self.policy.call(send), self.ok)
+        self.assertEqual(self.policy.stats.retries, 2)
+
+    def test_gives_up_after_max_retries(self):
+        send = mock.Mock(side_effect=HTTPError(502))
+
+        with self.assertRaises(HTTPError):
+            self.policy.call(send)
+
+        self.assertEqual(send.call_count, 4)
+        self.assertEqual(self.policy.stats.as_dict(), {"retries": 3, "recovered": 0, "exhausted": 1})
+
+    def test_honours_retry_after(self):
+        send = mock.Mock(side_effect=[HTTPError(429, headers={"Retry-After": "4"}), self.ok])
+
+        self.policy.call(send)
+
+        self.sleep.assert_called_once_with(4.0)
+
+    def test_respects_deadline(self):
+        send = mock.Mock(side_effect=[HTTPError(503, headers={"Retry-After": "6"})] * 2 + [self.ok])
+
+        with self.assertRaises(HTTPError):
+            self.policy.call(send)
+
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(self.timer.now, 6)
+        self.assertEqual(self.policy.stats.exhausted, 1)
+
+    def test_retries_returned_responses(self):
+        failed = mock.Mock(status=503, headers={})
+        succeeded = mock.Mock(status=200, headers={})
+        send = mock.Mock(side_effect=[failed, succeeded])
+
+        self.assertIs(self.policy.call(send), succeeded)
+        self.assertEqual(self.policy.stats.recovered, 1)
+
+
+class TestAdapterRetries(TestCase):
+    def setUp(self):
+        patcher = mock.patch("vaultx.retry.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.policy = RetryPolicy()
+        self.adapter = adapters.VaultxAdapter(retry_policy=self.policy)
+
+    @respx.mock
+    def test_get_is_retried(self):
+        route = respx.get(HEALTH_URL).mock(
+            side_effect=[httpx.Response(503, headers={"Retry-After": "1"}), httpx.Response(200, json={"ok": True})]
+        )
+
+        response = self.adapter.get("/v1/sys/health")
+
+        self.assertTrue(response["ok"])
+        self.assertEqual(route.call_count, 2)
+        self.sleep.assert_called_once_with(1.0)
+
+    @respx.mock
+    def test_post_is_only_retried_on_opt_in(self):
+        route = respx.post(HEALTH_URL).mock(side_effect=[httpx.Response(503), httpx.Response(204)])
+        with self.assertRaises(HTTPError):
+            self.adapter.post("/v1/sys/health")
+        self.assertEqual(route.call_count, 1)
+
+        route.side_effect = [httpx.Response(503), httpx.Response(204)]
+        self.assertEqual(self.adapter.post("/v1/sys/health", retry=True).status, 204)
+        self.assertEqual(route.call_count, 3)
+
+    @respx.mock
+    def test_connection_errors_are_retried(self):
+        route = respx.get(HEALTH_URL).mock(side_effect=[httpx.ConnectError("refused"), httpx.Response(200, json={})])
+
+        self.assertEqual(self.adapter.get("/v1/sys/health").status, 200)
+        self.assertEqual(route.call_count, 2)
+
+
+class TestAsyncAdapterRetries(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch("vaultx.retry.asyncio.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.policy = RetryPolicy()
+
+    @respx.mock
+    async def test_get_is_retried(self):
+        route = respx.get(HEALTH_URL).mock(side_effect=[httpx.Response(502), httpx.Response(200, json={})])
+        adapter = adapters.AsyncVaultxAdapter(client=httpx.AsyncClient(), retry_policy=self.policy)
+
+        self.assertEqual((await adapter.get("/v1/sys/health")).status, 200)
+
+        self.assertEqual(route.call_count, 2)
+        self.assertEqual(self.policy.stats.recovered, 1)
+
+    async def test_aiohttp_adapter(self):
+        responses = iter([web.Response(status=503, headers={"Retry-After": "2"}), web.json_response({})])
+
+        async def handler(request):
+            return next(responses)
+
+        app = web.Application()
+        app.router.add_get("/v1/sys/health", handler)
+        async with TestServer(app) as server:
+            adapter = adapters.AiohttpVaultxAdapter(base_uri=str(server.make_url("")), retry_policy=self.policy)
+            async with adapter:
+                self.assertEqual((await adapter.get("/v1/sys/health")).status, 200)
+
+        self.assertEqual(self.sleep.call_args_list[0], mock.call(2.0))
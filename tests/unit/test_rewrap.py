@@ -0,0 +1,171 @@
+import json
+import os
+import tempfile
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from httpx import Response
+
+from vaultx import exceptions
+from vaultx.adapters import VaultxResponse
+from vaultx.api.async_secrets_engines.transit import Transit as AsyncTransit
+from vaultx.api.secrets_engines.transit import Transit
+from vaultx.rewrap import RewrapCampaign, ciphertext_version
+
+
+class FakeTransitAdapter:
+    """Adapter answering Transit read_key and batch rewrap requests for a key at version 3."""
+
+    def __init__(self):
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        return VaultxResponse(Response(200, json={"data": {"name": url.rsplit("/", 1)[1], "latest_version": 3}}))
+
+    def post(self, url, json):
+        ciphertexts = [item["ciphertext"] for item in json["batch_input"]]
+        with self._lock:
+            self.batches.append(ciphertexts)
+        results = [
+            {"error": "invalid ciphertext"} if "bad" in c else {"ciphertext": "vault:v3:" + c.split(":")[2]}
+            for c in ciphertexts
+        ]
+        # Like Vault, fail the whole request when an item fails unless partial failures are reported with 200
+        if any("error" in result for result in results) and json.get("partial_failure_response_code") != 200:
+            raise exceptions.HTTPError(status_code=400, method="POST", url=url)
+        return VaultxResponse(Response(200, json={"data": {"batch_results": results}}))
+
+
+class AsyncFakeTransitAdapter(FakeTransitAdapter):
+    async def get(self, url):
+        return super().get(url)
+
+    async def post(self, url, json):
+        return super().post(url, json)
+
+
+def ciphertexts(count, version=1):
+    return [(i, f"vault:v{version}:c{i}") for i in range(count)]
+
+
+class TestCiphertextVersion(TestCase):
+    def test_ciphertext_version(self):
+        self.assertEqual(ciphertext_version("vault:v12:abc"), 12)
+        for ciphertext in ("abc", "vault:abc", "vault:vx:abc"):
+            with self.assertRaises(exceptions.VaultxError):
+                ciphertext_version(ciphertext)
+
+
+class TestRewrapCampaign(TestCase):
+    def setUp(self):
+        self.adapter = FakeTransitAdapter()
+        self.results = {}
+        self.errors = {}
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, "rewrap.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def campaign(self, **kwargs):
+        return Transit(self.adapter).rewrap_campaign("app", batch_size=2, concurrency=1, **kwargs)
+
+    def test_rewraps_older_versions_in_batches(self):
+        items = ciphertexts(3) + [(3, "vault:v3:c3"), (4, "vault:v2:c4"), (5, "not-a-ciphertext"), (6, "vault:v1:bad")]
+        stats = self.campaign().run(items, self.results.__setitem__, self.errors.__setitem__)
+
+        self.assertEqual(self.results, {0: "vault:v3:c0", 1: "vault:v3:c1", 2: "vault:v3:c2", 4: "vault:v3:c4"})
+        self.assertEqual(set(self.errors), {5, 6})
+        batches = [["vault:v1:c0", "vault:v1:c1"], ["vault:v1:c2", "vault:v2:c4"], ["vault:v1:bad"]]
+        self.assertEqual(self.adapter.batches, batches)
+        counters = {"read": 7, "skipped": 1, "rewrapped": 4, "failed": 2, "requests": 3}
+        self.assertEqual({name: stats.as_dict()[name] for name in counters}, counters)
+
+    def test_concurrent_batches_deliver_every_result(self):
+        campaign = Transit(self.adapter).rewrap_campaign("app", batch_size=3, concurrency=4, checkpoint=self.checkpoint)
+        stats = campaign.run(ciphertexts(100), self.results.__setitem__)
+
+        self.assertEqual(len(self.results), 100)
+        self.assertEqual((stats.requests, campaign.position), (34, 100))
+
+    def test_resumes_from_checkpoint(self):
+        def fail_after_five(item_id, ciphertext):
+            if len(self.results) == 5:
+                raise RuntimeError("database unavailable")
+            self.results[item_id] = ciphertext
+
+        with self.assertRaises(RuntimeError):
+            self.campaign(checkpoint=self.checkpoint).run(ciphertexts(10), fail_after_five)
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)["position"], 4)
+
+        stats = self.campaign(checkpoint=self.checkpoint).run(ciphertexts(10), self.results.__setitem__)
+
+        self.assertEqual(len(self.results), 10)
+        self.assertEqual((stats.resumed, stats.read, stats.requests), (4, 6, 3))
+
+    def test_checkpoint_of_another_version_is_ignored(self):
+        with open(self.checkpoint, "w") as f:
+            json.dump({"name": "app", "mount_point": "transit", "version": 2, "position": 4}, f)
+
+        stats = self.campaign(checkpoint=self.checkpoint).run(ciphertexts(6), self.results.__setitem__)
+
+        self.assertEqual((stats.resumed, len(self.results)), (0, 6))
+
+    def test_progress_reports(self):
+        now = [0.0]
+
+        def timer():
+            now[0] += 1
+            return now[0]
+
+        reports = []
+        campaign = RewrapCampaign(
+            Transit(self.adapter), "app", batch_size=2, concurrency=1, checkpoint_interval=2, timer=timer
+        )
+        campaign.on_progress = lambda stats: reports.append(stats.read)
+        stats = campaign.run(ciphertexts(8), self.results.__setitem__)
+
+        self.assertEqual(reports[-1], 8)
+        self.assertGreater(len(reports), 1)
+        self.assertGreater(stats.rate, 0)
+
+    def test_invalid_parameters(self):
+        for kwargs in ({"batch_size": 0}, {"concurrency": 0}):
+            with self.assertRaises(ValueError):
+                RewrapCampaign(Transit(self.adapter), "app", **kwargs)
+
+
+class TestAsyncRewrapCampaign(IsolatedAsyncioTestCase):
+    async def test_rewraps_async_iterable(self):
+        adapter = AsyncFakeTransitAdapter()
+        results = {}
+
+        async def items():
+            for item in ciphertexts(10) + [(10, "vault:v3:c10")]:
+                yield item
+
+        async def on_result(item_id, ciphertext):
+            results[item_id] = ciphertext
+
+        campaign = AsyncTransit(adapter).rewrap_campaign("app", batch_size=3, concurrency=2)
+        stats = await campaign.run(items(), on_result)
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[9], "vault:v3:c9")
+        self.assertEqual((stats.requests, stats.skipped, campaign.position), (4, 1, 11))
+
+    async def test_item_errors_of_a_batch_reach_on_error(self):
+        adapter = AsyncFakeTransitAdapter()
+        results, errors = {}, {}
+
+        async def on_error(item_id, error):
+            errors[item_id] = error
+
+        campaign = AsyncTransit(adapter).rewrap_campaign("app", batch_size=3)
+        stats = await campaign.run(ciphertexts(2) + [(2, "vault:v1:bad")], results.__setitem__, on_error)
+
+        self.assertEqual(results, {0: "vault:v3:c0", 1: "vault:v3:c1"})
+        self.assertEqual(str(errors[2]), "invalid ciphertext")
+        self.assertEqual((stats.rewrapped, stats.failed, stats.requests), (2, 1, 1))
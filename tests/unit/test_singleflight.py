@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import httpx
+import respx
+
+from vaultx import AsyncClient, adapters
+from vaultx.constants.client import DEFAULT_URL
+from vaultx.exceptions import HTTPError
+from vaultx.singleflight import AsyncSingleFlight, SingleFlight, request_key
+
+
+DATA_URL = f"{DEFAULT_URL}/v1/secret/data/foo"
+
+
+class TestRequestKey(TestCase):
+    def test_identical_requests_share_a_key(self):
+        first = request_key("get", "/v1/a", None, {"params": {"version": 1}}, "token", None)
+        second = request_key("GET", "/v1/a", {}, {"params": {"version": 1}}, "token", None)
+        self.assertEqual(first, second)
+
+    def test_distinguishing_parts(self):
+        key = request_key("GET", "/v1/a", None, {}, "token", None)
+        self.assertNotEqual(key, request_key("GET", "/v1/b", None, {}, "token", None))
+        self.assertNotEqual(key, request_key("GET", "/v1/a", None, {"params": {"version": 2}}, "token", None))
+        self.assertNotEqual(key, request_key("GET", "/v1/a", None, {}, "other", None))
+        self.assertNotEqual(key, request_key("GET", "/v1/a", None, {}, "token", "ns1"))
+
+    def test_writes_and_bodies_are_not_coalesced(self):
+        self.assertIsNone(request_key("POST", "/v1/a", None, {}, "token"))
+        self.assertIsNone(request_key("GET", "/v1/a", None, {"json": {}}, "token"))
+        self.assertIsNone(request_key("GET", "/v1/a", None, {"stream": True}, "token"))
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_callers_share_one_call(self):
+        group = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            leader = executor.submit(group.do, "key", fn)
+            started.wait(5)
+            followers = [executor.submit(group.do, "key", fn) for _ in range(7)]
+            while group.stats.deduplicated < 7:
+                threading.Event().wait(0.001)
+            release.set()
+            results = [future.result() for future in [leader, *followers]]
+
+        self.assertEqual(results, ["result"] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(group.stats.as_dict(), {"calls": 1, "deduplicated": 7})
+        self.assertEqual(group.stats.dedup_ratio, 7 / 8)
+
+    def test_errors_are_shared_and_keys_released(self):
+        group = SingleFlight()
+
+        def fail():
+            raise HTTPError(500)
+
+        with self.assertRaises(HTTPError):
+            group.do("key", fail)
+        self.assertEqual(group.do("key", lambda: 1), 1)
+        self.assertEqual(group.stats.calls, 2)
+
+
+class TestAsyncSingleFlight(IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_one_call(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(group.do("key", fn) for _ in range(5)))
+
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(group.stats.as_dict(), {"calls": 1, "deduplicated": 4})
+        self.assertEqual(await group.do("key", fn), "result")
+        self.assertEqual(len(calls), 2)
+
+    async def test_cancelling_the_first_caller_does_not_cancel_the_call(self):
+        group = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        first = asyncio.ensure_future(group.do("key", fn))
+        second = asyncio.ensure_future(group.do("key", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "result")
+        self.assertTrue(first.cancelled())
+
+
+class TestAdapterCoalescing(TestCase):
+    @respx.mock
+    def test_concurrent_gets_are_sent_once(self):
+        release = threading.Event()
+
+        def respond(request):
+            release.wait(5)
+            return httpx.Response(200, json={"data": {"data": {"a": 1}}})
+
+        route = respx.get(DATA_URL).mock(side_effect=respond)
+        adapter = adapters.VaultxAdapter(token="token", coalesce_requests=True)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(adapter.get, "/v1/secret/data/foo") for _ in range(4)]
+            while adapter.singleflight.stats.deduplicated < 3:
+                threading.Event().wait(0.001)
+            release.set()
+            responses = [future.result() for future in futures]
+
+        self.assertEqual(route.call_count, 1)
+        self.assertTrue(all(response is responses[0] for response in responses))
+
+    @respx.mock
+    def test_disabled_by_default(self):
+        respx.get(DATA_URL).mock(return_value=httpx.Response(200, json={}))
+        adapter = adapters.VaultxAdapter()
+
+        adapter.get("/v1/secret/data/foo")
+
+        self.assertIsNone(adapter.singleflight)
+
+
+class TestAsyncAdapterCoalescing(IsolatedAsyncioTestCase):
+    @respx.mock
+    async def test_concurrent_reads_are_sent_once(self):
+        async def respond(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"data": {"data": {"a": 1}, "metadata": {}}})
+
+        route = respx.get(DATA_URL).mock(side_effect=respond)
+        write = respx.post(DATA_URL).mock(return_value=httpx.Response(200, json={}))
+
+        async with AsyncClient(token="token", client=httpx.AsyncClient(), coalesce_requests=True) as client:
+            kv = client.secrets.kv.v2
+            responses = await asyncio.gather(*(kv.read_secret_version(path="foo") for _ in range(10)))
+            await asyncio.gather(*(kv.create_or_update_secret(path="foo", secret={"a": 2}) for _ in range(2)))
+
+            self.assertEqual(client.adapter.singleflight.stats.as_dict(), {"calls": 1, "deduplicated": 9})
+
+        self.assertEqual([response["data"]["data"] for response in responses], [{"a": 1}] * 10)
+        self.assertEqual(route.call_count, 1)
+        self.assertEqual(write.call_count, 2)
@@ -1,7 +1,31 @@
-from vaultx.clients import AsyncClient, Client
+import importlib
+import typing as tp
+
+
+if tp.TYPE_CHECKING:
+    from vaultx.clients import AsyncClient, Client
 
 
 __all__ = (
     "Client",
     "AsyncClient",
 )
+
+# Attributes imported on first access, so that importing a submodule does not load the clients and their dependencies
+_LAZY_ATTRIBUTES = {
+    "Client": "vaultx.clients",
+    "AsyncClient": "vaultx.clients",
+}
+
+
+def __getattr__(name: str) -> tp.Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
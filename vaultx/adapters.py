@@ -1,21 +1,65 @@
 import abc
+import functools
+import importlib
+import json
+import os
 import ssl  # pragma: no cover
+import threading
+import time
 import types
 import typing as tp
+from collections.abc import Callable, Mapping
 from types import CoroutineType
 from typing import Any, Optional, Union
 
-import aiohttp
 import httpx
 
-from vaultx.constants.client import DEFAULT_URL
+from vaultx.consistency import EVENTUAL, ConsistencySession, active_session
+from vaultx.constants.client import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_URL,
+    UNIX_SOCKET_SCHEME,
+    UNIX_SOCKET_URL,
+)
+from vaultx.singleflight import AsyncSingleFlight, SingleFlight, request_key
+from vaultx.streams import DEFAULT_CHUNK_SIZE
 from vaultx.utils import replace_double_slashes_to_single, urljoin
 from . import _types, exceptions
 
 
+if tp.TYPE_CHECKING:
+    # aiohttp is only imported once an async adapter needs it, keeping it out of synchronous programs
+    import aiohttp
+
+    from vaultx.cache import CacheTypes
+    from vaultx.circuit_breaker import CircuitBreaker
+    from vaultx.ratelimit import RateLimiter
+    from vaultx.retry import RetryPolicy
+
+
+# Decodes response bodies; orjson is used when installed. Assign any callable accepting bytes to use another decoder.
+try:
+    json_decoder: Callable[[bytes], Any] = importlib.import_module("orjson").loads
+except ImportError:
+    json_decoder = json.loads
+
+
+def _decode_body(content: bytes) -> dict:
+    if not content:
+        return {}
+    try:
+        return json_decoder(content)
+    except ValueError:
+        return {}
+
+
 class AdapterResponse(metaclass=abc.ABCMeta):
     """Abstract base class for Adapter responses."""
 
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def raw(self) -> Any:
@@ -48,18 +92,21 @@ class AdapterResponse(metaclass=abc.ABCMeta):
 
 @exceptions.handle_unknown_exception
 class HttpxAdapterResponse(AdapterResponse):
-    """An abstract AdapterResponse class for responses based on a httpx.Response."""
+    """
+    An abstract AdapterResponse class for responses based on a httpx.Response.
+
+    The body is only decoded when the value is first accessed, so callers checking the status alone, empty
+    responses and streamed binary responses never pay for JSON parsing.
+    """
+
+    __slots__ = ("_raw", "_value")
 
     _raw: tp.Final[httpx.Response]
-    _value: tp.Final[dict]
+    _value: Optional[dict]
 
     def __init__(self, response: httpx.Response) -> None:
-        try:
-            value = response.json()
-        except ValueError:
-            value = {}
-        self._value = value
         self._raw = response
+        self._value = None
 
     def __bool__(self) -> bool:
         # if self.status == 204:
@@ -74,8 +121,30 @@ class HttpxAdapterResponse(AdapterResponse):
     def status(self) -> int:
         return self._raw.status_code
 
+    @property
+    def headers(self) -> Mapping[str, str]:
+        """
+        The headers of the response, looked up case-insensitively.
+        :return: A mapping of header names to values.
+        """
+        return self._raw.headers
+
+    @property
+    def content(self) -> bytes:
+        """
+        The undecoded response body.
+        :return: The body of the response as bytes.
+        """
+        return self._raw.content
+
     @property
     def value(self) -> dict:
+        if self._value is None:
+            try:
+                content = self._raw.content
+            except httpx.ResponseNotRead:
+                return {}
+            self._value = _decode_body(content)
         return self._value
 
 
@@ -83,6 +152,8 @@ class HttpxAdapterResponse(AdapterResponse):
 class VaultxResponse(HttpxAdapterResponse):
     """The specialized AdapterResponse used for the HvacAdapter."""
 
+    __slots__ = ()
+
     def __getattr__(self, __name: str) -> Any:
         if __name == "_value" or __name == "_raw":
             raise AttributeError
@@ -101,6 +172,189 @@ class VaultxResponse(HttpxAdapterResponse):
         return self.value.__contains__(__o)
 
 
+@exceptions.handle_unknown_exception
+class AiohttpVaultxResponse(VaultxResponse):
+    """
+    The VaultxResponse produced by the AiohttpVaultxAdapter.
+
+    Status, headers and body are kept as aiohttp returned them; the equivalent httpx.Response is only built when
+    raw is accessed.
+    """
+
+    __slots__ = ("_status", "_headers", "_content", "_request", "_httpx_response")
+
+    def __init__(self, status: int, headers: Mapping[str, str], content: bytes, method: str, url: str) -> None:
+        self._status = status
+        self._headers = headers
+        self._content = content
+        self._request = (method, url)
+        self._httpx_response: Optional[httpx.Response] = None
+        self._value = None
+
+    def __bool__(self) -> bool:
+        return True
+
+    @property
+    def raw(self) -> httpx.Response:
+        if self._httpx_response is None:
+            self._httpx_response = httpx.Response(
+                self._status,
+                headers=list(self._headers.items()),
+                content=self._content,
+                request=httpx.Request(*self._request),
+            )
+        return self._httpx_response
+
+    @property
+    def status(self) -> int:
+        return self._status
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        return self._headers
+
+    @property
+    def content(self) -> bytes:
+        return self._content
+
+    @property
+    def value(self) -> dict:
+        if self._value is None:
+            self._value = _decode_body(self._content)
+        return self._value
+
+
+class PoolStats:
+    """Time requests spent waiting for a connection from an adapter's connection pool."""
+
+    __slots__ = ("requests", "wait_time", "max_wait", "_lock")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def mean_wait(self) -> float:
+        """Average seconds a request waited for a connection, 0.0 when nothing has been recorded yet."""
+        return self.wait_time / self.requests if self.requests else 0.0
+
+    def record(self, wait: float) -> None:
+        """
+        Record the pool wait of one request.
+
+        :param wait: Seconds between sending the request and a connection being assigned to it.
+        """
+        with self._lock:
+            self.requests += 1
+            self.wait_time += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+    def as_dict(self) -> dict[str, float]:
+        return {"requests": self.requests, "wait_time": self.wait_time, "max_wait": self.max_wait}
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+class _PoolWaitTrace:
+    """
+    httpcore trace extension recording the pool wait of a single request.
+
+    httpcore only emits connection and HTTP events once the pool has assigned a connection to the request, so the
+    first event marks the end of the wait.
+    """
+
+    __slots__ = ("_stats", "_started")
+
+    def __init__(self, stats: PoolStats) -> None:
+        self._stats = stats
+        self._started: Optional[float] = time.perf_counter()
+
+    def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        if self._started is not None:
+            self._stats.record(time.perf_counter() - self._started)
+            self._started = None
+
+
+class _AsyncPoolWaitTrace(_PoolWaitTrace):
+    __slots__ = ()
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:  # type: ignore[override]
+        super().__call__(event_name, info)
+
+
+def _pool_wait_trace_config(stats: PoolStats) -> "aiohttp.TraceConfig":
+    """Build an aiohttp.TraceConfig recording the pool wait of every request of a session into stats."""
+    import aiohttp
+
+    async def on_request_start(session: "aiohttp.ClientSession", context: Any, params: Any) -> None:
+        context.pool_wait_started = time.perf_counter()
+
+    async def on_connection_assigned(session: "aiohttp.ClientSession", context: Any, params: Any) -> None:
+        stats.record(time.perf_counter() - context.pool_wait_started)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_reuseconn.append(on_connection_assigned)
+    trace_config.on_connection_create_start.append(on_connection_assigned)
+    return trace_config
+
+
+def _unix_socket_path(base_uri: str, client: Any = None) -> Optional[str]:
+    """Path of the Unix domain socket of a unix:///path/to/socket address, None for other addresses."""
+    if not base_uri.startswith(UNIX_SOCKET_SCHEME):
+        return None
+    path = base_uri[len(UNIX_SOCKET_SCHEME) :]
+    if not path.startswith("/"):
+        raise exceptions.VaultxError(f'Unix socket addresses must be absolute like unix:///path, "{base_uri}" provided')
+    if client is not None:
+        # The socket is set on the transport or connector of the client, which a given client was created without
+        raise exceptions.VaultxError(
+            f'"{base_uri}" cannot be combined with a client, create the client for the socket and pass its URL instead'
+        )
+    return path
+
+
+def _httpx_timeout(
+    timeout: Optional[float],
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    pool_timeout: Optional[float] = None,
+) -> httpx.Timeout:
+    """Build an httpx.Timeout, using timeout for every phase without a specific value."""
+    phases = {"connect": connect_timeout, "read": read_timeout, "pool": pool_timeout}
+    return httpx.Timeout(timeout, **{phase: value for phase, value in phases.items() if value is not None})
+
+
+def _aiohttp_timeout(timeout: httpx.Timeout) -> "aiohttp.ClientTimeout":
+    """
+    Translate an httpx.Timeout into an aiohttp.ClientTimeout.
+
+    aiohttp bounds waiting for a free connection and establishing it with a single connect timeout, the pool timeout
+    is used for it while the connect timeout only bounds the socket connection.
+    """
+    import aiohttp
+
+    return aiohttp.ClientTimeout(total=None, connect=timeout.pool, sock_connect=timeout.connect, sock_read=timeout.read)
+
+
+def _login_cache_key(
+    base_uri: str, namespace: Optional[str], token: Optional[str], url: str, kwargs: Mapping[str, Any]
+) -> tuple[str, ...]:
+    body = json.dumps(kwargs, sort_keys=True, default=str)
+    return "login", base_uri, namespace or "", token or "", url, body
+
+
+def _login_ttl(response: VaultxResponse) -> Optional[float]:
+    # Shared tokens are only handed out during the first half of their TTL, leaving every process time to use them
+    lease_duration = (response.value.get("auth") or {}).get("lease_duration") or 0
+    return lease_duration / 2 or None
+
+
 class Adapter:
     """Abstract synchronous adapter class"""
 
@@ -118,11 +372,27 @@ class Adapter:
         ignore_exceptions: bool = False,
         strict_http: bool = False,
         request_header: bool = True,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        track_pool_wait: bool = False,
+        retry_policy: Optional["RetryPolicy"] = None,
+        consistency: str = EVENTUAL,
+        coalesce_requests: bool = False,
+        rate_limiter: Optional["RateLimiter"] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        login_cache: Optional["CacheTypes"] = None,
     ) -> None:
         """
         Create a new request adapter instance.
 
-        :param base_uri: Base URL for the Vault instance being addressed.
+        :param base_uri: Base URL for the Vault instance being addressed, or unix:///path/to/socket to send requests
+            over a Unix domain socket, e.g. to a local Vault Agent listener, base_uri then being "http://localhost".
+            A socket address cannot be combined with client, which would not send requests over it.
         :param token: Authentication token to include in requests sent to Vault.
         :param cert: Certificates for use in requests sent to the Vault instance. This should be a tuple with the
             certificate and then key.
@@ -141,12 +411,41 @@ class Adapter:
             otherwise process as is
         :param request_header: If true, add the X-Vault-Request header to all requests
             to protect against SSRF vulnerabilities.
+        :param max_connections: Maximum number of simultaneous connections, None for no limit.
+        :param max_keepalive_connections: Maximum number of idle connections kept open for reuse, None for no limit.
+        :param keepalive_expiry: Seconds an idle connection is kept open for reuse, None to keep it indefinitely.
+        :param http2: If True, negotiate HTTP/2 so that concurrent requests are multiplexed over a single connection.
+            Requires the h2 package, installed with pip install httpx[http2].
+        :param connect_timeout: Seconds to wait for a connection to be established, defaults to timeout.
+        :param read_timeout: Seconds to wait for a chunk of the response to be received, defaults to timeout.
+        :param pool_timeout: Seconds to wait for a free connection from the pool, defaults to timeout.
+        :param track_pool_wait: If True, record how long requests wait for a connection in pool_stats.
+        :param retry_policy: Optional policy retrying requests that failed with a transient error.
+        :param consistency: Default consistency mode of requests sent to standby nodes: "strong", "session" or
+            "eventual". See vaultx.consistency.
+        :param coalesce_requests: If True, identical GET, LIST and HEAD requests sent while one of them is in flight
+            share its response instead of being sent again.
+        :param rate_limiter: Optional limiter delaying requests to stay below Vault rate limit quotas.
+        :param circuit_breaker: Optional breaker failing requests immediately while their endpoint keeps failing.
+        :param login_cache: Optional cache of login responses, e.g. a vaultx.cache.FileCache letting the processes of
+            a host share one token instead of logging in separately.
         """
 
+        uds = _unix_socket_path(base_uri, client)
         if not client:
-            client = httpx.Client(cert=cert, verify=verify, proxy=proxy)
-
-        self.base_uri = base_uri
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+            if uds is None:
+                client = httpx.Client(cert=cert, verify=verify, proxy=proxy, http2=http2, limits=limits)
+            else:
+                # Connections to a local socket are never proxied, and are pooled like TCP ones
+                transport = httpx.HTTPTransport(cert=cert, verify=verify, http2=http2, limits=limits, uds=uds)
+                client = httpx.Client(transport=transport)
+
+        self.base_uri = UNIX_SOCKET_URL if uds is not None else base_uri
         self.token = token
         self.namespace = namespace
         self.client = client
@@ -154,11 +453,19 @@ class Adapter:
         self.ignore_exceptions = ignore_exceptions
         self.strict_http = strict_http
         self.request_header = request_header
+        self.token_manager: Optional[Any] = None
+        self.retry_policy = retry_policy
+        self.consistency = ConsistencySession(consistency)
+        self.singleflight: Optional[SingleFlight] = SingleFlight() if coalesce_requests else None
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.login_cache = login_cache
+        self.pool_stats: Optional[PoolStats] = PoolStats() if track_pool_wait else None
 
         self._kwargs: dict[str, Any] = {
             "cert": cert,
             "verify": verify,
-            "timeout": timeout,
+            "timeout": _httpx_timeout(timeout, connect_timeout, read_timeout, pool_timeout),
             "proxy": proxy,
         }
 
@@ -174,11 +481,15 @@ class Adapter:
         exc_value: Optional[BaseException] = None,
         traceback: Optional[types.TracebackType] = None,
     ) -> None:
+        if self.token_manager is not None:
+            self.token_manager.stop()
         self.client.__exit__(exc_type, exc_value, traceback)
 
     @exceptions.handle_unknown_exception
     def close(self):
-        """Close the Client's underlying TCP connections."""
+        """Close the Client's underlying TCP connections and stop the attached token manager, if any."""
+        if self.token_manager is not None:
+            self.token_manager.stop()
         self.client.close()
 
     @exceptions.handle_unknown_exception
@@ -261,13 +572,45 @@ class Adapter:
             attribute on the :py:meth:`vaultx.adapters.Adapter` instance under the _adapter Client attribute.
         :param kwargs: Additional keyword arguments to include in the params sent with the request.
         """
-        response = self.post(url, **kwargs)
+        if self.login_cache is None:
+            response = self.post(url, **kwargs)
+        else:
+            key = _login_cache_key(self.base_uri, self.namespace, self.token, url, kwargs)
+            response = self.login_cache.get_or_set(key, functools.partial(self.post, url, **kwargs), ttl=_login_ttl)
 
         if use_token:
             self.token = self.get_login_token(response)
+            if self.token_manager is not None:
+                self.token_manager.track(response)
 
         return response
 
+    def _singleflight_key(
+        self, method: str, url: str, headers: Optional[dict[str, str]], kwargs: Mapping[str, Any]
+    ) -> Optional[tp.Hashable]:
+        if self.singleflight is None:
+            return None
+        session = active_session(self.consistency)
+        return request_key(method, url, headers, kwargs, self.token, self.namespace, session.mode, session.index)
+
+    def _request_headers(self, headers: Optional[dict[str, str]], wrap_ttl: Optional[Any]) -> dict[str, str]:
+        if not headers:
+            headers = {}
+
+        if self.request_header:
+            headers["X-Vault-Request"] = "true"
+
+        if self.token:
+            headers["X-Vault-Token"] = self.token
+
+        if self.namespace:
+            headers["X-Vault-Namespace"] = self.namespace
+
+        if wrap_ttl:
+            headers["X-Vault-Wrap-TTL"] = str(wrap_ttl)
+
+        return headers
+
     @abc.abstractmethod
     def get_login_token(self, response: VaultxResponse) -> str:
         """
@@ -332,27 +675,62 @@ class VaultxAdapter(Adapter):
             attribute.
         :param headers: Additional headers to include with the request.
         :param raise_exception: If True, raise an exception.
-        :param kwargs: Additional keyword arguments to include in the requests call.
+        :param kwargs: Additional keyword arguments to include in the requests call. Pass retry=True or retry=False
+            to override whether the retry policy of the adapter applies to this request, and stream=True to get a
+            response whose body is left unread, to be iterated over from its raw httpx.Response and then closed.
         """
+        send = functools.partial(self._request, method, url, headers, raise_exception, **kwargs)
+        key = self._singleflight_key(method, url, headers, kwargs)
+        if key is None:
+            return send()
+        return self.singleflight.do(key, send)  # type: ignore[union-attr]
 
-        url = replace_double_slashes_to_single(url)
-        url = urljoin(self.base_uri, url)
-
-        if not headers:
-            headers = {}
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        retry = kwargs.pop("retry", None)
+        if self.retry_policy is not None and self.retry_policy.applies_to(method, retry):
+            send = functools.partial(self._send, method, url, headers, raise_exception, **kwargs)
+            return self.retry_policy.call(send)
+        return self._send(method, url, headers, raise_exception, **kwargs)
 
-        if self.request_header:
-            headers["X-Vault-Request"] = "true"
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        base_uri: Optional[str] = None,
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        if self.circuit_breaker is None:
+            return self._transmit(method, url, headers, raise_exception, base_uri, **kwargs)
+        send = functools.partial(self._transmit, method, url, headers, raise_exception, base_uri, **kwargs)
+        return self.circuit_breaker.call(method, url, self.namespace, send, node=base_uri)
 
-        if self.token:
-            headers["X-Vault-Token"] = self.token
+    def _transmit(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        base_uri: Optional[str] = None,
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
 
-        if self.namespace:
-            headers["X-Vault-Namespace"] = self.namespace
+        url = replace_double_slashes_to_single(url)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url, self.namespace)
+        path, url = url, urljoin(base_uri or self.base_uri, url)
 
-        wrap_ttl = kwargs.pop("wrap_ttl", None)
-        if wrap_ttl:
-            headers["X-Vault-Wrap-TTL"] = str(wrap_ttl)
+        headers = self._request_headers(headers, kwargs.pop("wrap_ttl", None))
+        session = active_session(self.consistency)
+        session.apply(headers)
 
         _kwargs: dict[str, Any] = {"timeout": self._kwargs.get("timeout")}
         _kwargs.update(kwargs)
@@ -365,22 +743,59 @@ class VaultxAdapter(Adapter):
                 params.update({"list": "true"})
             _kwargs["params"] = params
 
-        response = self.client.request(
-            method=method, url=url, headers=headers, follow_redirects=self.follow_redirects, **_kwargs
-        )
+        if self.pool_stats is not None:
+            _kwargs["extensions"] = {**_kwargs.get("extensions", {}), "trace": _PoolWaitTrace(self.pool_stats)}
+
+        response = self._client_request(method, url, headers, **_kwargs)
+        session.record(response.headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(path, self.namespace, response.status_code)
 
         if not response.is_success and (raise_exception and not self.ignore_exceptions):
-            raise exceptions.HTTPError(status_code=response.status_code, method=method, url=url)
+            response.close()
+            raise exceptions.HTTPError(
+                status_code=response.status_code, method=method, url=url, headers=response.headers
+            )
 
         return VaultxResponse(response)
 
+    def _client_request(
+        self, method: str, url: str, headers: dict[str, str], stream: bool = False, **kwargs: Any
+    ) -> httpx.Response:
+        if not stream:
+            return self.client.request(
+                method=method, url=url, headers=headers, follow_redirects=self.follow_redirects, **kwargs
+            )
+        # The body is left unread, to be iterated over and closed by the caller
+        request = self.client.build_request(method=method, url=url, headers=headers, **kwargs)
+        return self.client.send(request, stream=True, follow_redirects=self.follow_redirects)
+
+
+class _AiohttpResponseStream(httpx.AsyncByteStream):
+    """Body of an aiohttp response, read chunk by chunk and released once closed."""
+
+    def __init__(self, response: "aiohttp.ClientResponse", chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._response = response
+        self._chunk_size = chunk_size
+
+    async def __aiter__(self) -> tp.AsyncIterator[bytes]:
+        async for chunk in self._response.content.iter_chunked(self._chunk_size):
+            yield chunk
+
+    async def aclose(self) -> None:
+        self._response.release()
+
 
 @exceptions.async_handle_unknown_exception
 class AiohttpTransport(httpx.AsyncBaseTransport):
     """Class for providing httpx requests with aiohttp transport"""
 
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
-        self._session = session or aiohttp.ClientSession()
+    def __init__(self, session: Optional["aiohttp.ClientSession"] = None):
+        if session is None:
+            import aiohttp
+
+            session = aiohttp.ClientSession()
+        self._session = session
         self._closed = False
 
     async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
@@ -392,20 +807,34 @@ class AiohttpTransport(httpx.AsyncBaseTransport):
         # Prepare request parameters
         method = request.method
         url = str(request.url)
-        content = request.content
-
-        async with self._session.request(
+        try:
+            content: Any = request.content
+        except httpx.RequestNotRead:
+            # Streamed body, e.g. an iterator of file chunks, sent as it is produced; aiohttp sets the chunked
+            # transfer encoding itself and refuses an explicit one
+            content = request.stream
+            aiohttp_headers.pop("transfer-encoding", None)
+
+        request_kwargs: dict[str, Any] = {}
+        if "timeout" in request.extensions:
+            request_kwargs["timeout"] = _aiohttp_timeout(httpx.Timeout(**request.extensions["timeout"]))
+
+        aiohttp_response = await self._session.request(
             method=method,
             url=url,
             headers=aiohttp_headers,
             data=content,
             allow_redirects=False,
-        ) as aiohttp_response:
-            content = await aiohttp_response.read()
-            headers: list = [(k.lower(), v) for k, v in aiohttp_response.headers.items()]
-            return httpx.Response(
-                status_code=aiohttp_response.status, headers=headers, content=content, request=request
-            )
+            **request_kwargs,
+        )
+        headers: list = [(k.lower(), v) for k, v in aiohttp_response.headers.items()]
+        # httpx reads the body from the stream, all at once unless the request was sent with stream=True
+        return httpx.Response(
+            status_code=aiohttp_response.status,
+            headers=headers,
+            stream=_AiohttpResponseStream(aiohttp_response),
+            request=request,
+        )
 
     @exceptions.async_handle_unknown_exception
     async def __aenter__(self):
@@ -444,11 +873,27 @@ class AsyncAdapter:
         ignore_exceptions: bool = False,
         strict_http: bool = False,
         request_header: bool = True,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        track_pool_wait: bool = False,
+        retry_policy: Optional["RetryPolicy"] = None,
+        consistency: str = EVENTUAL,
+        coalesce_requests: bool = False,
+        rate_limiter: Optional["RateLimiter"] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        login_cache: Optional["CacheTypes"] = None,
     ) -> None:
         """
         Create a new async request adapter instance.
 
-        :param base_uri: Base URL for the Vault instance being addressed.
+        :param base_uri: Base URL for the Vault instance being addressed, or unix:///path/to/socket to send requests
+            over a Unix domain socket, e.g. to a local Vault Agent listener, base_uri then being "http://localhost".
+            A socket address cannot be combined with client, which would not send requests over it.
         :param token: Authentication token to include in requests sent to Vault.
         :param cert: Certificates for use in requests sent to the Vault instance. This should be a tuple with the
             certificate and then key.
@@ -467,12 +912,60 @@ class AsyncAdapter:
             otherwise process as is
         :param request_header: If true, add the X-Vault-Request header to all requests
             to protect against SSRF vulnerabilities.
+        :param max_connections: Maximum number of simultaneous connections, None for no limit.
+        :param max_keepalive_connections: Maximum number of idle connections kept open for reuse, None for no limit.
+            Only applies with http2=True; the aiohttp transport keeps every released connection open until
+            keepalive_expiry.
+        :param keepalive_expiry: Seconds an idle connection is kept open for reuse, None to keep it indefinitely.
+        :param http2: If True, negotiate HTTP/2 so that concurrent requests are multiplexed over a single connection.
+            Requires the h2 package, installed with pip install httpx[http2].
+        :param connect_timeout: Seconds to wait for a connection to be established, defaults to timeout.
+        :param read_timeout: Seconds to wait for a chunk of the response to be received, defaults to timeout.
+        :param pool_timeout: Seconds to wait for a free connection from the pool, defaults to timeout.
+        :param track_pool_wait: If True, record how long requests wait for a connection in pool_stats.
+        :param retry_policy: Optional policy retrying requests that failed with a transient error.
+        :param consistency: Default consistency mode of requests sent to standby nodes: "strong", "session" or
+            "eventual". See vaultx.consistency.
+        :param coalesce_requests: If True, identical GET, LIST and HEAD requests sent while one of them is in flight
+            share its response instead of being sent again.
+        :param rate_limiter: Optional limiter delaying requests to stay below Vault rate limit quotas.
+        :param circuit_breaker: Optional breaker failing requests immediately while their endpoint keeps failing.
+        :param login_cache: Optional cache of login responses, e.g. a vaultx.cache.FileCache letting the processes of
+            a host share one token instead of logging in separately.
         """
 
-        if not client:
-            client = httpx.AsyncClient(cert=cert, verify=verify, proxy=proxy, transport=AiohttpTransport())
+        self.pool_stats: Optional[PoolStats] = PoolStats() if track_pool_wait else None
 
-        self.base_uri = base_uri
+        uds = _unix_socket_path(base_uri, client)
+        if not client:
+            transport: httpx.AsyncBaseTransport
+            if http2:
+                # aiohttp only speaks HTTP/1.1
+                transport = httpx.AsyncHTTPTransport(
+                    cert=cert,
+                    verify=verify,
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive_connections,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                    uds=uds,
+                )
+            else:
+                import aiohttp
+
+                pool: dict[str, Any] = {"limit": max_connections or 0, "keepalive_timeout": keepalive_expiry}
+                connector = aiohttp.TCPConnector(**pool) if uds is None else aiohttp.UnixConnector(uds, **pool)
+                trace_configs = [_pool_wait_trace_config(self.pool_stats)] if self.pool_stats is not None else None
+                transport = AiohttpTransport(
+                    session=aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
+                )
+            # Connections to a local socket are never proxied
+            proxy = proxy if uds is None else None
+            client = httpx.AsyncClient(cert=cert, verify=verify, proxy=proxy, transport=transport)
+
+        self.base_uri = UNIX_SOCKET_URL if uds is not None else base_uri
         self.token = token
         self.namespace = namespace
         self.client = client
@@ -480,11 +973,18 @@ class AsyncAdapter:
         self.ignore_exceptions = ignore_exceptions
         self.strict_http = strict_http
         self.request_header = request_header
+        self.token_manager: Optional[Any] = None
+        self.retry_policy = retry_policy
+        self.consistency = ConsistencySession(consistency)
+        self.singleflight: Optional[AsyncSingleFlight] = AsyncSingleFlight() if coalesce_requests else None
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.login_cache = login_cache
 
         self._kwargs: dict[str, Any] = {
             "cert": cert,
             "verify": verify,
-            "timeout": timeout,
+            "timeout": _httpx_timeout(timeout, connect_timeout, read_timeout, pool_timeout),
             "proxy": proxy,
         }
 
@@ -500,11 +1000,15 @@ class AsyncAdapter:
         exc_value: Optional[BaseException] = None,
         traceback: Optional[types.TracebackType] = None,
     ) -> None:
+        if self.token_manager is not None:
+            await self.token_manager.stop()
         await self.client.__aexit__(exc_type, exc_value, traceback)
 
     @exceptions.async_handle_unknown_exception
     async def close(self):
-        """Close the AsyncClient's underlying TCP connections."""
+        """Close the AsyncClient's underlying TCP connections and stop the attached token manager, if any."""
+        if self.token_manager is not None:
+            await self.token_manager.stop()
         await self.client.aclose()
 
     @exceptions.async_handle_unknown_exception
@@ -587,13 +1091,46 @@ class AsyncAdapter:
             attribute on the :py:meth:`vaultx.adapters.AsyncAdapter` instance under the _adapter Client attribute.
         :param kwargs: Additional keyword arguments to include in the params sent with the request.
         """
-        response = await self.post(url, **kwargs)
+        if self.login_cache is None:
+            response = await self.post(url, **kwargs)
+        else:
+            key = _login_cache_key(self.base_uri, self.namespace, self.token, url, kwargs)
+            send = functools.partial(self.post, url, **kwargs)
+            response = await self.login_cache.get_or_set_async(key, send, ttl=_login_ttl)
 
         if use_token:
             self.token = await self.get_login_token(response)
+            if self.token_manager is not None:
+                self.token_manager.track(response)
 
         return response
 
+    def _singleflight_key(
+        self, method: str, url: str, headers: Optional[dict[str, str]], kwargs: Mapping[str, Any]
+    ) -> Optional[tp.Hashable]:
+        if self.singleflight is None:
+            return None
+        session = active_session(self.consistency)
+        return request_key(method, url, headers, kwargs, self.token, self.namespace, session.mode, session.index)
+
+    def _request_headers(self, headers: Optional[dict[str, str]], wrap_ttl: Optional[Any]) -> dict[str, str]:
+        if not headers:
+            headers = {}
+
+        if self.request_header:
+            headers["X-Vault-Request"] = "true"
+
+        if self.token and not isinstance(self.token, CoroutineType):
+            headers["X-Vault-Token"] = self.token
+
+        if self.namespace:
+            headers["X-Vault-Namespace"] = self.namespace
+
+        if wrap_ttl:
+            headers["X-Vault-Wrap-TTL"] = str(wrap_ttl)
+
+        return headers
+
     @abc.abstractmethod
     async def get_login_token(self, response: VaultxResponse) -> str:
         """
@@ -654,27 +1191,61 @@ class AsyncVaultxAdapter(AsyncAdapter):
             attribute.
         :param headers: Additional headers to include with the request.
         :param raise_exception: If True, raise an exception.
-        :param kwargs: Additional keyword arguments to include in the requests call.
+        :param kwargs: Additional keyword arguments to include in the requests call. Pass retry=True or retry=False
+            to override whether the retry policy of the adapter applies to this request, and stream=True to get a
+            response whose body is left unread, to be iterated over from its raw httpx.Response and then closed.
         """
+        send = functools.partial(self._request, method, url, headers, raise_exception, **kwargs)
+        key = self._singleflight_key(method, url, headers, kwargs)
+        if key is None:
+            return await send()
+        return await self.singleflight.do(key, send)  # type: ignore[union-attr]
 
-        url = replace_double_slashes_to_single(url)
-        url = urljoin(self.base_uri, url)
-
-        if not headers:
-            headers = {}
-
-        if self.request_header:
-            headers["X-Vault-Request"] = "true"
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        retry = kwargs.pop("retry", None)
+        if self.retry_policy is not None and self.retry_policy.applies_to(method, retry):
+            send = functools.partial(self._send, method, url, headers, raise_exception, **kwargs)
+            return await self.retry_policy.call_async(send)
+        return await self._send(method, url, headers, raise_exception, **kwargs)
 
-        if self.token and not isinstance(self.token, CoroutineType):
-            headers["X-Vault-Token"] = self.token
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        base_uri: Optional[str] = None,
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        if self.circuit_breaker is None:
+            return await self._transmit(method, url, headers, raise_exception, base_uri, **kwargs)
+        send = functools.partial(self._transmit, method, url, headers, raise_exception, base_uri, **kwargs)
+        return await self.circuit_breaker.call_async(method, url, self.namespace, send, node=base_uri)
 
-        if self.namespace:
-            headers["X-Vault-Namespace"] = self.namespace
+    async def _transmit(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        base_uri: Optional[str] = None,
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
 
-        wrap_ttl = kwargs.pop("wrap_ttl", None)
-        if wrap_ttl:
-            headers["X-Vault-Wrap-TTL"] = str(wrap_ttl)
+        url = replace_double_slashes_to_single(url)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(url, self.namespace)
+        path, url = url, urljoin(base_uri or self.base_uri, url)
+        headers = self._request_headers(headers, kwargs.pop("wrap_ttl", None))
+        session = active_session(self.consistency)
+        session.apply(headers)
 
         _kwargs: dict[str, Any] = {"timeout": self._kwargs.get("timeout")}
         _kwargs.update(kwargs)
@@ -687,11 +1258,364 @@ class AsyncVaultxAdapter(AsyncAdapter):
                 params.update({"list": "true"})
             _kwargs["params"] = params
 
-        response = await self.client.request(
-            method=method, url=url, headers=headers, follow_redirects=self.follow_redirects, **_kwargs
-        )
+        if self.pool_stats is not None:
+            # Only used by httpcore transports, sessions of the aiohttp transport record the wait themselves
+            trace = _AsyncPoolWaitTrace(self.pool_stats)
+            _kwargs["extensions"] = {**_kwargs.get("extensions", {}), "trace": trace}
+
+        response = await self._client_request(method, url, headers, **_kwargs)
+        session.record(response.headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(path, self.namespace, response.status_code)
 
         if not response.is_success and (raise_exception and not self.ignore_exceptions):
-            raise exceptions.HTTPError(status_code=response.status_code, method=method, url=url)
+            await response.aclose()
+            raise exceptions.HTTPError(
+                status_code=response.status_code, method=method, url=url, headers=response.headers
+            )
 
         return VaultxResponse(response)
+
+    async def _client_request(
+        self, method: str, url: str, headers: dict[str, str], stream: bool = False, **kwargs: Any
+    ) -> httpx.Response:
+        if not stream:
+            return await self.client.request(
+                method=method, url=url, headers=headers, follow_redirects=self.follow_redirects, **kwargs
+            )
+        # The body is left unread, to be iterated over and closed by the caller
+        request = self.client.build_request(method=method, url=url, headers=headers, **kwargs)
+        return await self.client.send(request, stream=True, follow_redirects=self.follow_redirects)
+
+
+def _aiohttp_ssl(
+    verify: Union[ssl.SSLContext, str, bool], cert: Optional[_types.CertTypes]
+) -> Union[ssl.SSLContext, bool]:
+    if isinstance(verify, ssl.SSLContext):
+        context = verify
+    elif verify is False and not cert:
+        return False
+    elif isinstance(verify, str):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        context = ssl.create_default_context()
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+
+    if isinstance(cert, str):
+        context.load_cert_chain(cert)
+    elif cert:
+        context.load_cert_chain(*cert)
+    return context
+
+
+def _aiohttp_params(params: Optional[Mapping[str, Any]]) -> Optional[list[tuple[str, str]]]:
+    # aiohttp rejects booleans and None, encode them the way httpx does.
+    if not params:
+        return None
+    encoded = []
+    for key, value in params.items():
+        for item in value if isinstance(value, (list, tuple)) else (value,):
+            if item is True:
+                item = "true"
+            elif item is False:
+                item = "false"
+            elif item is None:
+                item = ""
+            encoded.append((key, str(item)))
+    return encoded
+
+
+async def _read_and_release(response: "aiohttp.ClientResponse") -> bytes:
+    try:
+        return await response.read()
+    finally:
+        response.release()
+
+
+@exceptions.async_handle_unknown_exception
+class AiohttpVaultxAdapter(AsyncAdapter):
+    """
+    Asynchronous adapter sending requests with an aiohttp.ClientSession directly, without going through httpx.
+
+    Responses are AiohttpVaultxResponse instances, which behave like any other VaultxResponse.
+    """
+
+    def __init__(
+        self,
+        base_uri: str = DEFAULT_URL,
+        token: Optional[str] = None,
+        cert: Optional[_types.CertTypes] = None,
+        verify: Union[ssl.SSLContext, str, bool] = True,
+        timeout: int = 30,
+        proxy: Optional[str] = None,
+        follow_redirects: bool = True,
+        client: Optional["aiohttp.ClientSession"] = None,
+        namespace: Optional[str] = None,
+        ignore_exceptions: bool = False,
+        strict_http: bool = False,
+        request_header: bool = True,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        track_pool_wait: bool = False,
+        retry_policy: Optional["RetryPolicy"] = None,
+        consistency: str = EVENTUAL,
+        coalesce_requests: bool = False,
+        rate_limiter: Optional["RateLimiter"] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        login_cache: Optional["CacheTypes"] = None,
+        limit_per_host: int = 0,
+        ttl_dns_cache: Optional[int] = 10,
+    ) -> None:
+        """
+        Create a new aiohttp adapter instance.
+
+        :param base_uri: Base URL for the Vault instance being addressed, or unix:///path/to/socket to send requests
+            over a Unix domain socket, e.g. to a local Vault Agent listener, base_uri then being "http://localhost".
+            A socket address cannot be combined with client, which would not send requests over it.
+        :param token: Authentication token to include in requests sent to Vault.
+        :param cert: Certificates for use in requests sent to the Vault instance. This should be a tuple with the
+            certificate and then key.
+        :param verify: Either a boolean to indicate whether TLS verification should be performed
+            when sending requests to Vault, a string pointing at the CA bundle to use for verification,
+            or an ssl.SSLContext.
+        :param timeout: The timeout value for requests sent to Vault.
+        :param proxy: Proxy to use when performing requests.
+        :param follow_redirects: Whether to follow redirects when sending requests to Vault.
+        :param client: Optional aiohttp.ClientSession to use when performing requests. The connector parameters
+            below are ignored when a session is provided.
+        :param namespace: Optional Vault Namespace.
+        :param ignore_exceptions: If True, always return the response object for a given request.
+            I.e., don't raise an exception based on response status code, etc.
+        :param strict_http: If True, use only standard HTTP verbs in request with additional params,
+            otherwise process as is
+        :param request_header: If true, add the X-Vault-Request header to all requests
+            to protect against SSRF vulnerabilities.
+        :param max_connections: Maximum number of simultaneous connections, None for no limit.
+        :param max_keepalive_connections: Accepted for compatibility with the other adapters; aiohttp keeps every
+            released connection open until keepalive_expiry.
+        :param keepalive_expiry: Seconds an idle connection is kept open for reuse.
+        :param http2: Must be False, aiohttp only supports HTTP/1.1.
+        :param connect_timeout: Seconds to wait for a connection to be established, defaults to timeout.
+        :param read_timeout: Seconds to wait for a chunk of the response to be received, defaults to timeout.
+        :param pool_timeout: Seconds to wait for a free connection from the pool and for establishing it, defaults
+            to timeout.
+        :param track_pool_wait: If True, record how long requests wait for a connection in pool_stats.
+        :param retry_policy: Optional policy retrying requests that failed with a transient error.
+        :param consistency: Default consistency mode of requests sent to standby nodes: "strong", "session" or
+            "eventual". See vaultx.consistency.
+        :param coalesce_requests: If True, identical GET, LIST and HEAD requests sent while one of them is in flight
+            share its response instead of being sent again.
+        :param rate_limiter: Optional limiter delaying requests to stay below Vault rate limit quotas.
+        :param circuit_breaker: Optional breaker failing requests immediately while their endpoint keeps failing.
+        :param login_cache: Optional cache of login responses, e.g. a vaultx.cache.FileCache letting the processes of
+            a host share one token instead of logging in separately.
+        :param limit_per_host: Maximum number of simultaneous connections to the same host, 0 for no limit.
+        :param ttl_dns_cache: Seconds resolved addresses are cached for, None to cache them forever.
+        """
+        if http2:
+            raise exceptions.VaultxError("HTTP/2 is not supported by aiohttp, use AsyncVaultxAdapter instead")
+
+        self.uds = _unix_socket_path(base_uri, client)
+        self.base_uri = UNIX_SOCKET_URL if self.uds is not None else base_uri
+        self.token = token
+        self.namespace = namespace
+        self.follow_redirects = follow_redirects
+        self.ignore_exceptions = ignore_exceptions
+        self.strict_http = strict_http
+        self.request_header = request_header
+        self.token_manager: Optional[Any] = None
+        self.retry_policy = retry_policy
+        self.consistency = ConsistencySession(consistency)
+        self.singleflight: Optional[AsyncSingleFlight] = AsyncSingleFlight() if coalesce_requests else None
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.login_cache = login_cache
+
+        self._session = client
+        self._kwargs: dict[str, Any] = {
+            "cert": cert,
+            "verify": verify,
+            "timeout": _httpx_timeout(timeout, connect_timeout, read_timeout, pool_timeout),
+            # Connections to a local socket are never proxied
+            "proxy": proxy if self.uds is None else None,
+        }
+        self._connector_kwargs: dict[str, Any] = {
+            "limit": max_connections or 0,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_expiry,
+            "ttl_dns_cache": ttl_dns_cache,
+        }
+        self._timeout = _aiohttp_timeout(_httpx_timeout(timeout, connect_timeout, read_timeout, pool_timeout))
+        self.pool_stats: Optional[PoolStats] = PoolStats() if track_pool_wait else None
+
+    @property
+    def session(self) -> "aiohttp.ClientSession":
+        """The aiohttp.ClientSession used for requests, created on first use so that it is bound to a running loop."""
+        if self._session is None:
+            import aiohttp
+
+            connector: aiohttp.BaseConnector
+            if self.uds is None:
+                connector = aiohttp.TCPConnector(
+                    ssl=_aiohttp_ssl(self._kwargs["verify"], self._kwargs["cert"]), **self._connector_kwargs
+                )
+            else:
+                # There are no DNS lookups to cache
+                pool = {name: value for name, value in self._connector_kwargs.items() if name != "ttl_dns_cache"}
+                connector = aiohttp.UnixConnector(self.uds, **pool)
+            trace_configs = [_pool_wait_trace_config(self.pool_stats)] if self.pool_stats is not None else None
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout, trace_configs=trace_configs
+            )
+        return self._session
+
+    async def __aenter__(self: "AiohttpVaultxAdapter") -> "AiohttpVaultxAdapter":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]] = None,
+        exc_value: Optional[BaseException] = None,
+        traceback: Optional[types.TracebackType] = None,
+    ) -> None:
+        await self.close()
+
+    async def close(self):
+        """Close the aiohttp session's connections and stop the attached token manager, if any."""
+        if self.token_manager is not None:
+            await self.token_manager.stop()
+        if self._session is not None:
+            await self._session.close()
+
+    async def get_login_token(self, response: VaultxResponse) -> str:
+        """
+        Extract the client token from a login response.
+
+        :param response: The response object returned by the login method.
+        """
+        return response.value["auth"]["client_token"]
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        raise_exception: Optional[bool] = True,
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        """
+        Main method for routing HTTP requests to the configured Vault base_uri.
+
+        :param method: HTTP method to use with the request. E.g., GET, POST, etc.
+        :param url: Partial URL path to send the request to. This will be joined to the end of the instance's base_uri
+            attribute.
+        :param headers: Additional headers to include with the request.
+        :param raise_exception: If True, raise an exception.
+        :param kwargs: Additional keyword arguments to include in the request: json, params, data or content,
+            and timeout. Pass retry=True or retry=False to override whether the retry policy of the adapter applies
+            to this request, and stream=True to get a response whose body is left unread, to be iterated over with
+            raw.aiter_bytes() and then closed with raw.aclose().
+        """
+        send = functools.partial(self._request, method, url, headers, raise_exception, **kwargs)
+        key = self._singleflight_key(method, url, headers, kwargs)
+        if key is None:
+            return await send()
+        return await self.singleflight.do(key, send)  # type: ignore[union-attr]
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        retry = kwargs.pop("retry", None)
+        if self.retry_policy is not None and self.retry_policy.applies_to(method, retry):
+            send = functools.partial(self._send, method, url, headers, raise_exception, **kwargs)
+            return await self.retry_policy.call_async(send)
+        return await self._send(method, url, headers, raise_exception, **kwargs)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        base_uri: Optional[str] = None,
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        if self.circuit_breaker is None:
+            return await self._transmit(method, url, headers, raise_exception, base_uri, **kwargs)
+        send = functools.partial(self._transmit, method, url, headers, raise_exception, base_uri, **kwargs)
+        return await self.circuit_breaker.call_async(method, url, self.namespace, send, node=base_uri)
+
+    async def _transmit(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        base_uri: Optional[str] = None,
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        url = replace_double_slashes_to_single(url)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(url, self.namespace)
+        path, url = url, urljoin(base_uri or self.base_uri, url)
+        headers = self._request_headers(headers, kwargs.pop("wrap_ttl", None))
+        session = active_session(self.consistency)
+        session.apply(headers)
+
+        params: Any = kwargs.pop("params", None)
+        if self.strict_http and method.lower() == "list":
+            method = "GET"
+            params = {**(params or {}), "list": "true"}
+
+        timeout = kwargs.pop("timeout", None)
+        json_body = kwargs.pop("json", None)
+        data = kwargs.pop("content", None) or kwargs.pop("data", None)
+        stream = kwargs.pop("stream", False)
+        if kwargs:
+            raise exceptions.VaultxError(f"Unsupported request arguments: {', '.join(kwargs)}")
+
+        response = await self.session.request(
+            method,
+            url,
+            headers=headers,
+            params=_aiohttp_params(params),
+            json=json_body,
+            data=data,
+            allow_redirects=self.follow_redirects,
+            proxy=self._kwargs["proxy"],
+            timeout=self._timeout if timeout is None else _aiohttp_timeout(httpx.Timeout(timeout)),
+        )
+        content = b"" if stream else await _read_and_release(response)
+        session.record(response.headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(path, self.namespace, response.status)
+
+        if not 200 <= response.status < 300 and (raise_exception and not self.ignore_exceptions):
+            response.release()
+            raise exceptions.HTTPError(status_code=response.status, method=method, url=url, headers=response.headers)
+
+        if stream:
+            # The body is left unread, to be iterated over with raw.aiter_bytes() and closed by the caller
+            raw = httpx.Response(
+                response.status,
+                headers=list(response.headers.items()),
+                stream=_AiohttpResponseStream(response),
+                request=httpx.Request(method, url),
+            )
+            return VaultxResponse(raw)
+        return AiohttpVaultxResponse(response.status, response.headers, content, method, url)
@@ -0,0 +1,310 @@
+"""
+Local caching proxy sharing one authenticated client between the processes of a host
+"""
+
+import ipaddress
+import logging
+from collections.abc import Awaitable, Callable, Collection, Hashable
+from typing import Any, Optional
+
+from aiohttp import web
+
+from vaultx import exceptions
+from vaultx.adapters import VaultxResponse
+from vaultx.cache import TTLCache
+from vaultx.clients import AsyncClient
+from vaultx.lifecycle import AsyncLeaseManager, AsyncTokenManager, LeaseEvent, ManagedLease
+from vaultx.singleflight import AsyncSingleFlight, SingleFlightStats
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8100
+
+# Responses under these prefixes describe the state of Vault or of tokens, and are always forwarded
+DEFAULT_UNCACHED_PREFIXES = ("sys/", "auth/")
+
+# Request headers forwarded to Vault, the token being always the one of the agent
+FORWARDED_HEADERS = (
+    "Content-Type",
+    "X-Vault-Namespace",
+    "X-Vault-Wrap-TTL",
+    "X-Vault-Index",
+    "X-Vault-Inconsistent",
+    "X-Vault-Forward",
+)
+
+# Methods which never modify anything in Vault, and so never invalidate cached responses
+_READ_METHODS = frozenset({"GET", "LIST"})
+
+# KV v2 operations addressing the same secret as reads of its "data" path
+_KV_OPERATIONS = frozenset({"data", "metadata", "delete", "undelete", "destroy"})
+
+CACHE_HEADER = "X-Vaultx-Cache"
+
+
+def _secret_path(path: str) -> str:
+    """Path of the secret a request addresses, e.g. "secret/app" for both "secret/data/app" and "secret/destroy/app"."""
+    mount, _, rest = path.partition("/")
+    operation, _, secret = rest.partition("/")
+    return f"{mount}/{secret}" if operation in _KV_OPERATIONS and secret else path
+
+
+def _response_value(response: VaultxResponse) -> Any:
+    try:
+        return response.value
+    except (ValueError, exceptions.VaultxError):
+        # Not JSON, e.g. a PEM encoded certificate
+        return {}
+
+
+def _wrapped(response: VaultxResponse) -> bool:
+    """Whether a response holds a single-use wrapping token, which must only ever reach one caller."""
+    value = _response_value(response)
+    return isinstance(value, dict) and bool(value.get("wrap_info"))
+
+
+def _error(status: int, message: str, headers: Optional[dict[str, str]] = None) -> web.Response:
+    return web.json_response({"errors": [message]}, status=status, headers=headers)
+
+
+class AgentStats:
+    """Counters describing the requests an agent has served since its creation."""
+
+    __slots__ = ("requests", "forwarded", "leases", "errors")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.forwarded = 0
+        self.leases = 0
+        self.errors = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+class Agent:
+    """
+    Local proxy forwarding Vault API requests with the token of a single AsyncClient.
+
+    Processes of the host send plain Vault API requests to the agent, on a Unix socket or a loopback port, without
+    logging in: the agent sends them to Vault with its own token, which its token manager keeps alive, and over its
+    own connection pool. Any token sent by a process is ignored.
+
+    Successful GET responses outside of uncached_prefixes are cached. Responses carrying a lease, e.g. database
+    credentials, are shared by every process until the lease expires, and renewable leases are renewed by the
+    agent's lease manager; others are kept for cache_ttl seconds. Concurrent identical reads are sent once. Wrapped
+    responses, whose wrapping token can be unwrapped only once, are never cached nor shared. Writes drop the cached
+    responses of the path they address, KV v2 operations being mapped to the secret they modify.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        relogin: Optional[Callable[[], Awaitable[Any]]] = None,
+        cache_ttl: float = 60.0,
+        max_entries: int = 1024,
+        uncached_prefixes: Collection[str] = DEFAULT_UNCACHED_PREFIXES,
+    ) -> None:
+        """
+        Create a new Agent instance.
+
+        :param client: Authenticated client requests are sent with.
+        :param relogin: Optional coroutine function logging the client in again once its token cannot be renewed.
+        :param cache_ttl: Number of seconds responses without a lease are cached for.
+        :param max_entries: Maximum number of cached responses.
+        :param uncached_prefixes: Path prefixes, after "/v1/", of requests which are never cached.
+        """
+        self.client = client
+        self.uncached_prefixes = tuple(uncached_prefixes)
+        self.cache = TTLCache(ttl=cache_ttl, max_entries=max_entries)
+        self.token_manager = AsyncTokenManager(client.adapter, relogin=relogin)
+        self.lease_manager = AsyncLeaseManager(client.adapter)
+        self.lease_manager.add_listener(self._on_lease_event)
+        self._lease_keys: dict[str, Hashable] = {}
+        self._singleflight = AsyncSingleFlight()
+        self._stats = AgentStats()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> "Agent":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    @property
+    def stats(self) -> AgentStats:
+        """Request, forwarding and lease counters of this agent. Cache counters are in cache.stats."""
+        return self._stats
+
+    @property
+    def singleflight_stats(self) -> SingleFlightStats:
+        """Counters of the reads sent to Vault and of those served by a concurrent identical read."""
+        return self._singleflight.stats
+
+    def application(self) -> web.Application:
+        """
+        Build the aiohttp application serving the Vault API, to be run with start or by any aiohttp runner.
+
+        :return: The application.
+        """
+        app = web.Application()
+        app.router.add_route("*", "/v1/{path:.*}", self.handle)
+        return app
+
+    async def start(self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> "Agent":
+        """
+        Start the token and lease managers and listen for requests.
+
+        :param path: Path of a Unix socket to listen on, instead of a TCP port.
+        :param host: Loopback address to listen on when no path is given. Other addresses are refused, since the
+            agent hands its token's permissions to anyone able to reach it.
+        :param port: TCP port to listen on when no path is given.
+        :return: The started agent.
+        """
+        if path is None and host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(f'"host" must be a loopback address, "{host}" provided')
+        if self._runner is not None:
+            return self
+
+        await self.token_manager.start()
+        await self.lease_manager.start()
+        runner = web.AppRunner(self.application(), access_log=None)
+        await runner.setup()
+        site = web.UnixSite(runner, path) if path is not None else web.TCPSite(runner, host, port)
+        try:
+            await site.start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        logger.info("Vault agent listening on %s", site.name)
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening and stop the token and lease managers. Leases are left untouched in Vault."""
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            await runner.cleanup()
+        await self.lease_manager.stop()
+        await self.token_manager.stop()
+
+    def _cacheable(self, method: str, path: str, headers: dict[str, str]) -> bool:
+        return method == "GET" and "X-Vault-Wrap-TTL" not in headers and not path.startswith(self.uncached_prefixes)
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        """
+        Serve a Vault API request, from the cache or by forwarding it to Vault.
+
+        :param request: Request of a local process.
+        :return: The response of Vault, with an X-Vaultx-Cache header telling whether it was cached.
+        """
+        self._stats.requests += 1
+        path = request.match_info["path"].strip("/")
+        headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+        params = dict(request.query)
+        body = await request.read()
+
+        if not self._cacheable(request.method, path, headers):
+            response = await self._forward(request.method, path, headers, params, body)
+            if isinstance(response, VaultxResponse):
+                if request.method not in _READ_METHODS and response.status < 400:
+                    self._invalidate(path)
+                return self._respond(response, "BYPASS")
+            return response
+
+        key = (path, tuple(sorted(params.items())), headers.get("X-Vault-Namespace"))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._respond(cached, "HIT")
+
+        sent = False
+
+        async def load() -> Any:
+            nonlocal sent
+            sent = True
+            loaded = await self._forward(request.method, path, headers, params, body)
+            if isinstance(loaded, VaultxResponse) and loaded.status == 200:
+                self._store(key, loaded)
+            return loaded
+
+        response = await self._singleflight.do(key, load)
+        if isinstance(response, VaultxResponse) and not sent and _wrapped(response):
+            # Wrapped by a Vault policy rather than on request: the wrapping token belongs to the caller who sent it
+            response = await self._forward(request.method, path, headers, params, body)
+            if isinstance(response, VaultxResponse):
+                return self._respond(response, "BYPASS")
+        return self._respond(response, "MISS") if isinstance(response, VaultxResponse) else response
+
+    async def _forward(
+        self, method: str, path: str, headers: dict[str, str], params: dict[str, str], body: bytes
+    ) -> Any:
+        """Send a request to Vault, returning its response, or the error response to answer if it could not be sent."""
+        self._stats.forwarded += 1
+        kwargs: dict[str, Any] = {"params": params} if params else {}
+        if body:
+            kwargs["content"] = body
+        try:
+            url = f"/v1/{path}"
+            return await self.client.adapter.request(method, url, headers=headers, raise_exception=False, **kwargs)
+        except exceptions.CircuitOpenError as e:
+            self._stats.errors += 1
+            return _error(503, str(e), headers={"Retry-After": str(int(e.retry_after) + 1)})
+        except Exception as e:
+            # Connection errors of the async adapters reach here unwrapped, as well as VaultxError
+            self._stats.errors += 1
+            logger.warning("Forwarding %s %s failed: %s", method, path, e)
+            return _error(502, str(e))
+
+    def _store(self, key: Hashable, response: VaultxResponse) -> None:
+        value = _response_value(response)
+        if isinstance(value, dict) and value.get("wrap_info"):
+            return
+        lease_id = value.get("lease_id") if isinstance(value, dict) else None
+        if not lease_id:
+            self.cache.set(key, response)
+            return
+        lease_duration = value.get("lease_duration") or 0
+        if lease_duration <= 0:
+            return
+        if self.lease_manager.register(value) is not None:
+            self._lease_keys[lease_id] = key
+            self._stats.leases += 1
+            self.cache.set(key, response, ttl=lease_duration)
+        else:
+            # Leases which cannot be renewed stop being handed out before they are about to expire
+            self.cache.set(key, response, ttl=lease_duration * self.lease_manager.renew_fraction)
+
+    def _on_lease_event(self, event: str, lease: ManagedLease, error: Optional[BaseException]) -> None:
+        key = self._lease_keys.get(lease.lease_id)
+        if key is None:
+            return
+        if event == LeaseEvent.RENEWED:
+            cached = self.cache.get(key)
+            if cached is not None and cached.value.get("lease_id") == lease.lease_id:
+                self.cache.set(key, cached, ttl=lease.lease_duration)
+                return
+            # The response expired, was evicted or invalidated, or was replaced by one with a new lease
+        else:
+            # The lease cannot be renewed anymore: the next read gets new credentials instead of expiring ones
+            self.cache.invalidate(key)
+        del self._lease_keys[lease.lease_id]
+        self.lease_manager.unregister(lease.lease_id)
+
+    def _invalidate(self, path: str) -> None:
+        secret = _secret_path(path)
+        self.cache.invalidate_where(lambda key: _secret_path(key[0]) == secret)
+
+    def _respond(self, response: VaultxResponse, cache_status: str) -> web.Response:
+        headers = {CACHE_HEADER: cache_status}
+        content_type = response.headers.get("Content-Type")
+        if content_type:
+            headers["Content-Type"] = content_type
+        index = response.headers.get("X-Vault-Index")
+        if index:
+            headers["X-Vault-Index"] = index
+        return web.Response(status=response.status, body=response.content, headers=headers)
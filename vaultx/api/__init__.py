@@ -1,14 +1,20 @@
 """Collection of Vault API endpoint classes."""
 
-from vaultx.api.async_auth_methods import AsyncAuthMethods
-from vaultx.api.async_secrets_engines import AsyncSecretsEngines
-from vaultx.api.async_system_backend import AsyncSystemBackend
-from vaultx.api.auth_methods import AuthMethods
-from vaultx.api.secrets_engines import SecretsEngines
-from vaultx.api.system_backend import SystemBackend
+import importlib
+import typing as tp
+
 from vaultx.api.vault_api_base import AsyncVaultApiBase, VaultApiBase
 
 
+if tp.TYPE_CHECKING:
+    from vaultx.api.async_auth_methods import AsyncAuthMethods
+    from vaultx.api.async_secrets_engines import AsyncSecretsEngines
+    from vaultx.api.async_system_backend import AsyncSystemBackend
+    from vaultx.api.auth_methods import AuthMethods
+    from vaultx.api.secrets_engines import SecretsEngines
+    from vaultx.api.system_backend import SystemBackend
+
+
 __all__ = (
     "AuthMethods",
     "SecretsEngines",
@@ -19,3 +25,26 @@ __all__ = (
     "VaultApiBase",
     "AsyncVaultApiBase",
 )
+
+# Categories are imported on first access, so that a synchronous client never loads the asynchronous ones
+_LAZY_ATTRIBUTES = {
+    "AuthMethods": "vaultx.api.auth_methods",
+    "SecretsEngines": "vaultx.api.secrets_engines",
+    "SystemBackend": "vaultx.api.system_backend",
+    "AsyncAuthMethods": "vaultx.api.async_auth_methods",
+    "AsyncSecretsEngines": "vaultx.api.async_secrets_engines",
+    "AsyncSystemBackend": "vaultx.api.async_system_backend",
+}
+
+
+def __getattr__(name: str) -> tp.Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
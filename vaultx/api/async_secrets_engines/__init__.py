@@ -1,26 +1,30 @@
 """Vault secrets engines endpoints"""
 
+import importlib
 import typing as tp
 
 from vaultx import exceptions
 from vaultx.adapters import AsyncAdapter
-from vaultx.api.async_secrets_engines.active_directory import ActiveDirectory
-from vaultx.api.async_secrets_engines.aws import Aws
-from vaultx.api.async_secrets_engines.azure import Azure
-from vaultx.api.async_secrets_engines.consul import Consul
-from vaultx.api.async_secrets_engines.database import Database
-from vaultx.api.async_secrets_engines.gcp import Gcp
-from vaultx.api.async_secrets_engines.identity import Identity
-from vaultx.api.async_secrets_engines.kv import Kv
-from vaultx.api.async_secrets_engines.kv_v1 import KvV1
-from vaultx.api.async_secrets_engines.kv_v2 import KvV2
-from vaultx.api.async_secrets_engines.ldap import Ldap
-from vaultx.api.async_secrets_engines.pki import Pki
-from vaultx.api.async_secrets_engines.rabbitmq import RabbitMQ
-from vaultx.api.async_secrets_engines.ssh import Ssh
-from vaultx.api.async_secrets_engines.transform import Transform
-from vaultx.api.async_secrets_engines.transit import Transit
-from vaultx.api.vault_api_base import AsyncVaultApiBase
+from vaultx.api.vault_api_base import AsyncVaultApiCategory
+
+
+if tp.TYPE_CHECKING:
+    from vaultx.api.async_secrets_engines.active_directory import ActiveDirectory
+    from vaultx.api.async_secrets_engines.aws import Aws
+    from vaultx.api.async_secrets_engines.azure import Azure
+    from vaultx.api.async_secrets_engines.consul import Consul
+    from vaultx.api.async_secrets_engines.database import Database
+    from vaultx.api.async_secrets_engines.gcp import Gcp
+    from vaultx.api.async_secrets_engines.identity import Identity
+    from vaultx.api.async_secrets_engines.kv import Kv
+    from vaultx.api.async_secrets_engines.kv_v1 import KvV1
+    from vaultx.api.async_secrets_engines.kv_v2 import KvV2
+    from vaultx.api.async_secrets_engines.ldap import Ldap
+    from vaultx.api.async_secrets_engines.pki import Pki
+    from vaultx.api.async_secrets_engines.rabbitmq import RabbitMQ
+    from vaultx.api.async_secrets_engines.ssh import Ssh
+    from vaultx.api.async_secrets_engines.transform import Transform
+    from vaultx.api.async_secrets_engines.transit import Transit
 
 
 __all__ = (
@@ -43,43 +47,55 @@ __all__ = (
     "AsyncSecretsEngines",
 )
 
+# Classes of the package imported on first access, see the implemented classes of the category below
+_LAZY_ATTRIBUTES = {
+    "ActiveDirectory": "vaultx.api.async_secrets_engines.active_directory",
+    "Aws": "vaultx.api.async_secrets_engines.aws",
+    "Azure": "vaultx.api.async_secrets_engines.azure",
+    "Consul": "vaultx.api.async_secrets_engines.consul",
+    "Database": "vaultx.api.async_secrets_engines.database",
+    "Gcp": "vaultx.api.async_secrets_engines.gcp",
+    "Identity": "vaultx.api.async_secrets_engines.identity",
+    "Kv": "vaultx.api.async_secrets_engines.kv",
+    "KvV1": "vaultx.api.async_secrets_engines.kv_v1",
+    "KvV2": "vaultx.api.async_secrets_engines.kv_v2",
+    "Ldap": "vaultx.api.async_secrets_engines.ldap",
+    "Pki": "vaultx.api.async_secrets_engines.pki",
+    "RabbitMQ": "vaultx.api.async_secrets_engines.rabbitmq",
+    "Ssh": "vaultx.api.async_secrets_engines.ssh",
+    "Transform": "vaultx.api.async_secrets_engines.transform",
+    "Transit": "vaultx.api.async_secrets_engines.transit",
+}
 
-@exceptions.handle_unknown_exception
-class AsyncSecretsEngines(AsyncVaultApiBase):
-    """Secrets Engines."""
 
-    _implemented_classes: tp.Final[dict] = {
-        "_aws": Aws,
-        "_azure": Azure,
-        "_gcp": Gcp,
-        "_active_directory": ActiveDirectory,
-        "_identity": Identity,
-        "_kv": Kv,
-        "_ldap": Ldap,
-        "_pki": Pki,
-        "_transform": Transform,
-        "_transit": Transit,
-        "_database": Database,
-        "_rabbitmq": RabbitMQ,
-        "_ssh": Ssh,
-    }
+def __getattr__(name: str) -> tp.Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
-    def __init__(self, adapter: AsyncAdapter) -> None:
-        for attr_name, _class in self._implemented_classes.items():
-            setattr(self, attr_name, _class(adapter=adapter))
-        super().__init__(adapter)
 
-    def __getattr__(self, item: str):
-        """
-        Get an instance of a class instance.
+@exceptions.handle_unknown_exception
+class AsyncSecretsEngines(AsyncVaultApiCategory):
+    """Secrets Engines."""
 
-        :param item: Name of the class being requested.
-        :return: The requested class instance where available.
-        """
-        item = f"_{item}"
-        if item in self._implemented_classes:
-            return getattr(self, item)
-        raise AttributeError
+    _implemented_classes: tp.ClassVar[dict] = {
+        "_aws": "vaultx.api.async_secrets_engines.aws.Aws",
+        "_azure": "vaultx.api.async_secrets_engines.azure.Azure",
+        "_gcp": "vaultx.api.async_secrets_engines.gcp.Gcp",
+        "_active_directory": "vaultx.api.async_secrets_engines.active_directory.ActiveDirectory",
+        "_identity": "vaultx.api.async_secrets_engines.identity.Identity",
+        "_kv": "vaultx.api.async_secrets_engines.kv.Kv",
+        "_ldap": "vaultx.api.async_secrets_engines.ldap.Ldap",
+        "_pki": "vaultx.api.async_secrets_engines.pki.Pki",
+        "_transform": "vaultx.api.async_secrets_engines.transform.Transform",
+        "_transit": "vaultx.api.async_secrets_engines.transit.Transit",
+        "_database": "vaultx.api.async_secrets_engines.database.Database",
+        "_rabbitmq": "vaultx.api.async_secrets_engines.rabbitmq.RabbitMQ",
+        "_ssh": "vaultx.api.async_secrets_engines.ssh.Ssh",
+    }
 
     @property
     def adapter(self) -> AsyncAdapter:
@@ -99,5 +115,4 @@ class AsyncSecretsEngines(AsyncVaultApiBase):
         :param adapter: New adapter instance to set for this class and all implemented classes.
         """
         self._adapter = adapter
-        for implemented_class in self._implemented_classes:
-            getattr(self, f"{implemented_class}").adapter = adapter
+        self._set_implemented_adapters(adapter)
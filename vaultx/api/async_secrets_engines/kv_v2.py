@@ -1,8 +1,15 @@
-from typing import Any, Optional
-
-from vaultx import exceptions
+import asyncio
+import functools
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from typing import Any, Optional, Union
+
+from vaultx import exceptions, utils
 from vaultx.adapters import VaultxResponse
 from vaultx.api.vault_api_base import AsyncVaultApiBase
+from vaultx.cache import CacheTypes, TTLCache, _Generations, load_snapshot, save_snapshot
+from vaultx.constants.kv import DEFAULT_LIST_CONCURRENCY, DEFAULT_READ_CONCURRENCY
 from vaultx.exceptions import VaultxError
 
 
@@ -16,6 +23,146 @@ class KvV2(AsyncVaultApiBase):
     Reference: https://www.vaultproject.io/api/secret/kv/kv-v2.html
     """
 
+    def __init__(self, adapter, cache: Optional[CacheTypes] = None) -> None:
+        """
+        Create a new KvV2 instance.
+
+        :param adapter: Instance of :py:class:`vaultx.adapters.AsyncAdapter`; used for performing HTTP requests.
+        :param cache: Optional read cache for read_secret_version results. Disabled when not provided.
+        """
+        super().__init__(adapter=adapter)
+        self._cache = cache
+        self._generations = _Generations()
+        self._revalidation: Optional[asyncio.Future] = None
+
+    @property
+    def cache(self) -> Optional[CacheTypes]:
+        """The read cache used by read_secret_version, if enabled."""
+        return self._cache
+
+    def enable_cache(
+        self, ttl: float = 60.0, max_entries: int = 1024, cache: Optional[CacheTypes] = None
+    ) -> CacheTypes:
+        """
+        Enable the client-side read-through cache for read_secret_version.
+
+        Entries are keyed by (mount_point, path, version, namespace) and are dropped when this instance writes,
+        patches, deletes, undeletes or destroys the secret at the same path.
+        Cached responses are shared between callers and must be treated as read-only.
+
+        :param ttl: Number of seconds a cached response stays valid.
+        :param max_entries: Maximum number of cached responses; the least recently used ones are evicted first.
+        :param cache: Cache to use instead of a new TTLCache, e.g. a FileCache shared with the other processes of
+            the host. ttl and max_entries are then ignored.
+        :return: The cache, whose "stats" attribute exposes hit, miss and eviction counters.
+        """
+        self._cache = cache if cache is not None else TTLCache(ttl=ttl, max_entries=max_entries)
+        return self._cache
+
+    def disable_cache(self) -> None:
+        """Disable the read cache and drop all of its entries."""
+        if self._cache is not None:
+            self._cache.clear()
+        self._cache = None
+
+    def _cache_key(self, path: str, version: Optional[int], mount_point: str) -> tuple[str, str, Optional[int], Any]:
+        return mount_point.strip("/"), path.strip("/"), version, getattr(self._adapter, "namespace", None)
+
+    def _invalidate_cache(self, path: str, mount_point: str) -> None:
+        if self._cache is None:
+            return
+        mount_point, path, _, namespace = self._cache_key(path, None, mount_point)
+        self._generations.bump((mount_point, path, namespace))
+        self._cache.invalidate_where(lambda key: key[0] == mount_point and key[1] == path and key[3] == namespace)
+
+    async def save_snapshot(
+        self, path: Union[str, "os.PathLike[str]"], key: bytes, max_age: float = 86400.0
+    ) -> int:
+        """
+        Save the cached responses to an encrypted snapshot file, to warm up the cache of a later process.
+
+        The file is written in the default executor.
+
+        :param path: Path of the snapshot file, replaced atomically.
+        :param key: AES key of 16, 24 or 32 bytes, kept apart from the snapshot, e.g. in the environment of the
+            process: a key stored next to the file would give no protection at rest.
+        :param max_age: Number of seconds the snapshot can be loaded for.
+        :return: Number of saved responses.
+        """
+        if self._cache is None:
+            raise VaultxError("The read cache must be enabled to save a snapshot")
+        items = self._cache.items()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(save_snapshot, path, items, max_age, key=key))
+
+    async def load_snapshot(
+        self, path: Union[str, "os.PathLike[str]"], key: bytes, revalidate: bool = True
+    ) -> int:
+        """
+        Warm up the read cache with the responses of a snapshot file saved by save_snapshot.
+
+        Loaded responses are served right away, for the cache ttl, while they are revalidated against the current
+        version of their secret; the cache is enabled with default settings if needed. A missing, expired or
+        undecryptable snapshot loads nothing. The file is read in the default executor.
+
+        :param path: Path of the snapshot file.
+        :param key: AES key the snapshot was saved with.
+        :param revalidate: Whether to revalidate the loaded entries in a background task.
+        :return: Number of loaded responses.
+        """
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(None, functools.partial(load_snapshot, path, key=key))
+        cache = self._cache if self._cache is not None else self.enable_cache()
+        for entry_key, value in entries:
+            cache.set(entry_key, value)
+        if revalidate and entries:
+            # A reference is kept so that the task is not garbage collected while it runs
+            self._revalidation = asyncio.ensure_future(self.revalidate_cache([entry_key for entry_key, _ in entries]))
+        return len(entries)
+
+    async def revalidate_cache(
+        self, keys: Optional[Iterable[Any]] = None, concurrency: int = DEFAULT_READ_CONCURRENCY
+    ) -> int:
+        """
+        Check cached responses against the metadata of their secret, dropping or refreshing the outdated ones.
+
+        A cached latest version is read again when a newer version exists, and a cached pinned version is dropped
+        once deleted or destroyed. Responses of other namespaces are dropped, and those that could not be checked,
+        e.g. because Vault is unreachable, are kept until they expire.
+
+        :param keys: Cache keys to check, every cached response by default.
+        :param concurrency: Maximum number of concurrent metadata requests.
+        :return: Number of dropped or refreshed responses.
+        """
+        if self._cache is None:
+            return 0
+        if keys is None:
+            keys = [entry_key for entry_key, _ in self._cache.items()]
+        changed = await utils.async_map_concurrently(self._revalidate_entry, keys, concurrency=concurrency)
+        return sum(result is True for result in changed.values())
+
+    async def _revalidate_entry(self, key: Any) -> bool:
+        assert self._cache is not None
+        mount_point, path, version, namespace = key
+        cached = self._cache.get(key)
+        if cached is None:
+            return False
+        if namespace != getattr(self._adapter, "namespace", None):
+            self._cache.invalidate(key)
+            return True
+        try:
+            metadata = (await self.read_secret_metadata(path=path, mount_point=mount_point))["data"]
+        except exceptions.HTTPError as e:
+            if e.status_code != 404:
+                raise
+            metadata = None
+        if not _is_stale(cached, version, metadata):
+            return False
+        self._cache.invalidate(key)
+        if version is None and metadata is not None:
+            await self.read_secret_version(path=path, mount_point=mount_point)
+        return True
+
     async def configure(
         self,
         max_versions: int = 10,
@@ -114,6 +261,26 @@ class KvV2(AsyncVaultApiBase):
         :return: The VaultxResponse of the request.
         """
 
+        read = functools.partial(self._read_secret_version, path, version, mount_point, raise_on_deleted_version)
+        if self._cache is None:
+            return await read()
+        key = self._cache_key(path, version, mount_point)
+        secret = (key[0], key[1], key[3])
+        response = None
+
+        async def load() -> Optional[VaultxResponse]:
+            nonlocal response
+            generation = self._generations.current(secret)
+            response = await read()
+            # A write invalidated the secret while it was read: the response may predate it, so it is not stored
+            return response if self._generations.current(secret) == generation else None
+
+        cached = await self._cache.get_or_set_async(key, load)
+        return cached if cached is not None else response
+
+    async def _read_secret_version(
+        self, path: str, version: Optional[int], mount_point: str, raise_on_deleted_version: bool
+    ) -> Optional[VaultxResponse]:
         params = {}
         if version is not None:
             params["version"] = version
@@ -128,6 +295,31 @@ class KvV2(AsyncVaultApiBase):
                 return None
             raise
 
+    async def read_many(
+        self,
+        paths: Iterable[str],
+        mount_point: str = DEFAULT_MOUNT_POINT,
+        concurrency: int = DEFAULT_READ_CONCURRENCY,
+        on_error: str = "return",
+    ) -> dict[str, Union[VaultxResponse, Exception]]:
+        """
+        Retrieve the latest versions of secrets at the specified locations concurrently.
+
+        At most concurrency requests are in flight at once, all sharing this instance's adapter.
+
+        :param paths: Specifies the paths of the secrets to read. Duplicates are read once.
+        :param mount_point: The "path" the secret engine was mounted on.
+        :param concurrency: Maximum number of concurrent requests.
+        :param on_error: Partial failure policy. "return" maps a failed path to the raised exception,
+            "skip" leaves failed paths out of the result and "raise" re-raises the first error.
+        :return: Mapping of each path to its VaultxResponse (or exception), in input order.
+        """
+
+        async def read(path: str) -> VaultxResponse:
+            return await self.read_secret_version(path=path, mount_point=mount_point, raise_on_deleted_version=True)  # type: ignore[return-value]
+
+        return await utils.async_map_concurrently(read, paths, concurrency=concurrency, on_error=on_error)
+
     async def create_or_update_secret(
         self, path: str, secret, cas: Optional[int] = None, mount_point: str = DEFAULT_MOUNT_POINT
     ) -> VaultxResponse:
@@ -156,10 +348,13 @@ class KvV2(AsyncVaultApiBase):
             params["options"]["cas"] = cas
 
         api_path = f"/v1/{mount_point}/data/{path}"
-        return await self._adapter.post(
-            url=api_path,
-            json=params,
-        )
+        try:
+            return await self._adapter.post(
+                url=api_path,
+                json=params,
+            )
+        finally:
+            self._invalidate_cache(path, mount_point)
 
     async def patch(self, path: str, secret: dict[Any, Any], mount_point: str = DEFAULT_MOUNT_POINT) -> VaultxResponse:
         """
@@ -170,7 +365,8 @@ class KvV2(AsyncVaultApiBase):
         :param mount_point: The "path" the secret engine was mounted on.
         :return: The VaultxResponse of the create_or_update_secret request.
         """
-        # First, do a read.
+        # First, do a read, bypassing any cached copy so the check-and-set version is current.
+        self._invalidate_cache(path, mount_point)
         try:
             current_secret_version = await self.read_secret_version(
                 path=path,
@@ -188,7 +384,7 @@ class KvV2(AsyncVaultApiBase):
             raise VaultxError from e
 
         # Update existing secret dict.
-        patched_secret = current_secret_version["data"]["data"]
+        patched_secret = dict(current_secret_version["data"]["data"])
         patched_secret.update(secret)
 
         # Write back updated secret.
@@ -216,9 +412,12 @@ class KvV2(AsyncVaultApiBase):
         :return: The response of the request.
         """
         api_path = f"/v1/{mount_point}/data/{path}"
-        return await self._adapter.delete(
-            url=api_path,
-        )
+        try:
+            return await self._adapter.delete(
+                url=api_path,
+            )
+        finally:
+            self._invalidate_cache(path, mount_point)
 
     async def delete_secret_versions(
         self, path: str, versions: list[int], mount_point: str = DEFAULT_MOUNT_POINT
@@ -245,10 +444,13 @@ class KvV2(AsyncVaultApiBase):
             raise exceptions.VaultxError(message=error_msg)
         params = {"versions": versions}
         api_path = f"/v1/{mount_point}/delete/{path}"
-        return await self._adapter.post(
-            url=api_path,
-            json=params,
-        )
+        try:
+            return await self._adapter.post(
+                url=api_path,
+                json=params,
+            )
+        finally:
+            self._invalidate_cache(path, mount_point)
 
     async def undelete_secret_versions(
         self, path: str, versions: list[int], mount_point: str = DEFAULT_MOUNT_POINT
@@ -273,10 +475,13 @@ class KvV2(AsyncVaultApiBase):
             raise exceptions.VaultxError(message=error_msg)
         params = {"versions": versions}
         api_path = f"/v1/{mount_point}/undelete/{path}"
-        return await self._adapter.post(
-            url=api_path,
-            json=params,
-        )
+        try:
+            return await self._adapter.post(
+                url=api_path,
+                json=params,
+            )
+        finally:
+            self._invalidate_cache(path, mount_point)
 
     async def destroy_secret_versions(
         self, path: str, versions: list[int], mount_point: str = DEFAULT_MOUNT_POINT
@@ -298,10 +503,13 @@ class KvV2(AsyncVaultApiBase):
             raise exceptions.VaultxError(message=error_msg)
         params = {"versions": versions}
         api_path = f"/v1/{mount_point}/destroy/{path}"
-        return await self._adapter.post(
-            url=api_path,
-            json=params,
-        )
+        try:
+            return await self._adapter.post(
+                url=api_path,
+                json=params,
+            )
+        finally:
+            self._invalidate_cache(path, mount_point)
 
     async def list_secrets(self, path: str, mount_point: str = DEFAULT_MOUNT_POINT) -> VaultxResponse:
         """
@@ -323,6 +531,87 @@ class KvV2(AsyncVaultApiBase):
             url=api_path,
         )
 
+    async def walk(
+        self,
+        path: str = "",
+        mount_point: str = DEFAULT_MOUNT_POINT,
+        concurrency: int = DEFAULT_LIST_CONCURRENCY,
+        fetch_data: bool = False,
+    ) -> AsyncIterator[Union[str, tuple[str, VaultxResponse]]]:
+        """
+        Traverse the folders under the specified location breadth-first, yielding secret paths as they are discovered.
+
+        At most concurrency listings (and reads, when fetch_data is set) are in flight at once.
+        No new request is started while the caller handles a yielded item, so at most concurrency results are
+        buffered. Folders and secrets discovered but not visited yet are queued, so memory grows with the breadth
+        of the tree.
+        Folders and secrets deleted during the traversal are skipped.
+
+        :param path: Specifies the path of the folder to traverse. The whole mount is traversed by default.
+        :param mount_point: The "path" the secret engine was mounted on.
+        :param concurrency: Maximum number of concurrent requests.
+        :param fetch_data: If True, the latest version of every secret is read and (path, VaultxResponse)
+            tuples are yielded instead of paths.
+        :return: Asynchronous generator of secret paths, relative to the mount point.
+        """
+        if concurrency <= 0:
+            raise VaultxError(f'"concurrency" must be a positive integer, "{concurrency}" provided')
+
+        folders = deque([_folder(path)])
+        secrets: deque[str] = deque()
+        in_flight: dict[asyncio.Future[Any], tuple[bool, str]] = {}
+        try:
+            while folders or secrets or in_flight:
+                # Reads go first so that discovered secrets do not pile up while the tree is being expanded.
+                while len(in_flight) < concurrency and (folders or secrets):
+                    future, request = self._start_walk_request(folders, secrets, mount_point)
+                    in_flight[future] = request
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    is_listing, walked_path = in_flight.pop(future)
+                    result = future.result()
+                    if not is_listing:
+                        if result is not None:
+                            yield walked_path, result
+                        continue
+                    subfolders, found = _split_keys(walked_path, result)
+                    folders.extend(subfolders)
+                    if fetch_data:
+                        secrets.extend(found)
+                    else:
+                        for secret in found:
+                            yield secret
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def _start_walk_request(
+        self, folders: deque[str], secrets: deque[str], mount_point: str
+    ) -> tuple[asyncio.Future[Any], tuple[bool, str]]:
+        if secrets:
+            secret = secrets.popleft()
+            return asyncio.ensure_future(self._read_walked_secret(secret, mount_point)), (False, secret)
+        folder = folders.popleft()
+        return asyncio.ensure_future(self._list_walked_folder(folder, mount_point)), (True, folder)
+
+    async def _list_walked_folder(self, folder: str, mount_point: str) -> list[str]:
+        try:
+            response = await self.list_secrets(path=folder, mount_point=mount_point)
+        except exceptions.HTTPError as e:
+            if e.status_code == 404:
+                return []
+            raise
+        return response["data"]["keys"]
+
+    async def _read_walked_secret(self, path: str, mount_point: str) -> Optional[VaultxResponse]:
+        try:
+            return await self.read_secret_version(path=path, mount_point=mount_point, raise_on_deleted_version=True)
+        except exceptions.HTTPError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
     async def read_secret_metadata(self, path: str, mount_point: str = DEFAULT_MOUNT_POINT) -> VaultxResponse:
         """
         Retrieve the metadata and versions for the secret at the specified path.
@@ -383,10 +672,13 @@ class KvV2(AsyncVaultApiBase):
                 raise exceptions.VaultxError(error_msg)
             params["custom_metadata"] = custom_metadata
         api_path = f"/v1/{mount_point}/metadata/{path}"
-        return await self._adapter.post(
-            url=api_path,
-            json=params,
-        )
+        try:
+            return await self._adapter.post(
+                url=api_path,
+                json=params,
+            )
+        finally:
+            self._invalidate_cache(path, mount_point)
 
     async def delete_metadata_and_all_versions(
         self, path: str, mount_point: str = DEFAULT_MOUNT_POINT
@@ -403,6 +695,29 @@ class KvV2(AsyncVaultApiBase):
         :return: The response of the request.
         """
         api_path = f"/v1/{mount_point}/metadata/{path}"
-        return await self._adapter.delete(
-            url=api_path,
-        )
+        try:
+            return await self._adapter.delete(
+                url=api_path,
+            )
+        finally:
+            self._invalidate_cache(path, mount_point)
+
+
+def _is_stale(cached: Any, version: Optional[int], metadata: Optional[dict[str, Any]]) -> bool:
+    if metadata is None:
+        return True
+    if version is None:
+        return cached["data"]["metadata"]["version"] != metadata["current_version"]
+    state = metadata["versions"].get(str(version))
+    return state is None or bool(state["destroyed"] or state["deletion_time"])
+
+
+def _folder(path: str) -> str:
+    path = path.strip("/")
+    return f"{path}/" if path else ""
+
+
+def _split_keys(folder: str, keys: list[str]) -> tuple[list[str], list[str]]:
+    subfolders = [folder + key for key in keys if key.endswith("/")]
+    secrets = [folder + key for key in keys if not key.endswith("/")]
+    return subfolders, secrets
@@ -1,12 +1,21 @@
-from typing import Optional
+import asyncio
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Any, Optional
 
-from vaultx import exceptions, utils
+from vaultx import exceptions, streams, utils
 from vaultx.adapters import VaultxResponse
 from vaultx.api.vault_api_base import AsyncVaultApiBase
 from vaultx.constants import transit as transit_constants
+from vaultx.envelope import DEFAULT_DATA_KEY_BITS, DEFAULT_DATA_KEY_TTL, DEFAULT_MAX_USES, AsyncEnvelopeEncryptor
+
+
+if TYPE_CHECKING:
+    from vaultx.rewrap import AsyncRewrapCampaign, RewrapStats
 
 
 DEFAULT_MOUNT_POINT = "transit"
+DEFAULT_MAX_BATCH_SIZE = 250
+DEFAULT_MAX_BATCH_DELAY = 0.005
 
 
 class Transit(AsyncVaultApiBase):
@@ -261,6 +270,7 @@ class Transit(AsyncVaultApiBase):
         convergent_encryption: Optional[str] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
         associated_data: Optional[str] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Encrypt the provided plaintext using the named key.
@@ -298,13 +308,14 @@ class Transit(AsyncVaultApiBase):
             ciphertext is generated. It is very important when using this mode that you ensure that all nonces are
             unique for a given context. Failing to do so will severely impact the ciphertext's security.
         :param mount_point: The "path" the method/backend was mounted on.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
         if plaintext is None and batch_input is None:
             raise ValueError("plaintext must be specified unless batch_input is set")
-        params = {
-            "plaintext": plaintext,
-        }
+        params = {} if batch_input is not None else {"plaintext": plaintext}
         params.update(
             utils.remove_nones(
                 {
@@ -313,6 +324,7 @@ class Transit(AsyncVaultApiBase):
                     "key_version": key_version,
                     "nonce": nonce,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                     "type": _type,
                     "convergent_encryption": convergent_encryption,
                 }
@@ -333,6 +345,7 @@ class Transit(AsyncVaultApiBase):
         batch_input: Optional[list[dict]] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
         associated_data: Optional[str] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Decrypt the provided ciphertext using the named key.
@@ -353,13 +366,14 @@ class Transit(AsyncVaultApiBase):
             the parameters 'ciphertext', 'context' and 'nonce' are also set, they will be ignored. Format for the input
             goes like this: [dict(context="b64_context", ciphertext="b64_plaintext"), ...]
         :param mount_point: The "path" the method/backend was mounted on.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
         if ciphertext is None and batch_input is None:
             raise ValueError("ciphertext must be specified unless batch_input is set")
-        params = {
-            "ciphertext": ciphertext,
-        }
+        params = {} if batch_input is not None else {"ciphertext": ciphertext}
         params.update(
             utils.remove_nones(
                 {
@@ -367,6 +381,7 @@ class Transit(AsyncVaultApiBase):
                     "associated_data": associated_data,
                     "nonce": nonce,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -379,12 +394,13 @@ class Transit(AsyncVaultApiBase):
     async def rewrap_data(
         self,
         name: str,
-        ciphertext: str,
+        ciphertext: Optional[str] = None,
         context: Optional[str] = None,
         key_version: Optional[int] = None,
         nonce: Optional[str] = None,
         batch_input: Optional[list[dict]] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Rewrap the provided ciphertext using the latest version of the named key.
@@ -398,6 +414,7 @@ class Transit(AsyncVaultApiBase):
         :param name: Specifies the name of the encryption key to re-encrypt against.
             This is specified as part of the URL.
         :param ciphertext: Specifies the ciphertext to re-encrypt.
+            Ignored if ``batch_input`` is set, otherwise required.
         :param context: Specifies the base64 encoded context for key derivation. This is required if key derivation is
             enabled.
         :param key_version: Specifies the version of the key to use for the operation. If not set, uses the latest
@@ -409,11 +426,14 @@ class Transit(AsyncVaultApiBase):
             the parameters 'ciphertext', 'context' and 'nonce' are also set, they will be ignored. Format for the input
             goes like this: [dict(context="b64_context", ciphertext="b64_plaintext"), ...]
         :param mount_point: The "path" the method/backend was mounted on.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
-        params = {
-            "ciphertext": ciphertext,
-        }
+        if ciphertext is None and batch_input is None:
+            raise ValueError("ciphertext must be specified unless batch_input is set")
+        params = {} if batch_input is not None else {"ciphertext": ciphertext}
         params.update(
             utils.remove_nones(
                 {
@@ -421,6 +441,7 @@ class Transit(AsyncVaultApiBase):
                     "key_version": key_version,
                     "nonce": nonce,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -568,10 +589,12 @@ class Transit(AsyncVaultApiBase):
     async def generate_hmac(
         self,
         name: str,
-        hash_input: str,
+        hash_input: Optional[str] = None,
         key_version: Optional[int] = None,
         algorithm: Optional[str] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
+        batch_input: Optional[list[dict[str, str]]] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Return the digest of given data using the specified hash algorithm and the named key.
@@ -585,26 +608,35 @@ class Transit(AsyncVaultApiBase):
         :param name: Specifies the name of the encryption key to generate hmac against. This is specified as part of the
             URL.
         :param hash_input: Specifies the base64 encoded input data.
+            Ignored if ``batch_input`` is set, otherwise required.
         :param key_version: Specifies the version of the key to use for the operation. If not set, uses the latest
             version. Must be greater than or equal to the key's min_encryption_version, if set.
         :param algorithm: Specifies the hash algorithm to use. This can also be specified as part of the URL.
             Currently-supported algorithms are: sha2-224, sha2-256, sha2-384, sha2-512
         :param mount_point: The "path" the method/backend was mounted on.
+        :param batch_input: Specifies a list of items to be processed in a single batch. The format for the input is:
+            [dict(input="b64_input"), ...]. Results are returned in the ``batch_results`` array component of the
+            ``data`` element of the response.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
+        if hash_input is None and batch_input is None:
+            raise ValueError("hash_input must be specified unless batch_input is set")
         if algorithm is not None and algorithm not in transit_constants.ALLOWED_HASH_DATA_ALGORITHMS:
             allowed_types = ", ".join(transit_constants.ALLOWED_HASH_DATA_ALGORITHMS)
             raise exceptions.VaultxError(
                 f'invalid algorithm argument provided "{algorithm}", supported types: "{allowed_types}"'
             )
-        params = {
-            "input": hash_input,
-        }
+        params = {} if batch_input is not None else {"input": hash_input}
         params.update(
             utils.remove_nones(
                 {
                     "key_version": key_version,
                     "algorithm": algorithm,
+                    "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -627,6 +659,7 @@ class Transit(AsyncVaultApiBase):
         salt_length: Optional[str] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
         batch_input: Optional[list[dict[str, str]]] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """Return the cryptographic signature of the given data using the named key and the specified hash algorithm.
 
@@ -669,6 +702,9 @@ class Transit(AsyncVaultApiBase):
             This parameter is mutually exclusive with the ``hash_input`` parameter, but one of them must be supplied.
             If both are set, or neither are set, an exception will be raised.
             Responses are returned in the ``batch_results`` array component of the ``data`` element of the response.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
         if hash_algorithm is not None and hash_algorithm not in transit_constants.ALLOWED_HASH_DATA_ALGORITHMS:
@@ -711,9 +747,7 @@ class Transit(AsyncVaultApiBase):
             error_msg = "Invalid parameter combination: 'hash_input' or 'batch_input' should be provided, not both."
             raise exceptions.VaultxError(message=error_msg)
 
-        params = {
-            "input": hash_input,
-        }
+        params = {} if batch_input is not None else {"input": hash_input}
         params.update(
             utils.remove_nones(
                 {
@@ -725,6 +759,7 @@ class Transit(AsyncVaultApiBase):
                     "marshaling_algorithm": marshaling_algorithm,
                     "salt_length": salt_length,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -921,3 +956,393 @@ class Transit(AsyncVaultApiBase):
             url=api_path,
             json=params,
         )
+
+    def envelope(
+        self,
+        name: str,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+        context: Optional[str] = None,
+        bits: int = DEFAULT_DATA_KEY_BITS,
+        max_age: float = DEFAULT_DATA_KEY_TTL,
+        max_uses: int = DEFAULT_MAX_USES,
+        unwrap_ttl: float = DEFAULT_DATA_KEY_TTL,
+    ) -> AsyncEnvelopeEncryptor:
+        """
+        Create an envelope encryptor encrypting payloads locally with cached data keys wrapped by the named key.
+
+        :param name: Specifies the name of the encryption key wrapping the data keys.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param bits: Size of the data keys, 128 or 256.
+        :param max_age: Number of seconds a data key is used for encryption.
+        :param max_uses: Number of encryptions a data key is used for.
+        :param unwrap_ttl: Number of seconds an unwrapped data key is kept.
+        :return: A new AsyncEnvelopeEncryptor bound to this Transit instance.
+        """
+        return AsyncEnvelopeEncryptor(
+            self,
+            name,
+            mount_point=mount_point,
+            context=context,
+            bits=bits,
+            max_age=max_age,
+            max_uses=max_uses,
+            unwrap_ttl=unwrap_ttl,
+        )
+
+    async def encrypt_stream(
+        self,
+        name: str,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        context: Optional[str] = None,
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Encrypt a stream locally, chunk by chunk and in constant memory, with a new data key wrapped by the named key.
+
+        Supported methods:
+            POST: /{mount_point}/datakey/plaintext/{name}. Produces: 200 application/json
+
+        :param name: Specifies the name of the encryption key wrapping the data key.
+        :param source: Path or binary file object the plaintext is read from. File objects are left open.
+        :param destination: Path or binary file object the encrypted stream is written to. File objects are left open.
+        :param associated_data: Optional data authenticated along with the stream, needed again to decrypt it.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param chunk_size: Size of the chunks encrypted separately.
+        :param workers: Number of threads encrypting chunks in parallel.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        encryptor = self.envelope(name, mount_point=mount_point, context=context)
+        return await encryptor.encrypt_stream(
+            source, destination, associated_data=associated_data, chunk_size=chunk_size, workers=workers
+        )
+
+    async def decrypt_stream(
+        self,
+        name: str,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        context: Optional[str] = None,
+        workers: int = 1,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Decrypt a stream written by encrypt_stream, chunk by chunk and in constant memory, unwrapping its data key with
+        the named key.
+
+        Supported methods:
+            POST: /{mount_point}/decrypt/{name}. Produces: 200 application/json
+
+        :param name: Specifies the name of the encryption key the data key was wrapped with.
+        :param source: Path or binary file object the encrypted stream is read from. File objects are left open.
+        :param destination: Path or binary file object the plaintext is written to. File objects are left open.
+        :param associated_data: The associated data the stream was encrypted with.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param workers: Number of threads decrypting chunks in parallel.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        encryptor = self.envelope(name, mount_point=mount_point, context=context)
+        return await encryptor.decrypt_stream(source, destination, associated_data=associated_data, workers=workers)
+
+    def rewrap_campaign(
+        self,
+        name: str,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+        key_version: Optional[int] = None,
+        batch_size: int = transit_constants.DEFAULT_REWRAP_BATCH_SIZE,
+        concurrency: int = transit_constants.DEFAULT_REWRAP_CONCURRENCY,
+        checkpoint: Optional[str] = None,
+        checkpoint_interval: float = transit_constants.DEFAULT_REWRAP_CHECKPOINT_INTERVAL,
+        on_progress: Optional[Callable[["RewrapStats"], Any]] = None,
+    ) -> "AsyncRewrapCampaign":
+        """
+        Create a resumable campaign rewrapping stored ciphertexts to the latest version of the named key in batches.
+
+        :param name: Specifies the name of the encryption key the ciphertexts were encrypted with.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :param key_version: Specifies the version of the key to rewrap to, the latest version by default.
+        :param batch_size: Number of ciphertexts sent in each rewrap request.
+        :param concurrency: Maximum number of rewrap requests in flight at once.
+        :param checkpoint: Optional path of the file progress is saved to and resumed from.
+        :param checkpoint_interval: Number of seconds between checkpoints and progress reports.
+        :param on_progress: Optional callable invoked with the stats at every progress report.
+        :return: A new AsyncRewrapCampaign bound to this Transit instance, started with its run method.
+        """
+        from vaultx.rewrap import AsyncRewrapCampaign
+
+        return AsyncRewrapCampaign(
+            self,
+            name,
+            mount_point=mount_point,
+            key_version=key_version,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            checkpoint=checkpoint,
+            checkpoint_interval=checkpoint_interval,
+            on_progress=on_progress,
+        )
+
+    def batcher(
+        self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_delay: float = DEFAULT_MAX_BATCH_DELAY
+    ) -> "TransitBatcher":
+        """
+        Create a micro-batching layer coalescing concurrent single-item operations into batch_input requests.
+
+        :param max_batch_size: Number of queued items that triggers an immediate flush.
+        :param max_delay: Maximum number of seconds an item waits for more items before its batch is flushed.
+        :return: A new TransitBatcher bound to this Transit instance.
+        """
+        return TransitBatcher(self, max_batch_size=max_batch_size, max_delay=max_delay)
+
+
+class TransitBatcher:
+    """
+    Coalesce concurrent single-item Transit operations into batch_input requests.
+
+    Items are queued per (operation, key name, mount point, request-wide options) and flushed as one request once
+    max_batch_size items are queued or max_delay seconds passed since the first one. Every caller awaits its own
+    item of ``batch_results``. Batches ask Vault to report partial failures with a 200 response, so per-item errors
+    are raised as VaultxError to the affected caller only.
+    """
+
+    _methods: dict[str, str] = {
+        "encrypt": "encrypt_data",
+        "decrypt": "decrypt_data",
+        "rewrap": "rewrap_data",
+        "hmac": "generate_hmac",
+        "sign": "sign_data",
+    }
+
+    def __init__(
+        self,
+        transit: Transit,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_BATCH_DELAY,
+    ) -> None:
+        """
+        Create a new TransitBatcher instance.
+
+        :param transit: The async Transit instance used to send batches.
+        :param max_batch_size: Number of queued items that triggers an immediate flush.
+        :param max_delay: Maximum number of seconds an item waits for more items before its batch is flushed.
+        """
+        if max_batch_size <= 0:
+            raise ValueError(f'"max_batch_size" must be a positive integer, "{max_batch_size}" provided')
+        self._transit = transit
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: dict[Hashable, list[tuple[dict[str, Any], asyncio.Future]]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._inflight: set[asyncio.Task] = set()
+        self.items = 0
+        self.requests = 0
+
+    async def __aenter__(self) -> "TransitBatcher":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.flush()
+
+    async def encrypt(
+        self,
+        name: str,
+        plaintext: str,
+        context: Optional[str] = None,
+        nonce: Optional[str] = None,
+        associated_data: Optional[str] = None,
+        key_version: Optional[int] = None,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Queue a plaintext for batched encryption.
+
+        :param name: Specifies the name of the encryption key to encrypt against.
+        :param plaintext: Specifies base64 encoded plaintext to be encoded.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param nonce: Specifies the base64 encoded nonce value.
+        :param associated_data: Specifies base64 encoded associated data to be authenticated with AEAD ciphers.
+        :param key_version: Specifies the version of the key to use for encryption.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: This item's entry of batch_results, e.g. {"ciphertext": "vault:v1:..."}.
+        """
+        item = {"plaintext": plaintext, "context": context, "nonce": nonce, "associated_data": associated_data}
+        return await self._submit("encrypt", name, mount_point, item, {"key_version": key_version})
+
+    async def decrypt(
+        self,
+        name: str,
+        ciphertext: str,
+        context: Optional[str] = None,
+        nonce: Optional[str] = None,
+        associated_data: Optional[str] = None,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Queue a ciphertext for batched decryption.
+
+        :param name: Specifies the name of the encryption key to decrypt against.
+        :param ciphertext: The ciphertext to decrypt.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param nonce: Specifies a base64 encoded nonce value used during encryption.
+        :param associated_data: Specifies base64 encoded associated data to be authenticated with AEAD ciphers.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: This item's entry of batch_results, e.g. {"plaintext": "..."}.
+        """
+        item = {"ciphertext": ciphertext, "context": context, "nonce": nonce, "associated_data": associated_data}
+        return await self._submit("decrypt", name, mount_point, item, {})
+
+    async def rewrap(
+        self,
+        name: str,
+        ciphertext: str,
+        context: Optional[str] = None,
+        nonce: Optional[str] = None,
+        key_version: Optional[int] = None,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Queue a ciphertext for batched rewrapping.
+
+        :param name: Specifies the name of the encryption key to re-encrypt against.
+        :param ciphertext: Specifies the ciphertext to re-encrypt.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param nonce: Specifies a base64 encoded nonce value used during encryption.
+        :param key_version: Specifies the version of the key to use for the operation.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: This item's entry of batch_results, e.g. {"ciphertext": "vault:v2:..."}.
+        """
+        item = {"ciphertext": ciphertext, "context": context, "nonce": nonce}
+        return await self._submit("rewrap", name, mount_point, item, {"key_version": key_version})
+
+    async def hmac(
+        self,
+        name: str,
+        hash_input: str,
+        key_version: Optional[int] = None,
+        algorithm: Optional[str] = None,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Queue an input for batched HMAC generation.
+
+        :param name: Specifies the name of the encryption key to generate hmac against.
+        :param hash_input: Specifies the base64 encoded input data.
+        :param key_version: Specifies the version of the key to use for the operation.
+        :param algorithm: Specifies the hash algorithm to use.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: This item's entry of batch_results, e.g. {"hmac": "vault:v1:..."}.
+        """
+        options = {"key_version": key_version, "algorithm": algorithm}
+        return await self._submit("hmac", name, mount_point, {"input": hash_input}, options)
+
+    async def sign(
+        self,
+        name: str,
+        hash_input: str,
+        context: Optional[str] = None,
+        key_version: Optional[int] = None,
+        hash_algorithm: Optional[str] = None,
+        prehashed: Optional[bool] = None,
+        signature_algorithm: Optional[str] = None,
+        marshaling_algorithm: Optional[str] = None,
+        salt_length: Optional[str] = None,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Queue an input for batched signing.
+
+        :param name: Specifies the name of the encryption key to use for signing.
+        :param hash_input: Specifies the base64 encoded input data.
+        :param context: Base64 encoded context for key derivation.
+        :param key_version: Specifies the version of the key to use for signatures.
+        :param hash_algorithm: Specifies the hash algorithm to use for supporting key types.
+        :param prehashed: Set to true when the input is already hashed.
+        :param signature_algorithm: When using a RSA key, specifies the RSA signature algorithm to use for signing.
+        :param marshaling_algorithm: Specifies the way in which the signature should be marshaled.
+        :param salt_length: The salt length used to sign.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: This item's entry of batch_results, e.g. {"signature": "vault:v1:..."}.
+        """
+        options = {
+            "key_version": key_version,
+            "hash_algorithm": hash_algorithm,
+            "prehashed": prehashed,
+            "signature_algorithm": signature_algorithm,
+            "marshaling_algorithm": marshaling_algorithm,
+            "salt_length": salt_length,
+        }
+        return await self._submit("sign", name, mount_point, {"input": hash_input, "context": context}, options)
+
+    async def flush(self) -> None:
+        """Send every queued item immediately and wait for all in-flight batches to complete."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def _submit(
+        self, operation: str, name: str, mount_point: str, item: dict[str, Any], options: dict[str, Any]
+    ) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        key = (operation, name, mount_point, tuple(sorted(utils.remove_nones(options).items())))
+        future: asyncio.Future = loop.create_future()
+        queue = self._pending.setdefault(key, [])
+        queue.append((utils.remove_nones(item), future))
+        self.items += 1
+
+        if len(queue) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_delay, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._send(key, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, key: Any, batch: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        operation, name, mount_point, options = key
+        method = getattr(self._transit, self._methods[operation])
+        self.requests += 1
+        try:
+            # Vault fails a whole batch with 400 when any item fails, unless told to report partial failures
+            response = await method(
+                name=name,
+                batch_input=[item for item, _ in batch],
+                mount_point=mount_point,
+                partial_failure_response_code=200,
+                **dict(options),
+            )
+            results = response["data"]["batch_results"]
+            if len(results) != len(batch):
+                raise exceptions.VaultxError(
+                    f"Expected {len(batch)} batch results from {operation}, received {len(results)}"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, (_, future) in enumerate(batch):
+            result = results[index]
+            if future.done():
+                continue
+            if result.get("error"):
+                future.set_exception(exceptions.VaultxError(message=result["error"]))
+            else:
+                future.set_result(result)
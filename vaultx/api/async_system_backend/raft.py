@@ -1,10 +1,17 @@
-from typing import Optional
+import asyncio
+from collections.abc import AsyncIterator
+from typing import IO, Any, Optional
 
-from vaultx import utils
+from vaultx import exceptions, streams, utils
 from vaultx.adapters import VaultxResponse
 from vaultx.api.vault_api_base import AsyncVaultApiBase
 
 
+def _snapshot_chunks(f: IO[bytes], decompress: bool, chunk_size: int) -> AsyncIterator[bytes]:
+    chunks = streams.aiter_file(f, chunk_size)
+    return streams.adecompressing(chunks, chunk_size) if decompress else chunks
+
+
 class Raft(AsyncVaultApiBase):
     """
     Raft cluster-related system backend methods.
@@ -96,7 +103,8 @@ class Raft(AsyncVaultApiBase):
     async def take_raft_snapshot(self) -> VaultxResponse:
         """
         Return a snapshot of the current state of the raft cluster.
-        The snapshot is returned as binary data and should be redirected to a file.
+        The snapshot is returned as binary data, held in memory; use save_raft_snapshot to stream large snapshots to
+        a file instead.
 
         Supported methods:
             GET: /sys/storage/raft/snapshot.
@@ -106,8 +114,93 @@ class Raft(AsyncVaultApiBase):
         api_path = "/v1/sys/storage/raft/snapshot"
         return await self._adapter.get(
             url=api_path,
+        )
+
+    async def save_raft_snapshot(
+        self,
+        file: streams.FileTypes,
+        compress: bool = False,
+        compress_level: int = 6,
+        algorithm: str = "sha256",
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """
+        Stream a snapshot of the current state of the raft cluster to a file, chunk by chunk, in constant memory.
+        Disk writes run in the default executor, so that they do not block the event loop.
+
+        Supported methods:
+            GET: /sys/storage/raft/snapshot.
+
+        :param file: Path or binary file object the snapshot is written to. File objects are left open.
+        :param compress: Whether to gzip the snapshot while writing it. Vault snapshots are already compressed
+            archives, so this mostly helps with snapshots of large, highly redundant data sets.
+        :param compress_level: Gzip compression level, from 1 (fastest) to 9 (smallest).
+        :param algorithm: Name of the hashlib algorithm the checksum is computed with.
+        :param chunk_size: Size of the chunks read from the response.
+        :return: Size and checksum of the snapshot as returned by Vault, before any compression, e.g.
+            {"size": 1048576, "algorithm": "sha256", "checksum": "..."}, to be passed to restore_raft_snapshot_from.
+        """
+        api_path = "/v1/sys/storage/raft/snapshot"
+        response = await self._adapter.get(
+            url=api_path,
             stream=True,
         )
+        loop = asyncio.get_running_loop()
+        digest = streams.StreamDigest(algorithm)
+        try:
+            chunks = streams.ahashing(response.raw.aiter_bytes(chunk_size), digest)
+            if compress:
+                chunks = streams.acompressing(chunks, compress_level)
+            with streams.open_file(file, "wb") as f:
+                async for chunk in chunks:
+                    await loop.run_in_executor(None, f.write, chunk)
+        finally:
+            await response.raw.aclose()
+        return digest.as_dict()
+
+    async def restore_raft_snapshot_from(
+        self,
+        file: streams.FileTypes,
+        force: bool = False,
+        decompress: bool = False,
+        checksum: Optional[str] = None,
+        algorithm: str = "sha256",
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+    ) -> VaultxResponse:
+        """
+        Install a snapshot read from a file, streaming it to Vault chunk by chunk, in constant memory.
+        Disk reads run in the default executor, so that they do not block the event loop.
+
+        Supported methods:
+            POST: /sys/storage/raft/snapshot.
+            POST: /sys/storage/raft/snapshot-force.
+
+        :param file: Path or binary file object, positioned at the start of the snapshot, the snapshot is read from.
+        :param force: Whether to bypass the checks ensuring the Autounseal or shamir keys are consistent with the
+            snapshot data, as force_restore_raft_snapshot does.
+        :param decompress: Whether the file was compressed by save_raft_snapshot.
+        :param checksum: Expected checksum of the snapshot, as returned by save_raft_snapshot. When provided, the file
+            is read a first time to verify it, and nothing is sent if it does not match.
+        :param algorithm: Name of the hashlib algorithm the checksum was computed with.
+        :param chunk_size: Size of the chunks read from the file.
+        :return: The response of the restore request.
+        """
+        api_path = "/v1/sys/storage/raft/snapshot-force" if force else "/v1/sys/storage/raft/snapshot"
+        with streams.open_file(file, "rb") as f:
+            if checksum is not None:
+                start = f.tell()
+                digest = streams.StreamDigest(algorithm)
+                async for chunk in _snapshot_chunks(f, decompress, chunk_size):
+                    digest.update(chunk)
+                if digest.checksum != checksum:
+                    raise exceptions.VaultxError(
+                        f"Snapshot checksum mismatch: expected {checksum}, got {digest.checksum}"
+                    )
+                f.seek(start)
+            return await self._adapter.post(
+                url=api_path,
+                content=_snapshot_chunks(f, decompress, chunk_size),
+            )
 
     async def restore_raft_snapshot(self, snapshot: bytes) -> VaultxResponse:
         """
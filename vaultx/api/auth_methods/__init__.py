@@ -1,25 +1,29 @@
 """Collection of classes for various Vault auth methods."""
 
+import importlib
 import typing as tp
 
 from vaultx import exceptions
 from vaultx.adapters import Adapter
-from vaultx.api.auth_methods.approle import AppRole
-from vaultx.api.auth_methods.aws import Aws
-from vaultx.api.auth_methods.azure import Azure
-from vaultx.api.auth_methods.cert import Cert
-from vaultx.api.auth_methods.gcp import Gcp
-from vaultx.api.auth_methods.github import Github
-from vaultx.api.auth_methods.jwt import Jwt
-from vaultx.api.auth_methods.kubernetes import Kubernetes
-from vaultx.api.auth_methods.ldap import Ldap
-from vaultx.api.auth_methods.legacy_mfa import LegacyMfa
-from vaultx.api.auth_methods.oidc import Oidc
-from vaultx.api.auth_methods.okta import Okta
-from vaultx.api.auth_methods.radius import Radius
-from vaultx.api.auth_methods.token import Token
-from vaultx.api.auth_methods.userpass import Userpass
-from vaultx.api.vault_api_base import VaultApiBase
+from vaultx.api.vault_api_base import VaultApiCategory
+
+
+if tp.TYPE_CHECKING:
+    from vaultx.api.auth_methods.approle import AppRole
+    from vaultx.api.auth_methods.aws import Aws
+    from vaultx.api.auth_methods.azure import Azure
+    from vaultx.api.auth_methods.cert import Cert
+    from vaultx.api.auth_methods.gcp import Gcp
+    from vaultx.api.auth_methods.github import Github
+    from vaultx.api.auth_methods.jwt import Jwt
+    from vaultx.api.auth_methods.kubernetes import Kubernetes
+    from vaultx.api.auth_methods.ldap import Ldap
+    from vaultx.api.auth_methods.legacy_mfa import LegacyMfa
+    from vaultx.api.auth_methods.oidc import Oidc
+    from vaultx.api.auth_methods.okta import Okta
+    from vaultx.api.auth_methods.radius import Radius
+    from vaultx.api.auth_methods.token import Token
+    from vaultx.api.auth_methods.userpass import Userpass
 
 
 __all__ = (
@@ -41,45 +45,56 @@ __all__ = (
     "Token",
 )
 
+# Classes of the package imported on first access, see the implemented classes of the category below
+_LAZY_ATTRIBUTES = {
+    "AppRole": "vaultx.api.auth_methods.approle",
+    "Aws": "vaultx.api.auth_methods.aws",
+    "Azure": "vaultx.api.auth_methods.azure",
+    "Cert": "vaultx.api.auth_methods.cert",
+    "Gcp": "vaultx.api.auth_methods.gcp",
+    "Github": "vaultx.api.auth_methods.github",
+    "Jwt": "vaultx.api.auth_methods.jwt",
+    "Kubernetes": "vaultx.api.auth_methods.kubernetes",
+    "Ldap": "vaultx.api.auth_methods.ldap",
+    "LegacyMfa": "vaultx.api.auth_methods.legacy_mfa",
+    "Oidc": "vaultx.api.auth_methods.oidc",
+    "Okta": "vaultx.api.auth_methods.okta",
+    "Radius": "vaultx.api.auth_methods.radius",
+    "Token": "vaultx.api.auth_methods.token",
+    "Userpass": "vaultx.api.auth_methods.userpass",
+}
 
-@exceptions.handle_unknown_exception
-class AuthMethods(VaultApiBase):
-    """Auth Methods."""
 
-    _implemented_classes: tp.Final[dict] = {
-        "_approle": AppRole,
-        "_aws": Aws,
-        "_azure": Azure,
-        "_cert": Cert,
-        "_gcp": Gcp,
-        "_github": Github,
-        "_jwt": Jwt,
-        "_kubernetes": Kubernetes,
-        "_ldap": Ldap,
-        "_legacy_mfa": LegacyMfa,
-        "_oidc": Oidc,
-        "_okta": Okta,
-        "_radius": Radius,
-        "_userpass": Userpass,
-        "_token": Token,
-    }
+def __getattr__(name: str) -> tp.Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
-    def __init__(self, adapter: Adapter) -> None:
-        for attr_name, _class in self._implemented_classes.items():
-            setattr(self, attr_name, _class(adapter=adapter))
-        super().__init__(adapter)
 
-    def __getattr__(self, item: str):
-        """
-        Get an instance of a class instance in this category where available.
+@exceptions.handle_unknown_exception
+class AuthMethods(VaultApiCategory):
+    """Auth Methods."""
 
-        :param item: Name of the class being requested.
-        :return: The requested class instance where available.
-        """
-        item = f"_{item}"
-        if item in self._implemented_classes:
-            return getattr(self, item)
-        raise AttributeError
+    _implemented_classes: tp.ClassVar[dict] = {
+        "_approle": "vaultx.api.auth_methods.approle.AppRole",
+        "_aws": "vaultx.api.auth_methods.aws.Aws",
+        "_azure": "vaultx.api.auth_methods.azure.Azure",
+        "_cert": "vaultx.api.auth_methods.cert.Cert",
+        "_gcp": "vaultx.api.auth_methods.gcp.Gcp",
+        "_github": "vaultx.api.auth_methods.github.Github",
+        "_jwt": "vaultx.api.auth_methods.jwt.Jwt",
+        "_kubernetes": "vaultx.api.auth_methods.kubernetes.Kubernetes",
+        "_ldap": "vaultx.api.auth_methods.ldap.Ldap",
+        "_legacy_mfa": "vaultx.api.auth_methods.legacy_mfa.LegacyMfa",
+        "_oidc": "vaultx.api.auth_methods.oidc.Oidc",
+        "_okta": "vaultx.api.auth_methods.okta.Okta",
+        "_radius": "vaultx.api.auth_methods.radius.Radius",
+        "_userpass": "vaultx.api.auth_methods.userpass.Userpass",
+        "_token": "vaultx.api.auth_methods.token.Token",
+    }
 
     @property
     def adapter(self) -> Adapter:
@@ -99,5 +114,4 @@ class AuthMethods(VaultApiBase):
         :param adapter: New adapter instance to set for this class and all implemented classes.
         """
         self._adapter = adapter
-        for implemented_class in self._implemented_classes:
-            getattr(self, f"{implemented_class}").adapter = adapter
+        self._set_implemented_adapters(adapter)
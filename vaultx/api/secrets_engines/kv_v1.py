@@ -1,8 +1,10 @@
-from typing import Any, Optional
+from collections.abc import Iterable
+from typing import Any, Optional, Union
 
-from vaultx import exceptions
+from vaultx import exceptions, utils
 from vaultx.adapters import VaultxResponse
 from vaultx.api.vault_api_base import VaultApiBase
+from vaultx.constants.kv import DEFAULT_READ_CONCURRENCY
 
 
 DEFAULT_MOUNT_POINT = "secret"
@@ -31,6 +33,31 @@ class KvV1(VaultApiBase):
             url=api_path,
         )
 
+    def read_many(
+        self,
+        paths: Iterable[str],
+        mount_point: str = DEFAULT_MOUNT_POINT,
+        concurrency: int = DEFAULT_READ_CONCURRENCY,
+        on_error: str = "return",
+    ) -> dict[str, Union[VaultxResponse, Exception]]:
+        """
+        Retrieve the secrets at the specified locations concurrently.
+
+        Requests are sent from a thread pool of at most concurrency workers sharing this instance's adapter.
+
+        :param paths: Specifies the paths of the secrets to read. Duplicates are read once.
+        :param mount_point: The "path" the secret engine was mounted on.
+        :param concurrency: Maximum number of concurrent requests.
+        :param on_error: Partial failure policy. "return" maps a failed path to the raised exception,
+            "skip" leaves failed paths out of the result and "raise" re-raises the first error.
+        :return: Mapping of each path to its VaultxResponse (or exception), in input order.
+        """
+
+        def read(path: str) -> VaultxResponse:
+            return self.read_secret(path=path, mount_point=mount_point)
+
+        return utils.map_concurrently(read, paths, concurrency=concurrency, on_error=on_error)
+
     def list_secrets(self, path: str, mount_point: str = DEFAULT_MOUNT_POINT) -> VaultxResponse:
         """
         Return a list of key names at the specified location.
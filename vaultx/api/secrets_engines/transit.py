@@ -1,9 +1,15 @@
-from typing import Optional
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Optional
 
-from vaultx import exceptions, utils
+from vaultx import exceptions, streams, utils
 from vaultx.adapters import VaultxResponse
 from vaultx.api.vault_api_base import VaultApiBase
 from vaultx.constants import transit as transit_constants
+from vaultx.envelope import DEFAULT_DATA_KEY_BITS, DEFAULT_DATA_KEY_TTL, DEFAULT_MAX_USES, EnvelopeEncryptor
+
+
+if TYPE_CHECKING:
+    from vaultx.rewrap import RewrapCampaign, RewrapStats
 
 
 DEFAULT_MOUNT_POINT = "transit"
@@ -261,6 +267,7 @@ class Transit(VaultApiBase):
         convergent_encryption: Optional[str] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
         associated_data: Optional[str] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Encrypt the provided plaintext using the named key.
@@ -298,13 +305,14 @@ class Transit(VaultApiBase):
             ciphertext is generated. It is very important when using this mode that you ensure that all nonces are
             unique for a given context. Failing to do so will severely impact the ciphertext's security.
         :param mount_point: The "path" the method/backend was mounted on.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
         if plaintext is None and batch_input is None:
             raise ValueError("plaintext must be specified unless batch_input is set")
-        params = {
-            "plaintext": plaintext,
-        }
+        params = {} if batch_input is not None else {"plaintext": plaintext}
         params.update(
             utils.remove_nones(
                 {
@@ -313,6 +321,7 @@ class Transit(VaultApiBase):
                     "key_version": key_version,
                     "nonce": nonce,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                     "type": _type,
                     "convergent_encryption": convergent_encryption,
                 }
@@ -333,6 +342,7 @@ class Transit(VaultApiBase):
         batch_input: Optional[list[dict]] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
         associated_data: Optional[str] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Decrypt the provided ciphertext using the named key.
@@ -353,13 +363,14 @@ class Transit(VaultApiBase):
             the parameters 'ciphertext', 'context' and 'nonce' are also set, they will be ignored. Format for the input
             goes like this: [dict(context="b64_context", ciphertext="b64_plaintext"), ...]
         :param mount_point: The "path" the method/backend was mounted on.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
         if ciphertext is None and batch_input is None:
             raise ValueError("ciphertext must be specified unless batch_input is set")
-        params = {
-            "ciphertext": ciphertext,
-        }
+        params = {} if batch_input is not None else {"ciphertext": ciphertext}
         params.update(
             utils.remove_nones(
                 {
@@ -367,6 +378,7 @@ class Transit(VaultApiBase):
                     "associated_data": associated_data,
                     "nonce": nonce,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -379,12 +391,13 @@ class Transit(VaultApiBase):
     def rewrap_data(
         self,
         name: str,
-        ciphertext: str,
+        ciphertext: Optional[str] = None,
         context: Optional[str] = None,
         key_version: Optional[int] = None,
         nonce: Optional[str] = None,
         batch_input: Optional[list[dict]] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Rewrap the provided ciphertext using the latest version of the named key.
@@ -398,6 +411,7 @@ class Transit(VaultApiBase):
         :param name: Specifies the name of the encryption key to re-encrypt against.
             This is specified as part of the URL.
         :param ciphertext: Specifies the ciphertext to re-encrypt.
+            Ignored if ``batch_input`` is set, otherwise required.
         :param context: Specifies the base64 encoded context for key derivation. This is required if key derivation is
             enabled.
         :param key_version: Specifies the version of the key to use for the operation. If not set, uses the latest
@@ -409,11 +423,14 @@ class Transit(VaultApiBase):
             the parameters 'ciphertext', 'context' and 'nonce' are also set, they will be ignored. Format for the input
             goes like this: [dict(context="b64_context", ciphertext="b64_plaintext"), ...]
         :param mount_point: The "path" the method/backend was mounted on.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
-        params = {
-            "ciphertext": ciphertext,
-        }
+        if ciphertext is None and batch_input is None:
+            raise ValueError("ciphertext must be specified unless batch_input is set")
+        params = {} if batch_input is not None else {"ciphertext": ciphertext}
         params.update(
             utils.remove_nones(
                 {
@@ -421,6 +438,7 @@ class Transit(VaultApiBase):
                     "key_version": key_version,
                     "nonce": nonce,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -568,10 +586,12 @@ class Transit(VaultApiBase):
     def generate_hmac(
         self,
         name: str,
-        hash_input: str,
+        hash_input: Optional[str] = None,
         key_version: Optional[int] = None,
         algorithm: Optional[str] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
+        batch_input: Optional[list[dict[str, str]]] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """
         Return the digest of given data using the specified hash algorithm and the named key.
@@ -585,26 +605,35 @@ class Transit(VaultApiBase):
         :param name: Specifies the name of the encryption key to generate hmac against. This is specified as part of the
             URL.
         :param hash_input: Specifies the base64 encoded input data.
+            Ignored if ``batch_input`` is set, otherwise required.
         :param key_version: Specifies the version of the key to use for the operation. If not set, uses the latest
             version. Must be greater than or equal to the key's min_encryption_version, if set.
         :param algorithm: Specifies the hash algorithm to use. This can also be specified as part of the URL.
             Currently-supported algorithms are: sha2-224, sha2-256, sha2-384, sha2-512
         :param mount_point: The "path" the method/backend was mounted on.
+        :param batch_input: Specifies a list of items to be processed in a single batch. The format for the input is:
+            [dict(input="b64_input"), ...]. Results are returned in the ``batch_results`` array component of the
+            ``data`` element of the response.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
+        if hash_input is None and batch_input is None:
+            raise ValueError("hash_input must be specified unless batch_input is set")
         if algorithm is not None and algorithm not in transit_constants.ALLOWED_HASH_DATA_ALGORITHMS:
             allowed_types = ", ".join(transit_constants.ALLOWED_HASH_DATA_ALGORITHMS)
             raise exceptions.VaultxError(
                 f'invalid algorithm argument provided "{algorithm}", supported types: "{allowed_types}"'
             )
-        params = {
-            "input": hash_input,
-        }
+        params = {} if batch_input is not None else {"input": hash_input}
         params.update(
             utils.remove_nones(
                 {
                     "key_version": key_version,
                     "algorithm": algorithm,
+                    "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -627,6 +656,7 @@ class Transit(VaultApiBase):
         salt_length: Optional[str] = None,
         mount_point: str = DEFAULT_MOUNT_POINT,
         batch_input: Optional[list[dict[str, str]]] = None,
+        partial_failure_response_code: Optional[int] = None,
     ) -> VaultxResponse:
         """Return the cryptographic signature of the given data using the named key and the specified hash algorithm.
 
@@ -669,6 +699,9 @@ class Transit(VaultApiBase):
             This parameter is mutually exclusive with the ``hash_input`` parameter, but one of them must be supplied.
             If both are set, or neither are set, an exception will be raised.
             Responses are returned in the ``batch_results`` array component of the ``data`` element of the response.
+        :param partial_failure_response_code: HTTP status code Vault answers with when only some items of
+            ``batch_input`` fail. Vault defaults to 400, which fails the whole request; use 200 to receive the
+            ``batch_results`` and check each item's ``error`` field.
         :return: The VaultxResponse of the request.
         """
         if hash_algorithm is not None and hash_algorithm not in transit_constants.ALLOWED_HASH_DATA_ALGORITHMS:
@@ -711,9 +744,7 @@ class Transit(VaultApiBase):
             error_msg = "Invalid parameter combination: 'hash_input' or 'batch_input' should be provided, not both."
             raise exceptions.VaultxError(message=error_msg)
 
-        params = {
-            "input": hash_input,
-        }
+        params = {} if batch_input is not None else {"input": hash_input}
         params.update(
             utils.remove_nones(
                 {
@@ -725,6 +756,7 @@ class Transit(VaultApiBase):
                     "marshaling_algorithm": marshaling_algorithm,
                     "salt_length": salt_length,
                     "batch_input": batch_input,
+                    "partial_failure_response_code": partial_failure_response_code,
                 }
             )
         )
@@ -921,3 +953,135 @@ class Transit(VaultApiBase):
             url=api_path,
             json=params,
         )
+
+    def envelope(
+        self,
+        name: str,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+        context: Optional[str] = None,
+        bits: int = DEFAULT_DATA_KEY_BITS,
+        max_age: float = DEFAULT_DATA_KEY_TTL,
+        max_uses: int = DEFAULT_MAX_USES,
+        unwrap_ttl: float = DEFAULT_DATA_KEY_TTL,
+    ) -> EnvelopeEncryptor:
+        """
+        Create an envelope encryptor encrypting payloads locally with cached data keys wrapped by the named key.
+
+        :param name: Specifies the name of the encryption key wrapping the data keys.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param bits: Size of the data keys, 128 or 256.
+        :param max_age: Number of seconds a data key is used for encryption.
+        :param max_uses: Number of encryptions a data key is used for.
+        :param unwrap_ttl: Number of seconds an unwrapped data key is kept.
+        :return: A new EnvelopeEncryptor bound to this Transit instance.
+        """
+        return EnvelopeEncryptor(
+            self,
+            name,
+            mount_point=mount_point,
+            context=context,
+            bits=bits,
+            max_age=max_age,
+            max_uses=max_uses,
+            unwrap_ttl=unwrap_ttl,
+        )
+
+    def encrypt_stream(
+        self,
+        name: str,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        context: Optional[str] = None,
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Encrypt a stream locally, chunk by chunk and in constant memory, with a new data key wrapped by the named key.
+
+        Supported methods:
+            POST: /{mount_point}/datakey/plaintext/{name}. Produces: 200 application/json
+
+        :param name: Specifies the name of the encryption key wrapping the data key.
+        :param source: Path or binary file object the plaintext is read from. File objects are left open.
+        :param destination: Path or binary file object the encrypted stream is written to. File objects are left open.
+        :param associated_data: Optional data authenticated along with the stream, needed again to decrypt it.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param chunk_size: Size of the chunks encrypted separately.
+        :param workers: Number of threads encrypting chunks in parallel.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        encryptor = self.envelope(name, mount_point=mount_point, context=context)
+        return encryptor.encrypt_stream(
+            source, destination, associated_data=associated_data, chunk_size=chunk_size, workers=workers
+        )
+
+    def decrypt_stream(
+        self,
+        name: str,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        context: Optional[str] = None,
+        workers: int = 1,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+    ) -> dict[str, Any]:
+        """
+        Decrypt a stream written by encrypt_stream, chunk by chunk and in constant memory, unwrapping its data key with
+        the named key.
+
+        Supported methods:
+            POST: /{mount_point}/decrypt/{name}. Produces: 200 application/json
+
+        :param name: Specifies the name of the encryption key the data key was wrapped with.
+        :param source: Path or binary file object the encrypted stream is read from. File objects are left open.
+        :param destination: Path or binary file object the plaintext is written to. File objects are left open.
+        :param associated_data: The associated data the stream was encrypted with.
+        :param context: Specifies the base64 encoded context for key derivation.
+        :param workers: Number of threads decrypting chunks in parallel.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        encryptor = self.envelope(name, mount_point=mount_point, context=context)
+        return encryptor.decrypt_stream(source, destination, associated_data=associated_data, workers=workers)
+
+    def rewrap_campaign(
+        self,
+        name: str,
+        mount_point: str = DEFAULT_MOUNT_POINT,
+        key_version: Optional[int] = None,
+        batch_size: int = transit_constants.DEFAULT_REWRAP_BATCH_SIZE,
+        concurrency: int = transit_constants.DEFAULT_REWRAP_CONCURRENCY,
+        checkpoint: Optional[str] = None,
+        checkpoint_interval: float = transit_constants.DEFAULT_REWRAP_CHECKPOINT_INTERVAL,
+        on_progress: Optional[Callable[["RewrapStats"], Any]] = None,
+    ) -> "RewrapCampaign":
+        """
+        Create a resumable campaign rewrapping stored ciphertexts to the latest version of the named key in batches.
+
+        :param name: Specifies the name of the encryption key the ciphertexts were encrypted with.
+        :param mount_point: The "path" the method/backend was mounted on.
+        :param key_version: Specifies the version of the key to rewrap to, the latest version by default.
+        :param batch_size: Number of ciphertexts sent in each rewrap request.
+        :param concurrency: Maximum number of rewrap requests in flight at once.
+        :param checkpoint: Optional path of the file progress is saved to and resumed from.
+        :param checkpoint_interval: Number of seconds between checkpoints and progress reports.
+        :param on_progress: Optional callable invoked with the stats at every progress report.
+        :return: A new RewrapCampaign bound to this Transit instance, started with its run method.
+        """
+        from vaultx.rewrap import RewrapCampaign
+
+        return RewrapCampaign(
+            self,
+            name,
+            mount_point=mount_point,
+            key_version=key_version,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            checkpoint=checkpoint,
+            checkpoint_interval=checkpoint_interval,
+            on_progress=on_progress,
+        )
@@ -20,7 +20,7 @@ from vaultx.api.system_backend.quota import Quota
 from vaultx.api.system_backend.raft import Raft
 from vaultx.api.system_backend.seal import Seal
 from vaultx.api.system_backend.wrapping import Wrapping
-from vaultx.api.vault_api_base import VaultApiBase
+from vaultx.api.vault_api_base import VaultApiBase, VaultApiCategory
 
 
 __all__ = (
@@ -63,8 +63,9 @@ class SystemBackend(
     Raft,
     Seal,
     Wrapping,
+    VaultApiCategory,
 ):
-    _implemented_classes: tp.Final[dict] = {
+    _implemented_classes: tp.ClassVar[dict] = {
         "_audit": Audit,
         "_auth": Auth,
         "_capabilities": Capabilities,
@@ -83,23 +84,6 @@ class SystemBackend(
         "_wrapping": Wrapping,
     }
 
-    def __init__(self, adapter: Adapter) -> None:
-        for attr_name, _class in self._implemented_classes.items():
-            setattr(self, attr_name, _class(adapter=adapter))
-        super().__init__(adapter=adapter)
-
-    def __getattr__(self, item: str):
-        """
-        Get an instance of a class instance.
-
-        :param item: Name of the class being requested.
-        :return: The requested class instance where available.
-        """
-        item = f"_{item}"
-        if item in self._implemented_classes:
-            return getattr(self, item)
-        raise AttributeError
-
     @property
     def adapter(self) -> Adapter:
         """
@@ -118,5 +102,4 @@ class SystemBackend(
         :param adapter: New adapter instance to set for this class and all implemented classes.
         """
         self._adapter = adapter
-        for implemented_class in self._implemented_classes:
-            getattr(self, f"{implemented_class}").adapter = adapter
+        self._set_implemented_adapters(adapter)
@@ -1,10 +1,16 @@
-from typing import Optional
+from collections.abc import Iterator
+from typing import IO, Any, Optional
 
-from vaultx import utils
+from vaultx import exceptions, streams, utils
 from vaultx.adapters import VaultxResponse
 from vaultx.api.vault_api_base import VaultApiBase
 
 
+def _snapshot_chunks(f: IO[bytes], decompress: bool, chunk_size: int) -> Iterator[bytes]:
+    chunks = streams.iter_file(f, chunk_size)
+    return streams.decompressing(chunks, chunk_size) if decompress else chunks
+
+
 class Raft(VaultApiBase):
     """
     Raft cluster-related system backend methods.
@@ -96,7 +102,8 @@ class Raft(VaultApiBase):
     def take_raft_snapshot(self) -> VaultxResponse:
         """
         Return a snapshot of the current state of the raft cluster.
-        The snapshot is returned as binary data and should be redirected to a file.
+        The snapshot is returned as binary data, held in memory; use save_raft_snapshot to stream large snapshots to
+        a file instead.
 
         Supported methods:
             GET: /sys/storage/raft/snapshot.
@@ -106,8 +113,90 @@ class Raft(VaultApiBase):
         api_path = "/v1/sys/storage/raft/snapshot"
         return self._adapter.get(
             url=api_path,
+        )
+
+    def save_raft_snapshot(
+        self,
+        file: streams.FileTypes,
+        compress: bool = False,
+        compress_level: int = 6,
+        algorithm: str = "sha256",
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """
+        Stream a snapshot of the current state of the raft cluster to a file, chunk by chunk, in constant memory.
+
+        Supported methods:
+            GET: /sys/storage/raft/snapshot.
+
+        :param file: Path or binary file object the snapshot is written to. File objects are left open.
+        :param compress: Whether to gzip the snapshot while writing it. Vault snapshots are already compressed
+            archives, so this mostly helps with snapshots of large, highly redundant data sets.
+        :param compress_level: Gzip compression level, from 1 (fastest) to 9 (smallest).
+        :param algorithm: Name of the hashlib algorithm the checksum is computed with.
+        :param chunk_size: Size of the chunks read from the response.
+        :return: Size and checksum of the snapshot as returned by Vault, before any compression, e.g.
+            {"size": 1048576, "algorithm": "sha256", "checksum": "..."}, to be passed to restore_raft_snapshot_from.
+        """
+        api_path = "/v1/sys/storage/raft/snapshot"
+        response = self._adapter.get(
+            url=api_path,
             stream=True,
         )
+        digest = streams.StreamDigest(algorithm)
+        try:
+            chunks = streams.hashing(response.raw.iter_bytes(chunk_size), digest)
+            if compress:
+                chunks = streams.compressing(chunks, compress_level)
+            with streams.open_file(file, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        finally:
+            response.raw.close()
+        return digest.as_dict()
+
+    def restore_raft_snapshot_from(
+        self,
+        file: streams.FileTypes,
+        force: bool = False,
+        decompress: bool = False,
+        checksum: Optional[str] = None,
+        algorithm: str = "sha256",
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+    ) -> VaultxResponse:
+        """
+        Install a snapshot read from a file, streaming it to Vault chunk by chunk, in constant memory.
+
+        Supported methods:
+            POST: /sys/storage/raft/snapshot.
+            POST: /sys/storage/raft/snapshot-force.
+
+        :param file: Path or binary file object, positioned at the start of the snapshot, the snapshot is read from.
+        :param force: Whether to bypass the checks ensuring the Autounseal or shamir keys are consistent with the
+            snapshot data, as force_restore_raft_snapshot does.
+        :param decompress: Whether the file was compressed by save_raft_snapshot.
+        :param checksum: Expected checksum of the snapshot, as returned by save_raft_snapshot. When provided, the file
+            is read a first time to verify it, and nothing is sent if it does not match.
+        :param algorithm: Name of the hashlib algorithm the checksum was computed with.
+        :param chunk_size: Size of the chunks read from the file.
+        :return: The response of the restore request.
+        """
+        api_path = "/v1/sys/storage/raft/snapshot-force" if force else "/v1/sys/storage/raft/snapshot"
+        with streams.open_file(file, "rb") as f:
+            if checksum is not None:
+                start = f.tell()
+                digest = streams.StreamDigest(algorithm)
+                for chunk in _snapshot_chunks(f, decompress, chunk_size):
+                    digest.update(chunk)
+                if digest.checksum != checksum:
+                    raise exceptions.VaultxError(
+                        f"Snapshot checksum mismatch: expected {checksum}, got {digest.checksum}"
+                    )
+                f.seek(start)
+            return self._adapter.post(
+                url=api_path,
+                content=_snapshot_chunks(f, decompress, chunk_size),
+            )
 
     def restore_raft_snapshot(self, snapshot: bytes) -> VaultxResponse:
         """
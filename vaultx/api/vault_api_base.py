@@ -1,3 +1,6 @@
+import importlib
+import typing as tp
+
 from vaultx.adapters import Adapter, AsyncAdapter
 
 
@@ -21,3 +24,56 @@ class AsyncVaultApiBase:
         :param adapter: Instance of AsyncAdapter; used for performing HTTP requests.
         """
         self._adapter = adapter
+
+
+def _import_class(target: tp.Union[str, type]) -> type:
+    """Import a class from its dotted path, unless it is already a class."""
+    if isinstance(target, type):
+        return target
+    module_name, _, class_name = target.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class _ApiCategoryMixin:
+    """
+    Attribute access of the collections of API classes, such as the secrets engines.
+
+    Each implemented class, given as a class or as its dotted path, is imported and instantiated on first access, so
+    that creating a client does not pay for the engines it never uses. Instances are not shared between clients: each
+    one is bound to the adapter of its client, which can be replaced, and some keep state such as the KV v2 cache.
+    """
+
+    _implemented_classes: tp.ClassVar[dict[str, tp.Union[str, type]]]
+    _adapter: tp.Any
+
+    def __getattr__(self, item: str) -> tp.Any:
+        """
+        Get an instance of a class instance.
+
+        :param item: Name of the class being requested.
+        :return: The requested class instance where available.
+        """
+        name = item if item in self._implemented_classes else f"_{item}"
+        if name in self.__dict__:
+            return self.__dict__[name]
+        target = self._implemented_classes.get(name)
+        if target is None or "_adapter" not in self.__dict__:
+            raise AttributeError(item)
+        instance = _import_class(target)(adapter=self._adapter)
+        self.__dict__[name] = instance
+        return instance
+
+    def _set_implemented_adapters(self, adapter: tp.Any) -> None:
+        # Classes not instantiated yet will get the new adapter on first access
+        for name in self._implemented_classes:
+            instance = self.__dict__.get(name)
+            if instance is not None:
+                instance.adapter = adapter
+
+
+class VaultApiCategory(_ApiCategoryMixin, VaultApiBase):
+    """Base class for collections of API endpoint classes."""
+
+
+class AsyncVaultApiCategory(_ApiCategoryMixin, AsyncVaultApiBase):
+    """Async base class for collections of API endpoint classes."""
@@ -0,0 +1,651 @@
+"""
+Client-side caching primitives shared by the secrets engines
+"""
+
+import asyncio
+import base64
+import contextlib
+import hashlib
+import importlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Iterable, Iterator
+from typing import IO, Any, Optional, Union
+
+import httpx
+
+from vaultx.adapters import HttpxAdapterResponse, VaultxResponse
+
+
+# A fixed time-to-live, or a callable computing it from the value being stored, e.g. from a lease duration
+TTLTypes = Optional[Union[float, Callable[[Any], Optional[float]]]]
+
+
+def _entry_ttl(ttl: TTLTypes, value: Any) -> Optional[float]:
+    return ttl(value) if callable(ttl) else ttl
+
+
+class CacheStats:
+    """Counters describing how a cache has been used since its creation or the last reset."""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations", "invalidations")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache, 0.0 when nothing has been looked up yet."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time-to-live.
+
+    The cache is bounded by max_entries: storing a new key into a full cache evicts the least recently used entry.
+    Expired entries are dropped lazily, when they are looked up or when they reach the LRU end of the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 1024,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new TTLCache instance.
+
+        :param ttl: Number of seconds an entry stays valid after it was stored.
+        :param max_entries: Maximum number of entries kept at once.
+        :param timer: Monotonic clock used for expiry, mostly useful for testing.
+        """
+        if ttl <= 0:
+            raise ValueError(f'"ttl" must be a positive number, "{ttl}" provided')
+        if max_entries <= 0:
+            raise ValueError(f'"max_entries" must be a positive integer, "{max_entries}" provided')
+
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._timer = timer
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss, eviction, expiration and invalidation counters of this cache."""
+        return self._stats
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a value, refreshing its LRU position.
+
+        :param key: Key the value was stored under.
+        :return: The cached value, or None if the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries when the cache is full.
+
+        :param key: Key to store the value under.
+        :param value: Value to store.
+        :param ttl: Optional time-to-live overriding the cache-wide ttl for this entry.
+        """
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: TTLTypes = None) -> Any:
+        """
+        Look up a value, or compute and store it when it is missing or expired.
+
+        :param key: Key the value is stored under.
+        :param factory: Callable computing the value. None results are returned without being stored.
+        :param ttl: Optional time-to-live of a computed value, or a callable returning it from the value.
+        :return: The cached or computed value.
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            if value is not None:
+                self.set(key, value, _entry_ttl(ttl, value))
+        return value
+
+    async def get_or_set_async(self, key: Hashable, factory: Callable[[], Awaitable[Any]], ttl: TTLTypes = None) -> Any:
+        """
+        Look up a value, or compute and store it when it is missing or expired.
+
+        :param key: Key the value is stored under.
+        :param factory: Callable returning an awaitable computing the value. None results are not stored.
+        :param ttl: Optional time-to-live of a computed value, or a callable returning it from the value.
+        :return: The cached or computed value.
+        """
+        value = self.get(key)
+        if value is None:
+            value = await factory()
+            if value is not None:
+                self.set(key, value, _entry_ttl(ttl, value))
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a single entry if present.
+
+        :param key: Key of the entry to drop.
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Drop every entry whose key matches the predicate.
+
+        :param predicate: Callable receiving a key and returning True when the entry should be dropped.
+        :return: Number of dropped entries.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        """Key and value of every unexpired entry, from the least to the most recently used."""
+        now = self._timer()
+        with self._lock:
+            return [(key, value) for key, (expires_at, value) in self._entries.items() if expires_at > now]
+
+    def clear(self) -> None:
+        """Drop all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._timer()
+
+
+class _Generations:
+    """
+    Per-key invalidation counters, telling whether a key was invalidated while its value was being loaded.
+
+    Loads compare the generation taken when they start with the one when they end, and only store their result if
+    they match: a read sent before a write and answered after it must not put the old value back in the cache.
+    """
+
+    def __init__(self, max_keys: int = 4096) -> None:
+        self.max_keys = max_keys
+        self._counters: dict[Hashable, int] = {}
+        # Bumped when the counters are forgotten, so that loads started before cannot mistake a reset for no change
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def current(self, key: Hashable) -> tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._counters.get(key, 0)
+
+    def bump(self, key: Hashable) -> None:
+        with self._lock:
+            if key not in self._counters and len(self._counters) >= self.max_keys:
+                self._counters.clear()
+                self._epoch += 1
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+
+# Entry files: magic, expiry as a Unix timestamp, AES-GCM nonce, then the encrypted key and value
+_ENTRY_MAGIC = b"VXC1"
+_ENTRY_HEADER = struct.Struct(">4sd12s")
+_ENTRY_SUFFIX = ".entry"
+
+
+def _aesgcm(key: bytes) -> Any:
+    try:
+        aead = importlib.import_module("cryptography.hazmat.primitives.ciphers.aead")
+    except ImportError as e:
+        raise ImportError("cryptography is required for encryption, install it with pip install vaultx[crypto]") from e
+    return aead.AESGCM(key)
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or None, prefix=".entry-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temporary)
+        raise
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, HttpxAdapterResponse):
+        return {
+            "response": {
+                "status": value.status,
+                "headers": list(value.headers.items()),
+                "content": base64.b64encode(value.content).decode(),
+            }
+        }
+    return {"value": value}
+
+
+def _decode_value(encoded: dict[str, Any]) -> Any:
+    if "response" in encoded:
+        response = encoded["response"]
+        content = base64.b64decode(response["content"])
+        return VaultxResponse(httpx.Response(response["status"], headers=response["headers"], content=content))
+    return encoded["value"]
+
+
+def _decode_key(key: Any) -> Hashable:
+    return tuple(_decode_key(part) for part in key) if isinstance(key, list) else key
+
+
+class FileCache:
+    """
+    Cache shared by the processes of a host, such as the workers of a prefork server, with the interface of TTLCache.
+
+    Every entry is a file of directory, written atomically and encrypted with AES-GCM, so that processes sharing the
+    directory and the key share the entries. Keys must be JSON serializable, e.g. tuples of strings and integers, and
+    values either JSON serializable or responses, which are stored as their status, headers and body.
+    get_or_set takes a lock on the entry, so that only one process computes an expired value while the others wait
+    for it and read it back.
+
+    Requires a POSIX system, for file locks, and the cryptography package. The key is never written to the directory:
+    keep it elsewhere, e.g. generated by the parent process or read from a secret store, so that entries stay
+    confidential to whoever can read them. The directory and its locks subdirectory are created with mode 0o700.
+    Lock files are removed along with their entries. Counters in stats are those of the current process.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        key: bytes,
+        ttl: float = 60.0,
+        max_entries: int = 1024,
+        lock_poll_interval: float = 0.01,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Create a new FileCache instance.
+
+        :param directory: Directory holding the entries, created if missing. Every process must use the same one.
+        :param key: AES key of 16, 24 or 32 bytes shared by every process, e.g. passed by the parent process.
+        :param ttl: Number of seconds an entry stays valid after it was stored.
+        :param max_entries: Maximum number of entries kept at once; the ones expiring first are evicted first.
+        :param lock_poll_interval: Seconds between attempts of get_or_set_async to take an entry lock.
+        :param timer: Wall clock used for expiry, shared by every process, mostly useful for testing.
+        """
+        if ttl <= 0:
+            raise ValueError(f'"ttl" must be a positive number, "{ttl}" provided')
+        if max_entries <= 0:
+            raise ValueError(f'"max_entries" must be a positive integer, "{max_entries}" provided')
+
+        self.directory = os.fspath(directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock_poll_interval = lock_poll_interval
+        self._timer = timer
+        self._stats = CacheStats()
+        self._fcntl = importlib.import_module("fcntl")
+        # makedirs only applies the mode to the leaf directory, so the entries directory is created first
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "locks"), mode=0o700, exist_ok=True)
+        self._aead = _aesgcm(key)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss, eviction, expiration and invalidation counters of this cache, in this process."""
+        return self._stats
+
+    def _name(self, key: Hashable) -> str:
+        return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name + _ENTRY_SUFFIX)
+
+    def _read(self, name: str) -> Optional[tuple[float, Hashable, Any]]:
+        """Read and decrypt an entry, None when it is missing or cannot be decrypted."""
+        try:
+            with open(self._path(name), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            magic, expires_at, nonce = _ENTRY_HEADER.unpack_from(data)
+            if magic != _ENTRY_MAGIC:
+                return None
+            header = data[: _ENTRY_HEADER.size]
+            payload = json.loads(self._aead.decrypt(nonce, data[_ENTRY_HEADER.size :], header + name.encode()))
+        except Exception:
+            # Truncated, tampered with or encrypted with another key
+            return None
+        return expires_at, _decode_key(payload["key"]), _decode_value(payload["value"])
+
+    def _lookup(self, name: str) -> Optional[Any]:
+        entry = self._read(name)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= self._timer():
+            self._stats.expirations += 1
+            return None
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a value.
+
+        :param key: Key the value was stored under.
+        :return: The cached value, or None if the key is missing or expired.
+        """
+        value = self._lookup(self._name(key))
+        if value is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the entries expiring first when the cache is full.
+
+        :param key: Key to store the value under.
+        :param value: Value to store.
+        :param ttl: Optional time-to-live overriding the cache-wide ttl for this entry.
+        """
+        name = self._name(key)
+        nonce = os.urandom(12)
+        header = _ENTRY_HEADER.pack(_ENTRY_MAGIC, self._timer() + (self.ttl if ttl is None else ttl), nonce)
+        payload = json.dumps({"key": key, "value": _encode_value(value)}).encode()
+        data = header + self._aead.encrypt(nonce, payload, header + name.encode())
+
+        _write_atomically(self._path(name), data)
+        self._evict()
+
+    def _entries(self) -> list[str]:
+        return [entry[: -len(_ENTRY_SUFFIX)] for entry in os.listdir(self.directory) if entry.endswith(_ENTRY_SUFFIX)]
+
+    def _expiry(self, name: str) -> float:
+        try:
+            with open(self._path(name), "rb") as f:
+                return _ENTRY_HEADER.unpack(f.read(_ENTRY_HEADER.size))[1]
+        except (OSError, struct.error):
+            return 0.0
+
+    def _lock_path(self, name: str) -> str:
+        return os.path.join(self.directory, "locks", name)
+
+    def _remove(self, name: str) -> bool:
+        try:
+            os.unlink(self._path(name))
+        except FileNotFoundError:
+            return False
+        finally:
+            self._remove_lock(name)
+        return True
+
+    def _holds(self, lock: IO[Any], name: str) -> bool:
+        """Whether a locked file is still the lock of the entry, i.e. it was not removed before it was locked."""
+        try:
+            return os.stat(self._lock_path(name)).st_ino == os.fstat(lock.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _remove_lock(self, name: str) -> None:
+        """Remove the lock file of an entry, unless another process or thread is holding it."""
+        try:
+            with open(self._lock_path(name), "rb") as lock:
+                try:
+                    self._fcntl.flock(lock, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # In use: removed with a later eviction or invalidation of the entry
+                    return
+                # Only the holder of a lock removes it, and waiters check they locked the current file
+                if self._holds(lock, name):
+                    os.unlink(self._lock_path(name))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        names = self._entries()
+        if len(names) <= self.max_entries:
+            return
+        for name in sorted(names, key=self._expiry)[: len(names) - self.max_entries]:
+            if self._remove(name):
+                self._stats.evictions += 1
+
+    @contextlib.contextmanager
+    def _locked(self, name: str) -> Iterator[None]:
+        while True:
+            with open(self._lock_path(name), "a") as lock:
+                self._fcntl.flock(lock, self._fcntl.LOCK_EX)
+                if not self._holds(lock, name):
+                    # Removed while waiting for it: lock the file that replaced it
+                    continue
+                try:
+                    yield
+                finally:
+                    self._fcntl.flock(lock, self._fcntl.LOCK_UN)
+                return
+
+    @contextlib.asynccontextmanager
+    async def _locked_async(self, name: str) -> AsyncIterator[None]:
+        # Blocking on the lock would block the event loop, and waiting for it in a thread could not be cancelled
+        while True:
+            with open(self._lock_path(name), "a") as lock:
+                while True:
+                    try:
+                        self._fcntl.flock(lock, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(self.lock_poll_interval)
+                if not self._holds(lock, name):
+                    continue
+                try:
+                    yield
+                finally:
+                    self._fcntl.flock(lock, self._fcntl.LOCK_UN)
+                return
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: TTLTypes = None) -> Any:
+        """
+        Look up a value, or compute and store it when it is missing or expired.
+
+        The entry is locked while the value is computed: other processes and threads asking for it meanwhile wait
+        and get the stored value instead of computing it again.
+
+        :param key: Key the value is stored under.
+        :param factory: Callable computing the value. None results are returned without being stored.
+        :param ttl: Optional time-to-live of a computed value, or a callable returning it from the value.
+        :return: The cached or computed value.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        name = self._name(key)
+        with self._locked(name):
+            value = self._lookup(name)
+            if value is None:
+                value = factory()
+                if value is not None:
+                    self.set(key, value, _entry_ttl(ttl, value))
+        return value
+
+    async def get_or_set_async(self, key: Hashable, factory: Callable[[], Awaitable[Any]], ttl: TTLTypes = None) -> Any:
+        """
+        Look up a value, or compute and store it when it is missing or expired.
+
+        The entry is locked while the value is computed: other processes and tasks asking for it meanwhile wait
+        and get the stored value instead of computing it again.
+
+        :param key: Key the value is stored under.
+        :param factory: Callable returning an awaitable computing the value. None results are not stored.
+        :param ttl: Optional time-to-live of a computed value, or a callable returning it from the value.
+        :return: The cached or computed value.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        name = self._name(key)
+        async with self._locked_async(name):
+            value = self._lookup(name)
+            if value is None:
+                value = await factory()
+                if value is not None:
+                    self.set(key, value, _entry_ttl(ttl, value))
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a single entry if present.
+
+        :param key: Key of the entry to drop.
+        """
+        if self._remove(self._name(key)):
+            self._stats.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Drop every entry whose key matches the predicate. Every entry is decrypted to find its key.
+
+        :param predicate: Callable receiving a key and returning True when the entry should be dropped.
+        :return: Number of dropped entries.
+        """
+        dropped = 0
+        for name in self._entries():
+            entry = self._read(name)
+            if entry is not None and predicate(entry[1]) and self._remove(name):
+                dropped += 1
+        self._stats.invalidations += dropped
+        return dropped
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        """Key and value of every unexpired entry. Every entry is decrypted."""
+        now = self._timer()
+        entries = (self._read(name) for name in self._entries())
+        return [(entry[1], entry[2]) for entry in entries if entry is not None and entry[0] > now]
+
+    def clear(self) -> None:
+        """Drop all entries, for every process. Counters are kept."""
+        for name in self._entries():
+            self._remove(name)
+        # Locks of values that were never stored, e.g. because their factory returned None
+        for name in os.listdir(os.path.join(self.directory, "locks")):
+            self._remove_lock(name)
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._expiry(self._name(key)) > self._timer()
+
+
+CacheTypes = Union[TTLCache, FileCache]
+
+
+# Snapshot files: magic, expiry as a Unix timestamp, AES-GCM nonce, then the encrypted entries
+_SNAPSHOT_MAGIC = b"VXS1"
+
+
+def save_snapshot(
+    path: Union[str, "os.PathLike[str]"],
+    items: Iterable[tuple[Hashable, Any]],
+    max_age: float,
+    key: bytes,
+    timer: Callable[[], float] = time.time,
+) -> int:
+    """
+    Write cache entries to an encrypted snapshot file, replacing it atomically.
+
+    The key is required and must be kept apart from the snapshot, e.g. in the environment of the process or wrapped
+    by Transit: a key readable along with the snapshot would leave its secrets effectively in plaintext on disk.
+
+    :param path: Path of the snapshot file.
+    :param items: Keys and values to save, with the same constraints as FileCache entries.
+    :param max_age: Number of seconds the snapshot can be loaded for.
+    :param key: AES key of 16, 24 or 32 bytes.
+    :param timer: Wall clock stamping the snapshot, mostly useful for testing.
+    :return: Number of saved entries.
+    """
+    path = os.fspath(path)
+    aead = _aesgcm(key)
+    entries = [[entry_key, _encode_value(value)] for entry_key, value in items]
+    nonce = os.urandom(12)
+    header = _ENTRY_HEADER.pack(_SNAPSHOT_MAGIC, timer() + max_age, nonce)
+    _write_atomically(path, header + aead.encrypt(nonce, json.dumps(entries).encode(), header))
+    return len(entries)
+
+
+def load_snapshot(
+    path: Union[str, "os.PathLike[str]"],
+    key: bytes,
+    timer: Callable[[], float] = time.time,
+) -> list[tuple[Hashable, Any]]:
+    """
+    Read the entries of a snapshot file written by save_snapshot.
+
+    :param path: Path of the snapshot file.
+    :param key: AES key the snapshot was saved with.
+    :param timer: Wall clock the snapshot expiry is compared with, mostly useful for testing.
+    :return: Keys and values of the snapshot, empty when it is missing, expired or cannot be decrypted.
+    """
+    path = os.fspath(path)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, expires_at, nonce = _ENTRY_HEADER.unpack_from(data)
+        if magic != _SNAPSHOT_MAGIC or expires_at <= timer():
+            return []
+        header = data[: _ENTRY_HEADER.size]
+        entries = json.loads(_aesgcm(key).decrypt(nonce, data[_ENTRY_HEADER.size :], header))
+    except ImportError:
+        raise
+    except Exception:
+        # Missing, truncated, tampered with or encrypted with another key: start cold
+        return []
+    return [(_decode_key(entry_key), _decode_value(value)) for entry_key, value in entries]
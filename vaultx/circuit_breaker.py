@@ -0,0 +1,368 @@
+"""
+Failing fast on Vault endpoints that keep failing or timing out
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Collection
+from typing import Any, Optional, TypeVar
+
+from vaultx import exceptions
+from vaultx.retry import _transient_error
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+
+def _path_segments(url: str) -> list[str]:
+    path = url.split("?", 1)[0].strip("/")
+    if path.startswith("v1/"):
+        path = path[3:]
+    return [segment for segment in path.split("/") if segment]
+
+
+def _namespaced(key: str, namespace: Optional[str]) -> str:
+    return f"{namespace.strip('/')}/{key}" if namespace else key
+
+
+def endpoint_key(url: str, namespace: Optional[str] = None) -> str:
+    """
+    Normalize a request path to the endpoint it belongs to: its mount and operation.
+
+    "/v1/database/creds/readonly" becomes "database/creds", "/v1/auth/approle/login" becomes "auth/approle/login" and
+    "/v1/sys/health" becomes "sys/health". Requests in a namespace are prefixed with it, e.g. "ns1/database/creds".
+
+    The mount is assumed to be the first path segment, or the first two under "auth/", since mounts cannot be told
+    apart from the path alone. Requests to nested mounts such as "team/a/kv" therefore share the circuit of every
+    mount under "team/a", and KV v1 mounts, whose paths have no operation, get one circuit per top-level folder. Use
+    mount_endpoint_key when such mounts are in use.
+
+    :param url: Path of the request.
+    :param namespace: Namespace the request is sent to.
+    :return: The endpoint key.
+    """
+    segments = _path_segments(url)
+    size = 3 if segments[:1] == ["auth"] else 2
+    return _namespaced("/".join(segments[:size]), namespace)
+
+
+def mount_endpoint_key(
+    mounts: Collection[str], flat_mounts: Collection[str] = ()
+) -> Callable[[str, Optional[str]], str]:
+    """
+    Build a key_func resolving the mount of a request from the known mounts of the Vault server.
+
+    The key is the longest of mounts the request path falls under, followed by its operation, e.g.
+    "team/a/kv/data" for "/v1/team/a/kv/data/app" when "team/a/kv" is a mount. Requests under flat_mounts, whose
+    paths carry no operation, get one circuit per mount. Other requests are keyed by endpoint_key.
+
+    :param mounts: Mount paths, e.g. "team/a/kv" or "auth/approle", as listed by sys/mounts and sys/auth.
+    :param flat_mounts: Mounts without operations in their paths, such as KV v1 mounts.
+    :return: The key_func, to be passed to CircuitBreaker.
+    """
+    flat = {mount.strip("/") for mount in flat_mounts}
+    # Longest mounts first, so that nested mounts win over the mounts they are nested in
+    known = sorted({mount.strip("/") for mount in mounts} | flat, key=lambda mount: mount.count("/"), reverse=True)
+
+    def key_func(url: str, namespace: Optional[str] = None) -> str:
+        segments = _path_segments(url)
+        path = "/".join(segments)
+        for mount in known:
+            if path == mount or path.startswith(f"{mount}/"):
+                size = mount.count("/") + (1 if mount in flat else 2)
+                return _namespaced("/".join(segments[:size]), namespace)
+        return endpoint_key(url, namespace)
+
+    return key_func
+
+
+class CircuitBreakerStats:
+    """Counters describing how a circuit breaker has been used since its creation."""
+
+    __slots__ = ("calls", "failures", "slow_calls", "rejected", "opened", "_lock")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.opened = 0
+        self._lock = threading.Lock()
+
+    def _increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+class _Circuit:
+    __slots__ = ("state", "outcomes", "opened_at", "trials", "successes")
+
+    def __init__(self, window_size: int) -> None:
+        self.state = CLOSED
+        # (failed, slow) outcome of the most recent calls
+        self.outcomes: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self.opened_at = 0.0
+        self.trials = 0
+        self.successes = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    Each endpoint, as returned by key_func, has its own circuit. With the cluster adapters, each node has its own
+    circuit for every endpoint, e.g. "database/creds@https://vault-2:8200", so that a failing node does not stop
+    requests to the others:
+
+    - closed: requests are sent and their outcome is recorded in a sliding window of the last window_size calls. Once
+      it holds at least minimum_calls outcomes, the circuit opens if the share of failed calls reaches
+      failure_rate_threshold or the share of calls slower than slow_call_duration reaches slow_call_rate_threshold;
+    - open: requests fail immediately with CircuitOpenError for open_duration seconds, without using a connection;
+    - half-open: up to half_open_calls trial requests are sent. The circuit closes once they all succeed and opens
+      again as soon as one fails or is slow.
+
+    Failures are responses with a status in failure_status_codes and network errors, including timeouts. Other errors,
+    e.g. 403 or 404 responses, are successes as far as the endpoint's health is concerned.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 1.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_calls: int = 3,
+        failure_status_codes: Collection[int] = DEFAULT_FAILURE_STATUS_CODES,
+        key_func: Callable[[str, Optional[str]], str] = endpoint_key,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new CircuitBreaker instance.
+
+        :param failure_rate_threshold: Share of failed calls, between 0 and 1, opening the circuit.
+        :param slow_call_duration: Seconds after which a call is slow, None to ignore call durations.
+        :param slow_call_rate_threshold: Share of slow calls, between 0 and 1, opening the circuit.
+        :param window_size: Number of most recent calls the rates are computed on.
+        :param minimum_calls: Number of calls recorded before the rates are evaluated.
+        :param open_duration: Seconds a circuit stays open before trial requests are let through.
+        :param half_open_calls: Number of successful trial requests closing a half-open circuit.
+        :param failure_status_codes: Response statuses counted as failures.
+        :param key_func: Callable mapping a request path and namespace to its endpoint key.
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        if not 0 < failure_rate_threshold <= 1 or not 0 < slow_call_rate_threshold <= 1:
+            raise ValueError("Rate thresholds must be greater than 0 and at most 1")
+        if window_size < 1 or not 1 <= minimum_calls <= window_size:
+            raise ValueError(f'"minimum_calls" must be between 1 and window_size, "{minimum_calls}" provided')
+        if open_duration <= 0:
+            raise ValueError(f'"open_duration" must be a positive number, "{open_duration}" provided')
+        if half_open_calls < 1:
+            raise ValueError(f'"half_open_calls" must be a positive integer, "{half_open_calls}" provided')
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.failure_status_codes = frozenset(failure_status_codes)
+        self.key_func = key_func
+        self._timer = timer
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+        self._stats = CircuitBreakerStats()
+
+    @property
+    def stats(self) -> CircuitBreakerStats:
+        """Call, failure, rejection and opening counters of this breaker."""
+        return self._stats
+
+    @property
+    def states(self) -> dict[str, str]:
+        """State of the circuit of every endpoint called so far."""
+        with self._lock:
+            return {key: self._current_state(circuit) for key, circuit in self._circuits.items()}
+
+    def state(self, key: str) -> str:
+        """
+        State of the circuit of an endpoint.
+
+        :param key: Endpoint key, e.g. "database/creds".
+        :return: One of "closed", "open" or "half_open".
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return self._current_state(circuit) if circuit is not None else CLOSED
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """
+        Close the circuit of an endpoint, or of every endpoint, forgetting recorded outcomes.
+
+        :param key: Endpoint key, None for every endpoint.
+        """
+        with self._lock:
+            if key is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(key, None)
+
+    def _current_state(self, circuit: _Circuit) -> str:
+        if circuit.state == OPEN and self._timer() - circuit.opened_at >= self.open_duration:
+            return HALF_OPEN
+        return circuit.state
+
+    def _open(self, key: str, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = self._timer()
+        circuit.outcomes.clear()
+        self._stats._increment("opened")
+        logger.warning("Circuit breaker for %s opened for %.1fs", key, self.open_duration)
+
+    def _acquire(self, key: str, method: str, url: str) -> _Circuit:
+        """Let a call through the circuit of key, or raise CircuitOpenError."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit(self.window_size)
+            if circuit.state == OPEN and self._current_state(circuit) == HALF_OPEN:
+                circuit.state = HALF_OPEN
+                circuit.trials = circuit.successes = 0
+            if circuit.state == OPEN or (circuit.state == HALF_OPEN and circuit.trials >= self.half_open_calls):
+                self._stats._increment("rejected")
+                retry_after = max(circuit.opened_at + self.open_duration - self._timer(), 0.0)
+                raise exceptions.CircuitOpenError(key, retry_after, method=method, url=url)
+            if circuit.state == HALF_OPEN:
+                circuit.trials += 1
+        self._stats._increment("calls")
+        return circuit
+
+    def _release(self, circuit: _Circuit) -> None:
+        # The call was interrupted, e.g. cancelled, without telling anything about the endpoint
+        with self._lock:
+            if circuit.state == HALF_OPEN:
+                circuit.trials -= 1
+
+    def _failed(self, outcome: Any) -> bool:
+        if isinstance(outcome, exceptions.HTTPError):
+            return outcome.status_code in self.failure_status_codes
+        if isinstance(outcome, BaseException):
+            return _transient_error(outcome)
+        return outcome.status in self.failure_status_codes
+
+    def _record(self, key: str, circuit: _Circuit, outcome: Any, duration: float) -> None:
+        failed = self._failed(outcome)
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+        if failed:
+            self._stats._increment("failures")
+        if slow:
+            self._stats._increment("slow_calls")
+
+        with self._lock:
+            if circuit.state == HALF_OPEN:
+                if failed or slow:
+                    self._open(key, circuit)
+                else:
+                    circuit.successes += 1
+                    if circuit.successes >= self.half_open_calls:
+                        circuit.state = CLOSED
+                        logger.info("Circuit breaker for %s closed", key)
+                return
+            if circuit.state != CLOSED:
+                return
+            circuit.outcomes.append((failed, slow))
+            calls = len(circuit.outcomes)
+            if calls < self.minimum_calls:
+                return
+            failure_rate = sum(outcome[0] for outcome in circuit.outcomes) / calls
+            slow_rate = sum(outcome[1] for outcome in circuit.outcomes) / calls
+            if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                self._open(key, circuit)
+
+    def _key(self, url: str, namespace: Optional[str], node: Optional[str]) -> str:
+        key = self.key_func(url, namespace)
+        return f"{key}@{node}" if node else key
+
+    def call(
+        self, method: str, url: str, namespace: Optional[str], send: Callable[[], T], node: Optional[str] = None
+    ) -> T:
+        """
+        Call send through the circuit of the endpoint of a request.
+
+        :param method: HTTP method of the request.
+        :param url: Path of the request.
+        :param namespace: Namespace the request is sent to.
+        :param send: Callable sending the request.
+        :param node: Base URI of the cluster node the request is sent to, giving it circuits of its own.
+        :return: The response returned by send.
+        """
+        key = self._key(url, namespace, node)
+        circuit = self._acquire(key, method, url)
+        started = self._timer()
+        try:
+            response = send()
+        except Exception as exc:
+            self._record(key, circuit, exc, self._timer() - started)
+            raise
+        except BaseException:
+            self._release(circuit)
+            raise
+        self._record(key, circuit, response, self._timer() - started)
+        return response
+
+    async def call_async(
+        self,
+        method: str,
+        url: str,
+        namespace: Optional[str],
+        send: Callable[[], Awaitable[T]],
+        node: Optional[str] = None,
+    ) -> T:
+        """
+        Await send through the circuit of the endpoint of a request.
+
+        :param method: HTTP method of the request.
+        :param url: Path of the request.
+        :param namespace: Namespace the request is sent to.
+        :param send: Callable returning an awaitable that sends the request.
+        :param node: Base URI of the cluster node the request is sent to, giving it circuits of its own.
+        :return: The response returned by send.
+        """
+        key = self._key(url, namespace, node)
+        circuit = self._acquire(key, method, url)
+        started = self._timer()
+        try:
+            response = await send()
+        except Exception as exc:
+            self._record(key, circuit, exc, self._timer() - started)
+            raise
+        except BaseException:
+            self._release(circuit)
+            raise
+        self._record(key, circuit, response, self._timer() - started)
+        return response
@@ -10,7 +10,11 @@ import httpx
 
 from vaultx import _types, adapters, api, exceptions
 from vaultx.adapters import VaultxResponse
+from vaultx.consistency import EVENTUAL
 from vaultx.constants.client import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
     DEFAULT_URL,
     VAULT_CACERT,
     VAULT_CAPATH,
@@ -20,6 +24,15 @@ from vaultx.constants.client import (
 from vaultx.utils import get_token_from_env
 
 
+# Only needed by the options and methods using them, which import them on use
+if tp.TYPE_CHECKING:
+    from vaultx import lifecycle
+    from vaultx.cache import CacheTypes
+    from vaultx.circuit_breaker import CircuitBreaker
+    from vaultx.ratelimit import RateLimiter
+    from vaultx.retry import RetryPolicy
+
+
 try:
     hcl = importlib.import_module("hcl")
 
@@ -27,6 +40,28 @@ try:
 except ImportError:
     has_hcl_parser = False
 
+# Defaults of the adapter options added after the original adapter constructor. Only the options set to another
+# value are passed on, so that custom adapters written for the original signature keep working.
+_ADAPTER_OPTION_DEFAULTS: dict[str, Any] = {
+    "max_connections": DEFAULT_MAX_CONNECTIONS,
+    "max_keepalive_connections": DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    "keepalive_expiry": DEFAULT_KEEPALIVE_EXPIRY,
+    "http2": False,
+    "connect_timeout": None,
+    "read_timeout": None,
+    "pool_timeout": None,
+    "retry_policy": None,
+    "consistency": EVENTUAL,
+    "coalesce_requests": False,
+    "rate_limiter": None,
+    "circuit_breaker": None,
+    "login_cache": None,
+}
+
+
+def _adapter_options(**options: Any) -> dict[str, Any]:
+    return {name: value for name, value in options.items() if value != _ADAPTER_OPTION_DEFAULTS[name]}
+
 
 class MetaClient(metaclass=abc.ABCMeta):
     """Vaultx abstract client interface"""
@@ -136,12 +171,26 @@ class Client(MetaClient):
         client: Optional[httpx.Client] = None,
         adapter: tp.Type[adapters.Adapter] = adapters.VaultxAdapter,
         namespace: Optional[str] = None,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        retry_policy: Optional["RetryPolicy"] = None,
+        consistency: str = EVENTUAL,
+        coalesce_requests: bool = False,
+        rate_limiter: Optional["RateLimiter"] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        login_cache: Optional["CacheTypes"] = None,
         **kwargs,
     ) -> None:
         """
         Create a new vaultx client instance.
 
-        :param url: Base URL for the Vault instance being addressed.
+        :param url: Base URL for the Vault instance being addressed, or unix:///path/to/socket for a listener on a
+            Unix domain socket, such as a local Vault Agent.
         :param token: Authentication token to include in requests sent to Vault.
         :param cert: Certificates for use in requests sent to the Vault instance. This should be a tuple with the
             certificate and then key.
@@ -154,8 +203,31 @@ class Client(MetaClient):
         :param follow_redirects: Whether to follow redirects when sending requests to Vault.
         :param client: Optional client object to use when performing request.
         :param adapter: Optional class to be used for performing requests.
-        :param kwargs: Additional parameters to pass to the adapter constructor.
         :param namespace: Optional Vault Namespace.
+        :param max_connections: Maximum number of simultaneous connections, None for no limit.
+        :param max_keepalive_connections: Maximum number of idle connections kept open for reuse, None for no limit.
+        :param keepalive_expiry: Seconds an idle connection is kept open for reuse, None to keep it indefinitely.
+        :param http2: If True, negotiate HTTP/2 so that concurrent requests are multiplexed over a single connection.
+            Requires the h2 package, installed with pip install httpx[http2].
+        :param connect_timeout: Seconds to wait for a connection to be established, defaults to timeout.
+        :param read_timeout: Seconds to wait for a chunk of the response to be received, defaults to timeout.
+        :param pool_timeout: Seconds to wait for a free connection from the pool, defaults to timeout.
+        :param retry_policy: Optional :py:class:`vaultx.retry.RetryPolicy` retrying requests that failed with a
+            transient error, such as a 503 during a leader election or a reset connection.
+        :param consistency: Default consistency of reads served by standby nodes. "strong" forwards every request
+            to the active node, "session" makes standbys wait until they have replicated the writes made through this
+            client, "eventual" adds no guarantee. Override it for a block of code with
+            :py:func:`vaultx.consistency.consistency`.
+        :param coalesce_requests: If True, identical GET, LIST and HEAD requests sent while one of them is in flight
+            share its response instead of being sent again. Counters are available in adapter.singleflight.stats.
+        :param rate_limiter: Optional :py:class:`vaultx.ratelimit.RateLimiter` delaying requests to stay below Vault
+            rate limit quotas, and backing off when Vault answers 429.
+        :param circuit_breaker: Optional :py:class:`vaultx.circuit_breaker.CircuitBreaker` failing requests with
+            :py:class:`vaultx.exceptions.CircuitOpenError` while their endpoint keeps failing or timing out.
+        :param login_cache: Optional cache of login responses. A :py:class:`vaultx.cache.FileCache` lets the worker
+            processes of a host log in once and share the token, each entry being kept for half the token TTL.
+        :param kwargs: Additional parameters to pass to the adapter constructor. Of the options above, only those
+            set to a non-default value are passed to the adapter, so custom adapters need not accept them.
         """
 
         token = token if token else get_token_from_env()
@@ -190,6 +262,21 @@ class Client(MetaClient):
             follow_redirects=follow_redirects,
             client=client,
             namespace=namespace,
+            **_adapter_options(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                http2=http2,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                pool_timeout=pool_timeout,
+                retry_policy=retry_policy,
+                consistency=consistency,
+                coalesce_requests=coalesce_requests,
+                rate_limiter=rate_limiter,
+                circuit_breaker=circuit_breaker,
+                login_cache=login_cache,
+            ),
             **kwargs,
         )
 
@@ -260,7 +347,7 @@ class Client(MetaClient):
         self._adapter.follow_redirects = follow_redirects
 
     @property
-    def auth(self) -> api.AuthMethods:
+    def auth(self) -> "api.AuthMethods":
         """
         Accessor for the Client instance's auth methods. Provided via the :py:class:`vaultx.api.AuthMethods` class.
         :return: This Client instance's associated Auth instance.
@@ -268,7 +355,7 @@ class Client(MetaClient):
         return self._auth
 
     @property
-    def secrets(self) -> api.SecretsEngines:
+    def secrets(self) -> "api.SecretsEngines":
         """
         Accessor for the Client instance's secrets engines.
             Provided via the :py:class:`vaultx.api.SecretsEngines` class.
@@ -277,7 +364,7 @@ class Client(MetaClient):
         return self._secrets
 
     @property
-    def sys(self) -> api.SystemBackend:
+    def sys(self) -> "api.SystemBackend":
         """
         Accessor for the Client instance's system backend methods.
         :return: This Client instance's associated SystemBackend instance.
@@ -514,6 +601,22 @@ class Client(MetaClient):
         """
         return self._adapter.login(url=url, use_token=use_token, **kwargs)
 
+    def start_token_renewal(
+        self, relogin: Optional[tp.Callable[[], Any]] = None, **kwargs: Any
+    ) -> "lifecycle.TokenManager":
+        """
+        Keep the client's token alive by renewing it from a background daemon thread.
+        The TTL is taken from subsequent login responses, or looked up for an already set token.
+
+        :param relogin: Optional callable performing a fresh login (e.g. via approle, kubernetes or jwt)
+            when the token can no longer be renewed.
+        :param kwargs: Additional parameters to pass to the :py:class:`vaultx.lifecycle.TokenManager` constructor.
+        :return: The started token manager. It is stopped when the client is closed.
+        """
+        from vaultx import lifecycle
+
+        return lifecycle.TokenManager(self._adapter, relogin=relogin, **kwargs).start()
+
 
 @exceptions.async_handle_unknown_exception
 class AsyncClient(MetaClient):
@@ -531,12 +634,26 @@ class AsyncClient(MetaClient):
         client: Optional[httpx.AsyncClient] = None,
         adapter: tp.Type[adapters.AsyncAdapter] = adapters.AsyncVaultxAdapter,
         namespace: Optional[str] = None,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        retry_policy: Optional["RetryPolicy"] = None,
+        consistency: str = EVENTUAL,
+        coalesce_requests: bool = False,
+        rate_limiter: Optional["RateLimiter"] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        login_cache: Optional["CacheTypes"] = None,
         **kwargs,
     ) -> None:
         """
         Create a new vaultx async client instance.
 
-        :param url: Base URL for the Vault instance being addressed.
+        :param url: Base URL for the Vault instance being addressed, or unix:///path/to/socket for a listener on a
+            Unix domain socket, such as a local Vault Agent.
         :param token: Authentication token to include in requests sent to Vault.
         :param cert: Certificates for use in requests sent to the Vault instance. This should be a tuple with the
             certificate and then key.
@@ -549,8 +666,33 @@ class AsyncClient(MetaClient):
         :param follow_redirects: Whether to follow redirects when sending requests to Vault.
         :param client: Optional async client object to use when performing request.
         :param adapter: Optional class to be used for performing requests.
-        :param kwargs: Additional parameters to pass to the adapter constructor.
         :param namespace: Optional Vault Namespace.
+        :param max_connections: Maximum number of simultaneous connections, None for no limit.
+        :param max_keepalive_connections: Maximum number of idle connections kept open for reuse, None for no limit.
+            Only applies with http2=True; the default aiohttp transport keeps every released connection open until
+            keepalive_expiry.
+        :param keepalive_expiry: Seconds an idle connection is kept open for reuse, None to keep it indefinitely.
+        :param http2: If True, negotiate HTTP/2 so that concurrent requests are multiplexed over a single connection.
+            Requires the h2 package, installed with pip install httpx[http2].
+        :param connect_timeout: Seconds to wait for a connection to be established, defaults to timeout.
+        :param read_timeout: Seconds to wait for a chunk of the response to be received, defaults to timeout.
+        :param pool_timeout: Seconds to wait for a free connection from the pool, defaults to timeout.
+        :param retry_policy: Optional :py:class:`vaultx.retry.RetryPolicy` retrying requests that failed with a
+            transient error, such as a 503 during a leader election or a reset connection.
+        :param consistency: Default consistency of reads served by standby nodes. "strong" forwards every request
+            to the active node, "session" makes standbys wait until they have replicated the writes made through this
+            client, "eventual" adds no guarantee. Override it for a block of code with
+            :py:func:`vaultx.consistency.consistency`.
+        :param coalesce_requests: If True, identical GET, LIST and HEAD requests sent while one of them is in flight
+            share its response instead of being sent again. Counters are available in adapter.singleflight.stats.
+        :param rate_limiter: Optional :py:class:`vaultx.ratelimit.RateLimiter` delaying requests to stay below Vault
+            rate limit quotas, and backing off when Vault answers 429.
+        :param circuit_breaker: Optional :py:class:`vaultx.circuit_breaker.CircuitBreaker` failing requests with
+            :py:class:`vaultx.exceptions.CircuitOpenError` while their endpoint keeps failing or timing out.
+        :param login_cache: Optional cache of login responses. A :py:class:`vaultx.cache.FileCache` lets the worker
+            processes of a host log in once and share the token, each entry being kept for half the token TTL.
+        :param kwargs: Additional parameters to pass to the adapter constructor. Of the options above, only those
+            set to a non-default value are passed to the adapter, so custom adapters need not accept them.
         """
 
         token = token if token else get_token_from_env()
@@ -584,6 +726,21 @@ class AsyncClient(MetaClient):
             follow_redirects=follow_redirects,
             client=client,
             namespace=namespace,
+            **_adapter_options(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                http2=http2,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                pool_timeout=pool_timeout,
+                retry_policy=retry_policy,
+                consistency=consistency,
+                coalesce_requests=coalesce_requests,
+                rate_limiter=rate_limiter,
+                circuit_breaker=circuit_breaker,
+                login_cache=login_cache,
+            ),
             **kwargs,
         )
 
@@ -654,7 +811,7 @@ class AsyncClient(MetaClient):
         self._adapter.follow_redirects = follow_redirects
 
     @property
-    def auth(self) -> api.AsyncAuthMethods:
+    def auth(self) -> "api.AsyncAuthMethods":
         """
         Accessor for the AsyncClient instance's auth methods.
             Provided via the :py:class:`vaultx.api.AsyncAuthMethods` class.
@@ -663,7 +820,7 @@ class AsyncClient(MetaClient):
         return self._auth
 
     @property
-    def secrets(self) -> api.AsyncSecretsEngines:
+    def secrets(self) -> "api.AsyncSecretsEngines":
         """
         Accessor for the AsyncClient instance's secrets engines.
             Provided via the :py:class:`vaultx.api.AsyncSecretsEngines` class.
@@ -672,7 +829,7 @@ class AsyncClient(MetaClient):
         return self._secrets
 
     @property
-    def sys(self) -> api.AsyncSystemBackend:
+    def sys(self) -> "api.AsyncSystemBackend":
         """
         Accessor for the AsyncClient instance's async system backend methods.
         :return: This AsyncClient instance's associated AsyncSystemBackend instance.
@@ -908,3 +1065,19 @@ class AsyncClient(MetaClient):
         :return: The response of the auth request.
         """
         return await self._adapter.login(url=url, use_token=use_token, **kwargs)
+
+    async def start_token_renewal(
+        self, relogin: Optional[tp.Callable[[], tp.Awaitable[Any]]] = None, **kwargs: Any
+    ) -> "lifecycle.AsyncTokenManager":
+        """
+        Keep the client's token alive by renewing it from a background asyncio task.
+        The TTL is taken from subsequent login responses, or looked up for an already set token.
+
+        :param relogin: Optional coroutine function performing a fresh login (e.g. via approle, kubernetes or jwt)
+            when the token can no longer be renewed.
+        :param kwargs: Additional parameters to pass to the :py:class:`vaultx.lifecycle.AsyncTokenManager` constructor.
+        :return: The started token manager. It is stopped when the client is closed.
+        """
+        from vaultx import lifecycle
+
+        return await lifecycle.AsyncTokenManager(self._adapter, relogin=relogin, **kwargs).start()
@@ -0,0 +1,482 @@
+"""
+Adapters routing requests across the nodes of a Vault HA cluster
+"""
+
+import asyncio
+import contextlib
+import functools
+import itertools
+import logging
+import sys
+import threading
+import time
+from collections.abc import AsyncIterable, Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import httpx
+
+from vaultx import exceptions
+from vaultx.adapters import AsyncVaultxAdapter, VaultxAdapter, VaultxResponse
+from vaultx.consistency import active_session
+from vaultx.constants.client import DEFAULT_TOPOLOGY_REFRESH_INTERVAL, DEFAULT_URL
+from vaultx.retry import IDEMPOTENT_METHODS, _transient_error
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = "active"
+PERFORMANCE_STANDBY = "performance_standby"
+STANDBY = "standby"
+SEALED = "sealed"
+UNREACHABLE = "unreachable"
+UNKNOWN = "unknown"
+
+# Statuses answered by a node that cannot serve the request, e.g. a sealed node or one stepping down
+FAILOVER_STATUS_CODES = frozenset({502, 503})
+# Answered by a standby that has not caught up with the X-Vault-Index state of the request in time
+STALE_STATUS_CODE = 412
+# Errors raised before the request reached the node, so that even a write can safely be sent to another node
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, ConnectionRefusedError)
+
+HEALTH_PATH = "/v1/sys/health"
+LEADER_PATH = "/v1/sys/leader"
+
+
+def role_from_health(health: Any) -> str:
+    """
+    Derive the role of a node from its /sys/health response body.
+
+    :param health: The decoded health response.
+    :return: One of "active", "performance_standby", "standby", "sealed" or "unknown".
+    """
+    if not isinstance(health, dict) or "sealed" not in health:
+        return UNKNOWN
+    if health["sealed"] or not health.get("initialized", True):
+        return SEALED
+    if health.get("performance_standby"):
+        return PERFORMANCE_STANDBY
+    if health.get("standby"):
+        return STANDBY
+    return ACTIVE
+
+
+def _connect_error(error: BaseException) -> bool:
+    # aiohttp errors can only be raised once an async adapter imported aiohttp
+    aiohttp = sys.modules.get("aiohttp")
+    connect_errors = CONNECT_ERRORS if aiohttp is None else (*CONNECT_ERRORS, aiohttp.ClientConnectorError)
+    while error is not None:
+        if isinstance(error, connect_errors):
+            return True
+        error = error.__cause__  # type: ignore[assignment]
+    return False
+
+
+def _failover_error(error: BaseException, idempotent: bool) -> bool:
+    if isinstance(error, exceptions.CircuitOpenError):
+        # The circuit of this node rejected the request before it was sent
+        return True
+    if isinstance(error, exceptions.HTTPError):
+        return error.status_code in FAILOVER_STATUS_CODES or error.status_code == STALE_STATUS_CODE
+    # A write may already have been applied when the connection failed after the request was sent
+    return _transient_error(error) if idempotent else _connect_error(error)
+
+
+def _replayable(kwargs: dict[str, Any]) -> bool:
+    # Iterators of chunks, e.g. a streamed snapshot, are consumed by the first attempt
+    content = kwargs.get("content")
+    return not isinstance(content, (Iterable, AsyncIterable)) or isinstance(content, (bytes, str))
+
+
+def _stale(outcome: Any) -> bool:
+    status = outcome.status_code if isinstance(outcome, exceptions.HTTPError) else getattr(outcome, "status", None)
+    return status == STALE_STATUS_CODE
+
+
+class ClusterTopology:
+    """
+    Thread-safe view of the roles of the nodes of a Vault cluster.
+
+    Writes are routed to the active node. Reads are spread round-robin across performance standbys and fall back to
+    the active node. Plain standbys, which only redirect to the active node, and sealed or unreachable nodes are only
+    tried once every other node has failed.
+    """
+
+    def __init__(self, nodes: Sequence[str], timer: Callable[[], float] = time.monotonic) -> None:
+        """
+        Create a new ClusterTopology instance.
+
+        :param nodes: Addresses of the nodes of the cluster, e.g. "https://vault-0.example.com:8200".
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        if not nodes:
+            raise ValueError("At least one node address must be provided")
+        self._roles: dict[str, str] = {node.rstrip("/"): UNKNOWN for node in nodes}
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self.refreshed_at: Optional[float] = None
+        self.failovers = 0
+
+    @property
+    def nodes(self) -> list[str]:
+        with self._lock:
+            return list(self._roles)
+
+    @property
+    def roles(self) -> dict[str, str]:
+        """A snapshot of the role of every node."""
+        with self._lock:
+            return dict(self._roles)
+
+    @property
+    def active(self) -> Optional[str]:
+        """Address of the active node, if known."""
+        with self._lock:
+            return next((node for node, role in self._roles.items() if role == ACTIVE), None)
+
+    def set_roles(self, roles: dict[str, str]) -> None:
+        """
+        Replace the roles of the given nodes after a refresh.
+
+        :param roles: Mapping of node address to role.
+        """
+        with self._lock:
+            self._roles.update({node.rstrip("/"): role for node, role in roles.items()})
+            self.refreshed_at = self._timer()
+
+    def mark_failed(self, node: str) -> None:
+        """Mark a node as unreachable after a request to it failed."""
+        with self._lock:
+            self._roles[node] = UNREACHABLE
+            self.failovers += 1
+
+    def candidates(self, method: str, active_only: bool = False) -> list[str]:
+        """
+        Order the nodes in which a request should be attempted.
+
+        :param method: HTTP method of the request.
+        :param active_only: If True, prefer the active node for reads as well, e.g. for strongly consistent reads.
+        :return: Every node address, the preferred one first.
+        """
+        with self._lock:
+            by_role: dict[str, list[str]] = {}
+            for node, role in self._roles.items():
+                by_role.setdefault(role, []).append(node)
+
+        standbys = by_role.get(PERFORMANCE_STANDBY, [])
+        if standbys and method.upper() in IDEMPOTENT_METHODS and not active_only:
+            offset = next(self._round_robin) % len(standbys)
+            preferred = standbys[offset:] + standbys[:offset] + by_role.get(ACTIVE, [])
+        else:
+            preferred = by_role.get(ACTIVE, []) + standbys
+        fallback = [node for role in (UNKNOWN, STANDBY, SEALED, UNREACHABLE) for node in by_role.get(role, [])]
+        return preferred + fallback
+
+
+class _ClusterAdapterMixin:
+    """Topology probing shared by the sync and async cluster adapters."""
+
+    topology: ClusterTopology
+
+    def _roles_from_probes(self, health: dict[str, Any]) -> dict[str, str]:
+        return {node: UNREACHABLE if value is None else role_from_health(value) for node, value in health.items()}
+
+    @staticmethod
+    def _leader_address(leader: Any) -> Optional[str]:
+        if isinstance(leader, dict) and leader.get("ha_enabled") and leader.get("leader_address"):
+            return leader["leader_address"].rstrip("/")
+        return None
+
+
+@exceptions.handle_unknown_exception
+class ClusterVaultxAdapter(_ClusterAdapterMixin, VaultxAdapter):
+    """
+    Synchronous adapter aware of the nodes of a Vault HA cluster.
+
+    The role of every node is read from /sys/health when the first request is sent and then refreshed from a daemon
+    thread. When no configured node reports being active, the leader address returned by /sys/leader is added to the
+    nodes. A request failing with a 502/503 status, or a connection error, is sent to the next candidate node and the
+    failed node is only tried again after a refresh found it healthy. Writes only fail over when the connection could
+    not be established, as a request that reached its node may have been applied. Requests streaming their content
+    from an iterator never fail over. With a circuit breaker, every node has circuits of its own, and a request
+    rejected by an open circuit of one node is sent to the next candidate.
+    """
+
+    def __init__(
+        self,
+        base_uri: str = DEFAULT_URL,
+        nodes: Optional[Sequence[str]] = None,
+        refresh_interval: Optional[float] = DEFAULT_TOPOLOGY_REFRESH_INTERVAL,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Create a new cluster adapter instance.
+
+        :param base_uri: Address used when nodes is not provided.
+        :param nodes: Addresses of the nodes of the cluster.
+        :param refresh_interval: Seconds between two topology refreshes, None to only refresh after failures.
+        :param kwargs: Additional parameters to pass to the VaultxAdapter constructor.
+        """
+        super().__init__(base_uri=base_uri, **kwargs)
+        self.topology = ClusterTopology(nodes or [base_uri])
+        self.refresh_interval = refresh_interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _probe(self, node: str, path: str) -> Optional[dict]:
+        try:
+            return self._send("GET", path, None, False, base_uri=node).value
+        except Exception as exc:
+            logger.debug("Probing %s%s failed: %s", node, path, exc)
+            return None
+
+    def refresh(self) -> dict[str, str]:
+        """
+        Read the role of every node now.
+
+        :return: A snapshot of the role of every node.
+        """
+        nodes = self.topology.nodes
+        with ThreadPoolExecutor(max_workers=len(nodes), thread_name_prefix="vaultx-cluster-probe") as executor:
+            probes = list(executor.map(functools.partial(self._probe, path=HEALTH_PATH), nodes))
+        roles = self._roles_from_probes({node: probes[index] for index, node in enumerate(nodes)})
+        if ACTIVE not in roles.values():
+            reachable = next((node for node, role in roles.items() if role != UNREACHABLE), None)
+            leader = self._leader_address(self._probe(reachable, LEADER_PATH)) if reachable else None
+            if leader is not None:
+                roles[leader] = ACTIVE
+        self.topology.set_roles(roles)
+        return self.topology.roles
+
+    def _ensure_started(self) -> None:
+        if self.topology.refreshed_at is not None or self._stopped.is_set():
+            return
+        with self._start_lock:
+            if self.topology.refreshed_at is None:
+                self.refresh()
+                self._thread = threading.Thread(target=self._run, name="vaultx-cluster-topology", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        # Without a refresh interval, the thread only wakes up after a failover
+        while not self._stopped.is_set():
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            try:
+                self.refresh()
+            except Exception as exc:
+                logger.warning("Refreshing the cluster topology failed: %s", exc)
+
+    def _stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop()
+        super().__exit__(*exc_info)
+
+    def close(self) -> None:
+        """Stop the topology refresh thread, then close the adapter."""
+        self._stop()
+        super().close()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        # Send the request to the preferred node of the cluster, failing over to the other nodes
+        retry = kwargs.pop("retry", None)
+        send = functools.partial(self._send_routed, method, url, headers, raise_exception, **kwargs)
+        if self.retry_policy is not None and self.retry_policy.applies_to(method, retry):
+            return self.retry_policy.call(send)
+        return send()
+
+    def _send_routed(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        self._ensure_started()
+        session = active_session(self.consistency)
+        candidates = self.topology.candidates(method, active_only=session.requires_active_node)
+        if not _replayable(kwargs):
+            candidates = candidates[:1]
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for node in candidates[:-1]:
+            try:
+                outcome: Any = self._send(method, url, headers, raise_exception, base_uri=node, **kwargs)
+            except Exception as exc:
+                if not _failover_error(exc, idempotent):
+                    raise
+                outcome = exc
+                logger.info("Request to %s failed, failing over: %s", node, exc)
+            else:
+                if outcome.status not in FAILOVER_STATUS_CODES and not _stale(outcome):
+                    return outcome
+            if _stale(outcome):
+                # The node is healthy but lagging behind, the next candidates are closer to the active node
+                continue
+            if isinstance(outcome, exceptions.CircuitOpenError):
+                # Only this endpoint is known to fail on the node, which keeps serving the others
+                continue
+            self.topology.mark_failed(node)
+            self._wake.set()
+        return self._send(method, url, headers, raise_exception, base_uri=candidates[-1], **kwargs)
+
+
+@exceptions.async_handle_unknown_exception
+class AsyncClusterVaultxAdapter(_ClusterAdapterMixin, AsyncVaultxAdapter):
+    """
+    Asynchronous adapter aware of the nodes of a Vault HA cluster.
+
+    Behaves like ClusterVaultxAdapter, refreshing the topology from an asyncio task started by the first request.
+    """
+
+    def __init__(
+        self,
+        base_uri: str = DEFAULT_URL,
+        nodes: Optional[Sequence[str]] = None,
+        refresh_interval: Optional[float] = DEFAULT_TOPOLOGY_REFRESH_INTERVAL,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Create a new async cluster adapter instance.
+
+        :param base_uri: Address used when nodes is not provided.
+        :param nodes: Addresses of the nodes of the cluster.
+        :param refresh_interval: Seconds between two topology refreshes, None to only refresh after failures.
+        :param kwargs: Additional parameters to pass to the AsyncVaultxAdapter constructor.
+        """
+        super().__init__(base_uri=base_uri, **kwargs)
+        self.topology = ClusterTopology(nodes or [base_uri])
+        self.refresh_interval = refresh_interval
+        self._wake: Optional[asyncio.Event] = None
+        self._first_refresh: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self, node: str, path: str) -> Optional[dict]:
+        try:
+            return (await self._send("GET", path, None, False, base_uri=node)).value
+        except Exception as exc:
+            logger.debug("Probing %s%s failed: %s", node, path, exc)
+            return None
+
+    async def refresh(self) -> dict[str, str]:
+        """
+        Read the role of every node now.
+
+        :return: A snapshot of the role of every node.
+        """
+        nodes = self.topology.nodes
+        probes = await asyncio.gather(*(self._probe(node, HEALTH_PATH) for node in nodes))
+        roles = self._roles_from_probes({node: probes[index] for index, node in enumerate(nodes)})
+        if ACTIVE not in roles.values():
+            reachable = next((node for node, role in roles.items() if role != UNREACHABLE), None)
+            leader = self._leader_address(await self._probe(reachable, LEADER_PATH)) if reachable else None
+            if leader is not None:
+                roles[leader] = ACTIVE
+        self.topology.set_roles(roles)
+        return self.topology.roles
+
+    async def _ensure_started(self) -> None:
+        if self.topology.refreshed_at is not None:
+            return
+        # Concurrent first requests share a single refresh
+        if self._first_refresh is None:
+            self._first_refresh = asyncio.ensure_future(self.refresh())
+        await asyncio.shield(self._first_refresh)
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="vaultx-cluster-topology")
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.refresh_interval)
+            self._wake.clear()
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.warning("Refreshing the cluster topology failed: %s", exc)
+
+    async def _stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._stop()
+        await super().__aexit__(*exc_info)
+
+    async def close(self) -> None:
+        """Cancel the topology refresh task, then close the adapter."""
+        await self._stop()
+        await super().close()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        # Send the request to the preferred node of the cluster, failing over to the other nodes
+        retry = kwargs.pop("retry", None)
+        send = functools.partial(self._send_routed, method, url, headers, raise_exception, **kwargs)
+        if self.retry_policy is not None and self.retry_policy.applies_to(method, retry):
+            return await self.retry_policy.call_async(send)
+        return await send()
+
+    async def _send_routed(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]],
+        raise_exception: Optional[bool],
+        **kwargs: Optional[Any],
+    ) -> VaultxResponse:
+        await self._ensure_started()
+        session = active_session(self.consistency)
+        candidates = self.topology.candidates(method, active_only=session.requires_active_node)
+        if not _replayable(kwargs):
+            candidates = candidates[:1]
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for node in candidates[:-1]:
+            try:
+                outcome: Any = await self._send(method, url, headers, raise_exception, base_uri=node, **kwargs)
+            except Exception as exc:
+                if not _failover_error(exc, idempotent):
+                    raise
+                outcome = exc
+                logger.info("Request to %s failed, failing over: %s", node, exc)
+            else:
+                if outcome.status not in FAILOVER_STATUS_CODES and not _stale(outcome):
+                    return outcome
+            if _stale(outcome):
+                # The node is healthy but lagging behind, the next candidates are closer to the active node
+                continue
+            if isinstance(outcome, exceptions.CircuitOpenError):
+                # Only this endpoint is known to fail on the node, which keeps serving the others
+                continue
+            self.topology.mark_failed(node)
+            if self._wake is not None:
+                self._wake.set()
+        return await self._send(method, url, headers, raise_exception, base_uri=candidates[-1], **kwargs)
@@ -0,0 +1,150 @@
+"""
+Read-after-write consistency across Vault nodes using X-Vault-Index states
+"""
+
+import base64
+import binascii
+import contextlib
+import contextvars
+import threading
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Optional
+
+
+STRONG = "strong"
+SESSION = "session"
+EVENTUAL = "eventual"
+CONSISTENCY_MODES = (STRONG, SESSION, EVENTUAL)
+
+INDEX_HEADER = "X-Vault-Index"
+INCONSISTENT_HEADER = "X-Vault-Inconsistent"
+FORWARD_ACTIVE_NODE = "forward-active-node"
+
+
+def parse_index_state(state: str) -> Optional[tuple[str, int, int]]:
+    """
+    Decode an X-Vault-Index state.
+
+    :param state: The base64 encoded "v1:<cluster id>:<local index>:<replicated index>:<hmac>" header value.
+    :return: The cluster id, replicated index and local index, or None if the state cannot be decoded.
+    """
+    try:
+        pieces = base64.b64decode(state, validate=True).decode().rsplit(":", 1)[0].split(":")
+        if len(pieces) != 4 or pieces[0] != "v1" or not pieces[1]:
+            return None
+        return pieces[1], int(pieces[3]), int(pieces[2])
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def newest_index_state(current: Optional[str], new: str) -> str:
+    """
+    Pick the state a later request must wait for.
+
+    States of the same cluster are compared by their replicated then local index; any other new state replaces the
+    current one.
+
+    :param current: The state recorded so far, if any.
+    :param new: The state returned by the latest response.
+    :return: The state to send with the next requests.
+    """
+    if current is None:
+        return new
+    current_parsed, new_parsed = parse_index_state(current), parse_index_state(new)
+    if current_parsed and new_parsed and current_parsed[0] == new_parsed[0] and current_parsed > new_parsed:
+        return current
+    return new
+
+
+class ConsistencySession:
+    """
+    The consistency requirements of a logical sequence of requests.
+
+    - strong: every request is served by the active node, standbys forward it with X-Vault-Inconsistent.
+    - session: the X-Vault-Index state of every response is recorded and sent with later requests, so that a standby
+      only answers once it has caught up with this session's own writes.
+    - eventual: requests carry no consistency header and may observe stale data on standbys.
+    """
+
+    __slots__ = ("mode", "index", "_lock")
+
+    def __init__(self, mode: str = SESSION) -> None:
+        """
+        Create a new ConsistencySession instance.
+
+        :param mode: One of "strong", "session" or "eventual".
+        """
+        if mode not in CONSISTENCY_MODES:
+            raise ValueError(f'"mode" must be one of {", ".join(CONSISTENCY_MODES)}, "{mode}" provided')
+        self.mode = mode
+        self.index: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def requires_active_node(self) -> bool:
+        return self.mode == STRONG
+
+    def apply(self, headers: MutableMapping[str, str]) -> None:
+        """
+        Add the consistency headers of this session to a request.
+
+        :param headers: Headers of the request, modified in place.
+        """
+        if self.mode == SESSION and self.index is not None:
+            headers[INDEX_HEADER] = self.index
+        elif self.mode == STRONG:
+            headers[INCONSISTENT_HEADER] = FORWARD_ACTIVE_NODE
+
+    def record(self, headers: Mapping[str, str]) -> None:
+        """
+        Remember the X-Vault-Index state returned with a response.
+
+        :param headers: Headers of the response.
+        """
+        if self.mode != SESSION:
+            return
+        state = headers.get(INDEX_HEADER)
+        if state:
+            with self._lock:
+                self.index = newest_index_state(self.index, state)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(mode={self.mode!r}, index={self.index!r})"
+
+
+_current_session: contextvars.ContextVar[Optional[ConsistencySession]] = contextvars.ContextVar(
+    "vaultx_consistency_session", default=None
+)
+
+
+def current_session() -> Optional[ConsistencySession]:
+    """Return the session entered by the current context, if any."""
+    return _current_session.get()
+
+
+def active_session(default: ConsistencySession) -> ConsistencySession:
+    """
+    Return the session a request belongs to.
+
+    :param default: The client-wide session, used outside of a consistency block.
+    """
+    return _current_session.get() or default
+
+
+@contextlib.contextmanager
+def consistency(mode: str = SESSION) -> Iterator[ConsistencySession]:
+    """
+    Run the enclosed requests in a new consistency session, overriding the consistency mode of the client.
+
+    The session is bound to the current context, so it follows asyncio tasks created inside the block and the worker
+    threads of read_many and walk.
+
+    :param mode: One of "strong", "session" or "eventual".
+    :return: The session, whose index holds the latest recorded state.
+    """
+    session = ConsistencySession(mode)
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
@@ -2,7 +2,14 @@ from os import getenv
 
 
 DEFAULT_URL = "http://localhost:8200"
+UNIX_SOCKET_SCHEME = "unix://"
+# Base URL of requests sent over a Unix domain socket, whose host is only used for the Host header
+UNIX_SOCKET_URL = "http://localhost"
 VAULT_CACERT = getenv("VAULT_CACERT")
 VAULT_CAPATH = getenv("VAULT_CAPATH")
 VAULT_CLIENT_CERT = getenv("VAULT_CLIENT_CERT")
 VAULT_CLIENT_KEY = getenv("VAULT_CLIENT_KEY")
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+DEFAULT_TOPOLOGY_REFRESH_INTERVAL = 10.0
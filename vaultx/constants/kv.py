@@ -0,0 +1,4 @@
+"""Constants related to the KV secrets engines."""
+
+DEFAULT_READ_CONCURRENCY = 10
+DEFAULT_LIST_CONCURRENCY = 10
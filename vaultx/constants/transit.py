@@ -50,3 +50,8 @@ ALLOWED_MARSHALING_ALGORITHMS = [
 # https://github.com/hashicorp/vault/pull/16549
 # Either 'auto', 'hash', '-1', or any non-negative integer.
 ALLOWED_SALT_LENGTHS = re.compile(r"auto|hash|-1|\d+")
+
+# Defaults of rewrap campaigns, kept here so that the Transit classes do not import vaultx.rewrap until one is created
+DEFAULT_REWRAP_BATCH_SIZE = 250
+DEFAULT_REWRAP_CONCURRENCY = 4
+DEFAULT_REWRAP_CHECKPOINT_INTERVAL = 10.0
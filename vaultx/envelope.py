@@ -0,0 +1,745 @@
+"""
+Envelope encryption with Transit data keys, the bulk encryption being done locally with AES-GCM
+"""
+
+import asyncio
+import base64
+import contextlib
+import functools
+import importlib
+import os
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Optional
+
+from vaultx import exceptions, streams
+from vaultx.cache import TTLCache, _aesgcm
+from vaultx.singleflight import AsyncSingleFlight, SingleFlight
+
+
+if TYPE_CHECKING:
+    from vaultx.adapters import VaultxResponse
+    from vaultx.api.async_secrets_engines.transit import Transit as AsyncTransit
+    from vaultx.api.secrets_engines.transit import Transit
+
+
+# Envelopes: magic, length of the wrapped data key, the wrapped data key, AES-GCM nonce, then the ciphertext and tag.
+# Only the magic is authenticated along with the caller's associated data, so that the wrapped data key of an envelope
+# can be rewrapped after a key rotation without touching its ciphertext: a substituted data key fails authentication.
+ENVELOPE_MAGIC = b"VXE1"
+_ENVELOPE_HEADER = struct.Struct(">4sH")
+_NONCE_SIZE = 12
+
+# Random 96-bit nonces are safe for up to 2**32 messages under one key, data keys are replaced long before that
+DEFAULT_MAX_USES = 2**20
+MAX_USES_LIMIT = 2**32
+
+DEFAULT_DATA_KEY_TTL = 300.0
+DEFAULT_DATA_KEY_BITS = 256
+ALLOWED_DATA_KEY_BITS = (128, 256)
+
+_DATA_KEY = ("datakey",)
+
+
+def _pack(wrapped: str, nonce: bytes, ciphertext: bytes) -> bytes:
+    encoded = wrapped.encode()
+    return _ENVELOPE_HEADER.pack(ENVELOPE_MAGIC, len(encoded)) + encoded + nonce + ciphertext
+
+
+def _unpack(envelope: bytes) -> tuple[str, bytes, bytes]:
+    """Split an envelope into its wrapped data key, nonce and ciphertext."""
+    if len(envelope) < _ENVELOPE_HEADER.size:
+        raise exceptions.VaultxError("Invalid envelope: too short")
+    magic, length = _ENVELOPE_HEADER.unpack_from(envelope)
+    start = _ENVELOPE_HEADER.size + length
+    if magic != ENVELOPE_MAGIC or len(envelope) < start + _NONCE_SIZE:
+        raise exceptions.VaultxError("Invalid envelope: unknown format or truncated")
+    wrapped = envelope[_ENVELOPE_HEADER.size : start].decode()
+    return wrapped, envelope[start : start + _NONCE_SIZE], envelope[start + _NONCE_SIZE :]
+
+
+def wrapped_key(envelope: bytes) -> str:
+    """
+    Read the wrapped data key of an envelope, e.g. to find the Transit key version it was encrypted with.
+
+    :param envelope: Envelope produced by an envelope encryptor.
+    :return: The data key ciphertext, e.g. "vault:v1:...".
+    """
+    return _unpack(envelope)[0]
+
+
+def _associated_data(associated_data: Optional[bytes]) -> bytes:
+    return ENVELOPE_MAGIC + (associated_data or b"")
+
+
+# Encrypted streams: magic, chunk size, length of the wrapped data key, the wrapped data key and a random salt, then
+# frames made of a final flag, the ciphertext length and the ciphertext of one chunk. Each stream is encrypted with its
+# own key, derived from the data key and the salt with HKDF, so that a cached data key seals any number of streams
+# without their nonces ever repeating under one key. The nonce of a frame is its index and final flag, so that
+# reordered, dropped or truncated frames fail authentication.
+STREAM_MAGIC = b"VXF1"
+_STREAM_HEADER = struct.Struct(">4sIH")
+_FRAME_HEADER = struct.Struct(">?I")
+_FRAME_NONCE = struct.Struct(">7xI?")
+_STREAM_SALT_SIZE = 32
+_TAG_SIZE = 16
+MAX_STREAM_CHUNK_SIZE = 2**32 - 1 - _TAG_SIZE
+_MAX_FRAMES = 2**32
+
+
+def _validate_stream_params(chunk_size: int, workers: int) -> None:
+    if not 0 < chunk_size <= MAX_STREAM_CHUNK_SIZE:
+        raise ValueError(f'"chunk_size" must be between 1 and {MAX_STREAM_CHUNK_SIZE}, "{chunk_size}" provided')
+    if workers <= 0:
+        raise ValueError(f'"workers" must be a positive integer, "{workers}" provided')
+
+
+def _stream_header(chunk_size: int, wrapped: str, salt: bytes) -> bytes:
+    encoded = wrapped.encode()
+    return _STREAM_HEADER.pack(STREAM_MAGIC, chunk_size, len(encoded)) + encoded + salt
+
+
+def _parse_stream_header(header: bytes) -> tuple[int, int]:
+    """Read the chunk size and wrapped data key length from the fixed-size start of a stream header."""
+    magic, chunk_size, length = _STREAM_HEADER.unpack(header)
+    if magic != STREAM_MAGIC or not 0 < chunk_size <= MAX_STREAM_CHUNK_SIZE:
+        raise exceptions.VaultxError("Invalid encrypted stream: unknown format")
+    return chunk_size, length
+
+
+def _stream_aead(data_key: bytes, salt: bytes) -> Any:
+    """AES-GCM cipher of the key of one stream, derived from the data key and the salt of the stream."""
+    hashes = importlib.import_module("cryptography.hazmat.primitives.hashes")
+    hkdf = importlib.import_module("cryptography.hazmat.primitives.kdf.hkdf")
+    kdf = hkdf.HKDF(algorithm=hashes.SHA256(), length=len(data_key), salt=salt, info=STREAM_MAGIC)
+    return _aesgcm(kdf.derive(data_key))
+
+
+def _stream_associated_data(chunk_size: int, associated_data: Optional[bytes]) -> bytes:
+    return STREAM_MAGIC + struct.pack(">I", chunk_size) + (associated_data or b"")
+
+
+def _parse_frame_header(header: bytes, chunk_size: int) -> tuple[bool, int]:
+    final, length = _FRAME_HEADER.unpack(header)
+    if length > chunk_size + _TAG_SIZE:
+        raise exceptions.VaultxError("Invalid encrypted stream: frame larger than its chunk size")
+    return final, length
+
+
+def _seal_frame(aead: Any, aad: bytes, index: int, chunk: bytes, final: bool) -> bytes:
+    ciphertext = aead.encrypt(_FRAME_NONCE.pack(index, final), chunk, aad)
+    return _FRAME_HEADER.pack(final, len(ciphertext)) + ciphertext
+
+
+def _open_frame(aead: Any, aad: bytes, index: int, final: bool, ciphertext: bytes) -> bytes:
+    try:
+        return aead.decrypt(_FRAME_NONCE.pack(index, final), ciphertext, aad)
+    except Exception as e:
+        raise exceptions.VaultxError(f"Encrypted stream could not be authenticated at frame {index}") from e
+
+
+def _numbered_frames(chunks: Iterable[bytes]) -> Iterator[tuple[int, bytes, bool]]:
+    """Number chunks and flag the last one, a stream always having at least one, possibly empty, frame."""
+    index, previous = 0, None
+    for chunk in chunks:
+        if previous is not None:
+            yield index, previous, False
+            index += 1
+            if index >= _MAX_FRAMES:
+                raise exceptions.VaultxError(f"Streams are limited to {_MAX_FRAMES} chunks, use a larger chunk size")
+        previous = chunk
+    yield index, previous if previous is not None else b"", True
+
+
+async def _anumbered_frames(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, bytes, bool]]:
+    """Number chunks and flag the last one, a stream always having at least one, possibly empty, frame."""
+    index, previous = 0, None
+    async for chunk in chunks:
+        if previous is not None:
+            yield index, previous, False
+            index += 1
+            if index >= _MAX_FRAMES:
+                raise exceptions.VaultxError(f"Streams are limited to {_MAX_FRAMES} chunks, use a larger chunk size")
+        previous = chunk
+    yield index, previous if previous is not None else b"", True
+
+
+def _read_exactly(f: IO[bytes], size: int) -> bytes:
+    data = f.read(size)
+    while len(data) < size:
+        # Pipes and sockets may return less than asked for before their end
+        more = f.read(size - len(data))
+        if not more:
+            raise exceptions.VaultxError("Invalid encrypted stream: truncated")
+        data += more
+    return data
+
+
+async def _aread_exactly(f: IO[bytes], size: int) -> bytes:
+    return await asyncio.get_running_loop().run_in_executor(None, _read_exactly, f, size)
+
+
+def _read_frames(f: IO[bytes], chunk_size: int) -> Iterator[tuple[int, bool, bytes]]:
+    index = 0
+    while True:
+        final, length = _parse_frame_header(_read_exactly(f, _FRAME_HEADER.size), chunk_size)
+        yield index, final, _read_exactly(f, length)
+        if final:
+            if f.read(1):
+                raise exceptions.VaultxError("Invalid encrypted stream: data after the final frame")
+            return
+        index += 1
+
+
+async def _aread_frames(f: IO[bytes], chunk_size: int) -> AsyncIterator[tuple[int, bool, bytes]]:
+    loop = asyncio.get_running_loop()
+    index = 0
+    while True:
+        final, length = _parse_frame_header(await _aread_exactly(f, _FRAME_HEADER.size), chunk_size)
+        yield index, final, await _aread_exactly(f, length)
+        if final:
+            if await loop.run_in_executor(None, f.read, 1):
+                raise exceptions.VaultxError("Invalid encrypted stream: data after the final frame")
+            return
+        index += 1
+
+
+@contextlib.contextmanager
+def _open_streams(
+    source: streams.FileTypes, destination: streams.FileTypes, workers: int
+) -> Iterator[tuple[IO[bytes], IO[bytes], Optional[ThreadPoolExecutor]]]:
+    """Open the source and destination of a stream, and the executor its frames are processed in, if any."""
+    with streams.open_file(source, "rb") as src, streams.open_file(destination, "wb") as dst:
+        if workers == 1:
+            yield src, dst, None
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vaultx-envelope") as executor:
+            yield src, dst, executor
+
+
+def _map_frames(
+    func: Callable[..., bytes], frames: Iterable[tuple[Any, ...]], executor: Optional[ThreadPoolExecutor], window: int
+) -> Iterator[bytes]:
+    """Apply func to frames in order, keeping at most window frames in flight in executor."""
+    if executor is None:
+        for frame in frames:
+            yield func(*frame)
+        return
+    pending: deque[Future[bytes]] = deque()
+    try:
+        for frame in frames:
+            pending.append(executor.submit(func, *frame))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def _amap_frames(
+    func: Callable[..., bytes],
+    frames: AsyncIterable[tuple[Any, ...]],
+    executor: Optional[ThreadPoolExecutor],
+    window: int,
+) -> AsyncIterator[bytes]:
+    """Apply func to frames in order, keeping at most window frames in flight in executor."""
+    if executor is None:
+        async for frame in frames:
+            yield func(*frame)
+        return
+    loop = asyncio.get_running_loop()
+    pending: deque[asyncio.Future[bytes]] = deque()
+    try:
+        async for frame in frames:
+            pending.append(loop.run_in_executor(executor, func, *frame))
+            if len(pending) >= window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class EnvelopeStats:
+    """Counters describing the data keys and envelopes an envelope encryptor has handled since its creation."""
+
+    __slots__ = ("data_keys", "unwraps", "encryptions", "decryptions")
+
+    def __init__(self) -> None:
+        self.data_keys = 0
+        self.unwraps = 0
+        self.encryptions = 0
+        self.decryptions = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+class _BaseEnvelopeEncryptor:
+    """Data key and unwrap caches shared by the sync and async envelope encryptors."""
+
+    def __init__(
+        self,
+        name: str,
+        mount_point: str,
+        context: Optional[str],
+        bits: int,
+        max_age: float,
+        max_uses: int,
+        unwrap_ttl: float,
+        max_unwrapped: int,
+        timer: Callable[[], float],
+    ) -> None:
+        if bits not in ALLOWED_DATA_KEY_BITS:
+            raise ValueError(f'"bits" must be one of {ALLOWED_DATA_KEY_BITS}, "{bits}" provided')
+        if max_age <= 0:
+            raise ValueError(f'"max_age" must be a positive number, "{max_age}" provided')
+        if not 0 < max_uses <= MAX_USES_LIMIT:
+            raise ValueError(f'"max_uses" must be between 1 and {MAX_USES_LIMIT}, "{max_uses}" provided')
+
+        self.name = name
+        self.mount_point = mount_point
+        self.context = context
+        self.bits = bits
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.unwrap_cache = TTLCache(ttl=unwrap_ttl, max_entries=max_unwrapped, timer=timer)
+        self._timer = timer
+        # AES-GCM cipher, wrapped data key and plaintext data key, the latter being needed to derive stream keys
+        self._data_key: Optional[tuple[Any, str, bytes]] = None
+        self._expires_at = 0.0
+        self._uses = 0
+        self._lock = threading.Lock()
+        self._stats = EnvelopeStats()
+
+    @property
+    def stats(self) -> EnvelopeStats:
+        """Data key, unwrap and envelope counters. Unwrap cache counters are in unwrap_cache.stats."""
+        return self._stats
+
+    def rotate(self) -> None:
+        """Stop using the current data key, the next encryption generating a new one."""
+        self._data_key = None
+
+    def clear(self) -> None:
+        """Forget the current data key and every unwrapped one."""
+        self.rotate()
+        self.unwrap_cache.clear()
+
+    def _data_key_usable(self) -> bool:
+        return self._data_key is not None and self._uses < self.max_uses and self._timer() < self._expires_at
+
+    def _take_data_key(self) -> Optional[tuple[Any, str, bytes]]:
+        """Count one more use of the current data key, or return None once it must be replaced."""
+        with self._lock:
+            if not self._data_key_usable():
+                return None
+            self._uses += 1
+            return self._data_key
+
+    def _store_data_key(self, response: "VaultxResponse") -> None:
+        data = response["data"]
+        key = base64.b64decode(data["plaintext"])
+        aead = _aesgcm(key)
+        with self._lock:
+            self._data_key = (aead, data["ciphertext"], key)
+            self._expires_at = self._timer() + self.max_age
+            self._uses = 0
+            self._stats.data_keys += 1
+        # Envelopes sealed with this data key are opened without asking Vault to unwrap it
+        self.unwrap_cache.set(data["ciphertext"], (aead, key))
+
+    def _store_unwrapped(self, wrapped: str, response: "VaultxResponse") -> tuple[Any, bytes]:
+        key = base64.b64decode(response["data"]["plaintext"])
+        unwrapped = (_aesgcm(key), key)
+        self._stats.unwraps += 1
+        self.unwrap_cache.set(wrapped, unwrapped)
+        return unwrapped
+
+    def _seal(self, data_key: tuple[Any, str], plaintext: bytes, associated_data: Optional[bytes]) -> bytes:
+        aead, wrapped = data_key
+        nonce = os.urandom(_NONCE_SIZE)
+        ciphertext = aead.encrypt(nonce, plaintext, _associated_data(associated_data))
+        self._stats.encryptions += 1
+        return _pack(wrapped, nonce, ciphertext)
+
+    def _open(self, aead: Any, nonce: bytes, ciphertext: bytes, associated_data: Optional[bytes]) -> bytes:
+        try:
+            plaintext = aead.decrypt(nonce, ciphertext, _associated_data(associated_data))
+        except Exception as e:
+            # cryptography's InvalidTag, raised for a modified envelope or mismatched associated data
+            raise exceptions.VaultxError("Envelope could not be authenticated") from e
+        self._stats.decryptions += 1
+        return plaintext
+
+
+class EnvelopeEncryptor(_BaseEnvelopeEncryptor):
+    """
+    Thread-safe envelope encryption with data keys generated by a Transit key.
+
+    Data keys are generated with generate_data_key and kept in memory for max_age seconds and max_uses encryptions,
+    payloads being encrypted locally with AES-GCM. Every envelope carries the data key wrapped by the Transit key, so
+    only that key is sent to decrypt_data when opening it. Unwrapped data keys are kept in an unwrap cache for
+    unwrap_ttl seconds. Concurrent callers needing the same data key share one request.
+
+    Requires the cryptography package, installed with pip install vaultx[crypto].
+    """
+
+    def __init__(
+        self,
+        transit: "Transit",
+        name: str,
+        mount_point: str = "transit",
+        context: Optional[str] = None,
+        bits: int = DEFAULT_DATA_KEY_BITS,
+        max_age: float = DEFAULT_DATA_KEY_TTL,
+        max_uses: int = DEFAULT_MAX_USES,
+        unwrap_ttl: float = DEFAULT_DATA_KEY_TTL,
+        max_unwrapped: int = 1024,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new EnvelopeEncryptor instance.
+
+        :param transit: Transit instance data keys are generated and unwrapped with.
+        :param name: Name of the Transit key wrapping the data keys.
+        :param mount_point: The "path" the Transit secrets engine was mounted on.
+        :param context: Base64 encoded context for key derivation, required if derivation is enabled for the key.
+        :param bits: Size of the data keys, 128 or 256.
+        :param max_age: Number of seconds a data key is used for encryption.
+        :param max_uses: Number of encryptions a data key is used for.
+        :param unwrap_ttl: Number of seconds an unwrapped data key is kept.
+        :param max_unwrapped: Maximum number of unwrapped data keys kept at once.
+        :param timer: Monotonic clock used for expiry, mostly useful for testing.
+        """
+        super().__init__(name, mount_point, context, bits, max_age, max_uses, unwrap_ttl, max_unwrapped, timer)
+        self.transit = transit
+        self._singleflight = SingleFlight()
+
+    def data_key(self) -> tuple[Any, str]:
+        """
+        Get the data key to encrypt with, generating a new one once the current one reached max_age or max_uses.
+
+        :return: The AES-GCM cipher of the data key and the data key wrapped by the Transit key.
+        """
+        aead, wrapped, _ = self._next_data_key()
+        return aead, wrapped
+
+    def _next_data_key(self) -> tuple[Any, str, bytes]:
+        while True:
+            data_key = self._take_data_key()
+            if data_key is not None:
+                return data_key
+            self._singleflight.do(_DATA_KEY, self._generate_data_key)
+
+    def _generate_data_key(self) -> None:
+        if self._data_key_usable():
+            # Generated by a call which completed between this caller's lookup and its own call
+            return
+        response = self.transit.generate_data_key(
+            name=self.name, key_type="plaintext", context=self.context, bits=self.bits, mount_point=self.mount_point
+        )
+        self._store_data_key(response)
+
+    def unwrap(self, wrapped: str) -> Any:
+        """
+        Get the AES-GCM cipher of a wrapped data key, from the unwrap cache or by decrypting it with Vault.
+
+        :param wrapped: Data key wrapped by the Transit key, e.g. "vault:v1:...".
+        :return: The AES-GCM cipher of the data key.
+        """
+        return self._unwrap(wrapped)[0]
+
+    def _unwrap(self, wrapped: str) -> tuple[Any, bytes]:
+        unwrapped = self.unwrap_cache.get(wrapped)
+        if unwrapped is not None:
+            return unwrapped
+
+        def load() -> tuple[Any, bytes]:
+            response = self.transit.decrypt_data(
+                name=self.name, ciphertext=wrapped, context=self.context, mount_point=self.mount_point
+            )
+            return self._store_unwrapped(wrapped, response)
+
+        return self._singleflight.do(("unwrap", wrapped), load)
+
+    def encrypt(self, plaintext: bytes, associated_data: Optional[bytes] = None) -> bytes:
+        """
+        Encrypt a payload locally with the current data key.
+
+        :param plaintext: Payload to encrypt.
+        :param associated_data: Optional data authenticated along with the payload, needed again to decrypt it.
+        :return: The envelope, holding the wrapped data key, the nonce and the ciphertext.
+        """
+        return self._seal(self.data_key(), plaintext, associated_data)
+
+    def decrypt(self, envelope: bytes, associated_data: Optional[bytes] = None) -> bytes:
+        """
+        Decrypt an envelope, asking Vault to unwrap its data key unless it is cached.
+
+        :param envelope: Envelope returned by encrypt.
+        :param associated_data: The associated data the envelope was encrypted with.
+        :return: The payload.
+        """
+        wrapped, nonce, ciphertext = _unpack(envelope)
+        return self._open(self.unwrap(wrapped), nonce, ciphertext, associated_data)
+
+    def encrypt_stream(
+        self,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        algorithm: str = "sha256",
+    ) -> dict[str, Any]:
+        """
+        Encrypt a stream chunk by chunk with the current data key, in memory bounded by chunk_size and workers.
+
+        :param source: Path or binary file object the plaintext is read from. File objects are left open.
+        :param destination: Path or binary file object the encrypted stream is written to. File objects are left open.
+        :param associated_data: Optional data authenticated along with the stream, needed again to decrypt it.
+        :param chunk_size: Size of the chunks encrypted separately.
+        :param workers: Number of threads encrypting chunks in parallel, 1 encrypting them in the calling thread.
+        :param algorithm: Name of the hashlib algorithm the checksum of the plaintext is computed with.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        _validate_stream_params(chunk_size, workers)
+        _, wrapped, key = self._next_data_key()
+        salt = os.urandom(_STREAM_SALT_SIZE)
+        aad = _stream_associated_data(chunk_size, associated_data)
+        seal = functools.partial(_seal_frame, _stream_aead(key, salt), aad)
+        digest = streams.StreamDigest(algorithm)
+        with _open_streams(source, destination, workers) as (src, dst, executor):
+            dst.write(_stream_header(chunk_size, wrapped, salt))
+            frames = _numbered_frames(streams.hashing(streams.iter_file(src, chunk_size), digest))
+            for frame in _map_frames(seal, frames, executor, 2 * workers):
+                dst.write(frame)
+        self._stats.encryptions += 1
+        return digest.as_dict()
+
+    def decrypt_stream(
+        self,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        workers: int = 1,
+        algorithm: str = "sha256",
+    ) -> dict[str, Any]:
+        """
+        Decrypt a stream written by encrypt_stream chunk by chunk, in memory bounded by its chunk size and workers.
+        Every chunk is authenticated before being written, but an error may be raised once part of the plaintext was
+        written, e.g. for a truncated stream, in which case the destination must be discarded.
+
+        :param source: Path or binary file object the encrypted stream is read from. File objects are left open.
+        :param destination: Path or binary file object the plaintext is written to. File objects are left open.
+        :param associated_data: The associated data the stream was encrypted with.
+        :param workers: Number of threads decrypting chunks in parallel, 1 decrypting them in the calling thread.
+        :param algorithm: Name of the hashlib algorithm the checksum of the plaintext is computed with.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        _validate_stream_params(1, workers)
+        digest = streams.StreamDigest(algorithm)
+        with _open_streams(source, destination, workers) as (src, dst, executor):
+            chunk_size, length = _parse_stream_header(_read_exactly(src, _STREAM_HEADER.size))
+            wrapped = _read_exactly(src, length).decode()
+            aead = _stream_aead(self._unwrap(wrapped)[1], _read_exactly(src, _STREAM_SALT_SIZE))
+            open_ = functools.partial(_open_frame, aead, _stream_associated_data(chunk_size, associated_data))
+            for chunk in _map_frames(open_, _read_frames(src, chunk_size), executor, 2 * workers):
+                dst.write(digest.update(chunk))
+        self._stats.decryptions += 1
+        return digest.as_dict()
+
+
+class AsyncEnvelopeEncryptor(_BaseEnvelopeEncryptor):
+    """
+    Envelope encryption with data keys generated by an async Transit key.
+
+    Data keys are generated with generate_data_key and kept in memory for max_age seconds and max_uses encryptions,
+    payloads being encrypted locally with AES-GCM. Every envelope carries the data key wrapped by the Transit key, so
+    only that key is sent to decrypt_data when opening it. Unwrapped data keys are kept in an unwrap cache for
+    unwrap_ttl seconds. Concurrent callers needing the same data key share one request.
+
+    Requires the cryptography package, installed with pip install vaultx[crypto].
+    """
+
+    def __init__(
+        self,
+        transit: "AsyncTransit",
+        name: str,
+        mount_point: str = "transit",
+        context: Optional[str] = None,
+        bits: int = DEFAULT_DATA_KEY_BITS,
+        max_age: float = DEFAULT_DATA_KEY_TTL,
+        max_uses: int = DEFAULT_MAX_USES,
+        unwrap_ttl: float = DEFAULT_DATA_KEY_TTL,
+        max_unwrapped: int = 1024,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new AsyncEnvelopeEncryptor instance.
+
+        :param transit: Async Transit instance data keys are generated and unwrapped with.
+        :param name: Name of the Transit key wrapping the data keys.
+        :param mount_point: The "path" the Transit secrets engine was mounted on.
+        :param context: Base64 encoded context for key derivation, required if derivation is enabled for the key.
+        :param bits: Size of the data keys, 128 or 256.
+        :param max_age: Number of seconds a data key is used for encryption.
+        :param max_uses: Number of encryptions a data key is used for.
+        :param unwrap_ttl: Number of seconds an unwrapped data key is kept.
+        :param max_unwrapped: Maximum number of unwrapped data keys kept at once.
+        :param timer: Monotonic clock used for expiry, mostly useful for testing.
+        """
+        super().__init__(name, mount_point, context, bits, max_age, max_uses, unwrap_ttl, max_unwrapped, timer)
+        self.transit = transit
+        self._singleflight = AsyncSingleFlight()
+
+    async def data_key(self) -> tuple[Any, str]:
+        """
+        Get the data key to encrypt with, generating a new one once the current one reached max_age or max_uses.
+
+        :return: The AES-GCM cipher of the data key and the data key wrapped by the Transit key.
+        """
+        aead, wrapped, _ = await self._next_data_key()
+        return aead, wrapped
+
+    async def _next_data_key(self) -> tuple[Any, str, bytes]:
+        while True:
+            data_key = self._take_data_key()
+            if data_key is not None:
+                return data_key
+            await self._singleflight.do(_DATA_KEY, self._generate_data_key)
+
+    async def _generate_data_key(self) -> None:
+        if self._data_key_usable():
+            # Generated by a call which completed between this caller's lookup and its own call
+            return
+        response = await self.transit.generate_data_key(
+            name=self.name, key_type="plaintext", context=self.context, bits=self.bits, mount_point=self.mount_point
+        )
+        self._store_data_key(response)
+
+    async def unwrap(self, wrapped: str) -> Any:
+        """
+        Get the AES-GCM cipher of a wrapped data key, from the unwrap cache or by decrypting it with Vault.
+
+        :param wrapped: Data key wrapped by the Transit key, e.g. "vault:v1:...".
+        :return: The AES-GCM cipher of the data key.
+        """
+        return (await self._unwrap(wrapped))[0]
+
+    async def _unwrap(self, wrapped: str) -> tuple[Any, bytes]:
+        unwrapped = self.unwrap_cache.get(wrapped)
+        if unwrapped is not None:
+            return unwrapped
+
+        async def load() -> tuple[Any, bytes]:
+            response = await self.transit.decrypt_data(
+                name=self.name, ciphertext=wrapped, context=self.context, mount_point=self.mount_point
+            )
+            return self._store_unwrapped(wrapped, response)
+
+        return await self._singleflight.do(("unwrap", wrapped), load)
+
+    async def encrypt(self, plaintext: bytes, associated_data: Optional[bytes] = None) -> bytes:
+        """
+        Encrypt a payload locally with the current data key.
+
+        :param plaintext: Payload to encrypt.
+        :param associated_data: Optional data authenticated along with the payload, needed again to decrypt it.
+        :return: The envelope, holding the wrapped data key, the nonce and the ciphertext.
+        """
+        return self._seal(await self.data_key(), plaintext, associated_data)
+
+    async def decrypt(self, envelope: bytes, associated_data: Optional[bytes] = None) -> bytes:
+        """
+        Decrypt an envelope, asking Vault to unwrap its data key unless it is cached.
+
+        :param envelope: Envelope returned by encrypt.
+        :param associated_data: The associated data the envelope was encrypted with.
+        :return: The payload.
+        """
+        wrapped, nonce, ciphertext = _unpack(envelope)
+        return self._open(await self.unwrap(wrapped), nonce, ciphertext, associated_data)
+
+    async def encrypt_stream(
+        self,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        chunk_size: int = streams.DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        algorithm: str = "sha256",
+    ) -> dict[str, Any]:
+        """
+        Encrypt a stream chunk by chunk with the current data key, in memory bounded by chunk_size and workers.
+        Disk reads and writes run in the default executor.
+
+        :param source: Path or binary file object the plaintext is read from. File objects are left open.
+        :param destination: Path or binary file object the encrypted stream is written to. File objects are left open.
+        :param associated_data: Optional data authenticated along with the stream, needed again to decrypt it.
+        :param chunk_size: Size of the chunks encrypted separately.
+        :param workers: Number of threads encrypting chunks in parallel, 1 encrypting them in the calling thread.
+        :param algorithm: Name of the hashlib algorithm the checksum of the plaintext is computed with.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        _validate_stream_params(chunk_size, workers)
+        _, wrapped, key = await self._next_data_key()
+        salt = os.urandom(_STREAM_SALT_SIZE)
+        aad = _stream_associated_data(chunk_size, associated_data)
+        seal = functools.partial(_seal_frame, _stream_aead(key, salt), aad)
+        digest = streams.StreamDigest(algorithm)
+        loop = asyncio.get_running_loop()
+        with _open_streams(source, destination, workers) as (src, dst, executor):
+            await loop.run_in_executor(None, dst.write, _stream_header(chunk_size, wrapped, salt))
+            frames = _anumbered_frames(streams.ahashing(streams.aiter_file(src, chunk_size), digest))
+            async for frame in _amap_frames(seal, frames, executor, 2 * workers):
+                await loop.run_in_executor(None, dst.write, frame)
+        self._stats.encryptions += 1
+        return digest.as_dict()
+
+    async def decrypt_stream(
+        self,
+        source: streams.FileTypes,
+        destination: streams.FileTypes,
+        associated_data: Optional[bytes] = None,
+        workers: int = 1,
+        algorithm: str = "sha256",
+    ) -> dict[str, Any]:
+        """
+        Decrypt a stream written by encrypt_stream chunk by chunk, in memory bounded by its chunk size and workers.
+        Every chunk is authenticated before being written, but an error may be raised once part of the plaintext was
+        written, e.g. for a truncated stream, in which case the destination must be discarded. Disk reads and writes
+        run in the default executor.
+
+        :param source: Path or binary file object the encrypted stream is read from. File objects are left open.
+        :param destination: Path or binary file object the plaintext is written to. File objects are left open.
+        :param associated_data: The associated data the stream was encrypted with.
+        :param workers: Number of threads decrypting chunks in parallel, 1 decrypting them in the calling thread.
+        :param algorithm: Name of the hashlib algorithm the checksum of the plaintext is computed with.
+        :return: Size and checksum of the plaintext, e.g. {"size": 1048576, "algorithm": "sha256", "checksum": "..."}.
+        """
+        _validate_stream_params(1, workers)
+        digest = streams.StreamDigest(algorithm)
+        loop = asyncio.get_running_loop()
+        with _open_streams(source, destination, workers) as (src, dst, executor):
+            chunk_size, length = _parse_stream_header(await _aread_exactly(src, _STREAM_HEADER.size))
+            wrapped = (await _aread_exactly(src, length)).decode()
+            key = (await self._unwrap(wrapped))[1]
+            aead = _stream_aead(key, await _aread_exactly(src, _STREAM_SALT_SIZE))
+            open_ = functools.partial(_open_frame, aead, _stream_associated_data(chunk_size, associated_data))
+            async for chunk in _amap_frames(open_, _aread_frames(src, chunk_size), executor, 2 * workers):
+                await loop.run_in_executor(None, dst.write, digest.update(chunk))
+        self._stats.decryptions += 1
+        return digest.as_dict()
@@ -32,6 +32,19 @@ class VaultxError(Exception):
         super().__init__(message)
 
 
+class CircuitOpenError(VaultxError):
+    """
+    Raised instead of sending a request to an endpoint whose circuit breaker is open.
+    """
+
+    def __init__(self, endpoint: str, retry_after: float, method=None, url=None):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(
+            message=f'Circuit breaker for "{endpoint}" is open, retry in {retry_after:.1f}s', method=method, url=url
+        )
+
+
 class HTTPError(Exception):
     """
     Vaultx exception for handling http errors
@@ -0,0 +1,817 @@
+"""
+Background managers keeping Vault tokens and leases alive
+"""
+
+import asyncio
+import contextlib
+import heapq
+import logging
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from vaultx import exceptions
+from vaultx.adapters import Adapter, AsyncAdapter, VaultxResponse
+from vaultx.retry import _transient_error
+
+
+logger = logging.getLogger(__name__)
+
+# Statuses meaning the token itself was rejected, so renewing it again is pointless
+TOKEN_REJECTED_STATUS_CODES = frozenset({400, 403})
+# Statuses meaning the lease is unknown, expired or not renewable with the current token
+LEASE_REJECTED_STATUS_CODES = frozenset({400, 403, 404})
+
+
+class _BaseTokenManager:
+    """Scheduling state shared by the sync and async token managers."""
+
+    def __init__(
+        self,
+        renew_fraction: float = 2 / 3,
+        jitter: float = 0.1,
+        increment: Optional[int] = None,
+        retry_interval: float = 5.0,
+        mount_point: str = "token",
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < renew_fraction < 1:
+            raise ValueError(f'"renew_fraction" must be between 0 and 1, "{renew_fraction}" provided')
+        if not 0 <= jitter < 1:
+            raise ValueError(f'"jitter" must be between 0 (inclusive) and 1, "{jitter}" provided')
+
+        self.renew_fraction = renew_fraction
+        self.jitter = jitter
+        self.increment = increment
+        self.retry_interval = retry_interval
+        self.mount_point = mount_point
+        self._timer = timer
+
+        self.relogin: Optional[Callable[[], Any]] = None
+        self.ttl: Optional[int] = None
+        self.renewable = False
+        self.expires_at: Optional[float] = None
+        self.renewals = 0
+        self.relogins = 0
+        self.failures = 0
+        self.last_error: Optional[BaseException] = None
+        self._granted_ttl: Optional[int] = None
+        self._needs_relogin = False
+
+    def track(self, response: Any) -> None:
+        """
+        Record the lifetime of the current token.
+
+        Accepts login and renew-self responses (TTL under "auth.lease_duration") as well as lookup-self responses
+        (TTL under "data.ttl"). Called by the adapter on every login performed with use_token=True.
+
+        :param response: The VaultxResponse (or its decoded dict) describing the token.
+        """
+        value = response.value if isinstance(response, VaultxResponse) else response
+        if not isinstance(value, dict):
+            return
+        if value.get("auth"):
+            ttl = value["auth"].get("lease_duration")
+            renewable = value["auth"].get("renewable", False)
+        elif value.get("data") and "ttl" in value["data"]:
+            ttl = value["data"]["ttl"]
+            renewable = value["data"].get("renewable", False)
+        else:
+            return
+
+        self._needs_relogin = False
+        self._granted_ttl = self.increment or ttl
+        self._set_ttl(ttl, renewable)
+        self._wake()
+
+    def _wake(self) -> None:
+        """Let the background worker reschedule after the token changed."""
+
+    def _set_ttl(self, ttl: Optional[int], renewable: bool) -> None:
+        self.ttl = ttl
+        self.renewable = bool(renewable)
+        self.expires_at = self._timer() + ttl if ttl else None
+
+    def _record_renewal(self, response: VaultxResponse) -> None:
+        auth = response.value.get("auth") or {}
+        ttl = auth.get("lease_duration", 0)
+        self.renewals += 1
+        self._set_ttl(ttl, auth.get("renewable", False))
+        # Vault caps renewals at the token's max_ttl. Once a renewal grants less than the original TTL, further
+        # renewals cannot extend the token's life, so the next cycle logs in again instead.
+        if self._granted_ttl and ttl < self._granted_ttl:
+            self._needs_relogin = True
+
+    def _record_failure(self, error: BaseException) -> None:
+        self.failures += 1
+        self.last_error = error
+        logger.warning("Token renewal failed: %s", error)
+
+    @property
+    def should_relogin(self) -> bool:
+        """Whether the next cycle must log in again because the token can no longer be renewed."""
+        return self._needs_relogin or not self.renewable
+
+    def _can_make_progress(self) -> bool:
+        return not self.should_relogin or self.relogin is not None
+
+    def next_delay(self) -> Optional[float]:
+        """
+        Compute how many seconds to wait before the next renewal or re-login.
+
+        The delay is the configured fraction of the remaining TTL, shortened by a random jitter so that many workers
+        holding tokens of the same age do not renew in lockstep.
+
+        :return: Seconds until the next cycle, or None for tokens that never expire.
+        """
+        if self.expires_at is None:
+            return None
+        remaining = max(self.expires_at - self._timer(), 0.0)
+        return remaining * self.renew_fraction * (1 - random.uniform(0, self.jitter))
+
+
+class TokenManager(_BaseTokenManager):
+    """
+    Keep the token of a synchronous adapter alive by renewing it from a daemon thread.
+
+    When the token is not renewable, has reached its max_ttl or renewal fails, the configured relogin callable
+    (e.g. ``lambda: client.auth.approle.login(role_id, secret_id)``) is used to obtain a new token.
+    """
+
+    def __init__(
+        self,
+        adapter: Adapter,
+        relogin: Optional[Callable[[], Any]] = None,
+        renew_fraction: float = 2 / 3,
+        jitter: float = 0.1,
+        increment: Optional[int] = None,
+        retry_interval: float = 5.0,
+        mount_point: str = "token",
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new TokenManager instance.
+
+        :param adapter: The adapter whose token should be kept alive.
+        :param relogin: Optional callable performing a fresh login when renewal is impossible.
+        :param renew_fraction: Fraction of the remaining TTL after which the token is renewed.
+        :param jitter: Maximum random fraction by which each delay is shortened.
+        :param increment: Optional TTL increment (in seconds) requested on each renewal.
+        :param retry_interval: Seconds to wait before retrying after a failed renewal or re-login.
+        :param mount_point: The "path" the token auth method was mounted on.
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        super().__init__(renew_fraction, jitter, increment, retry_interval, mount_point, timer)
+        self._adapter = adapter
+        from vaultx.api.auth_methods.token import Token
+
+        self._token_api = Token(adapter)
+        self.relogin = relogin
+        self._stop_event = threading.Event()
+        self._token_changed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "TokenManager":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "TokenManager":
+        """
+        Attach to the adapter and start the renewal thread.
+
+        If no login response has been tracked yet, the current token is looked up to learn its TTL. Without a token,
+        the thread waits for the next login performed through the adapter.
+        """
+        if self.running:
+            return self
+        self._adapter.token_manager = self
+        if self.expires_at is None and self._adapter.token:
+            self.track(self._token_api.lookup_self(mount_point=self.mount_point))
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="vaultx-token-manager", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the renewal thread and detach from the adapter."""
+        self._stop_event.set()
+        self._token_changed.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        if getattr(self._adapter, "token_manager", None) is self:
+            self._adapter.token_manager = None
+
+    def refresh(self) -> bool:
+        """
+        Run a single renewal cycle: renew the token, or log in again when renewal is impossible.
+
+        :return: True if the token was renewed or replaced.
+        """
+        if not self.should_relogin:
+            increment = str(self.increment) if self.increment else None
+            try:
+                response = self._token_api.renew_self(increment=increment, mount_point=self.mount_point)
+                self._record_renewal(response)
+                return True
+            except exceptions.HTTPError as e:
+                self._record_failure(e)
+                if e.status_code not in TOKEN_REJECTED_STATUS_CODES:
+                    return False
+                self._needs_relogin = True
+            except exceptions.VaultxError as e:
+                self._record_failure(e)
+                return False
+
+        if self.relogin is None:
+            return False
+        try:
+            response = self.relogin()
+        except Exception as e:
+            self._record_failure(e)
+            return False
+        if response is not None:
+            self.track(response)
+        self.relogins += 1
+        return True
+
+    def _wake(self) -> None:
+        self._token_changed.set()
+
+    def _run(self) -> None:
+        while True:
+            self._token_changed.clear()
+            if self._stop_event.is_set():
+                return
+            delay = self.next_delay()
+            if delay is None or not self._can_make_progress():
+                # Nothing to schedule until a login tracks a token with a known TTL.
+                self._token_changed.wait()
+                continue
+            if self._token_changed.wait(delay):
+                continue
+            if not self.refresh() and self._stop_event.wait(self.retry_interval):
+                return
+
+
+class AsyncTokenManager(_BaseTokenManager):
+    """Keep the token of an asynchronous adapter alive by renewing it from an asyncio task."""
+
+    def __init__(
+        self,
+        adapter: AsyncAdapter,
+        relogin: Optional[Callable[[], Awaitable[Any]]] = None,
+        renew_fraction: float = 2 / 3,
+        jitter: float = 0.1,
+        increment: Optional[int] = None,
+        retry_interval: float = 5.0,
+        mount_point: str = "token",
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new AsyncTokenManager instance.
+
+        :param adapter: The async adapter whose token should be kept alive.
+        :param relogin: Optional coroutine function performing a fresh login when renewal is impossible.
+        :param renew_fraction: Fraction of the remaining TTL after which the token is renewed.
+        :param jitter: Maximum random fraction by which each delay is shortened.
+        :param increment: Optional TTL increment (in seconds) requested on each renewal.
+        :param retry_interval: Seconds to wait before retrying after a failed renewal or re-login.
+        :param mount_point: The "path" the token auth method was mounted on.
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        super().__init__(renew_fraction, jitter, increment, retry_interval, mount_point, timer)
+        self._adapter = adapter
+        from vaultx.api.async_auth_methods.token import Token as AsyncToken
+
+        self._token_api = AsyncToken(adapter)
+        self.relogin = relogin
+        self._task: Optional[asyncio.Task] = None
+        self._token_changed: Optional[asyncio.Event] = None
+
+    async def __aenter__(self) -> "AsyncTokenManager":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> "AsyncTokenManager":
+        """
+        Attach to the adapter and start the renewal task.
+
+        If no login response has been tracked yet, the current token is looked up to learn its TTL. Without a token,
+        the task waits for the next login performed through the adapter.
+        """
+        if self.running:
+            return self
+        self._adapter.token_manager = self
+        if self.expires_at is None and self._adapter.token:
+            self.track(await self._token_api.lookup_self(mount_point=self.mount_point))
+        self._token_changed = asyncio.Event()
+        self._task = asyncio.create_task(self._run(self._token_changed), name="vaultx-token-manager")
+        return self
+
+    async def stop(self) -> None:
+        """Cancel the renewal task and detach from the adapter."""
+        task, self._task = self._task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if getattr(self._adapter, "token_manager", None) is self:
+            self._adapter.token_manager = None
+
+    async def refresh(self) -> bool:
+        """
+        Run a single renewal cycle: renew the token, or log in again when renewal is impossible.
+
+        :return: True if the token was renewed or replaced.
+        """
+        if not self.should_relogin:
+            increment = str(self.increment) if self.increment else None
+            try:
+                response = await self._token_api.renew_self(increment=increment, mount_point=self.mount_point)
+                self._record_renewal(response)
+                return True
+            except exceptions.HTTPError as e:
+                self._record_failure(e)
+                if e.status_code not in TOKEN_REJECTED_STATUS_CODES:
+                    return False
+                self._needs_relogin = True
+            except exceptions.VaultxError as e:
+                self._record_failure(e)
+                return False
+
+        if self.relogin is None:
+            return False
+        try:
+            response = await self.relogin()
+        except Exception as e:
+            self._record_failure(e)
+            return False
+        if response is not None:
+            self.track(response)
+        self.relogins += 1
+        return True
+
+    def _wake(self) -> None:
+        if self._token_changed is not None:
+            self._token_changed.set()
+
+    async def _run(self, token_changed: asyncio.Event) -> None:
+        while True:
+            token_changed.clear()
+            delay = self.next_delay()
+            if delay is None or not self._can_make_progress():
+                # Nothing to schedule until a login tracks a token with a known TTL.
+                await token_changed.wait()
+                continue
+            try:
+                await asyncio.wait_for(token_changed.wait(), delay)
+                continue
+            except asyncio.TimeoutError:
+                pass
+            if not await self.refresh():
+                await asyncio.sleep(self.retry_interval)
+
+
+class LeaseEvent:
+    """Names of the events emitted by lease managers."""
+
+    RENEWED = "renewed"
+    MAX_TTL_REACHED = "max_ttl_reached"
+    RENEWAL_FAILED = "renewal_failed"
+
+
+class ManagedLease:
+    """A lease tracked by a lease manager."""
+
+    __slots__ = ("lease_id", "lease_duration", "renewable", "expires_at", "deadline", "renewals", "failures", "data")
+
+    def __init__(
+        self, lease_id: str, lease_duration: int, renewable: bool, expires_at: float, data: Optional[Any] = None
+    ) -> None:
+        self.lease_id = lease_id
+        self.lease_duration = lease_duration
+        self.renewable = renewable
+        self.expires_at = expires_at
+        self.deadline = expires_at
+        self.renewals = 0
+        self.failures = 0
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(lease_id={self.lease_id!r}, lease_duration={self.lease_duration!r})"
+
+
+LeaseListener = Callable[[str, ManagedLease, Optional[BaseException]], Any]
+
+
+class _BaseLeaseManager:
+    """Deadline heap and event dispatching shared by the sync and async lease managers."""
+
+    def __init__(
+        self,
+        renew_fraction: float = 2 / 3,
+        jitter: float = 0.1,
+        batch_window: float = 1.0,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < renew_fraction < 1:
+            raise ValueError(f'"renew_fraction" must be between 0 and 1, "{renew_fraction}" provided')
+        if not 0 <= jitter < 1:
+            raise ValueError(f'"jitter" must be between 0 (inclusive) and 1, "{jitter}" provided')
+
+        self.renew_fraction = renew_fraction
+        self.jitter = jitter
+        self.batch_window = batch_window
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self._timer = timer
+        self._leases: dict[str, ManagedLease] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._sequence = 0
+        self._listeners: list[LeaseListener] = []
+        self.renewals = 0
+        self.failures = 0
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def __contains__(self, lease_id: object) -> bool:
+        return lease_id in self._leases
+
+    def get(self, lease_id: str) -> Optional[ManagedLease]:
+        return self._leases.get(lease_id)
+
+    def add_listener(self, listener: LeaseListener) -> None:
+        """
+        Subscribe to lease events.
+
+        :param listener: Callable receiving the event name (see :py:class:`LeaseEvent`), the lease and the error that
+            caused a renewal failure, if any.
+        """
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, lease: ManagedLease, error: Optional[BaseException] = None) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event, lease, error)
+            except Exception:
+                logger.exception("Lease listener failed on %s event for %s", event, lease.lease_id)
+
+    def _add(
+        self,
+        lease: Any,
+        lease_duration: Optional[int] = None,
+        renewable: Optional[bool] = None,
+    ) -> Optional[ManagedLease]:
+        lease_id: Optional[str]
+        if isinstance(lease, str):
+            lease_id, data = lease, None
+        else:
+            value = lease.value if isinstance(lease, VaultxResponse) else lease
+            lease_id, data = value.get("lease_id"), value.get("data")
+            lease_duration = value.get("lease_duration") if lease_duration is None else lease_duration
+            renewable = value.get("renewable") if renewable is None else renewable
+        if not lease_id:
+            raise exceptions.VaultxError("Cannot manage a response without a lease_id")
+        if not lease_duration or not renewable:
+            return None
+
+        managed = ManagedLease(lease_id, lease_duration, bool(renewable), self._timer() + lease_duration, data)
+        self._leases[lease_id] = managed
+        self._schedule(managed)
+        return managed
+
+    def _schedule(self, lease: ManagedLease, delay: Optional[float] = None) -> None:
+        if delay is None:
+            delay = max(lease.expires_at - self._timer(), 0.0) * self.renew_fraction
+        lease.deadline = self._timer() + delay * (1 - random.uniform(0, self.jitter))
+        self._sequence += 1
+        heapq.heappush(self._heap, (lease.deadline, self._sequence, lease.lease_id))
+
+    def _remove(self, lease_id: str) -> Optional[ManagedLease]:
+        # Heap entries of removed leases are skipped lazily when they are popped.
+        return self._leases.pop(lease_id, None)
+
+    def _registered(self, lease: ManagedLease) -> bool:
+        # Leases unregistered, or registered again, while their renewal was in flight are left alone
+        return self._leases.get(lease.lease_id) is lease
+
+    def next_deadline(self) -> Optional[float]:
+        """Return the earliest renewal deadline, dropping stale heap entries on the way."""
+        while self._heap:
+            deadline, _, lease_id = self._heap[0]
+            lease = self._leases.get(lease_id)
+            if lease is not None and lease.deadline == deadline:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self) -> list[ManagedLease]:
+        """Pop every lease whose deadline falls within the batch window, so that close deadlines share a wakeup."""
+        horizon = self._timer() + self.batch_window
+        due = []
+        while (deadline := self.next_deadline()) is not None and deadline <= horizon:
+            _, _, lease_id = heapq.heappop(self._heap)
+            due.append(self._leases[lease_id])
+        return due
+
+    def _record_renewal(self, lease: ManagedLease, response: VaultxResponse) -> None:
+        value = response.value
+        granted = value.get("lease_duration", 0)
+        lease.renewals += 1
+        lease.failures = 0
+        self.renewals += 1
+        lease.expires_at = self._timer() + granted
+        lease.renewable = bool(value.get("renewable", lease.renewable))
+        # Vault grants less than the requested increment once the lease is about to hit its max_ttl.
+        if granted < lease.lease_duration or not lease.renewable:
+            self._remove(lease.lease_id)
+            self._emit(LeaseEvent.MAX_TTL_REACHED, lease)
+            return
+        self._schedule(lease)
+        self._emit(LeaseEvent.RENEWED, lease)
+
+    def _record_failure(self, lease: ManagedLease, error: BaseException) -> None:
+        self.failures += 1
+        lease.failures += 1
+        remaining = lease.expires_at - self._timer()
+        if remaining > 0 and _retryable_renewal_error(error):
+            # Retry with exponential backoff, at the latest when the lease expires
+            backoff = min(self.retry_interval * 2 ** (lease.failures - 1), self.max_retry_interval)
+            self._schedule(lease, min(backoff, remaining))
+            logger.warning("Lease %s renewal failed, retrying: %s", lease.lease_id, error)
+            return
+        self._remove(lease.lease_id)
+        logger.warning("Lease %s renewal failed: %s", lease.lease_id, error)
+        self._emit(LeaseEvent.RENEWAL_FAILED, lease, error)
+
+
+def _retryable_renewal_error(error: BaseException) -> bool:
+    if isinstance(error, exceptions.HTTPError):
+        return error.status_code not in LEASE_REJECTED_STATUS_CODES
+    return _transient_error(error)
+
+
+class LeaseManager(_BaseLeaseManager):
+    """
+    Renew many leases from a single daemon thread.
+
+    Leases are kept in a heap ordered by renewal deadline, so thousands of leases cost one sleeping thread
+    rather than one timer each. Leases whose deadlines fall within batch_window seconds of each other are renewed
+    in the same wakeup. Transient renewal failures (network errors, 429 and 5xx responses) are retried with
+    exponential backoff until the lease expires. Leases that reach their max_ttl, expire or are rejected by Vault
+    are dropped and reported to listeners.
+    """
+
+    def __init__(
+        self,
+        adapter: Adapter,
+        renew_fraction: float = 2 / 3,
+        jitter: float = 0.1,
+        batch_window: float = 1.0,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new LeaseManager instance.
+
+        :param adapter: The adapter used to renew leases.
+        :param renew_fraction: Fraction of the remaining lease duration after which the lease is renewed.
+        :param jitter: Maximum random fraction by which each renewal delay is shortened.
+        :param batch_window: Leases due within this many seconds of the earliest one are renewed together.
+        :param retry_interval: Seconds to wait before retrying the first transient renewal failure of a lease,
+            doubled after each further failure.
+        :param max_retry_interval: Upper bound of the delay between renewal retries.
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        super().__init__(renew_fraction, jitter, batch_window, retry_interval, max_retry_interval, timer)
+        from vaultx.api.system_backend.lease import Lease as LeaseApi
+
+        self._lease_api = LeaseApi(adapter)
+        self._condition = threading.Condition()
+        self._stopped = True
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "LeaseManager":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(
+        self, lease: Any, lease_duration: Optional[int] = None, renewable: Optional[bool] = None
+    ) -> Optional[ManagedLease]:
+        """
+        Start renewing a lease.
+
+        :param lease: The response of a dynamic secret request (e.g. database.generate_credentials), or a lease ID.
+        :param lease_duration: Lease duration in seconds, required when a bare lease ID is given.
+        :param renewable: Whether the lease is renewable, required when a bare lease ID is given.
+        :return: The managed lease, or None when the lease is not renewable.
+        """
+        with self._condition:
+            managed = self._add(lease, lease_duration, renewable)
+            self._condition.notify()
+        return managed
+
+    def unregister(self, lease_id: str) -> None:
+        """
+        Stop renewing a lease. The lease itself is left untouched in Vault.
+
+        :param lease_id: The ID of the lease.
+        """
+        with self._condition:
+            self._remove(lease_id)
+
+    def start(self) -> "LeaseManager":
+        """Start the renewal thread."""
+        if self.running:
+            return self
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="vaultx-lease-manager", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the renewal thread. Registered leases are kept and renewed again after a restart."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def renew_due(self) -> int:
+        """
+        Renew every lease whose deadline has been reached.
+
+        :return: Number of leases processed.
+        """
+        with self._condition:
+            due = self._pop_due()
+        for lease in due:
+            try:
+                response = self._lease_api.renew_lease(lease_id=lease.lease_id, increment=lease.lease_duration)
+            except Exception as e:
+                with self._condition:
+                    if self._registered(lease):
+                        self._record_failure(lease, e)
+                continue
+            with self._condition:
+                if self._registered(lease):
+                    self._record_renewal(lease, response)
+        return len(due)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    deadline = self.next_deadline()
+                    timeout = None if deadline is None else deadline - self._timer()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+            self.renew_due()
+
+
+class AsyncLeaseManager(_BaseLeaseManager):
+    """Renew many leases from a single asyncio task. Mostly similar to the sync version."""
+
+    def __init__(
+        self,
+        adapter: AsyncAdapter,
+        renew_fraction: float = 2 / 3,
+        jitter: float = 0.1,
+        batch_window: float = 1.0,
+        max_concurrency: int = 16,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new AsyncLeaseManager instance.
+
+        :param adapter: The async adapter used to renew leases.
+        :param renew_fraction: Fraction of the remaining lease duration after which the lease is renewed.
+        :param jitter: Maximum random fraction by which each renewal delay is shortened.
+        :param batch_window: Leases due within this many seconds of the earliest one are renewed together.
+        :param max_concurrency: Maximum number of renewal requests in flight at once.
+        :param retry_interval: Seconds to wait before retrying the first transient renewal failure of a lease,
+            doubled after each further failure.
+        :param max_retry_interval: Upper bound of the delay between renewal retries.
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        super().__init__(renew_fraction, jitter, batch_window, retry_interval, max_retry_interval, timer)
+        from vaultx.api.async_system_backend.lease import Lease as AsyncLeaseApi
+
+        self._lease_api = AsyncLeaseApi(adapter)
+        self.max_concurrency = max_concurrency
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncLeaseManager":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def register(
+        self, lease: Any, lease_duration: Optional[int] = None, renewable: Optional[bool] = None
+    ) -> Optional[ManagedLease]:
+        """
+        Start renewing a lease.
+
+        :param lease: The response of a dynamic secret request (e.g. database.generate_credentials), or a lease ID.
+        :param lease_duration: Lease duration in seconds, required when a bare lease ID is given.
+        :param renewable: Whether the lease is renewable, required when a bare lease ID is given.
+        :return: The managed lease, or None when the lease is not renewable.
+        """
+        managed = self._add(lease, lease_duration, renewable)
+        self._wakeup.set()
+        return managed
+
+    def unregister(self, lease_id: str) -> None:
+        """
+        Stop renewing a lease. The lease itself is left untouched in Vault.
+
+        :param lease_id: The ID of the lease.
+        """
+        self._remove(lease_id)
+
+    async def start(self) -> "AsyncLeaseManager":
+        """Start the renewal task."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="vaultx-lease-manager")
+        return self
+
+    async def stop(self) -> None:
+        """Cancel the renewal task. Registered leases are kept and renewed again after a restart."""
+        task, self._task = self._task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def renew_due(self) -> int:
+        """
+        Renew every lease whose deadline has been reached.
+
+        :return: Number of leases processed.
+        """
+        due = self._pop_due()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def renew(lease: ManagedLease) -> None:
+            async with semaphore:
+                try:
+                    response = await self._lease_api.renew_lease(
+                        lease_id=lease.lease_id, increment=lease.lease_duration
+                    )
+                except Exception as e:
+                    if self._registered(lease):
+                        self._record_failure(lease, e)
+                    return
+            if self._registered(lease):
+                self._record_renewal(lease, response)
+
+        await asyncio.gather(*(renew(lease) for lease in due))
+        return len(due)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else deadline - self._timer()
+            if timeout is None or timeout > 0:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                continue
+            await self.renew_due()
@@ -0,0 +1,327 @@
+"""
+Client-side rate limiting of requests, aligned with Vault rate limit quotas
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, Optional, Union
+
+from vaultx import exceptions
+
+
+logger = logging.getLogger(__name__)
+
+THROTTLED_STATUS_CODE = 429
+
+
+class RateLimitStats:
+    """Counters describing how a rate limiter has been used since its creation."""
+
+    __slots__ = ("acquired", "delayed", "wait_time", "throttled", "_lock")
+
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _record_acquire(self, delay: float) -> None:
+        with self._lock:
+            self.acquired += 1
+            if delay > 0:
+                self.delayed += 1
+                self.wait_time += delay
+
+    def _record_throttled(self) -> None:
+        with self._lock:
+            self.throttled += 1
+
+    def as_dict(self) -> dict[str, Union[int, float]]:
+        return {
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "wait_time": self.wait_time,
+            "throttled": self.throttled,
+        }
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose rate adapts to throttling with additive increase and multiplicative decrease.
+
+    Callers reserve a token and are told how long to wait for it; the balance may go negative, so that callers are
+    served in the order they arrived and nobody polls the bucket. Every 429 response multiplies the rate by
+    decrease_factor, every other response adds increase / rate to it, i.e. the rate grows back by roughly increase
+    requests per second every second, up to the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        increase: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new TokenBucket instance.
+
+        :param rate: Sustained number of requests per second.
+        :param burst: Number of requests that can be sent at once after an idle period, defaults to rate.
+        :param min_rate: Lowest rate reached by backing off, defaults to 5% of rate.
+        :param increase: Requests per second regained every second without throttling, defaults to 10% of rate.
+        :param decrease_factor: Factor applied to the current rate on every 429 response.
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        if rate <= 0:
+            raise ValueError(f'"rate" must be a positive number, "{rate}" provided')
+        if burst is not None and burst < 1:
+            raise ValueError(f'"burst" must be at least 1, "{burst}" provided')
+        if not 0 < decrease_factor < 1:
+            raise ValueError(f'"decrease_factor" must be between 0 and 1, "{decrease_factor}" provided')
+
+        self.max_rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.min_rate = min_rate if min_rate is not None else self.max_rate * 0.05
+        self.increase = increase if increase is not None else self.max_rate * 0.1
+        self.decrease_factor = decrease_factor
+        self._timer = timer
+        self._rate = self.max_rate
+        self._tokens = self.burst
+        self._updated = timer()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The current rate in requests per second."""
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token.
+
+        :return: Seconds to wait before the token may be used.
+        """
+        with self._lock:
+            self._refill(self._timer())
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def refund(self) -> None:
+        """Give back a reserved token that was not used, e.g. because the waiting caller was cancelled."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            self._refill(self._timer())
+            self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+
+    def on_success(self) -> None:
+        if self._rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill(self._timer())
+            self._rate = min(self.max_rate, self._rate + self.increase / self._rate)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(rate={self._rate:.3f}, max_rate={self.max_rate}, burst={self.burst})"
+
+
+def _normalize_path(path: str) -> str:
+    path = path.strip("/")
+    return f"{path}/" if path else ""
+
+
+def _quota_interval(value: Any) -> float:
+    if isinstance(value, str):
+        # Durations such as "1s" or "1m", as accepted by create_or_update_quota
+        units = {"s": 1, "m": 60, "h": 3600}
+        return float(value[:-1]) * units[value[-1]] if value[-1:] in units else float(value)
+    return float(value or 1)
+
+
+class RateLimiter:
+    """
+    Token buckets scoped by Vault path prefix, shared by every thread or task using the adapter it is attached to.
+
+    A request is limited by the bucket of the longest prefix matching its path, relative to /v1/ and including the
+    namespace, e.g. "ns1/secret/" for a KV read in the ns1 namespace. The "" prefix matches every path. Requests
+    matching no prefix are not limited.
+    """
+
+    def __init__(self, buckets: Optional[Mapping[str, TokenBucket]] = None) -> None:
+        """
+        Create a new RateLimiter instance.
+
+        :param buckets: Token bucket of each path prefix, e.g. {"secret/": TokenBucket(50), "": TokenBucket(500)}.
+        """
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats = RateLimitStats()
+        for prefix, bucket in (buckets or {}).items():
+            self.add(prefix, bucket)
+
+    @property
+    def stats(self) -> RateLimitStats:
+        """Acquisition, delay and throttling counters of this limiter."""
+        return self._stats
+
+    @property
+    def buckets(self) -> dict[str, TokenBucket]:
+        return dict(self._buckets)
+
+    def add(self, prefix: str, bucket: TokenBucket) -> None:
+        """
+        Limit the requests to a path prefix.
+
+        :param prefix: Path prefix relative to /v1/, e.g. "secret/" or "ns1/auth/approle/".
+        :param bucket: Token bucket of the prefix, replacing the existing one, if any.
+        """
+        self._buckets[_normalize_path(prefix)] = bucket
+        # Longest prefixes first, so that the first match is the most specific one
+        self._buckets = dict(sorted(self._buckets.items(), key=lambda item: len(item[0]), reverse=True))
+
+    def bucket_for(self, url: str, namespace: Optional[str] = None) -> Optional[TokenBucket]:
+        """
+        Find the bucket limiting a request.
+
+        :param url: Path of the request, e.g. "/v1/secret/data/foo".
+        :param namespace: Namespace the request is sent to.
+        :return: The bucket of the longest matching prefix, or None.
+        """
+        path = url.split("?", 1)[0].lstrip("/")
+        if path.startswith("v1/"):
+            path = path[3:]
+        if namespace:
+            path = f"{_normalize_path(namespace)}{path}"
+        path = _normalize_path(path)
+        for prefix, bucket in self._buckets.items():
+            if path.startswith(prefix):
+                return bucket
+        return None
+
+    def acquire(self, url: str, namespace: Optional[str] = None) -> float:
+        """
+        Block until a request may be sent.
+
+        :param url: Path of the request.
+        :param namespace: Namespace the request is sent to.
+        :return: Seconds waited.
+        """
+        bucket = self.bucket_for(url, namespace)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve()
+        self._stats._record_acquire(delay)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, url: str, namespace: Optional[str] = None) -> float:
+        """
+        Wait until a request may be sent, without blocking the event loop.
+
+        :param url: Path of the request.
+        :param namespace: Namespace the request is sent to.
+        :return: Seconds waited.
+        """
+        bucket = self.bucket_for(url, namespace)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve()
+        self._stats._record_acquire(delay)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                bucket.refund()
+                raise
+        return delay
+
+    def record(self, url: str, namespace: Optional[str], status: int) -> None:
+        """
+        Adapt the rate of the bucket of a request to its response.
+
+        :param url: Path of the request.
+        :param namespace: Namespace the request was sent to.
+        :param status: Status code of the response.
+        """
+        bucket = self.bucket_for(url, namespace)
+        if bucket is None:
+            return
+        if status == THROTTLED_STATUS_CODE:
+            self._stats._record_throttled()
+            bucket.on_throttled()
+            logger.debug("Throttled by Vault, backing off to %.3f requests/s: %s", bucket.rate, url)
+        else:
+            bucket.on_success()
+
+    @classmethod
+    def from_quota_configs(cls, quotas: Iterable[Mapping[str, Any]], **bucket_kwargs: Any) -> "RateLimiter":
+        """
+        Create a limiter mirroring Vault rate limit quotas.
+
+        :param quotas: Quota configurations as returned in the data of sys/quotas/rate-limit/:name.
+        :param bucket_kwargs: Additional arguments of every TokenBucket, such as increase or decrease_factor.
+        :return: The limiter.
+        """
+        limiter = cls()
+        for quota in quotas:
+            if quota.get("type", "rate-limit") != "rate-limit":
+                continue
+            rate = float(quota["rate"])
+            per_second = rate / _quota_interval(quota.get("interval"))
+            limiter.add(quota.get("path") or "", TokenBucket(per_second, burst=max(rate, 1), **bucket_kwargs))
+        return limiter
+
+    @classmethod
+    def from_quotas(cls, client: Any, **bucket_kwargs: Any) -> "RateLimiter":
+        """
+        Create a limiter mirroring the rate limit quotas of a Vault server.
+
+        :param client: A :py:class:`vaultx.Client` allowed to list and read quotas in the root namespace.
+        :param bucket_kwargs: Additional arguments of every TokenBucket.
+        :return: The limiter.
+        """
+        try:
+            names = client.sys.list_quotas()["data"]["keys"]
+        except exceptions.HTTPError as e:
+            if e.status_code != 404:
+                raise
+            names = []
+        quotas = [client.sys.read_quota(name)["data"] for name in names]
+        return cls.from_quota_configs(quotas, **bucket_kwargs)
+
+    @classmethod
+    async def from_quotas_async(cls, client: Any, **bucket_kwargs: Any) -> "RateLimiter":
+        """
+        Create a limiter mirroring the rate limit quotas of a Vault server.
+
+        :param client: A :py:class:`vaultx.AsyncClient` allowed to list and read quotas in the root namespace.
+        :param bucket_kwargs: Additional arguments of every TokenBucket.
+        :return: The limiter.
+        """
+        try:
+            names = (await client.sys.list_quotas())["data"]["keys"]
+        except exceptions.HTTPError as e:
+            if e.status_code != 404:
+                raise
+            names = []
+        quotas = [(await client.sys.read_quota(name))["data"] for name in names]
+        return cls.from_quota_configs(quotas, **bucket_kwargs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._buckets!r})"
@@ -0,0 +1,259 @@
+"""
+Retrying requests that failed because of transient Vault or network errors
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable, Collection, Mapping
+from typing import Any, Optional, TypeVar
+
+import httpx
+
+from vaultx import exceptions
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 412 is answered by a standby that did not catch up with the X-Vault-Index state of a request in time
+DEFAULT_RETRY_STATUS_CODES = frozenset({412, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "LIST", "HEAD"})
+
+# Errors raised before a response was received, e.g. refused or reset connections and timeouts
+TRANSIENT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError)
+
+
+class RetryStats:
+    """Counters describing how a retry policy has been used since its creation."""
+
+    __slots__ = ("retries", "recovered", "exhausted", "_lock")
+
+    def __init__(self) -> None:
+        self.retries = 0
+        self.recovered = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def _increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self) -> dict[str, int]:
+        return {"retries": self.retries, "recovered": self.recovered, "exhausted": self.exhausted}
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    :param value: Either a number of seconds or an HTTP date.
+    :param now: Current UNIX time used for HTTP dates, defaults to time.time().
+    :return: The number of seconds to wait, or None if the value is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - (time.time() if now is None else now), 0.0)
+
+
+def _transient_errors() -> tuple[type[BaseException], ...]:
+    # aiohttp errors can only be raised once an async adapter imported aiohttp
+    aiohttp = sys.modules.get("aiohttp")
+    return TRANSIENT_ERRORS if aiohttp is None else (*TRANSIENT_ERRORS, aiohttp.ClientConnectionError)
+
+
+def _transient_error(error: BaseException) -> bool:
+    # Adapters wrap unexpected errors into VaultxError, the original one is kept as the cause
+    transient_errors = _transient_errors()
+    while error is not None:
+        if isinstance(error, transient_errors):
+            return True
+        error = error.__cause__  # type: ignore[assignment]
+    return False
+
+
+class RetryPolicy:
+    """
+    Retry requests failing with a transient status code or network error, with exponential backoff and full jitter.
+
+    The n-th retry waits a random delay between 0 and min(max_backoff, backoff_base * 2 ** n) seconds, so that clients
+    failing at the same moment, e.g. during a leader election, do not retry in lockstep. A Retry-After header sent
+    with the failed response takes precedence over the computed delay. Retries stop once max_retries is reached or
+    when the next attempt would start after the deadline.
+
+    Only idempotent methods are retried by default; pass retry=True to a single adapter request to opt in, or
+    retry=False to opt out.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        max_backoff: float = 10.0,
+        deadline: Optional[float] = 30.0,
+        status_codes: Collection[int] = DEFAULT_RETRY_STATUS_CODES,
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new RetryPolicy instance.
+
+        :param max_retries: Maximum number of retries of a single request.
+        :param backoff_base: Upper bound in seconds of the delay before the first retry.
+        :param max_backoff: Upper bound in seconds of any computed delay.
+        :param deadline: Seconds after the first attempt past which no retry is started, None for no deadline.
+        :param status_codes: Response status codes that are retried.
+        :param methods: HTTP methods that are retried unless a request opts out.
+        :param respect_retry_after: Whether to wait for the delay requested by a Retry-After header.
+        :param timer: Monotonic clock, mostly useful for testing.
+        """
+        if max_retries < 0:
+            raise ValueError(f'"max_retries" must be a non-negative integer, "{max_retries}" provided')
+        if backoff_base <= 0 or max_backoff <= 0:
+            raise ValueError(f'Backoff delays must be positive numbers, "{backoff_base}" and "{max_backoff}" provided')
+        if deadline is not None and deadline <= 0:
+            raise ValueError(f'"deadline" must be a positive number, "{deadline}" provided')
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.respect_retry_after = respect_retry_after
+        self._timer = timer
+        self._stats = RetryStats()
+
+    @property
+    def stats(self) -> RetryStats:
+        """Retry, recovery and exhaustion counters of this policy."""
+        return self._stats
+
+    def applies_to(self, method: str, retry: Optional[bool] = None) -> bool:
+        """
+        Whether requests with the given method are retried.
+
+        :param method: HTTP method of the request.
+        :param retry: Per-request override, None to decide based on the method.
+        """
+        return retry if retry is not None else method.upper() in self.methods
+
+    def backoff(self, retry_number: int) -> float:
+        """
+        Compute a fully jittered delay.
+
+        :param retry_number: Zero-based number of the upcoming retry.
+        :return: Seconds to wait before the retry.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * 2**retry_number))
+
+    def _retry_after(self, headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        if not self.respect_retry_after or not headers:
+            return None
+        return parse_retry_after(headers.get("Retry-After"))
+
+    def _next_delay(self, retry_number: int, started: float, outcome: Any) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried.
+
+        :param retry_number: Zero-based number of the retry that would follow.
+        :param started: Timer value of the first attempt.
+        :param outcome: The response returned by the attempt or the exception it raised.
+        :return: Seconds to wait before retrying, or None if the outcome is final.
+        """
+        if isinstance(outcome, exceptions.HTTPError):
+            status: Optional[int] = outcome.status_code
+            headers = outcome.headers
+        elif isinstance(outcome, BaseException):
+            if not _transient_error(outcome):
+                return None
+            status, headers = None, None
+        else:
+            status, headers = outcome.status, outcome.headers
+
+        if status is not None and status not in self.status_codes:
+            return None
+        if retry_number >= self.max_retries:
+            self._stats._increment("exhausted")
+            return None
+
+        delay = self._retry_after(headers)
+        if delay is None:
+            delay = self.backoff(retry_number)
+        if self.deadline is not None and self._timer() + delay - started > self.deadline:
+            self._stats._increment("exhausted")
+            return None
+
+        self._stats._increment("retries")
+        logger.debug("Retrying request in %.3fs after %r", delay, outcome)
+        return delay
+
+    def _record_result(self, retry_number: int, response: Any) -> None:
+        if retry_number and response.status not in self.status_codes:
+            self._stats._increment("recovered")
+
+    def call(self, send: Callable[[], T]) -> T:
+        """
+        Call send until it succeeds or the policy gives up.
+
+        :param send: Callable performing one attempt of the request, returning a response or raising.
+        :return: The response of the last attempt.
+        """
+        started = self._timer()
+        retry_number = 0
+        while True:
+            try:
+                outcome: Any = send()
+            except Exception as exc:
+                delay = self._next_delay(retry_number, started, exc)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_delay(retry_number, started, outcome)
+                if delay is None:
+                    self._record_result(retry_number, outcome)
+                    return outcome
+            time.sleep(delay)
+            retry_number += 1
+
+    async def call_async(self, send: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await send until it succeeds or the policy gives up.
+
+        :param send: Callable returning an awaitable that performs one attempt of the request.
+        :return: The response of the last attempt.
+        """
+        started = self._timer()
+        retry_number = 0
+        while True:
+            try:
+                outcome: Any = await send()
+            except Exception as exc:
+                delay = self._next_delay(retry_number, started, exc)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_delay(retry_number, started, outcome)
+                if delay is None:
+                    self._record_result(retry_number, outcome)
+                    return outcome
+            await asyncio.sleep(delay)
+            retry_number += 1
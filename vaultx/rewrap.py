@@ -0,0 +1,496 @@
+"""
+Resumable bulk rewrapping of Transit ciphertexts after a key rotation
+"""
+
+import asyncio
+import inspect
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Hashable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from vaultx import exceptions
+from vaultx.cache import _write_atomically
+from vaultx.constants import transit as transit_constants
+
+
+if TYPE_CHECKING:
+    from vaultx.api.async_secrets_engines.transit import Transit as AsyncTransit
+    from vaultx.api.secrets_engines.transit import Transit
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = transit_constants.DEFAULT_REWRAP_BATCH_SIZE
+DEFAULT_CONCURRENCY = transit_constants.DEFAULT_REWRAP_CONCURRENCY
+DEFAULT_CHECKPOINT_INTERVAL = transit_constants.DEFAULT_REWRAP_CHECKPOINT_INTERVAL
+
+# Maximum number of input items in a batch, as a multiple of the batch size
+_MAX_BATCH_SPAN = 100
+
+_VERSION_PREFIX = re.compile(r"^vault:v(\d+):")
+
+ResultCallback = Callable[[Hashable, str], Any]
+ErrorCallback = Callable[[Hashable, Exception], Any]
+
+
+def ciphertext_version(ciphertext: str) -> int:
+    """
+    Read the version of the Transit key a ciphertext was encrypted with from its "vault:vN:" prefix.
+
+    :param ciphertext: Ciphertext returned by Transit, e.g. "vault:v2:...".
+    :return: The key version, e.g. 2.
+    """
+    match = _VERSION_PREFIX.match(ciphertext)
+    if match is None:
+        raise exceptions.VaultxError(f'Not a Transit ciphertext: "{ciphertext[:16]}..."')
+    return int(match.group(1))
+
+
+class RewrapStats:
+    """Counters describing the progress of a run of a rewrap campaign."""
+
+    __slots__ = ("read", "skipped", "rewrapped", "failed", "requests", "resumed", "elapsed")
+
+    def __init__(self) -> None:
+        self.read = 0
+        self.skipped = 0
+        self.rewrapped = 0
+        self.failed = 0
+        self.requests = 0
+        self.resumed = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Ciphertexts read per second, 0.0 before any time has elapsed."""
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters}, rate={self.rate:.1f}/s)"
+
+
+class _Batch:
+    """Consecutive input items, from start to end excluded, and those of them to send to Vault."""
+
+    __slots__ = ("start", "end", "items", "invalid")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.end = start
+        self.items: list[tuple[Hashable, str]] = []
+        self.invalid: list[tuple[Hashable, Exception]] = []
+
+
+class _BaseRewrapCampaign:
+    """Batching, result delivery and checkpointing shared by the sync and async rewrap campaigns."""
+
+    def __init__(
+        self,
+        name: str,
+        mount_point: str,
+        key_version: Optional[int],
+        batch_size: int,
+        concurrency: int,
+        checkpoint: Optional[Union[str, "os.PathLike[str]"]],
+        checkpoint_interval: float,
+        on_progress: Optional[Callable[[RewrapStats], Any]],
+        timer: Callable[[], float],
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError(f'"batch_size" must be a positive integer, "{batch_size}" provided')
+        if concurrency <= 0:
+            raise ValueError(f'"concurrency" must be a positive integer, "{concurrency}" provided')
+
+        self.name = name
+        self.mount_point = mount_point
+        self.key_version = key_version
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.checkpoint = os.fspath(checkpoint) if checkpoint is not None else None
+        self.checkpoint_interval = checkpoint_interval
+        self.on_progress = on_progress
+        self._timer = timer
+        self._target_version = 0
+        self._position = 0
+        self._completed: dict[int, int] = {}
+        self._started_at = 0.0
+        self._reported_at = 0.0
+        self._stats = RewrapStats()
+
+    @property
+    def stats(self) -> RewrapStats:
+        """Progress counters and throughput of the current or last run."""
+        return self._stats
+
+    @property
+    def position(self) -> int:
+        """Number of input items whose results were all delivered, from the start of the input."""
+        return self._position
+
+    def _start(self, latest_version: int) -> int:
+        """Reset the state of a new run, resuming from the checkpoint if it matches, and return its position."""
+        self._target_version = self.key_version or latest_version
+        self._stats = RewrapStats()
+        self._position = 0
+        self._completed = {}
+        state = self._load_checkpoint()
+        if state is not None:
+            self._position = state["position"]
+            logger.info("Resuming rewrap of %s after %d ciphertexts", self.name, self._position)
+        self._stats.resumed = self._position
+        self._started_at = self._reported_at = self._timer()
+        return self._position
+
+    def _load_checkpoint(self) -> Optional[dict[str, Any]]:
+        if self.checkpoint is None:
+            return None
+        try:
+            with open(self.checkpoint) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        campaign = (state.get("name"), state.get("mount_point"), state.get("version"))
+        if campaign != (self.name, self.mount_point, self._target_version):
+            # Left by a campaign for another key or version, e.g. before the latest rotation
+            return None
+        return state
+
+    def _save_checkpoint(self) -> None:
+        self._stats.elapsed = self._timer() - self._started_at
+        if self.checkpoint is None:
+            return
+        state = {
+            "name": self.name,
+            "mount_point": self.mount_point,
+            "version": self._target_version,
+            "position": self._position,
+        }
+        _write_atomically(self.checkpoint, json.dumps(state).encode())
+
+    def _batches(self, items: Iterable[tuple[Hashable, str]]) -> Iterator[_Batch]:
+        batch = _Batch(self._position)
+        for item_id, ciphertext in items:
+            self._add(batch, item_id, ciphertext)
+            if self._full(batch):
+                yield batch
+                batch = _Batch(batch.end)
+        yield batch
+
+    async def _abatches(self, items: AsyncIterable[tuple[Hashable, str]]) -> AsyncIterator[_Batch]:
+        batch = _Batch(self._position)
+        async for item_id, ciphertext in items:
+            self._add(batch, item_id, ciphertext)
+            if self._full(batch):
+                yield batch
+                batch = _Batch(batch.end)
+        yield batch
+
+    def _full(self, batch: _Batch) -> bool:
+        # Long runs of skipped items are cut too, so that the checkpoint keeps moving through them
+        return len(batch.items) >= self.batch_size or batch.end - batch.start >= _MAX_BATCH_SPAN * self.batch_size
+
+    def _add(self, batch: _Batch, item_id: Hashable, ciphertext: str) -> None:
+        batch.end += 1
+        self._stats.read += 1
+        try:
+            version = ciphertext_version(ciphertext)
+        except exceptions.VaultxError as e:
+            batch.invalid.append((item_id, e))
+            return
+        if version >= self._target_version:
+            self._stats.skipped += 1
+        else:
+            batch.items.append((item_id, ciphertext))
+
+    def _batch_input(self, batch: _Batch) -> dict[str, Any]:
+        # Without partial_failure_response_code, one failed item turns the whole batch into a 400 error
+        return {
+            "name": self.name,
+            "batch_input": [{"ciphertext": ciphertext} for _, ciphertext in batch.items],
+            "key_version": self.key_version,
+            "mount_point": self.mount_point,
+            "partial_failure_response_code": 200,
+        }
+
+    def _outcomes(
+        self, batch: _Batch, results: list[dict[str, Any]]
+    ) -> tuple[list[tuple[Hashable, str]], list[tuple[Hashable, Exception]]]:
+        """Split the items of a completed batch into new ciphertexts and errors."""
+        if len(results) != len(batch.items):
+            raise exceptions.VaultxError(
+                f"Expected {len(batch.items)} batch results from rewrap, received {len(results)}"
+            )
+        rewrapped, failed = [], list(batch.invalid)
+        for index, (item_id, _) in enumerate(batch.items):
+            result = results[index]
+            if result.get("error"):
+                failed.append((item_id, exceptions.VaultxError(message=result["error"])))
+            else:
+                rewrapped.append((item_id, result["ciphertext"]))
+        self._stats.rewrapped += len(rewrapped)
+        self._stats.failed += len(failed)
+        return rewrapped, failed
+
+    def _log_failure(self, item_id: Hashable, error: Exception) -> None:
+        logger.warning("Could not rewrap %r: %s", item_id, error)
+
+    def _delivered(self, batch: _Batch) -> None:
+        """Move the checkpoint past every batch delivered so far, reporting progress when it is due."""
+        # Batches complete in any order, the checkpoint only covers those without an earlier batch still in flight
+        self._completed[batch.start] = batch.end
+        while self._position in self._completed:
+            self._position = self._completed.pop(self._position)
+        if self._timer() - self._reported_at >= self.checkpoint_interval:
+            self._report()
+
+    def _report(self) -> None:
+        self._reported_at = self._timer()
+        self._save_checkpoint()
+        logger.info("Rewrap of %s: %r", self.name, self._stats)
+        if self.on_progress is not None:
+            self.on_progress(self._stats)
+
+
+class RewrapCampaign(_BaseRewrapCampaign):
+    """
+    Rewrap a large number of ciphertexts to the latest version of a Transit key, in batches sent from a thread pool.
+
+    Ciphertexts whose "vault:vN:" prefix shows they are already at the target version are skipped without any
+    request. The others are sent to rewrap_data in batch_input requests of batch_size items, at most concurrency at
+    once, and every new ciphertext is handed to the on_result callback, from the thread calling run.
+
+    Progress is saved to the checkpoint file every checkpoint_interval seconds and when the run stops, even on errors.
+    A new run with the same input, in the same order, skips the items already delivered; items of batches which
+    completed after an earlier batch still in flight are delivered again, so on_result must be idempotent.
+    """
+
+    def __init__(
+        self,
+        transit: "Transit",
+        name: str,
+        mount_point: str = "transit",
+        key_version: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint: Optional[Union[str, "os.PathLike[str]"]] = None,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+        on_progress: Optional[Callable[[RewrapStats], Any]] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new RewrapCampaign instance.
+
+        :param transit: Transit instance the ciphertexts are rewrapped with.
+        :param name: Name of the Transit key the ciphertexts were encrypted with.
+        :param mount_point: The "path" the Transit secrets engine was mounted on.
+        :param key_version: Version to rewrap to, the latest version of the key by default.
+        :param batch_size: Number of ciphertexts sent in each rewrap request.
+        :param concurrency: Maximum number of rewrap requests in flight at once.
+        :param checkpoint: Optional path of the file progress is saved to and resumed from.
+        :param checkpoint_interval: Number of seconds between checkpoints and progress reports.
+        :param on_progress: Optional callable invoked with the stats at every progress report.
+        :param timer: Monotonic clock used for checkpoints and throughput, mostly useful for testing.
+        """
+        super().__init__(
+            name, mount_point, key_version, batch_size, concurrency, checkpoint, checkpoint_interval, on_progress, timer
+        )
+        self.transit = transit
+
+    def run(
+        self,
+        items: Iterable[tuple[Hashable, str]],
+        on_result: ResultCallback,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> RewrapStats:
+        """
+        Rewrap every ciphertext of items, resuming from the checkpoint if there is one for the same key and version.
+
+        :param items: Pairs of an identifier, e.g. a database primary key, and the ciphertext to rewrap. When resuming,
+            the items before the checkpoint are skipped without being parsed.
+        :param on_result: Callable invoked with the identifier and the new ciphertext of every rewrapped item.
+        :param on_error: Optional callable invoked with the identifier and the error of every item which could not be
+            rewrapped. Such items are logged when it is not provided.
+        :return: The stats of the campaign.
+        """
+        latest_version = self.transit.read_key(name=self.name, mount_point=self.mount_point)["data"]["latest_version"]
+        position = self._start(latest_version)
+        inflight: dict[Future, _Batch] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="vaultx-rewrap") as executor:
+            try:
+                for batch in self._batches(itertools.islice(items, position, None)):
+                    while len(inflight) >= self.concurrency:
+                        self._deliver_completed(inflight, on_result, on_error)
+                    if batch.items:
+                        self._stats.requests += 1
+                        inflight[executor.submit(self._send, batch)] = batch
+                    else:
+                        self._deliver(batch, [], on_result, on_error)
+                while inflight:
+                    self._deliver_completed(inflight, on_result, on_error)
+            finally:
+                for future in inflight:
+                    future.cancel()
+                self._report()
+        return self._stats
+
+    def _deliver(
+        self,
+        batch: _Batch,
+        results: list[dict[str, Any]],
+        on_result: ResultCallback,
+        on_error: Optional[ErrorCallback],
+    ) -> None:
+        rewrapped, failed = self._outcomes(batch, results)
+        for item_id, ciphertext in rewrapped:
+            on_result(item_id, ciphertext)
+        for item_id, error in failed:
+            (on_error or self._log_failure)(item_id, error)
+        self._delivered(batch)
+
+    def _deliver_completed(
+        self, inflight: dict[Future, _Batch], on_result: ResultCallback, on_error: Optional[ErrorCallback]
+    ) -> None:
+        done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+        for future in done:
+            self._deliver(inflight.pop(future), future.result(), on_result, on_error)
+
+    def _send(self, batch: _Batch) -> list[dict[str, Any]]:
+        return self.transit.rewrap_data(**self._batch_input(batch))["data"]["batch_results"]
+
+
+class AsyncRewrapCampaign(_BaseRewrapCampaign):
+    """
+    Rewrap a large number of ciphertexts to the latest version of an async Transit key, in concurrent batches.
+
+    Ciphertexts whose "vault:vN:" prefix shows they are already at the target version are skipped without any
+    request. The others are sent to rewrap_data in batch_input requests of batch_size items, at most concurrency at
+    once, and every new ciphertext is handed to the on_result callback, which may be a coroutine function.
+
+    Progress is saved to the checkpoint file every checkpoint_interval seconds and when the run stops, even on errors.
+    A new run with the same input, in the same order, skips the items already delivered; items of batches which
+    completed after an earlier batch still in flight are delivered again, so on_result must be idempotent.
+    """
+
+    def __init__(
+        self,
+        transit: "AsyncTransit",
+        name: str,
+        mount_point: str = "transit",
+        key_version: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint: Optional[Union[str, "os.PathLike[str]"]] = None,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+        on_progress: Optional[Callable[[RewrapStats], Any]] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Create a new AsyncRewrapCampaign instance.
+
+        :param transit: Async Transit instance the ciphertexts are rewrapped with.
+        :param name: Name of the Transit key the ciphertexts were encrypted with.
+        :param mount_point: The "path" the Transit secrets engine was mounted on.
+        :param key_version: Version to rewrap to, the latest version of the key by default.
+        :param batch_size: Number of ciphertexts sent in each rewrap request.
+        :param concurrency: Maximum number of rewrap requests in flight at once.
+        :param checkpoint: Optional path of the file progress is saved to and resumed from.
+        :param checkpoint_interval: Number of seconds between checkpoints and progress reports.
+        :param on_progress: Optional callable invoked with the stats at every progress report.
+        :param timer: Monotonic clock used for checkpoints and throughput, mostly useful for testing.
+        """
+        super().__init__(
+            name, mount_point, key_version, batch_size, concurrency, checkpoint, checkpoint_interval, on_progress, timer
+        )
+        self.transit = transit
+
+    async def run(
+        self,
+        items: Union[Iterable[tuple[Hashable, str]], AsyncIterable[tuple[Hashable, str]]],
+        on_result: ResultCallback,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> RewrapStats:
+        """
+        Rewrap every ciphertext of items, resuming from the checkpoint if there is one for the same key and version.
+
+        :param items: Pairs of an identifier, e.g. a database primary key, and the ciphertext to rewrap, from an
+            iterable or an asynchronous iterable. When resuming, the items before the checkpoint are skipped without
+            being parsed.
+        :param on_result: Callable or coroutine function invoked with the identifier and the new ciphertext of every
+            rewrapped item.
+        :param on_error: Optional callable or coroutine function invoked with the identifier and the error of every
+            item which could not be rewrapped. Such items are logged when it is not provided.
+        :return: The stats of the campaign.
+        """
+        response = await self.transit.read_key(name=self.name, mount_point=self.mount_point)
+        position = self._start(response["data"]["latest_version"])
+        inflight: dict[asyncio.Future, _Batch] = {}
+        try:
+            async for batch in self._abatches(_skip(items, position)):
+                while len(inflight) >= self.concurrency:
+                    await self._deliver_completed(inflight, on_result, on_error)
+                if batch.items:
+                    self._stats.requests += 1
+                    inflight[asyncio.ensure_future(self._send(batch))] = batch
+                else:
+                    await self._deliver(batch, [], on_result, on_error)
+            while inflight:
+                await self._deliver_completed(inflight, on_result, on_error)
+        finally:
+            for task in inflight:
+                task.cancel()
+            self._report()
+        return self._stats
+
+    async def _deliver(
+        self,
+        batch: _Batch,
+        results: list[dict[str, Any]],
+        on_result: ResultCallback,
+        on_error: Optional[ErrorCallback],
+    ) -> None:
+        rewrapped, failed = self._outcomes(batch, results)
+        for item_id, ciphertext in rewrapped:
+            await _maybe_await(on_result(item_id, ciphertext))
+        for item_id, error in failed:
+            await _maybe_await((on_error or self._log_failure)(item_id, error))
+        self._delivered(batch)
+
+    async def _deliver_completed(
+        self, inflight: dict[asyncio.Future, _Batch], on_result: ResultCallback, on_error: Optional[ErrorCallback]
+    ) -> None:
+        done, _ = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            await self._deliver(inflight.pop(task), task.result(), on_result, on_error)
+
+    async def _send(self, batch: _Batch) -> list[dict[str, Any]]:
+        response = await self.transit.rewrap_data(**self._batch_input(batch))
+        return response["data"]["batch_results"]
+
+
+async def _maybe_await(result: Any) -> None:
+    if inspect.isawaitable(result):
+        await result
+
+
+async def _skip(
+    items: Union[Iterable[tuple[Hashable, str]], AsyncIterable[tuple[Hashable, str]]], count: int
+) -> AsyncIterator[tuple[Hashable, str]]:
+    if not isinstance(items, AsyncIterable):
+        for item in itertools.islice(items, count, None):
+            yield item
+        return
+    index = 0
+    async for item in items:
+        if index >= count:
+            yield item
+        index += 1
@@ -0,0 +1,181 @@
+"""
+Coalescing identical concurrent requests into a single call
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import Any, Generic, Optional, TypeVar
+
+from vaultx.retry import IDEMPOTENT_METHODS
+
+
+T = TypeVar("T")
+
+# Arguments which, when present, make a request unique
+BODY_ARGUMENTS = ("json", "data", "content", "files")
+
+
+class SingleFlightStats:
+    """Counters describing how a SingleFlight group has been used since its creation."""
+
+    __slots__ = ("calls", "deduplicated", "_lock")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+
+    def _record(self, leader: bool) -> None:
+        with self._lock:
+            if leader:
+                self.calls += 1
+            else:
+                self.deduplicated += 1
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Share of callers served by another caller's call, 0.0 when nothing has been called yet."""
+        total = self.calls + self.deduplicated
+        return self.deduplicated / total if total else 0.0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"calls": self.calls, "deduplicated": self.deduplicated}
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({counters})"
+
+
+def request_key(
+    method: str,
+    url: str,
+    headers: Optional[Mapping[str, str]],
+    kwargs: Mapping[str, Any],
+    *identity: Any,
+) -> Optional[Hashable]:
+    """
+    Build the key identifying an adapter request among concurrent ones.
+
+    :param method: HTTP method of the request.
+    :param url: URL of the request, relative to the adapter's base_uri.
+    :param headers: Additional headers of the request.
+    :param kwargs: Additional arguments of the request, such as params and wrap_ttl.
+    :param identity: Whatever else distinguishes the caller, such as the token and namespace.
+    :return: The key, or None if the request must not be coalesced: it is not idempotent, it has a body or its
+        response body is streamed, which only one caller could read.
+    """
+    if method.upper() not in IDEMPOTENT_METHODS or any(kwargs.get(name) is not None for name in BODY_ARGUMENTS):
+        return None
+    if kwargs.get("stream"):
+        return None
+    try:
+        return (
+            method.upper(),
+            url,
+            tuple(sorted((headers or {}).items())),
+            tuple(sorted((name, repr(value)) for name, value in kwargs.items())),
+            *identity,
+        )
+    except TypeError:
+        return None
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe group of calls in which concurrent callers of the same key share the call of the first one.
+
+    The first caller of a key runs the call; callers arriving while it is in flight wait for it and get the same
+    result or exception. The key is released as soon as the call returns, nothing is cached.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call[Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = SingleFlightStats()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Counters of calls made and of callers served by another caller's call."""
+        return self._stats
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run fn, unless a call for the same key is in flight, and return its result.
+
+        :param key: Key identifying equivalent calls.
+        :param fn: Callable performing the call.
+        :return: The result of the call, possibly shared with other callers.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        self._stats._record(leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Group of coroutine calls in which concurrent callers of the same key share the call of the first one.
+
+    The call runs in its own task, so that cancelling any of the callers, including the first one, does not cancel it
+    for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+        self._stats = SingleFlightStats()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Counters of calls made and of callers served by another caller's call."""
+        return self._stats
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await fn, unless a call for the same key is in flight, and return its result.
+
+        :param key: Key identifying equivalent calls.
+        :param fn: Callable returning an awaitable that performs the call.
+        :return: The result of the call, possibly shared with other callers.
+        """
+        call = self._calls.get(key)
+        self._stats._record(call is None)
+        if call is None:
+            call = self._calls[key] = asyncio.ensure_future(fn())
+            call.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(call)
+
+    def _release(self, key: Hashable, call: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled
+            call.exception()
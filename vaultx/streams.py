@@ -0,0 +1,191 @@
+"""
+Chunked reading, writing, hashing and compression of large bodies in constant memory
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import IO, Any, Union
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# zlib window bits producing and accepting the gzip format, so that compressed files can be read with gunzip
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+FileTypes = Union[str, "os.PathLike[str]", IO[bytes]]
+
+
+@contextlib.contextmanager
+def open_file(file: FileTypes, mode: str) -> Iterator[IO[bytes]]:
+    """
+    Open a path in binary mode, or use an already open binary file object, which is left open.
+
+    :param file: Path or binary file object.
+    :param mode: Mode a path is opened with, "rb" or "wb".
+    :return: The file object.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, mode) as f:
+            yield f
+    else:
+        yield file
+
+
+class StreamDigest:
+    """Size and checksum of a body, computed chunk by chunk as it goes through."""
+
+    __slots__ = ("algorithm", "size", "_hash")
+
+    def __init__(self, algorithm: str = "sha256") -> None:
+        """
+        Create a new StreamDigest instance.
+
+        :param algorithm: Name of a hashlib algorithm.
+        """
+        self.algorithm = algorithm
+        self.size = 0
+        self._hash = hashlib.new(algorithm)
+
+    def update(self, chunk: bytes) -> bytes:
+        self.size += len(chunk)
+        self._hash.update(chunk)
+        return chunk
+
+    @property
+    def checksum(self) -> str:
+        """Hexadecimal digest of the data seen so far."""
+        return self._hash.hexdigest()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"size": self.size, "algorithm": self.algorithm, "checksum": self.checksum}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(algorithm={self.algorithm!r}, size={self.size}, checksum={self.checksum!r})"
+
+
+def iter_file(f: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read a file in chunks.
+
+    :param f: Binary file object.
+    :param chunk_size: Maximum size of every chunk.
+    :return: Iterator of the chunks.
+    """
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def aiter_file(f: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Read a file in chunks, in the default executor so that disk reads do not block the event loop.
+
+    :param f: Binary file object.
+    :param chunk_size: Maximum size of every chunk.
+    :return: Asynchronous iterator of the chunks.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, f.read, chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def hashing(chunks: Iterable[bytes], digest: StreamDigest) -> Iterator[bytes]:
+    """Pass chunks through, updating digest with each of them."""
+    for chunk in chunks:
+        yield digest.update(chunk)
+
+
+async def ahashing(chunks: AsyncIterable[bytes], digest: StreamDigest) -> AsyncIterator[bytes]:
+    """Pass chunks through, updating digest with each of them."""
+    async for chunk in chunks:
+        yield digest.update(chunk)
+
+
+def compressing(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip-compress a stream of chunks.
+
+    :param chunks: Uncompressed chunks.
+    :param level: Compression level, from 1 (fastest) to 9 (smallest).
+    :return: Iterator of compressed chunks.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def acompressing(chunks: AsyncIterable[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """
+    Gzip-compress an asynchronous stream of chunks.
+
+    :param chunks: Uncompressed chunks.
+    :param level: Compression level, from 1 (fastest) to 9 (smallest).
+    :return: Asynchronous iterator of compressed chunks.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _inflate(decompressor: Any, data: bytes, chunk_size: int) -> Iterator[bytes]:
+    # Bound the output of highly compressible data instead of inflating a whole chunk at once
+    while data:
+        output = decompressor.decompress(data, chunk_size)
+        if output:
+            yield output
+        data = decompressor.unconsumed_tail
+
+
+def _finish_inflating(decompressor: Any) -> bytes:
+    output = decompressor.flush()
+    if not decompressor.eof:
+        raise ValueError("Compressed stream ended before the end of the gzip data")
+    return output
+
+
+def decompressing(chunks: Iterable[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Decompress a gzip stream of chunks, never producing chunks larger than chunk_size.
+
+    :param chunks: Compressed chunks.
+    :param chunk_size: Maximum size of every decompressed chunk.
+    :return: Iterator of decompressed chunks.
+    """
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    for chunk in chunks:
+        yield from _inflate(decompressor, chunk, chunk_size)
+    output = _finish_inflating(decompressor)
+    if output:
+        yield output
+
+
+async def adecompressing(chunks: AsyncIterable[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Decompress an asynchronous gzip stream of chunks, never producing chunks larger than chunk_size.
+
+    :param chunks: Compressed chunks.
+    :param chunk_size: Maximum size of every decompressed chunk.
+    :return: Asynchronous iterator of decompressed chunks.
+    """
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    async for chunk in chunks:
+        for output in _inflate(decompressor, chunk, chunk_size):
+            yield output
+    output = _finish_inflating(decompressor)
+    if output:
+        yield output
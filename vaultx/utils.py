@@ -1,9 +1,19 @@
+import asyncio
+import contextvars
 import os
-from typing import Any, Optional, Union
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional, TypeVar, Union
 
 from vaultx import exceptions
 
 
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+ALLOWED_ERROR_POLICIES = ["return", "skip", "raise"]
+
+
 def get_token_from_env() -> Optional[str]:
     """
     Get the token from env var, VAULT_TOKEN. If not set, attempt to get the token from, ~/.vault-token
@@ -114,3 +124,100 @@ def validate_pem_format(param_name: str, param_argument: Union[str, list]) -> bo
         raise exceptions.VaultxError(f"unsupported {param_name} public key / certificate format, required type: PEM")
 
     return True
+
+
+def _validate_concurrency_params(concurrency: int, on_error: str) -> None:
+    if concurrency <= 0:
+        raise exceptions.VaultxError(f'"concurrency" must be a positive integer, "{concurrency}" provided')
+    if on_error not in ALLOWED_ERROR_POLICIES:
+        raise exceptions.VaultxError(
+            f'invalid on_error argument provided "{on_error}", supported types: "{", ".join(ALLOWED_ERROR_POLICIES)}"'
+        )
+
+
+def submit_in_context(executor: ThreadPoolExecutor, func: Callable[..., R], *args: Any) -> "Future[R]":
+    """
+    Submit func to an executor, running it in a copy of the current context.
+
+    Worker threads otherwise start from an empty context and lose context variables such as the consistency session
+    of the caller.
+
+    :param executor: Executor to submit the call to.
+    :param func: Callable to invoke.
+    :param args: Positional arguments of the call.
+    :return: The future of the call.
+    """
+    return executor.submit(contextvars.copy_context().run, func, *args)
+
+
+def map_concurrently(
+    func: Callable[[K], R], keys: Iterable[K], concurrency: int, on_error: str = "return"
+) -> dict[K, Union[R, Exception]]:
+    """
+    Call func for every key from a thread pool of bounded size.
+
+    :param func: Callable to invoke with each key.
+    :param keys: Keys to process. Duplicates are processed once.
+    :param concurrency: Maximum number of calls running at once.
+    :param on_error: What to do with failed calls: "return" maps the key to the raised exception,
+        "skip" leaves the key out of the result and "raise" re-raises the error of the first failed key.
+    :return: Mapping of each key to its result, in input order.
+    """
+    _validate_concurrency_params(concurrency, on_error)
+    unique_keys = list(dict.fromkeys(keys))
+    results: dict[K, Union[R, Exception]] = {}
+    if not unique_keys:
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique_keys))) as executor:
+        futures = {key: submit_in_context(executor, func, key) for key in unique_keys}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                if on_error == "raise":
+                    for pending in futures.values():
+                        pending.cancel()
+                    raise
+                if on_error == "return":
+                    results[key] = e
+    return results
+
+
+async def async_map_concurrently(
+    func: Callable[[K], Awaitable[R]], keys: Iterable[K], concurrency: int, on_error: str = "return"
+) -> dict[K, Union[R, Exception]]:
+    """
+    Await func for every key, keeping at most concurrency calls in flight.
+
+    :param func: Coroutine function to invoke with each key.
+    :param keys: Keys to process. Duplicates are processed once.
+    :param concurrency: Maximum number of calls in flight at once.
+    :param on_error: What to do with failed calls: "return" maps the key to the raised exception,
+        "skip" leaves the key out of the result and "raise" re-raises the first error and cancels the other calls.
+    :return: Mapping of each key to its result, in input order.
+    """
+    _validate_concurrency_params(concurrency, on_error)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(key: K) -> R:
+        async with semaphore:
+            return await func(key)
+
+    tasks = {key: asyncio.ensure_future(call(key)) for key in dict.fromkeys(keys)}
+    try:
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=on_error != "raise")
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    results: dict[K, Union[R, Exception]] = {}
+    for index, key in enumerate(tasks):
+        outcome = outcomes[index]
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, Exception) and on_error == "skip":
+            continue
+        results[key] = outcome
+    return results